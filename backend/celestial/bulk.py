@@ -0,0 +1,122 @@
+"""Set-based writes for celestial bodies.
+
+This module creates and reassigns planets and asteroid belts in batches,
+with a fixed number of queries per batch instead of per body:
+
+**Functions:**
+- :func:`celestial.bulk.occupied_orbits`: Load the used orbits of many systems
+- :func:`celestial.bulk.create_bodies`: Bulk insert validated bodies
+- :func:`celestial.bulk.reassign_owners`: Move bodies between empires
+- :func:`celestial.bulk.set_owned_bodies`: Replace the bodies owned by an empire
+
+Bulk writes bypass ``save()`` and its signals, so these functions record the
+changes in the game change log themselves.
+"""
+
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import Prefetch
+from .models import Planet, AsteroidBelt, System
+from play.signals import CHANGE_KINDS
+from play.versioning import record_changes, deferred_version_bumps
+
+
+def occupied_orbits(system_ids):
+    """Load systems and their used orbits in one prefetch.
+
+    **Args:**
+        system_ids (Iterable[int]): IDs of the systems
+
+    **Returns:**
+        dict: ``{system_id: (system, set of used orbits)}`` for existing systems
+    """
+    systems = System.objects.filter(pk__in=set(system_ids)).only('id', 'game_id').prefetch_related(
+        Prefetch('planets', queryset=Planet.objects.only('id', 'system_id', 'orbit')),
+        Prefetch('asteroid_belts', queryset=AsteroidBelt.objects.only('id', 'system_id', 'orbit')),
+    )
+    return {
+        system.pk: (
+            system,
+            {planet.orbit for planet in system.planets.all()}
+            | {belt.orbit for belt in system.asteroid_belts.all()},
+        )
+        for system in systems
+    }
+
+
+def create_bodies(planets=(), asteroid_belts=(), systems=None):
+    """Insert validated planets and asteroid belts with one query per type.
+
+    **Args:**
+        planets (Iterable[dict]): Planet fields, including ``system_id``
+        asteroid_belts (Iterable[dict]): Asteroid belt fields, including ``system_id``
+        systems (dict): ``{system_id: System}`` used to find the games to record
+            the changes in, loaded when not given
+
+    **Returns:**
+        tuple: The created planets and the created asteroid belts
+    """
+    planets = [Planet(**data) for data in planets]
+    asteroid_belts = [AsteroidBelt(**data) for data in asteroid_belts]
+    if systems is None:
+        system_ids = {body.system_id for body in planets + asteroid_belts}
+        systems = System.objects.only('id', 'game_id').in_bulk(system_ids)
+
+    with transaction.atomic(), deferred_version_bumps():
+        planets = Planet.objects.bulk_create(planets)
+        asteroid_belts = AsteroidBelt.objects.bulk_create(asteroid_belts)
+        for model, bodies in ((Planet, planets), (AsteroidBelt, asteroid_belts)):
+            by_game = defaultdict(list)
+            for body in bodies:
+                by_game[systems[body.system_id].game_id].append(body.pk)
+            for game_id, ids in by_game.items():
+                record_changes(game_id, CHANGE_KINDS[model], ids)
+    return planets, asteroid_belts
+
+
+def reassign_owners(model, owners):
+    """Set the owning empire of many bodies with one UPDATE per empire.
+
+    Bodies that already have the requested owner are left untouched.
+
+    **Args:**
+        model: :model:`celestial.Planet` or :model:`celestial.AsteroidBelt`
+        owners (dict): ``{body_id: empire_id or None}``
+
+    **Returns:**
+        list: IDs of the bodies whose owner changed
+    """
+    if not owners:
+        return []
+    by_empire = defaultdict(list)
+    by_game = defaultdict(list)
+    for pk, empire_id, game_id in model.objects.filter(pk__in=owners).values_list(
+        'pk', 'empire_id', 'system__game_id'
+    ):
+        if empire_id == owners[pk]:
+            continue
+        by_empire[owners[pk]].append(pk)
+        by_game[game_id].append(pk)
+
+    with transaction.atomic(), deferred_version_bumps():
+        for empire_id, ids in by_empire.items():
+            model.objects.filter(pk__in=ids).update(empire_id=empire_id)
+        for game_id, ids in by_game.items():
+            record_changes(game_id, CHANGE_KINDS[model], ids)
+    return sorted(pk for ids in by_empire.values() for pk in ids)
+
+
+def set_owned_bodies(model, empire, bodies):
+    """Make the given bodies the only ones of their type owned by an empire.
+
+    **Args:**
+        model: :model:`celestial.Planet` or :model:`celestial.AsteroidBelt`
+        empire (Empire): The new owner
+        bodies (Iterable): The bodies the empire should own
+
+    **Returns:**
+        list: IDs of the bodies whose owner changed
+    """
+    owners = dict.fromkeys(model.objects.filter(empire=empire).values_list('pk', flat=True))
+    owners.update((body.pk, empire.pk) for body in bodies)
+    return reassign_owners(model, owners)
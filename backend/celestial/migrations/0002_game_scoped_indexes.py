@@ -0,0 +1,128 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("celestial", "0001_initial"),
+        ("play", "0003_game_change"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="asteroidbelt",
+            name="empire",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                help_text="The empire that owns this asteroid belt",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="owned_asteroid_belts",
+                to="play.empire",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="asteroidbelt",
+            name="system",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                help_text="The system this asteroid belt belongs to",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="asteroid_belts",
+                to="celestial.system",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="planet",
+            name="empire",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                help_text="The empire that owns this planet",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="owned_planets",
+                to="play.empire",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="planet",
+            name="system",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                help_text="The system this planet belongs to",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="planets",
+                to="celestial.system",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="system",
+            name="game",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                help_text="The game this system belongs to",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="systems",
+                to="play.game",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asteroidbelt",
+            index=models.Index(
+                fields=["empire"],
+                include=(
+                    "mineral_production",
+                    "organic_production",
+                    "radioactive_production",
+                    "exotic_production",
+                ),
+                name="celestial_belt_empire_cov",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="planet",
+            index=models.Index(
+                fields=["empire"],
+                include=(
+                    "mineral_production",
+                    "organic_production",
+                    "radioactive_production",
+                    "exotic_production",
+                    "mineral_storage_capacity",
+                    "organic_storage_capacity",
+                    "radioactive_storage_capacity",
+                    "exotic_storage_capacity",
+                ),
+                name="celestial_planet_empire_cov",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="system",
+            index=models.Index(
+                fields=["game", "id"], name="celestial_system_game_id_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="asteroidbelt",
+            constraint=models.UniqueConstraint(
+                fields=("system", "orbit"), name="celestial_belt_system_orbit_uniq"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="planet",
+            constraint=models.UniqueConstraint(
+                fields=("system", "orbit"), name="celestial_planet_system_orbit_uniq"
+            ),
+        ),
+    ]
@@ -59,6 +59,7 @@ class System(models.Model):
         'play.Game',
         on_delete=models.CASCADE,
         related_name='systems',
+        db_index=False,  # Leading column of a composite index
         help_text="The game this system belongs to",
         null=True,
         blank=True
@@ -67,6 +68,10 @@ class System(models.Model):
     class Meta:
         app_label = 'celestial'
         unique_together = ['game', 'x', 'y']  # Ensure no two systems in the same game occupy the same position
+        indexes = [
+            # Systems of a game in id order, without a sort
+            models.Index(fields=['game', 'id'], name='celestial_system_game_id_idx'),
+        ]
 
     def __str__(self):
         return f"System at ({self.x}, {self.y})"
@@ -127,6 +132,7 @@ class Planet(models.Model):
         'System',
         on_delete=models.CASCADE,
         related_name='planets',
+        db_index=False,  # Leading column of a composite index
         help_text="The system this planet belongs to",
         null=True,
         blank=True
@@ -137,6 +143,7 @@ class Planet(models.Model):
         'play.Empire',
         on_delete=models.SET_NULL,
         related_name='owned_planets',
+        db_index=False,  # Leading column of a composite index
         help_text="The empire that owns this planet",
         null=True,
         blank=True
@@ -211,6 +218,23 @@ class Planet(models.Model):
 
     class Meta:
         app_label = 'celestial'
+        constraints = [
+            # Backs the orbit checks in clean() and lookups by system and orbit
+            models.UniqueConstraint(fields=['system', 'orbit'], name='celestial_planet_system_orbit_uniq'),
+        ]
+        indexes = [
+            # Covers production and capacity totals of an empire's planets (PostgreSQL INCLUDE)
+            models.Index(
+                fields=['empire'],
+                include=[
+                    'mineral_production', 'organic_production',
+                    'radioactive_production', 'exotic_production',
+                    'mineral_storage_capacity', 'organic_storage_capacity',
+                    'radioactive_storage_capacity', 'exotic_storage_capacity',
+                ],
+                name='celestial_planet_empire_cov',
+            ),
+        ]
 
 class Star(models.Model):
     """A star at the center of a star system.
@@ -260,6 +284,7 @@ class AsteroidBelt(models.Model):
         'System',
         on_delete=models.CASCADE,
         related_name='asteroid_belts',
+        db_index=False,  # Leading column of a composite index
         help_text="The system this asteroid belt belongs to",
         null=True,
         blank=True
@@ -270,6 +295,7 @@ class AsteroidBelt(models.Model):
         'play.Empire',
         on_delete=models.SET_NULL,
         related_name='owned_asteroid_belts',
+        db_index=False,  # Leading column of a composite index
         help_text="The empire that owns this asteroid belt",
         null=True,
         blank=True
@@ -326,3 +352,18 @@ class AsteroidBelt(models.Model):
 
     class Meta:
         app_label = 'celestial'
+        constraints = [
+            # Backs the orbit checks in clean() and lookups by system and orbit
+            models.UniqueConstraint(fields=['system', 'orbit'], name='celestial_belt_system_orbit_uniq'),
+        ]
+        indexes = [
+            # Covers production totals of an empire's asteroid belts (PostgreSQL INCLUDE)
+            models.Index(
+                fields=['empire'],
+                include=[
+                    'mineral_production', 'organic_production',
+                    'radioactive_production', 'exotic_production',
+                ],
+                name='celestial_belt_empire_cov',
+            ),
+        ]
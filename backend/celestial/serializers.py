@@ -7,20 +7,24 @@ This module provides serializers for converting celestial models to/from JSON:
 - :serializer:`celestial.StarSerializer`: Handles star type selection
 - :serializer:`celestial.AsteroidBeltSerializer`: Handles asteroid belt resources
 - :serializer:`celestial.SystemSerializer`: Handles nested celestial objects
+- :serializer:`celestial.BulkBodiesSerializer`: Validates batches of new bodies
 """
 
 from rest_framework import serializers
 from .models import Planet, Star, AsteroidBelt, System
 from play.models import Game
+from core.serializers import SparseFieldsetMixin
+from .bulk import occupied_orbits, create_bodies
 
 
-class PlanetSerializer(serializers.ModelSerializer):
+class PlanetSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Planet model.
     
     **Fields:**
     - Resource production rates (decimal, 2 places)
     - Storage capacities (decimal, 2 places)
     - Orbital position
+    - System and owning empire (read-only)
     
     **Validation:**
     - All decimal fields use 2 decimal places
@@ -48,16 +52,19 @@ class PlanetSerializer(serializers.ModelSerializer):
             'radioactive_storage_capacity',
             'exotic_storage_capacity',
             'orbit',
+            'system',
+            'empire',
         ]
-        read_only_fields = ['id']
+        read_only_fields = ['id', 'system', 'empire']
 
 
-class AsteroidBeltSerializer(serializers.ModelSerializer):
+class AsteroidBeltSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for AsteroidBelt model.
     
     **Fields:**
     - Resource production rates (decimal, 2 places)
     - Orbital position
+    - System and owning empire (read-only)
     
     **Validation:**
     - All decimal fields use 2 decimal places
@@ -77,11 +84,13 @@ class AsteroidBeltSerializer(serializers.ModelSerializer):
             'radioactive_production',
             'exotic_production',
             'orbit',
+            'system',
+            'empire',
         ]
-        read_only_fields = ['id']
+        read_only_fields = ['id', 'system', 'empire']
 
 
-class StarSerializer(serializers.ModelSerializer):
+class StarSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Star model.
     
     **Fields:**
@@ -93,7 +102,7 @@ class StarSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class SystemSerializer(serializers.ModelSerializer):
+class SystemSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for System model.
     
     **Fields:**
@@ -164,4 +173,83 @@ class SystemSerializer(serializers.ModelSerializer):
             for attr, value in star_data.items():
                 setattr(star, attr, value)
             star.save()
-        return super().update(instance, validated_data) 
\ No newline at end of file
+        return super().update(instance, validated_data) 
+
+class BulkPlanetSerializer(PlanetSerializer):
+    """Serializer for a planet created in a batch.
+    
+    **Fields:**
+    - Same as :serializer:`celestial.PlanetSerializer`
+    - System ID (writable)
+    """
+    system = serializers.IntegerField(source='system_id', help_text="The system to add the planet to")
+
+    class Meta(PlanetSerializer.Meta):
+        read_only_fields = ['id', 'empire']
+
+
+class BulkAsteroidBeltSerializer(AsteroidBeltSerializer):
+    """Serializer for an asteroid belt created in a batch.
+    
+    **Fields:**
+    - Same as :serializer:`celestial.AsteroidBeltSerializer`
+    - System ID (writable)
+    """
+    system = serializers.IntegerField(source='system_id', help_text="The system to add the asteroid belt to")
+
+    class Meta(AsteroidBeltSerializer.Meta):
+        read_only_fields = ['id', 'empire']
+
+
+class BulkBodiesSerializer(serializers.Serializer):
+    """Serializer for creating planets and asteroid belts across many systems.
+    
+    **Validation:**
+    - Systems and their used orbits are loaded in one prefetch
+    - Orbit rules are checked in memory, against existing bodies and
+      against earlier bodies of the same batch
+    - Each orbit can only be occupied by one celestial body
+    - Total orbits cannot exceed MAX_ORBITS
+    
+    Errors are returned per body, in request order.
+    """
+    planets = BulkPlanetSerializer(many=True, required=False)
+    asteroid_belts = BulkAsteroidBeltSerializer(many=True, required=False)
+
+    def validate(self, data):
+        """Check the orbit rules of all bodies against one prefetch."""
+        planets = data.get('planets', [])
+        asteroid_belts = data.get('asteroid_belts', [])
+        self.systems = occupied_orbits(
+            body['system_id'] for body in planets + asteroid_belts
+        )
+
+        errors = {}
+        for name, bodies in (('planets', planets), ('asteroid_belts', asteroid_belts)):
+            body_errors = [self._check_orbit(body) for body in bodies]
+            if any(body_errors):
+                errors[name] = body_errors
+        if errors:
+            raise serializers.ValidationError(errors)
+        return data
+
+    def _check_orbit(self, body):
+        """Claim a body's orbit in its system, returning the errors if it can't."""
+        if body['system_id'] not in self.systems:
+            return {'system': [f"Invalid pk \"{body['system_id']}\" - object does not exist."]}
+        system, used = self.systems[body['system_id']]
+        if body['orbit'] in used:
+            return {'orbit': [f"Orbit {body['orbit']} is already occupied in this system."]}
+        if len(used) >= System.MAX_ORBITS:
+            return {'orbit': [f'System cannot have more than {System.MAX_ORBITS} occupied orbits.']}
+        used.add(body['orbit'])
+        return {}
+
+    def create(self, validated_data):
+        """Insert the bodies with one query per type."""
+        planets, asteroid_belts = create_bodies(
+            validated_data.get('planets', []),
+            validated_data.get('asteroid_belts', []),
+            systems={pk: system for pk, (system, _) in self.systems.items()},
+        )
+        return {'planets': planets, 'asteroid_belts': asteroid_belts}
@@ -34,9 +34,9 @@ class PlanetAPITest(APITestCase):
         """Test retrieving a list of planets"""
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['mineral_production'], '75.50')
-        self.assertEqual(response.data[0]['orbit'], 3)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['mineral_production'], '75.50')
+        self.assertEqual(response.data['results'][0]['orbit'], 3)
 
     def test_create_planet(self):
         """Test creating a new planet"""
@@ -99,8 +99,8 @@ class StarAPITest(APITestCase):
         """Test retrieving a list of stars"""
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['star_type'], 'blue')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['star_type'], 'blue')
 
     def test_create_star(self):
         """Test creating a new star"""
@@ -158,9 +158,9 @@ class AsteroidBeltAPITest(APITestCase):
         """Test retrieving a list of asteroid belts"""
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['mineral_production'], '75.50')
-        self.assertEqual(response.data[0]['orbit'], 4)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['mineral_production'], '75.50')
+        self.assertEqual(response.data['results'][0]['orbit'], 4)
 
     def test_create_asteroid_belt(self):
         """Test creating a new asteroid belt"""
@@ -229,10 +229,10 @@ class SystemAPITest(APITestCase):
         """Test retrieving a list of systems"""
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['x'], 1)
-        self.assertEqual(response.data[0]['y'], 1)
-        self.assertEqual(response.data[0]['star']['star_type'], 'yellow')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['x'], 1)
+        self.assertEqual(response.data['results'][0]['y'], 1)
+        self.assertEqual(response.data['results'][0]['star']['star_type'], 'yellow')
 
     def test_create_system(self):
         """Test creating a new system"""
@@ -0,0 +1,111 @@
+"""
+Test cases for bulk celestial body endpoints.
+"""
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from play.models import Game, GameChange
+from ..models import Planet, Star, AsteroidBelt, System
+
+
+def planet_data(system, orbit):
+    """Build the request data for a planet"""
+    return {
+        'system': system.id,
+        'orbit': orbit,
+        'mineral_production': '10.00',
+        'organic_production': '10.00',
+        'radioactive_production': '10.00',
+        'exotic_production': '10.00',
+        'mineral_storage_capacity': '100.00',
+        'organic_storage_capacity': '100.00',
+        'radioactive_storage_capacity': '100.00',
+        'exotic_storage_capacity': '100.00',
+    }
+
+
+def belt_data(system, orbit):
+    """Build the request data for an asteroid belt"""
+    return {
+        'system': system.id,
+        'orbit': orbit,
+        'mineral_production': '5.00',
+        'organic_production': '5.00',
+        'radioactive_production': '5.00',
+        'exotic_production': '5.00',
+    }
+
+
+class BulkBodiesAPITest(APITestCase):
+    def setUp(self):
+        """Set up a game with three systems, the first with a planet in orbit 1"""
+        self.game = Game.objects.create()
+        self.systems = [
+            System.objects.create(
+                x=x, y=0, star=Star.objects.create(star_type='yellow'), game=self.game
+            )
+            for x in range(3)
+        ]
+        Planet.objects.create(system=self.systems[0], orbit=1)
+        self.url = reverse('system-bulk-bodies')
+
+    def test_create_bodies_across_systems(self):
+        """Test creating planets and asteroid belts in many systems at once"""
+        data = {
+            'planets': [planet_data(system, 2) for system in self.systems],
+            'asteroid_belts': [belt_data(system, 3) for system in self.systems],
+        }
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['planets']), 3)
+        self.assertEqual(response.data['planets'][1]['system'], self.systems[1].id)
+        self.assertIsNotNone(response.data['asteroid_belts'][0]['id'])
+        self.assertEqual(Planet.objects.count(), 4)
+        self.assertEqual(AsteroidBelt.objects.count(), 3)
+        self.assertEqual(
+            GameChange.objects.filter(
+                game=self.game, kind=GameChange.Kind.PLANET,
+                object_id__in=[planet['id'] for planet in response.data['planets']]
+            ).count(), 3
+        )
+
+    def test_fixed_query_count(self):
+        """Test that validation and inserts don't query per body"""
+        data = {
+            'planets': [planet_data(system, orbit) for system in self.systems for orbit in (2, 3)],
+            'asteroid_belts': [belt_data(system, 4) for system in self.systems],
+        }
+        # 3 to prefetch systems and orbits, 2 inserts, 3 for the version bump
+        # and change log, 2 for the savepoint, and the layout invalidation
+        with self.assertNumQueries(11):
+            response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_occupied_orbit(self):
+        """Test that occupied orbits are rejected, including within the batch"""
+        data = {
+            'planets': [planet_data(self.systems[0], 1), planet_data(self.systems[1], 1)],
+            'asteroid_belts': [belt_data(self.systems[1], 1)],
+        }
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('orbit', response.data['planets'][0])
+        self.assertEqual(response.data['planets'][1], {})
+        self.assertIn('orbit', response.data['asteroid_belts'][0])
+        self.assertEqual(Planet.objects.count(), 1)
+
+    def test_max_orbits(self):
+        """Test that systems cannot exceed MAX_ORBITS occupied orbits"""
+        data = {'planets': [planet_data(self.systems[0], orbit) for orbit in range(2, 7)]}
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['planets'][:4], [{}, {}, {}, {}])
+        self.assertIn('orbit', response.data['planets'][4])
+        self.assertEqual(Planet.objects.count(), 1)
+
+    def test_invalid_system(self):
+        """Test that unknown systems are rejected"""
+        data = {'planets': [{**planet_data(self.systems[0], 2), 'system': 0}]}
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('system', response.data['planets'][0])
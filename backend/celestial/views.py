@@ -1,6 +1,8 @@
 """API endpoints for managing celestial bodies in the game.
 
-This module provides REST API endpoints for managing celestial objects:
+This module provides REST API endpoints for managing celestial objects.
+Every write invalidates the cached galaxy layout of the edited game
+(see :mod:`play.layout`):
 
 **ViewSets:**
 - :view:`celestial.PlanetViewSet`: CRUD operations for planets
@@ -19,12 +21,16 @@ from .serializers import (
     PlanetSerializer, 
     StarSerializer, 
     AsteroidBeltSerializer,
-    SystemSerializer
+    SystemSerializer,
+    BulkBodiesSerializer
 )
+from play.versioning import GameETagMixin
+from play.layout import invalidate_layout
+from core.streaming import StreamingListMixin
 
 # Create your views here.
 
-class PlanetViewSet(viewsets.ModelViewSet):
+class PlanetViewSet(GameETagMixin, StreamingListMixin, viewsets.ModelViewSet):
     """Manage planets through the API.
     
     **Operations:**
@@ -41,8 +47,10 @@ class PlanetViewSet(viewsets.ModelViewSet):
     """
     queryset = Planet.objects.all()
     serializer_class = PlanetSerializer
+    scope_filter_lookups = {'game': 'system__game', 'empire': 'empire'}
+    etag_game_lookup = 'system__game_id'
 
-class StarViewSet(viewsets.ModelViewSet):
+class StarViewSet(GameETagMixin, StreamingListMixin, viewsets.ModelViewSet):
     """Manage stars through the API.
     
     **Operations:**
@@ -57,8 +65,10 @@ class StarViewSet(viewsets.ModelViewSet):
     """
     queryset = Star.objects.all()
     serializer_class = StarSerializer
+    scope_filter_lookups = {'game': 'system__game'}
+    etag_game_lookup = 'system__game_id'
 
-class AsteroidBeltViewSet(viewsets.ModelViewSet):
+class AsteroidBeltViewSet(GameETagMixin, StreamingListMixin, viewsets.ModelViewSet):
     """Manage asteroid belts through the API.
     
     **Operations:**
@@ -74,26 +84,31 @@ class AsteroidBeltViewSet(viewsets.ModelViewSet):
     """
     queryset = AsteroidBelt.objects.all()
     serializer_class = AsteroidBeltSerializer
+    scope_filter_lookups = {'game': 'system__game', 'empire': 'empire'}
+    etag_game_lookup = 'system__game_id'
 
-class SystemViewSet(viewsets.ModelViewSet):
+class SystemViewSet(GameETagMixin, StreamingListMixin, viewsets.ModelViewSet):
     """Manage star systems through the API.
     
     **Operations:**
-    - List all systems
+    - List all systems (``?stream=true`` streams the full list)
     - Create new system
     - Retrieve system details
     - Update system
     - Delete system
     - Add planet to system
     - Add asteroid belt to system
+    - Add many planets and asteroid belts across systems
     
     **Constraints:**
     - Maximum of 5 orbital positions
     - Unique x,y coordinates within a game
     - Each orbit can only be occupied by one celestial body
     """
-    queryset = System.objects.all()
+    queryset = System.objects.select_related('star').prefetch_related('planets', 'asteroid_belts')
     serializer_class = SystemSerializer
+    scope_filter_lookups = {'game': 'game'}
+    etag_game_lookup = 'game_id'
 
     @action(detail=True, methods=['post'])
     def add_planet(self, request, pk=None):
@@ -110,7 +125,7 @@ class SystemViewSet(viewsets.ModelViewSet):
         - Total orbits cannot exceed MAX_ORBITS
         """
         system = self.get_object()
-        serializer = PlanetSerializer(data=request.data)
+        serializer = PlanetSerializer(data=request.data, context=self.get_serializer_context())
         
         if serializer.is_valid():
             try:
@@ -136,7 +151,7 @@ class SystemViewSet(viewsets.ModelViewSet):
         - Total orbits cannot exceed MAX_ORBITS
         """
         system = self.get_object()
-        serializer = AsteroidBeltSerializer(data=request.data)
+        serializer = AsteroidBeltSerializer(data=request.data, context=self.get_serializer_context())
         
         if serializer.is_valid():
             try:
@@ -146,3 +161,26 @@ class SystemViewSet(viewsets.ModelViewSet):
             except ValidationError as e:
                 return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['post'], url_path='bulk-bodies')
+    def bulk_bodies(self, request):
+        """Add planets and asteroid belts to many systems at once.
+        
+        **Process:**
+        1. Validate body data
+        2. Load the systems and their used orbits in one prefetch
+        3. Validate system constraints in memory
+        4. Insert all bodies with one query per type
+        5. Return created bodies
+        
+        **Validation:**
+        - Orbital position must be unique, including within the batch
+        - Total orbits cannot exceed MAX_ORBITS
+        - Nothing is created if any body is invalid
+        """
+        serializer = BulkBodiesSerializer(data=request.data, context=self.get_serializer_context())
+        if serializer.is_valid():
+            serializer.save()
+            invalidate_layout(system.game_id for system, _ in serializer.systems.values())
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,182 @@
+"""Helpers for async read views.
+
+This module provides the building blocks of the async read-only endpoints,
+which query the database with Django's async ORM so that one ASGI worker can
+serve many slow clients without a thread per request:
+
+**Functions:**
+- :func:`core.async_views.render_json`: Render data the way DRF's JSON renderer does
+- :func:`core.async_views.paginate_by_id`: Id keyset pages compatible with
+  :class:`core.pagination.IdCursorPagination` cursors
+- :func:`core.async_views.read_view`: Serve GETs asynchronously and delegate
+  writes to a sync DRF view
+
+Serializers still render the fetched objects; views fetch and prefetch
+everything a serializer reads up front, so rendering never touches the
+database from the event loop.
+"""
+
+from base64 import b64decode, b64encode
+from urllib import parse
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.urls import replace_query_param
+from .pagination import IdCursorPagination
+
+READ_METHODS = ('GET', 'HEAD')
+
+
+class InvalidCursor(Exception):
+    """Raised when a request's ``cursor`` parameter can't be decoded."""
+
+
+def render_json(data, status=200):
+    """Render data as a JSON response.
+
+    **Args:**
+        data: The data to render
+        status (int): The HTTP status code
+
+    **Returns:**
+        HttpResponse: The JSON response
+    """
+    return HttpResponse(
+        JSONRenderer().render(data), status=status, content_type='application/json'
+    )
+
+
+def not_found(model):
+    """Build the 404 response DRF returns for a missing object of a model."""
+    return render_json(
+        {'detail': f'No {model._meta.object_name} matches the given query.'}, status=404
+    )
+
+
+def page_size(request, pagination_class=IdCursorPagination):
+    """Get the requested page size, falling back to the pagination default.
+
+    **Args:**
+        request: The HTTP request
+        pagination_class: The sync pagination class whose limits are used
+
+    **Returns:**
+        int: The page size
+    """
+    value = request.GET.get(pagination_class.page_size_query_param, '')
+    if value.isdigit() and int(value) > 0:
+        return min(int(value), pagination_class.max_page_size)
+    return pagination_class.page_size
+
+
+def decode_cursor(request, pagination_class=IdCursorPagination):
+    """Decode the ``cursor`` parameter of a request.
+
+    **Returns:**
+        tuple: ``(position, reverse)``, with position None on the first page
+
+    **Raises:**
+        InvalidCursor: If the cursor is malformed
+    """
+    encoded = request.GET.get(pagination_class.cursor_query_param)
+    if encoded is None:
+        return None, False
+    try:
+        tokens = parse.parse_qs(b64decode(encoded.encode('ascii')).decode('ascii'), keep_blank_values=True)
+        reverse = bool(int(tokens.get('r', ['0'])[0]))
+        position = int(tokens['p'][0])
+    except (TypeError, ValueError, KeyError, UnicodeError):
+        raise InvalidCursor()
+    return position, reverse
+
+
+def cursor_url(request, position, reverse, pagination_class=IdCursorPagination):
+    """Build the link to the page before or after an id.
+
+    The cursor is encoded like :class:`rest_framework.pagination.CursorPagination`
+    does, so sync and async list endpoints accept each other's links.
+    """
+    tokens = {'p': position}
+    if reverse:
+        tokens['r'] = '1'
+    encoded = b64encode(parse.urlencode(tokens).encode('ascii')).decode('ascii')
+    return replace_query_param(
+        request.build_absolute_uri(), pagination_class.cursor_query_param, encoded
+    )
+
+
+async def paginate_by_id(request, queryset, render, pagination_class=IdCursorPagination):
+    """Fetch one id keyset page of a queryset with the async ORM.
+
+    **Args:**
+        request: The HTTP request
+        queryset (QuerySet): The rows to page through
+        render: Callable rendering the list of fetched objects
+        pagination_class: The sync pagination class whose limits and
+            cursor parameter are used
+
+    **Returns:**
+        dict: ``{'next': url, 'previous': url, 'results': [...]}``
+
+    **Raises:**
+        InvalidCursor: If the request's cursor is malformed
+    """
+    position, reverse = decode_cursor(request, pagination_class)
+    size = page_size(request, pagination_class)
+    if reverse:
+        queryset = queryset.filter(pk__lt=position).order_by('-pk')
+    else:
+        if position is not None:
+            queryset = queryset.filter(pk__gt=position)
+        queryset = queryset.order_by('pk')
+
+    rows = [row async for row in queryset[:size + 1]]
+    has_more = len(rows) > size
+    rows = rows[:size]
+    if reverse:
+        rows.reverse()
+        has_next, has_previous = True, has_more
+    else:
+        has_next, has_previous = has_more, position is not None
+
+    next_url = previous_url = None
+    if has_next:
+        next_position = rows[-1].pk if rows else position - 1
+        next_url = cursor_url(request, next_position, False, pagination_class)
+    if has_previous and rows:
+        previous_url = cursor_url(request, rows[0].pk, True, pagination_class)
+    elif has_previous:
+        previous_url = cursor_url(request, position + 1, True, pagination_class)
+    return {'next': next_url, 'previous': previous_url, 'results': render(rows)}
+
+
+def read_view(handler, sync_view=None):
+    """Serve reads with an async handler and everything else with a sync view.
+
+    The async handler answers GET and HEAD. Other methods are passed to
+    the sync DRF view in a worker thread, so an async route can stand in
+    for a viewset route without losing its write methods.
+
+    **Args:**
+        handler: Async view function for reads
+        sync_view: Sync view for other methods, e.g. ``ViewSet.as_view({...})``
+
+    **Returns:**
+        Async view function
+    """
+    delegate = sync_to_async(sync_view) if sync_view is not None else None
+
+    async def view(request, *args, **kwargs):
+        if request.method in READ_METHODS:
+            return await handler(request, *args, **kwargs)
+        if delegate is None:
+            return render_json(
+                {'detail': f'Method "{request.method}" not allowed.'}, status=405
+            )
+        return await delegate(request, *args, **kwargs)
+
+    view.__name__ = handler.__name__
+    view.__doc__ = handler.__doc__
+    # DRF views enforce CSRF for session-authenticated writes themselves
+    return csrf_exempt(view)
@@ -0,0 +1,97 @@
+"""Environment-driven database settings.
+
+This module builds the ``DATABASES['default']`` setting from environment
+variables with :mod:`environ`, so credentials and connection handling are
+configured per deployment instead of in ``settings.py``:
+
+**Connection:**
+- ``DATABASE_URL``: Full database URL, e.g. ``postgres://user:pass@db:5432/spacegame``
+- Otherwise ``POSTGRES_DB``, ``POSTGRES_USER``, ``POSTGRES_PASSWORD``,
+  ``POSTGRES_HOST`` and ``POSTGRES_PORT`` (as set by docker compose)
+
+**Connection reuse:**
+- ``DB_CONN_MAX_AGE``: Seconds a connection is kept open across requests
+  (default 60, 0 closes it after every request, ``None`` keeps it forever)
+- ``DB_CONN_HEALTH_CHECKS``: Check persistent connections before reusing
+  them in a new request (default on)
+- ``DB_POOL``: Use the PostgreSQL driver's connection pool instead of
+  persistent connections (requires psycopg 3 with ``psycopg[pool]``)
+- ``DB_POOL_MIN_SIZE``, ``DB_POOL_MAX_SIZE``, ``DB_POOL_TIMEOUT``: Pool
+  size and seconds to wait for a free connection
+
+**Read replica:**
+- ``DATABASE_REPLICA_URL``: URL of a read replica of the default database;
+  it uses the same connection reuse settings (see :mod:`core.routers`)
+
+**Functions:**
+- :func:`core.database.database_settings`: Build the default database setting
+- :func:`core.database.replica_database_settings`: Build the replica database setting
+"""
+
+import environ
+
+DEFAULT_CONN_MAX_AGE = 60
+
+DEFAULT_POOL_MIN_SIZE = 2
+
+DEFAULT_POOL_MAX_SIZE = 10
+
+DEFAULT_POOL_TIMEOUT = 10
+
+
+def database_settings(env=None):
+    """Build the default database setting from the environment.
+
+    **Args:**
+        env (environ.Env): The environment reader, defaults to ``os.environ``
+
+    **Returns:**
+        dict: The ``DATABASES['default']`` setting
+    """
+    env = env or environ.Env()
+    if env.str('DATABASE_URL', default=''):
+        return _connection_settings(env, env.db('DATABASE_URL'))
+    return _connection_settings(env, {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': env.str('POSTGRES_DB', default='spacegame'),
+        'USER': env.str('POSTGRES_USER', default='spacegame'),
+        'PASSWORD': env.str('POSTGRES_PASSWORD', default='spacegame'),
+        'HOST': env.str('POSTGRES_HOST', default='db'),
+        'PORT': env.str('POSTGRES_PORT', default='5432'),
+    })
+
+
+def replica_database_settings(env=None):
+    """Build the read replica database setting from the environment.
+
+    **Args:**
+        env (environ.Env): The environment reader, defaults to ``os.environ``
+
+    **Returns:**
+        dict: The replica's database setting, or None without ``DATABASE_REPLICA_URL``
+    """
+    env = env or environ.Env()
+    if not env.str('DATABASE_REPLICA_URL', default=''):
+        return None
+    database = _connection_settings(env, env.db('DATABASE_REPLICA_URL'))
+    # Tests read the replica's data from the test primary
+    database['TEST'] = {'MIRROR': 'default'}
+    return database
+
+
+def _connection_settings(env, database):
+    """Add the connection reuse settings to a database setting."""
+    if env.bool('DB_POOL', default=False):
+        # Pooled connections are returned to the pool after each request,
+        # so they can't also be persistent
+        database['CONN_MAX_AGE'] = 0
+        database.setdefault('OPTIONS', {})['pool'] = {
+            'min_size': env.int('DB_POOL_MIN_SIZE', default=DEFAULT_POOL_MIN_SIZE),
+            'max_size': env.int('DB_POOL_MAX_SIZE', default=DEFAULT_POOL_MAX_SIZE),
+            'timeout': env.float('DB_POOL_TIMEOUT', default=DEFAULT_POOL_TIMEOUT),
+        }
+    else:
+        max_age = env.str('DB_CONN_MAX_AGE', default=str(DEFAULT_CONN_MAX_AGE))
+        database['CONN_MAX_AGE'] = None if max_age.lower() == 'none' else int(max_age)
+    database['CONN_HEALTH_CHECKS'] = env.bool('DB_CONN_HEALTH_CHECKS', default=True)
+    return database
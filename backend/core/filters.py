@@ -0,0 +1,63 @@
+"""Query parameter filters for the game API.
+
+This module provides filter backends shared by the REST viewsets:
+
+**Classes:**
+- :class:`core.filters.GameScopeFilterBackend`: Filters lists by game and empire
+"""
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+class GameScopeFilterBackend(BaseFilterBackend):
+    """Filter querysets by the ``game`` and ``empire`` query parameters.
+    
+    Views opt in by declaring ``scope_filter_lookups``, a mapping of query
+    parameter name to ORM lookup:
+    
+    .. code-block:: python
+        class PlanetViewSet(viewsets.ModelViewSet):
+            scope_filter_lookups = {'game': 'system__game', 'empire': 'empire'}
+    
+    Only forward (many-to-one) lookups should be used so that the filtered
+    queryset never contains duplicate rows.
+    """
+
+    def get_scope_filter_lookups(self, view):
+        """Get the query parameter to lookup mapping declared by the view.
+        
+        **Returns:**
+            dict: Query parameter names mapped to ORM lookups
+        """
+        return getattr(view, 'scope_filter_lookups', {})
+
+    def filter_queryset(self, request, queryset, view):
+        """Apply each scope filter present in the query string.
+        
+        **Raises:**
+            ValidationError: If a filter value is not an integer id
+        """
+        for param, lookup in self.get_scope_filter_lookups(view).items():
+            value = request.query_params.get(param)
+            if value in (None, ''):
+                continue
+            try:
+                value = int(value)
+            except ValueError:
+                raise ValidationError({param: 'Must be an integer id.'})
+            queryset = queryset.filter(**{lookup: value})
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        """Describe the scope filters for the OpenAPI schema."""
+        return [
+            {
+                'name': param,
+                'required': False,
+                'in': 'query',
+                'description': f'Only return rows belonging to this {param} id',
+                'schema': {'type': 'integer'},
+            }
+            for param in self.get_scope_filter_lookups(view)
+        ]
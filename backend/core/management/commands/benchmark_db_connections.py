@@ -0,0 +1,101 @@
+"""Benchmark the cost of database connection setup per request.
+
+Usage::
+
+    python manage.py benchmark_db_connections --requests 500
+
+Simulates request cycles against the configured database: each cycle sends
+Django's ``request_started`` and ``request_finished`` signals around a small
+query, exactly as the request handler does, so connections are opened,
+checked and closed according to the connection settings. It compares:
+
+- ``per-request``: ``CONN_MAX_AGE = 0``, a new connection every request
+- ``persistent``: the configured ``CONN_MAX_AGE`` without health checks
+- ``persistent+checks``: the configured ``CONN_MAX_AGE`` with health checks
+
+With ``DB_POOL`` enabled every mode hands connections back to the pool, so
+the per-request mode measures pool checkout instead of connection setup.
+"""
+
+import time
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+
+# Connection reuse used for the persistent modes when CONN_MAX_AGE is 0
+BENCHMARK_CONN_MAX_AGE = 60
+
+
+def run_requests(alias, requests, max_age, health_checks):
+    """Run simulated request cycles with the given connection settings.
+
+    Args:
+        alias (str): The database alias
+        requests (int): Number of request cycles
+        max_age (int): ``CONN_MAX_AGE`` for the run
+        health_checks (bool): ``CONN_HEALTH_CHECKS`` for the run
+
+    Returns:
+        dict: Seconds per request and number of connections opened
+    """
+    connection = connections[alias]
+    saved = {key: connection.settings_dict[key] for key in ('CONN_MAX_AGE', 'CONN_HEALTH_CHECKS')}
+    opened = []
+
+    def count(sender, connection, **kwargs):
+        if connection.alias == alias:
+            opened.append(connection)
+
+    connection.close()
+    connection.settings_dict.update(CONN_MAX_AGE=max_age, CONN_HEALTH_CHECKS=health_checks)
+    connection_created.connect(count)
+    try:
+        start = time.perf_counter()
+        for _ in range(requests):
+            request_started.send(sender=None)
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            request_finished.send(sender=None)
+        elapsed = time.perf_counter() - start
+    finally:
+        connection_created.disconnect(count)
+        connection.settings_dict.update(saved)
+        connection.close()
+    return {'per_request': elapsed / requests, 'connections': len(opened)}
+
+
+class Command(BaseCommand):
+    help = 'Compare per-request, persistent and health-checked database connections'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Request cycles per mode')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database alias')
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        requests = options['requests']
+        settings_dict = connections[alias].settings_dict
+        max_age = settings_dict['CONN_MAX_AGE'] or BENCHMARK_CONN_MAX_AGE
+        pooled = 'pool' in settings_dict.get('OPTIONS', {})
+        self.stdout.write(
+            f"{settings_dict['ENGINE']} '{alias}': {requests} requests per mode"
+            + (' (pooled)' if pooled else '')
+        )
+
+        modes = [
+            ('per-request', 0, False),
+            ('persistent', max_age, False),
+            ('persistent+checks', max_age, True),
+        ]
+        results = {}
+        for name, age, checks in modes:
+            results[name] = result = run_requests(alias, requests, 0 if pooled else age, checks)
+            self.stdout.write(
+                f"{name:>18}: {result['per_request'] * 1000:8.3f} ms/request  "
+                f"{result['connections']} connections opened"
+            )
+
+        saved = results['per-request']['per_request'] - results['persistent']['per_request']
+        self.stdout.write(f'Connection setup removed per request: {saved * 1000:.3f} ms')
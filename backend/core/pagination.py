@@ -0,0 +1,26 @@
+"""Pagination classes for the game API.
+
+This module provides the pagination used by every list endpoint:
+
+**Classes:**
+- :class:`core.pagination.IdCursorPagination`: Keyset pagination on the primary key
+"""
+
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """Keyset (cursor) pagination ordered by primary key.
+    
+    Each page is fetched with ``WHERE id > <cursor> ORDER BY id LIMIT n``, so
+    the cost of a list request is proportional to the page size rather than
+    the table size, and pages stay stable while new rows are inserted.
+    
+    **Query parameters:**
+    - cursor: Opaque cursor taken from the ``next``/``previous`` links
+    - page_size: Number of results per page (default 100, maximum 1000)
+    """
+    ordering = 'id'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
@@ -0,0 +1,142 @@
+"""Read-replica routing for the game database.
+
+This module sends the reads of safe-method requests (GET, HEAD, OPTIONS) to
+a replica database, while writes and every unsafe request stay on the
+primary:
+
+- :func:`replica_routing_middleware` marks each request as replica-readable
+  or not, in a context variable, so routing works for sync and async views
+- :class:`ReplicaRouter` sends reads to ``REPLICA_DATABASE_ALIAS`` only for
+  replica-readable requests, and every write to the primary
+- After a client writes, a cookie pins its reads to the primary for
+  ``REPLICA_STICKY_SECONDS``, so it reads its own writes while the replica
+  catches up; reads after a write within the same request also stay on the
+  primary
+
+Code running outside requests (turn processing, management commands, tests)
+reads from the primary unless it opts in with :func:`read_from_replica`.
+
+**Classes:**
+- :class:`core.routers.ReplicaRouter`: Database router
+
+**Functions:**
+- :func:`core.routers.replica_routing_middleware`: Request routing middleware
+- :func:`core.routers.read_from_replica`: Route a block of code's reads
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.decorators import sync_and_async_middleware
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+STICKY_COOKIE = 'db_primary_until'
+
+DEFAULT_REPLICA_STICKY_SECONDS = 5
+
+
+class _Routing:
+    """Routing state of a request or block of code."""
+
+    def __init__(self, replica):
+        self.replica = replica
+        self.wrote = False
+
+
+_routing = ContextVar('db_routing', default=None)
+
+
+def replica_alias():
+    """Get the configured replica alias, or None if reads all go to the primary."""
+    alias = getattr(settings, 'REPLICA_DATABASE_ALIAS', None)
+    return alias if alias in settings.DATABASES else None
+
+
+@contextmanager
+def read_from_replica(enabled=True):
+    """Route the reads of a block of code to the replica, or to the primary.
+
+    **Args:**
+        enabled (bool): False pins the block's reads to the primary
+
+    **Yields:**
+        The block's routing state
+    """
+    state = _Routing(enabled)
+    token = _routing.set(state)
+    try:
+        yield state
+    finally:
+        _routing.reset(token)
+
+
+class ReplicaRouter:
+    """Send replica-readable reads to the replica and everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        """Get the replica alias for reads of replica-readable code paths."""
+        state = _routing.get()
+        if state is None or not state.replica or state.wrote:
+            return None
+        return replica_alias()
+
+    def db_for_write(self, model, **hints):
+        """Send writes to the primary, and later reads of the same request too."""
+        state = _routing.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Allow relations across aliases, which hold the same data."""
+        return True
+
+
+def _pinned_to_primary(request):
+    """Check whether a request's client wrote within the sticky window."""
+    try:
+        return float(request.COOKIES.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def _start(request):
+    """Open the routing block of a request."""
+    return read_from_replica(
+        request.method in SAFE_METHODS and not _pinned_to_primary(request)
+    )
+
+
+def _finish(request, response, state):
+    """Pin the client's reads to the primary after a write."""
+    if state.wrote or request.method not in SAFE_METHODS:
+        seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', DEFAULT_REPLICA_STICKY_SECONDS)
+        response.set_cookie(
+            STICKY_COOKIE, f'{time.time() + seconds:.3f}',
+            max_age=seconds, httponly=True, samesite='Lax'
+        )
+    return response
+
+
+@sync_and_async_middleware
+def replica_routing_middleware(get_response):
+    """Route the reads of safe-method requests to the replica.
+
+    Streamed response bodies are rendered after the middleware returns, so
+    their queries use the primary.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            with _start(request) as state:
+                response = await get_response(request)
+            return _finish(request, response, state)
+    else:
+        def middleware(request):
+            with _start(request) as state:
+                response = get_response(request)
+            return _finish(request, response, state)
+    return middleware
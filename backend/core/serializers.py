@@ -0,0 +1,128 @@
+"""Serializer utilities shared by the game API.
+
+This module provides mixins and fields for the REST serializers:
+
+**Mixins:**
+- :class:`core.serializers.SparseFieldsetMixin`: ``?fields=`` and ``?expand=`` support
+
+**Fields:**
+- :class:`core.serializers.PrimaryKeyListField`: Lists of related objects loaded in one query
+"""
+
+from rest_framework import serializers
+
+
+def parse_field_list(value):
+    """Parse a comma-separated field list.
+
+    **Args:**
+        value: A comma-separated string, an iterable of names, or None
+
+    **Returns:**
+        set: The field names, ignoring blanks
+    """
+    if not value:
+        return set()
+    if isinstance(value, str):
+        value = value.split(',')
+    return {name.strip() for name in value if name.strip()}
+
+
+class SparseFieldsetMixin:
+    """Let clients choose which fields a serializer renders.
+
+    **Query parameters:**
+    - fields: Comma-separated list of fields to render, e.g. ``?fields=id,name``
+    - expand: Comma-separated list of expandable fields to include,
+      e.g. ``?expand=planets,resource_capacities``
+
+    Expensive fields (nested collections, aggregates) are listed in
+    ``Meta.expandable_fields`` and are left out unless they are expanded or
+    named in ``fields``. Nested serializers are addressed with dotted paths,
+    e.g. ``?expand=empire.planets``.
+
+    Fields are removed in :meth:`get_fields`, before any instance is
+    serialized, so unrequested fields are never computed. Write-only fields
+    are always kept so that ``fields`` never affects input validation.
+
+    The same options can be passed in the serializer context under the
+    ``fields`` and ``expand`` keys, which take precedence over the request.
+    """
+
+    def get_fields(self):
+        """Build the fields, dropping unrequested and unexpanded ones."""
+        fields = super().get_fields()
+        prefix = ''.join(f'{name}.' for name in self._sparse_path())
+        requested = self._names_at_level(self._sparse_option('fields'), prefix)
+        expanded = self._names_at_level(self._sparse_option('expand'), prefix) | requested
+
+        for name in getattr(self.Meta, 'expandable_fields', ()):
+            if name not in expanded:
+                fields.pop(name, None)
+
+        if requested:
+            for name in list(fields):
+                if name not in requested and not fields[name].write_only:
+                    fields.pop(name)
+        return fields
+
+    def _sparse_option(self, key):
+        """Get the ``fields`` or ``expand`` option from the context or request."""
+        if key in self.context:
+            return parse_field_list(self.context[key])
+        request = self.context.get('request')
+        if request is None:
+            return set()
+        return parse_field_list(request.query_params.get(key))
+
+    def _sparse_path(self):
+        """Get the field names leading from the root serializer to this one."""
+        path = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                path.append(node.field_name)
+            node = node.parent
+        return reversed(path)
+
+    @staticmethod
+    def _names_at_level(names, prefix):
+        """Get the first path component of each name under ``prefix``."""
+        return {
+            name[len(prefix):].split('.')[0]
+            for name in names
+            if name.startswith(prefix) and len(name) > len(prefix)
+        }
+
+
+class PrimaryKeyListField(serializers.ListField):
+    """A list of primary keys resolved to objects with a single query.
+
+    Unlike ``PrimaryKeyRelatedField(many=True)``, which looks up each key
+    separately, all keys are loaded with one ``in_bulk`` query, so batches
+    of thousands of keys validate in constant time.
+
+    **Args:**
+        queryset: The objects the keys may refer to
+    """
+    default_error_messages = {
+        'does_not_exist': 'Invalid pk "{pk_value}" - object does not exist.',
+    }
+
+    def __init__(self, queryset, **kwargs):
+        self.queryset = queryset
+        kwargs.setdefault('child', serializers.IntegerField())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        """Load the objects for the given keys, keeping the request order."""
+        keys = list(dict.fromkeys(super().to_internal_value(data)))
+        objects = self.queryset.all().in_bulk(keys)
+        for key in keys:
+            if key not in objects:
+                self.fail('does_not_exist', pk_value=key)
+        return [objects[key] for key in keys]
+
+    def to_representation(self, data):
+        """Render the related objects as their primary keys."""
+        return [obj.pk for obj in data.all()] if hasattr(data, 'all') else [obj.pk for obj in data]
@@ -0,0 +1,178 @@
+"""Request coalescing for identical concurrent computations.
+
+This module makes concurrent callers that need the same expensive value
+wait for one computation and share its result, instead of each running it:
+
+- :class:`SingleFlight` coalesces callers within a process
+- :func:`coalesce` adds a shared Django cache entry and a cache lock, so
+  callers in other processes reuse the result or wait for it too
+
+Cached entries are refreshed early with probability rising as they near
+expiry (XFetch), so a popular entry is recomputed by one caller shortly
+before it expires rather than by every caller just after.
+
+**Classes:**
+- :class:`core.singleflight.SingleFlight`: In-process single-flight group
+- :class:`core.singleflight.Unshared`: Return a value without sharing it
+
+**Functions:**
+- :func:`core.singleflight.coalesce`: Cached, coalesced computation
+- :func:`core.singleflight.should_refresh`: XFetch early refresh test
+"""
+
+import math
+import random
+import threading
+import time
+from django.core.cache import cache
+
+DEFAULT_BETA = 1.0
+
+DEFAULT_LOCK_TIMEOUT = 10
+
+POLL_INTERVAL = 0.02
+
+
+class Unshared(Exception):
+    """Raised by a computation to return a value that must not be shared or cached.
+
+    **Args:**
+        value: The value returned to the caller that computed it
+    """
+
+    def __init__(self, value):
+        super().__init__()
+        self.value = value
+
+
+class _Call:
+    """A computation in flight and its outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.failed = False
+
+
+class SingleFlight:
+    """Run one computation per key at a time and share the result with concurrent callers.
+
+    Callers that arrive while a computation for the same key is running wait
+    for it and receive its value. If the computation fails, or the waiter
+    times out, waiters run the computation themselves, so errors are never
+    shared between callers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, timeout=None):
+        """Run ``fn`` for a key, or wait for the run already in flight.
+
+        **Args:**
+            key: The key identifying the computation
+            fn: Callable without arguments computing the value
+            timeout (float): Seconds to wait for a run in flight
+
+        **Returns:**
+            The value computed by ``fn``
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if call.done.wait(timeout) and not call.failed:
+                return call.value
+            return fn()
+
+        try:
+            call.value = fn()
+        except BaseException:
+            call.failed = True
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value
+
+
+_flights = SingleFlight()
+
+
+def should_refresh(entry, beta=DEFAULT_BETA, now=None):
+    """Decide whether to recompute a cached entry before it expires.
+
+    Implements XFetch: the chance of an early refresh rises as the entry
+    nears expiry, and entries that take longer to compute are refreshed
+    earlier.
+
+    **Args:**
+        entry (dict): Cached entry with ``delta`` (compute seconds) and ``expiry``
+        beta (float): Eagerness, values above 1 refresh earlier
+        now (float): Current time, defaults to ``time.time()``
+
+    **Returns:**
+        bool: True if the caller should recompute the entry
+    """
+    now = time.time() if now is None else now
+    return now - entry['delta'] * beta * math.log(1.0 - random.random()) >= entry['expiry']
+
+
+def coalesce(key, compute, timeout, beta=DEFAULT_BETA, lock_timeout=DEFAULT_LOCK_TIMEOUT):
+    """Get a cached value, computing it once across concurrent callers on a miss.
+
+    **Args:**
+        key (str): Cache key of the value
+        compute: Callable without arguments computing the value; it may raise
+            :class:`Unshared` to return a value that isn't cached or shared
+        timeout (int): Seconds the value stays cached
+        beta (float): Early refresh eagerness, see :func:`should_refresh`
+        lock_timeout (int): Seconds a computation may hold the cache lock,
+            and the longest a caller waits for another process's result
+
+    **Returns:**
+        The cached or computed value
+    """
+    entry = cache.get(key)
+    if entry is not None and not should_refresh(entry, beta):
+        return entry['value']
+    try:
+        return _flights.do(
+            key, lambda: _load(key, compute, timeout, entry, lock_timeout), lock_timeout
+        )
+    except Unshared as e:
+        return e.value
+
+
+def _load(key, compute, timeout, stale, lock_timeout):
+    """Compute and cache a value unless another process already is."""
+    lock_key = f'{key}:lock'
+    if not cache.add(lock_key, True, lock_timeout):
+        if stale is not None:
+            # Another process is refreshing early, keep serving the current value
+            return stale['value']
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry['value']
+        return _store(key, compute, timeout)
+    try:
+        return _store(key, compute, timeout)
+    finally:
+        cache.delete(lock_key)
+
+
+def _store(key, compute, timeout):
+    """Compute a value and cache it with its compute time for early refresh."""
+    start = time.monotonic()
+    value = compute()
+    delta = time.monotonic() - start
+    cache.set(key, {'value': value, 'delta': delta, 'expiry': time.time() + timeout}, timeout)
+    return value
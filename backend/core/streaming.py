@@ -0,0 +1,140 @@
+"""Streaming JSON responses for large collections.
+
+This module renders querysets as a JSON array that is written out while the
+rows are read, instead of building the full list of dicts and the full JSON
+string in memory before sending the first byte:
+
+**Functions:**
+- :func:`core.streaming.streaming_json_response`: Stream a queryset as JSON
+
+**Mixins:**
+- :class:`core.streaming.StreamingListMixin`: ``?stream=true`` on list endpoints
+"""
+
+import zlib
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.utils.encoders import JSONEncoder
+
+DEFAULT_STREAM_CHUNK_SIZE = 500
+
+STREAM_TRUE_VALUES = ('1', 'true', 'yes')
+
+
+def stream_chunk_size():
+    """Get the number of rows fetched and rendered per chunk.
+
+    **Returns:**
+        int: The ``STREAM_CHUNK_SIZE`` setting, or the default
+    """
+    return getattr(settings, 'STREAM_CHUNK_SIZE', DEFAULT_STREAM_CHUNK_SIZE)
+
+
+def iter_json_array(queryset, serializer_class, context=None, chunk_size=None):
+    """Render a queryset as a JSON array, one chunk of rows at a time.
+
+    The rows are read with ``QuerySet.iterator()``, so at most one chunk of
+    model instances (and their prefetched relations) is in memory. A single
+    serializer instance renders every row, so its fields are built once.
+
+    **Args:**
+        queryset: The rows to render
+        serializer_class: The serializer for one row
+        context: Serializer context
+        chunk_size: Rows per database fetch and per yielded string
+
+    **Yields:**
+        str: Consecutive pieces of the JSON document
+    """
+    chunk_size = chunk_size or stream_chunk_size()
+    serializer = serializer_class(context=context or {})
+    encoder = JSONEncoder(separators=(',', ':'))
+    if not queryset.ordered:
+        queryset = queryset.order_by('pk')
+
+    yield '['
+    separator = ''
+    parts = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        parts.append(separator + encoder.encode(serializer.to_representation(obj)))
+        separator = ','
+        if len(parts) >= chunk_size:
+            yield ''.join(parts)
+            parts = []
+    if parts:
+        yield ''.join(parts)
+    yield ']'
+
+
+def gzip_stream(chunks):
+    """Gzip-compress a stream of strings on the fly.
+
+    **Args:**
+        chunks: Iterable of strings
+
+    **Yields:**
+        bytes: Compressed data
+    """
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def accepts_gzip(request):
+    """Check whether the client accepts gzip-encoded responses."""
+    return 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '').lower()
+
+
+def streaming_json_response(request, queryset, serializer_class, context=None, chunk_size=None):
+    """Stream a queryset to the client as a JSON array.
+
+    The response is gzip-compressed when the client accepts it.
+
+    **Args:**
+        request: The HTTP request
+        queryset: The rows to render
+        serializer_class: The serializer for one row
+        context: Serializer context
+        chunk_size: Rows per database fetch
+
+    **Returns:**
+        StreamingHttpResponse: The streaming response
+    """
+    chunks = iter_json_array(queryset, serializer_class, context, chunk_size)
+    if accepts_gzip(request):
+        response = StreamingHttpResponse(gzip_stream(chunks), content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = StreamingHttpResponse(
+            (chunk.encode('utf-8') for chunk in chunks), content_type='application/json'
+        )
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+
+def wants_stream(request):
+    """Check whether the client asked for a streamed response with ``?stream=true``."""
+    return request.query_params.get('stream', '').lower() in STREAM_TRUE_VALUES
+
+
+class StreamingListMixin:
+    """Stream the whole list as a JSON array when ``?stream=true`` is given.
+
+    Streaming skips pagination, so it is meant for exports and for large
+    collections that clients read in full. Filters still apply.
+    """
+
+    def list(self, request, *args, **kwargs):
+        """List rows, streaming them when requested."""
+        if wants_stream(request):
+            return streaming_json_response(
+                request,
+                self.filter_queryset(self.get_queryset()),
+                self.get_serializer_class(),
+                self.get_serializer_context(),
+            )
+        return super().list(request, *args, **kwargs)
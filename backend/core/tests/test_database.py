@@ -0,0 +1,58 @@
+from io import StringIO
+import environ
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from core.database import database_settings
+
+
+def env_from(values):
+    """Build an environment reader over a dict of variables."""
+    env = environ.Env()
+    env.ENVIRON = values
+    return env
+
+
+class DatabaseSettingsTests(SimpleTestCase):
+    def test_postgres_variables(self):
+        """Test that POSTGRES_* variables configure persistent, health-checked connections"""
+        database = database_settings(env_from({'POSTGRES_HOST': 'localhost', 'POSTGRES_PASSWORD': 'secret'}))
+        self.assertEqual(database['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual(database['HOST'], 'localhost')
+        self.assertEqual(database['PASSWORD'], 'secret')
+        self.assertEqual(database['NAME'], 'spacegame')
+        self.assertEqual(database['CONN_MAX_AGE'], 60)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+
+    def test_database_url(self):
+        """Test that DATABASE_URL takes precedence"""
+        database = database_settings(env_from({
+            'DATABASE_URL': 'postgres://game:pw@dbhost:6543/galaxy',
+            'POSTGRES_HOST': 'ignored',
+            'DB_CONN_MAX_AGE': 'None',
+            'DB_CONN_HEALTH_CHECKS': 'false',
+        }))
+        self.assertEqual(
+            (database['HOST'], database['PORT'], database['NAME'], database['USER']),
+            ('dbhost', 6543, 'galaxy', 'game')
+        )
+        self.assertIsNone(database['CONN_MAX_AGE'])
+        self.assertFalse(database['CONN_HEALTH_CHECKS'])
+
+    def test_pool(self):
+        """Test that pooling configures the driver pool and disables persistent connections"""
+        database = database_settings(env_from({
+            'DB_POOL': 'true', 'DB_POOL_MAX_SIZE': '20', 'DB_CONN_MAX_AGE': '600'
+        }))
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertEqual(database['OPTIONS']['pool'], {'min_size': 2, 'max_size': 20, 'timeout': 10.0})
+
+
+class BenchmarkCommandTests(TestCase):
+    def test_reports_each_mode(self):
+        """Test that the benchmark reports every connection mode"""
+        out = StringIO()
+        call_command('benchmark_db_connections', '--requests', '5', stdout=out)
+        output = out.getvalue()
+        for mode in ('per-request', 'persistent', 'persistent+checks'):
+            self.assertIn(f'{mode}:', output)
+        self.assertIn('Connection setup removed per request', output)
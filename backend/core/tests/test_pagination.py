@@ -0,0 +1,88 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from play.models import Player, Race, Empire, Game
+from celestial.models import Planet, System, Star
+
+
+class CursorPaginationTests(APITestCase):
+    def setUp(self):
+        """Set up two games with planets, one of them owned by an empire"""
+        self.game = Game.objects.create()
+        self.other_game = Game.objects.create()
+        self.empire = Empire.objects.create(
+            name='Test Empire',
+            player=Player.objects.create(),
+            race=Race.objects.create(name='Test Race'),
+            game=self.game
+        )
+        self.system = System.objects.create(
+            x=0, y=0, star=Star.objects.create(star_type='yellow'), game=self.game
+        )
+        self.other_system = System.objects.create(
+            x=0, y=0, star=Star.objects.create(star_type='blue'), game=self.other_game
+        )
+        self.planets = [
+            Planet.objects.create(system=self.system, orbit=orbit)
+            for orbit in range(1, 4)
+        ]
+        self.planets[0].empire = self.empire
+        self.planets[0].save()
+        Planet.objects.create(system=self.other_system, orbit=1)
+        self.url = reverse('planet-list')
+
+    def test_list_is_paginated(self):
+        """Test that list responses contain results and cursor links"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 4)
+        self.assertIsNone(response.data['next'])
+        self.assertIsNone(response.data['previous'])
+
+    def test_follow_cursor(self):
+        """Test walking every page by following the next link"""
+        ids = []
+        response = self.client.get(self.url, {'page_size': 2})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 2)
+            ids.extend(row['id'] for row in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(ids, sorted(Planet.objects.values_list('id', flat=True)))
+
+    def test_cursor_stable_under_inserts(self):
+        """Test that rows inserted after a page was read don't shift later pages"""
+        response = self.client.get(self.url, {'page_size': 2})
+        first_page = [row['id'] for row in response.data['results']]
+        Planet.objects.create(system=self.system, orbit=5)
+        response = self.client.get(response.data['next'])
+        second_page = [row['id'] for row in response.data['results']]
+        self.assertFalse(set(first_page) & set(second_page))
+        self.assertEqual(second_page[0], first_page[-1] + 1)
+
+    def test_filter_by_game(self):
+        """Test filtering planets by game"""
+        response = self.client.get(self.url, {'game': self.game.id})
+        self.assertEqual(
+            [row['id'] for row in response.data['results']],
+            [planet.id for planet in self.planets]
+        )
+
+    def test_filter_by_empire(self):
+        """Test filtering planets by owning empire"""
+        response = self.client.get(self.url, {'empire': self.empire.id})
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['id'], self.planets[0].id)
+
+    def test_filter_invalid_id(self):
+        """Test that a non-integer filter value is rejected"""
+        response = self.client.get(self.url, {'game': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_empire_list_filter_by_game(self):
+        """Test filtering empires by game"""
+        response = self.client.get(reverse('empire-list'), {'game': self.other_game.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [])
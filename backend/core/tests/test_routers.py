@@ -0,0 +1,70 @@
+import time
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from core.routers import ReplicaRouter, STICKY_COOKIE, read_from_replica
+from play.models import Game
+
+
+@override_settings(REPLICA_DATABASE_ALIAS='replica')
+class ReplicaRouterTests(TestCase):
+    def setUp(self):
+        """Create a router"""
+        self.router = ReplicaRouter()
+
+    def test_reads_outside_requests_use_primary(self):
+        """Test that code outside a routing block reads from the primary"""
+        self.assertIsNone(self.router.db_for_read(Game))
+        with read_from_replica(False):
+            self.assertIsNone(self.router.db_for_read(Game))
+
+    def test_reads_after_writes_use_primary(self):
+        """Test that reads after a write in the same block stay on the primary"""
+        with read_from_replica():
+            self.assertEqual(self.router.db_for_read(Game), 'replica')
+            self.assertEqual(self.router.db_for_write(Game), 'default')
+            self.assertIsNone(self.router.db_for_read(Game))
+
+    @override_settings(REPLICA_DATABASE_ALIAS='missing')
+    def test_unknown_alias_uses_primary(self):
+        """Test that an alias missing from DATABASES disables replica reads"""
+        with read_from_replica():
+            self.assertIsNone(self.router.db_for_read(Game))
+
+
+@override_settings(REPLICA_DATABASE_ALIAS='replica', GAME_READ_COALESCE_TIMEOUT=0)
+class ReplicaRoutingRequestTests(APITestCase):
+    """Requests against two SQLite databases standing in for a primary and a replica."""
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        """Create a game that only exists on the replica, with an id the primary won't reach"""
+        self.replica_game = Game.objects.using('replica').create(id=1000, turn=7)
+
+    def test_get_reads_from_replica(self):
+        """Test that GET requests read from the replica"""
+        response = self.client.get(reverse('game-detail', args=[self.replica_game.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['turn'], 7)
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+
+    async def test_async_views_read_from_replica(self):
+        """Test that async views read from the replica"""
+        response = await self.async_client.get(reverse('async:game-detail', args=[self.replica_game.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['turn'], 7)
+
+    def test_reads_stick_to_primary_after_write(self):
+        """Test that a client reads its own writes from the primary"""
+        response = self.client.post(reverse('game-list'), {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Game.objects.using('default').filter(pk=response.data['id']).exists())
+        self.assertIn(STICKY_COOKIE, response.cookies)
+        url = reverse('game-detail', args=[response.data['id']])
+
+        # The test client sends the cookie back
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        self.client.cookies[STICKY_COOKIE] = str(time.time() - 1)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,112 @@
+import threading
+import time
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from core.singleflight import SingleFlight, Unshared, coalesce, should_refresh
+
+
+class SingleFlightTests(SimpleTestCase):
+    def test_concurrent_calls_share_one_run(self):
+        """Test that concurrent callers of the same key wait for one computation"""
+        flights = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'result'
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flights.do('key', compute)))
+        leader.start()
+        started.wait(5)
+        waiters = [
+            threading.Thread(target=lambda: results.append(flights.do('key', compute)))
+            for _ in range(5)
+        ]
+        for waiter in waiters:
+            waiter.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in [leader] + waiters:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['result'] * 6)
+
+    def test_errors_are_not_shared(self):
+        """Test that waiters compute themselves when the leader fails"""
+        flights = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def fail():
+            started.set()
+            release.wait(5)
+            raise ValueError('boom')
+
+        errors = []
+
+        def lead():
+            try:
+                flights.do('key', fail)
+            except ValueError as e:
+                errors.append(e)
+
+        results = []
+        leader = threading.Thread(target=lead)
+        leader.start()
+        started.wait(5)
+        waiter = threading.Thread(target=lambda: results.append(flights.do('key', lambda: 'own')))
+        waiter.start()
+        time.sleep(0.05)
+        release.set()
+        leader.join(5)
+        waiter.join(5)
+
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(results, ['own'])
+
+    def test_sequential_calls_recompute(self):
+        """Test that calls after a finished run compute again"""
+        flights = SingleFlight()
+        self.assertEqual(flights.do('key', lambda: 1), 1)
+        self.assertEqual(flights.do('key', lambda: 2), 2)
+
+
+class CoalesceTests(SimpleTestCase):
+    def setUp(self):
+        """Start each test with an empty cache"""
+        cache.clear()
+
+    def test_cached_value_is_reused(self):
+        """Test that a cached value is returned without computing"""
+        self.assertEqual(coalesce('key', lambda: 'first', 60), 'first')
+        self.assertEqual(coalesce('key', lambda: 'second', 60), 'first')
+
+    def test_unshared_values_are_not_cached(self):
+        """Test that Unshared values are returned but not cached"""
+        def compute():
+            raise Unshared('error response')
+
+        self.assertEqual(coalesce('key', compute, 60), 'error response')
+        self.assertEqual(coalesce('key', lambda: 'value', 60), 'value')
+
+    def test_waits_for_other_process(self):
+        """Test that a caller waits for the value while another process holds the lock"""
+        cache.add('key:lock', True, 5)
+        threading.Timer(0.05, lambda: cache.set(
+            'key', {'value': 'theirs', 'delta': 0, 'expiry': time.time() + 60}, 60
+        )).start()
+        self.assertEqual(coalesce('key', lambda: 'mine', 60), 'theirs')
+
+    def test_should_refresh(self):
+        """Test early refresh far from, close to, and after expiry"""
+        now = time.time()
+        self.assertFalse(should_refresh({'delta': 0.001, 'expiry': now + 60}, now=now))
+        self.assertTrue(should_refresh({'delta': 0.001, 'expiry': now - 1}, now=now))
+        # A slow computation close to expiry is almost always refreshed early
+        self.assertTrue(should_refresh({'delta': 1000, 'expiry': now + 0.001}, now=now))
@@ -0,0 +1,94 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from play.models import Player, Race, Empire, Game
+from celestial.models import Planet, AsteroidBelt, System, Star
+from research.models import Technology, EmpireTechnology
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        """Set up an empire with a planet, an asteroid belt and a research row"""
+        self.game = Game.objects.create()
+        self.empire = Empire.objects.create(
+            name='Test Empire',
+            player=Player.objects.create(),
+            race=Race.objects.create(name='Test Race'),
+            game=self.game
+        )
+        system = System.objects.create(
+            x=0, y=0, star=Star.objects.create(star_type='yellow'), game=self.game
+        )
+        self.planet = Planet.objects.create(
+            system=system, orbit=1, empire=self.empire, mineral_storage_capacity=150
+        )
+        self.belt = AsteroidBelt.objects.create(system=system, orbit=2, empire=self.empire)
+        self.technology = Technology.objects.create(
+            name='Mining', description='Better mining', category=Technology.Category.RESOURCES
+        )
+        self.research = EmpireTechnology.objects.create(
+            technology=self.technology, empire=self.empire
+        )
+        self.empire_url = reverse('empire-detail', args=[self.empire.id])
+        self.research_url = reverse('empiretechnology-detail', args=[self.research.id])
+
+    def test_empire_skips_expandable_fields(self):
+        """Test that nested collections and capacities are omitted by default"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.empire_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['name'], 'Test Empire')
+        for name in ('planets', 'asteroid_belts', 'resource_capacities'):
+            self.assertNotIn(name, response.data)
+        self.assertFalse(any('SUM(' in query['sql'].upper() for query in queries))
+
+    def test_empire_expand(self):
+        """Test expanding planets and capacities from one prefetch"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.empire_url, {'expand': 'planets,resource_capacities'})
+        self.assertEqual([planet['id'] for planet in response.data['planets']], [self.planet.id])
+        self.assertEqual(response.data['resource_capacities']['mineral_capacity'], 150)
+        self.assertNotIn('asteroid_belts', response.data)
+        self.assertFalse(any('SUM(' in query['sql'].upper() for query in queries))
+
+    def test_fields_selects_fields(self):
+        """Test that fields limits the rendered fields"""
+        response = self.client.get(self.empire_url, {'fields': 'id,name'})
+        self.assertEqual(set(response.data), {'id', 'name'})
+
+    def test_fields_implies_expand(self):
+        """Test that naming an expandable field in fields renders it"""
+        response = self.client.get(self.empire_url, {'fields': 'id,asteroid_belts'})
+        self.assertEqual(set(response.data), {'id', 'asteroid_belts'})
+        self.assertEqual(response.data['asteroid_belts'][0]['id'], self.belt.id)
+
+    def test_empire_technology_returns_empire_id(self):
+        """Test that research rows reference the empire by id unless expanded"""
+        response = self.client.get(self.research_url)
+        self.assertEqual(response.data['empire_id'], self.empire.id)
+        self.assertNotIn('empire', response.data)
+
+    def test_nested_expand(self):
+        """Test expanding a nested serializer and its expandable fields"""
+        response = self.client.get(self.research_url, {'expand': 'empire,empire.planets'})
+        self.assertEqual(response.data['empire']['name'], 'Test Empire')
+        self.assertEqual(len(response.data['empire']['planets']), 1)
+        self.assertNotIn('resource_capacities', response.data['empire'])
+
+    def test_fields_on_list(self):
+        """Test fields on a paginated celestial list"""
+        response = self.client.get(reverse('system-list'), {'fields': 'id,x,y'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'x', 'y'})
+
+    def test_fields_does_not_affect_writes(self):
+        """Test that write-only fields are accepted when fields is given"""
+        data = {
+            'name': 'Renamed',
+            'player_id': self.empire.player_id,
+            'race_id': self.empire.race_id,
+        }
+        response = self.client.put(f'{self.empire_url}?fields=name', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'name': 'Renamed'})
@@ -0,0 +1,84 @@
+import gzip
+import json
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from play.models import Game
+from celestial.models import Planet, AsteroidBelt, System, Star
+
+
+class StreamingListTests(APITestCase):
+    def setUp(self):
+        """Set up a game with five systems, each with a planet and an asteroid belt"""
+        self.game = Game.objects.create()
+        self.other_game = Game.objects.create()
+        self.systems = []
+        for x in range(5):
+            system = System.objects.create(
+                x=x, y=0, star=Star.objects.create(star_type='yellow'), game=self.game
+            )
+            Planet.objects.create(system=system, orbit=1)
+            AsteroidBelt.objects.create(system=system, orbit=2)
+            self.systems.append(system)
+        System.objects.create(
+            x=0, y=0, star=Star.objects.create(star_type='blue'), game=self.other_game
+        )
+
+    def read(self, response):
+        """Read and decode a streamed JSON response"""
+        content = b''.join(response.streaming_content)
+        if response.get('Content-Encoding') == 'gzip':
+            content = gzip.decompress(content)
+        return json.loads(content)
+
+    def test_stream_list(self):
+        """Test that ?stream=true returns the full filtered list as a JSON array"""
+        response = self.client.get(reverse('system-list'), {'game': self.game.id, 'stream': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        data = self.read(response)
+        self.assertEqual([s['id'] for s in data], [s.id for s in self.systems])
+        self.assertEqual(len(data[0]['planets']), 1)
+        self.assertEqual(data[0]['star']['star_type'], 'yellow')
+
+    def test_stream_matches_list(self):
+        """Test that streamed rows match the paginated rows"""
+        params = {'game': self.game.id}
+        paginated = self.client.get(reverse('planet-list'), params).json()['results']
+        streamed = self.read(self.client.get(reverse('planet-list'), {**params, 'stream': '1'}))
+        self.assertEqual(streamed, paginated)
+
+    def test_stream_gzip(self):
+        """Test that streams are gzip-compressed when the client accepts it"""
+        response = self.client.get(
+            reverse('game-systems', args=[self.game.id]), {'stream': 'true'},
+            HTTP_ACCEPT_ENCODING='gzip, deflate'
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(len(self.read(response)), 5)
+
+    def test_stream_sparse_fields(self):
+        """Test that sparse fieldsets apply to streamed rows"""
+        response = self.client.get(reverse('system-list'), {'stream': 'true', 'fields': 'id,x'})
+        data = self.read(response)
+        self.assertEqual(len(data), 6)
+        self.assertEqual(set(data[0]), {'id', 'x'})
+
+    @override_settings(STREAM_CHUNK_SIZE=2)
+    def test_stream_prefetches_per_chunk(self):
+        """Test that related rows are prefetched once per chunk, not once per row"""
+        response = self.client.get(
+            reverse('game-systems', args=[self.game.id]), {'stream': 'true'}
+        )
+        # One systems query, then a planets and an asteroid belts prefetch per chunk of 2
+        with self.assertNumQueries(7):
+            data = self.read(response)
+        self.assertEqual(len(data), 5)
+
+    def test_stream_empty(self):
+        """Test that an empty stream is an empty JSON array"""
+        response = self.client.get(reverse('planet-list'), {'game': 0, 'stream': 'true'})
+        self.assertEqual(self.read(response), [])
@@ -0,0 +1,74 @@
+import threading
+from django.test import SimpleTestCase
+from core.timers import TimerWheel
+
+
+class TimerWheelTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        self.wheel = TimerWheel(tick=1.0, slots=8, clock=lambda: self.now)
+        self.fired = []
+
+    def schedule(self, key, when):
+        self.wheel.schedule(key, when, lambda: self.fired.append(key))
+
+    def test_fires_at_deadline_never_early(self):
+        """Test that timers fire once their deadline has passed, in deadline order"""
+        self.schedule('b', 1003.5)
+        self.schedule('a', 1002)
+        self.assertEqual(self.wheel.advance(1001.9), [])
+        self.assertEqual(self.wheel.advance(1003.2), ['a'])
+        self.assertEqual(self.wheel.advance(1004), ['b'])
+        self.assertEqual(self.fired, ['a', 'b'])
+        self.assertEqual(len(self.wheel), 0)
+
+    def test_reschedule_and_cancel(self):
+        """Test that a key has one timer, which can be moved or dropped"""
+        self.schedule('game', 1002)
+        self.schedule('game', 1005)
+        self.assertEqual(len(self.wheel), 1)
+        self.assertEqual(self.wheel.advance(1003), [])
+        self.assertEqual(self.wheel.advance(1005), ['game'])
+        self.schedule('other', 1006)
+        self.assertTrue(self.wheel.cancel('other'))
+        self.assertFalse(self.wheel.cancel('other'))
+        self.assertEqual(self.wheel.advance(1010), [])
+
+    def test_deadlines_beyond_one_turn(self):
+        """Test that timers more than a turn of the wheel away wait for their turn"""
+        # Slot 1011 % 8 is visited at 1003 too
+        self.schedule('late', 1011)
+        self.assertEqual(self.wheel.advance(1003), [])
+        self.assertEqual(self.wheel.advance(1010), [])
+        self.assertEqual(self.wheel.advance(1011), ['late'])
+
+    def test_catches_up_after_a_long_pause(self):
+        """Test that every due timer fires when advancing past a full turn at once"""
+        for i in range(20):
+            self.schedule(i, 1001 + i)
+        self.assertEqual(self.wheel.advance(1100), list(range(20)))
+
+    def test_past_deadline_fires_on_next_tick(self):
+        """Test that a deadline already passed fires on the next advance"""
+        self.now = 1005.0
+        self.schedule('overdue', 1000)
+        self.assertEqual(self.wheel.advance(1006), ['overdue'])
+
+    def test_failing_callback_does_not_stop_others(self):
+        """Test that a failing timer is logged and the rest still fire"""
+        self.wheel.schedule('broken', 1001, lambda: 1 / 0)
+        self.schedule('ok', 1001)
+        with self.assertLogs('core.timers', 'ERROR'):
+            self.assertEqual(self.wheel.advance(1002), ['broken', 'ok'])
+        self.assertEqual(self.fired, ['ok'])
+
+    def test_background_thread(self):
+        """Test that a started wheel fires timers on its own"""
+        wheel = TimerWheel(tick=0.01)
+        fired = threading.Event()
+        wheel.schedule('soon', wheel.clock() + 0.02, fired.set)
+        wheel.start()
+        try:
+            self.assertTrue(fired.wait(5))
+        finally:
+            wheel.stop()
@@ -0,0 +1,133 @@
+"""Deadline timers for many keys at once.
+
+This module schedules callbacks at wall-clock deadlines with a hashed timer
+wheel: timers hang in one of a fixed number of slots by their deadline tick,
+and each tick only visits the slots that came due, so scheduling,
+rescheduling and cancelling are constant time however many timers are
+pending. Timers firing in the same tick are cheap to batch.
+
+**Classes:**
+- :class:`core.timers.TimerWheel`: Hashed timer wheel with a background thread
+"""
+
+import logging
+import math
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TICK = 1.0
+
+DEFAULT_SLOTS = 512
+
+
+class TimerWheel:
+    """Run callbacks at deadlines, with one timer per key.
+
+    Deadlines are rounded up to the next tick, so a timer never fires early.
+    Timers further away than one turn of the wheel stay in their slot until
+    the turn in which they are due.
+
+    **Args:**
+        tick (float): Seconds per tick
+        slots (int): Number of slots of the wheel
+        clock: Callable returning the current time in seconds since the epoch
+    """
+
+    def __init__(self, tick=DEFAULT_TICK, slots=DEFAULT_SLOTS, clock=time.time):
+        self.tick = tick
+        self.clock = clock
+        self._slots = [{} for _ in range(slots)]
+        self._timers = {}
+        self._lock = threading.Lock()
+        self._current = math.floor(clock() / tick)
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def _tick_of(self, when):
+        """Get the tick a time falls in, rounding up."""
+        return math.ceil(when / self.tick)
+
+    def __len__(self):
+        return len(self._timers)
+
+    def schedule(self, key, when, callback):
+        """Run a callback at a deadline, replacing the key's pending timer.
+
+        **Args:**
+            key: The key identifying the timer
+            when (float): Deadline in seconds since the epoch
+            callback: Callable without arguments
+        """
+        with self._lock:
+            tick = max(self._tick_of(when), self._current + 1)
+            self._cancel(key)
+            self._slots[tick % len(self._slots)][key] = (tick, callback)
+            self._timers[key] = tick
+
+    def cancel(self, key):
+        """Drop the key's pending timer, if any.
+
+        **Returns:**
+            bool: Whether a timer was pending
+        """
+        with self._lock:
+            return self._cancel(key)
+
+    def _cancel(self, key):
+        """Drop the key's pending timer while holding the lock."""
+        tick = self._timers.pop(key, None)
+        if tick is None:
+            return False
+        del self._slots[tick % len(self._slots)][key]
+        return True
+
+    def advance(self, now=None):
+        """Fire the timers that came due since the last advance.
+
+        **Args:**
+            now (float): The current time, defaults to the wheel's clock
+
+        **Returns:**
+            list: Keys of the fired timers, in deadline order
+        """
+        target = math.floor((self.clock() if now is None else now) / self.tick)
+        due = []
+        with self._lock:
+            # After a full turn of the wheel every slot has been visited
+            first = max(self._current + 1, target - len(self._slots) + 1)
+            for tick in range(first, target + 1):
+                slot = self._slots[tick % len(self._slots)]
+                for key, (deadline, callback) in list(slot.items()):
+                    if deadline <= target:
+                        del slot[key]
+                        del self._timers[key]
+                        due.append((deadline, key, callback))
+            self._current = max(self._current, target)
+        due.sort(key=lambda timer: timer[0])
+        for _, key, callback in due:
+            try:
+                callback()
+            except Exception:
+                logger.exception(f"Timer {key!r} failed")
+        return [key for _, key, _ in due]
+
+    def start(self):
+        """Advance the wheel every tick on a daemon thread, once."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='timer-wheel', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        """Advance the wheel until stopped."""
+        while not self._stopped.wait(self.tick):
+            self.advance()
@@ -0,0 +1,275 @@
+"""Computer empire AI for the space conquest game.
+
+At the end of each turn, before production, :func:`run_ai_phase` decides
+orders for every computer empire of the game and applies them to the turn's
+:class:`play.state.GameState`, which writes them back with the rest of the
+turn in one bulk flush.
+
+Deciding runs in parallel:
+
+- The state is reduced to a read-only :func:`snapshot` of its records
+- :func:`decide_orders` runs for each empire in a shared process pool of
+  ``AI_WORKERS`` processes, so a turn takes about as long as the slowest
+  empire rather than the sum of all of them. Only the turn scheduler and
+  worker commands start the pool (:func:`start_pool`); web processes decide
+  in process
+- The snapshot is sent to each pool process once per turn, with the
+  empires that process decides, rather than once per empire
+- Each empire gets ``AI_TURN_BUDGET`` seconds of CPU time. The search is
+  iterative deepening: it ranks its options looking one turn ahead, then
+  two, and so on, and returns the ranking of the deepest completed pass
+  when the budget runs out
+
+The only order is claiming an unowned planet or asteroid belt, as the
+ownership endpoint does for players, at most one per empire per turn.
+Options are scored by projecting the empire's storage with the rules in
+:mod:`play.economy`.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import threading
+import time
+from django.conf import settings
+from .economy import RESOURCES, next_storage, total_production, total_capacity
+from .models import Empire, Player
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AI_TURN_BUDGET = 0.05
+
+# Deepest lookahead, in turns
+MAX_DEPTH = 8
+
+# Claims ranked per empire, so an empire that loses a contested body gets its next choice
+RANKED_CLAIMS = 3
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def turn_budget():
+    """Get the CPU seconds each computer empire may think per turn.
+
+    Returns:
+        float: The budget in seconds
+    """
+    return getattr(settings, 'AI_TURN_BUDGET', DEFAULT_AI_TURN_BUDGET)
+
+
+def snapshot(state):
+    """Reduce a game state to what the AI reads.
+
+    Worker processes get pickled copies of the records, so they can't
+    change the state.
+
+    Args:
+        state (GameState): The game state
+
+    Returns:
+        dict: ``storage`` tuples by empire ID and ``bodies``, a list of
+        ``(kind, record)`` pairs for every planet and asteroid belt
+    """
+    return {
+        'storage': {
+            empire.id: tuple(getattr(empire, f'{resource}_storage') for resource in RESOURCES)
+            for empire in state.empires.values()
+        },
+        'bodies': [('planets', planet) for planet in state.planets.values()]
+        + [('asteroid_belts', belt) for belt in state.asteroid_belts.values()],
+    }
+
+
+def _signature(option):
+    """Get the kind, production and capacity of a body, which decide its score."""
+    kind, body = option
+    return (kind,) + tuple(
+        (getattr(body, f'{resource}_production'), getattr(body, f'{resource}_storage_capacity', 0))
+        for resource in RESOURCES
+    )
+
+
+def _heuristic(option):
+    """Rank a body by its production and capacity, for move ordering."""
+    return sum(production + capacity for production, capacity in _signature(option)[1:])
+
+
+def project(storage, holdings, claims, turns):
+    """Project an empire's total storage after some turns.
+
+    Args:
+        storage (tuple): Current storage, in resource order
+        holdings (list): The empire's ``(kind, record)`` bodies
+        claims (list): ``(kind, record)`` bodies claimed, one per turn, starting with this turn
+        turns (int): Turns to project
+
+    Returns:
+        Decimal: Total storage after the last turn
+    """
+    storage = dict(zip(RESOURCES, storage))
+    holdings = list(holdings)
+    for turn in range(turns):
+        if turn < len(claims):
+            holdings.append(claims[turn])
+        bodies = [body for _, body in holdings]
+        planets = [body for kind, body in holdings if kind == 'planets']
+        storage = next_storage(storage, total_production(bodies), total_capacity(planets))
+    return sum(storage.values())
+
+
+def decide_orders(view, empire_id, budget):
+    """Rank the bodies an empire should claim, within a CPU time budget.
+
+    Pass ``d`` scores every option by projecting ``d`` turns, claiming the
+    option now and the best remaining bodies in later turns. Each pass
+    searches in the order of the previous pass's ranking, and bodies alike
+    in kind, production and capacity are only projected once.
+
+    Args:
+        view (dict): The game's :func:`snapshot`
+        empire_id (int): The deciding empire
+        budget (float): CPU seconds available
+
+    Returns:
+        dict: ``empire``, ``claims`` (``(kind, id)`` pairs, best first) and
+        the completed search ``depth``
+    """
+    deadline = time.process_time() + budget
+    holdings = [option for option in view['bodies'] if option[1].empire_id == empire_id]
+    options = sorted(
+        (option for option in view['bodies'] if option[1].empire_id is None),
+        key=_heuristic, reverse=True
+    )
+    ranking, depth = options, 0
+    while options and depth < MAX_DEPTH:
+        scores = {}
+        for option in ranking:
+            if time.process_time() > deadline:
+                break
+            signature = _signature(option)
+            if signature not in scores:
+                later = [other for other in ranking if other is not option][:depth]
+                scores[signature] = project(
+                    view['storage'][empire_id], holdings, [option] + later, depth + 1
+                )
+        else:
+            ranking = sorted(ranking, key=lambda option: scores[_signature(option)], reverse=True)
+            depth += 1
+            continue
+        break
+    return {
+        'empire': empire_id,
+        'claims': [(kind, body.id) for kind, body in ranking[:RANKED_CLAIMS]],
+        'depth': depth,
+    }
+
+
+def _decide(args):
+    """Decide the orders of a share of the empires for the pool."""
+    view, empire_ids, budget = args
+    return [decide_orders(view, empire_id, budget) for empire_id in empire_ids]
+
+
+def _init_worker():
+    """Set up Django in worker processes started without a copy of the parent."""
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def start_pool():
+    """Start the process pool shared by the AI phases of this process.
+
+    Called by long-running turn processes before they start their threads.
+    Web processes never call it, so they don't fork from request threads.
+
+    Returns:
+        Pool: The pool, or None if ``AI_WORKERS`` is 0
+    """
+    global _pool
+    workers = getattr(settings, 'AI_WORKERS', None)
+    if workers == 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = multiprocessing.Pool(workers, initializer=_init_worker)
+            atexit.register(shutdown_pool)
+        return _pool
+
+
+def get_pool():
+    """Get the process pool shared by AI phases, or None to decide in this process."""
+    return _pool
+
+
+def shutdown_pool():
+    """Stop the shared process pool, if it was started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.terminate()
+            _pool.join()
+            _pool = None
+
+
+def apply_orders(state, decisions):
+    """Apply the AI's claims to the game state.
+
+    Contested bodies go to the empire with the lowest ID; the others get
+    their next ranked claim that is still free.
+
+    Args:
+        state (GameState): The game state
+        decisions (list): Results of :func:`decide_orders`
+
+    Returns:
+        dict: The claimed ``(kind, id)`` by empire ID
+    """
+    claimed = {}
+    for decision in sorted(decisions, key=lambda decision: decision['empire']):
+        for kind, body_id in decision['claims']:
+            body = getattr(state, kind)[body_id]
+            if body.empire_id is None:
+                body.empire_id = decision['empire']
+                claimed[decision['empire']] = (kind, body_id)
+                break
+    return claimed
+
+
+def run_ai_phase(state, empire_ids=None, budget=None, parallel=True):
+    """Decide and apply the orders of the computer empires of a game.
+
+    Args:
+        state (GameState): The game state, changed in memory
+        empire_ids (list): The deciding empires, defaults to the game's computer empires
+        budget (float): CPU seconds per empire, defaults to ``AI_TURN_BUDGET``
+        parallel (bool): Decide in the process pool rather than in this process
+
+    Returns:
+        dict: The claimed ``(kind, id)`` by empire ID
+    """
+    if empire_ids is None:
+        empire_ids = list(Empire.objects.filter(
+            game_id=state.game.id, player__player_type=Player.PlayerType.COMPUTER
+        ).order_by('pk').values_list('pk', flat=True))
+    if not empire_ids:
+        return {}
+    budget = turn_budget() if budget is None else budget
+    view = snapshot(state)
+    started = time.perf_counter()
+    pool = get_pool() if parallel and len(empire_ids) > 1 else None
+    if pool:
+        # One task per pool process, so each gets one copy of the snapshot
+        shares = min(pool._processes, len(empire_ids))
+        tasks = [(view, empire_ids[share::shares], budget) for share in range(shares)]
+        decisions = [decision for share in pool.map(_decide, tasks) for decision in share]
+    else:
+        decisions = _decide((view, empire_ids, budget))
+    claimed = apply_orders(state, decisions)
+    logger.debug(
+        f"AI phase: {len(empire_ids)} empires in {time.perf_counter() - started:.3f}s, "
+        f"depths {[decision['depth'] for decision in decisions]}, {len(claimed)} claims"
+    )
+    return claimed
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PlayConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "play"
+
+    def ready(self):
+        """Connect the signal handlers that keep game versions current."""
+        from . import signals  # noqa: F401
@@ -0,0 +1,196 @@
+"""Async read views for the game API.
+
+This module serves the read-only game endpoints with Django's async ORM, so
+that under an ASGI server (e.g. ``uvicorn spacegame.asgi:application``) one
+worker holds many slow client connections without a thread per request:
+
+- ``GET games/`` and ``GET games/{id}/``
+- ``GET games/{id}/systems/`` and ``GET games/{id}/empires/``
+- ``GET empires/{id}/planets/`` and ``GET empires/{id}/asteroid-belts/``
+
+The responses match the sync viewsets: the same serializers, id cursor pages,
+``?fields=``/``?expand=`` options, and game-versioned ETags with 304 answers
+to a matching ``If-None-Match``. Writes to the same routes are delegated to
+the sync viewsets (see :func:`core.async_views.read_view`).
+
+The views are mounted under ``/api/async/``, and in front of the sync
+viewsets under ``/api/`` when the ``ASYNC_READ_VIEWS`` setting is enabled.
+"""
+
+from celestial.models import Planet, AsteroidBelt
+from celestial.serializers import SystemSerializer, PlanetSerializer, AsteroidBeltSerializer
+from core.async_views import InvalidCursor, not_found, paginate_by_id, read_view, render_json
+from .models import Empire, Game
+from .serializers import EmpireSerializer, GameSerializer
+from .views import GameViewSet, prefetch_empire_expansions
+from .layout import aget_systems
+from .versioning import agame_etag, etag_matches, resource_etag
+
+
+def sparse_context(request):
+    """Build a serializer context with the request's ``fields``/``expand`` options."""
+    return {key: request.GET.get(key) for key in ('fields', 'expand')}
+
+
+def versioned(response, etag):
+    """Attach a game's ETag to a response, as :class:`GameETagMixin` does."""
+    if etag:
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+async def conditional(request, game_id):
+    """Get a game's ETag and whether the client's copy is current.
+
+    Args:
+        request: The HTTP request
+        game_id (int): The game ID
+
+    Returns:
+        tuple: ``(etag, not_modified)``; the ETag is None for unknown games
+    """
+    etag = resource_etag(await agame_etag(game_id), request)
+    return etag, etag is not None and etag_matches(request, etag)
+
+
+def not_modified(etag):
+    """Build an empty 304 response for a game version."""
+    return versioned(render_json(None, status=304), etag)
+
+
+async def game_list(request):
+    """List games, one id cursor page at a time.
+
+    Args:
+        request: The HTTP request
+
+    Returns:
+        HttpResponse: Page of games with ``next`` and ``previous`` links
+    """
+    context = sparse_context(request)
+    games = Game.objects.prefetch_related('empires', 'systems')
+    try:
+        page = await paginate_by_id(
+            request, games, lambda rows: GameSerializer(rows, many=True, context=context).data
+        )
+    except InvalidCursor:
+        return render_json({'detail': 'Invalid cursor'}, status=404)
+    return render_json(page)
+
+
+async def game_detail(request, pk):
+    """Get a game.
+
+    Args:
+        request: The HTTP request
+        pk (int): The game ID
+
+    Returns:
+        HttpResponse: The game, 304 if unchanged, or 404
+    """
+    etag, current = await conditional(request, pk)
+    if current:
+        return not_modified(etag)
+    game = await Game.objects.prefetch_related('empires', 'systems').filter(pk=pk).afirst()
+    if game is None:
+        return not_found(Game)
+    return versioned(render_json(GameSerializer(game, context=sparse_context(request)).data), etag)
+
+
+async def game_systems(request, pk):
+    """Get all systems in a game.
+
+    The full list is served from the cached galaxy layout with a fresh
+    ownership overlay; sparse fieldsets are rendered from the database.
+
+    Args:
+        request: The HTTP request
+        pk (int): The game ID
+
+    Returns:
+        HttpResponse: List of systems, 304 if unchanged, or 404
+    """
+    etag, current = await conditional(request, pk)
+    if current:
+        return not_modified(etag)
+    game = await Game.objects.filter(pk=pk).afirst()
+    if game is None:
+        return not_found(Game)
+    context = sparse_context(request)
+    if not any(context.values()):
+        return versioned(render_json(await aget_systems(game)), etag)
+
+    systems = [
+        system async for system in game.systems.select_related('star').prefetch_related(
+            'planets', 'asteroid_belts'
+        ).order_by('id')
+    ]
+    return versioned(render_json(SystemSerializer(systems, many=True, context=context).data), etag)
+
+
+async def game_empires(request, pk):
+    """Get all empires in a game.
+
+    Args:
+        request: The HTTP request
+        pk (int): The game ID
+
+    Returns:
+        HttpResponse: List of empires, 304 if unchanged, or 404
+    """
+    etag, current = await conditional(request, pk)
+    if current:
+        return not_modified(etag)
+    if etag is None:
+        return not_found(Game)
+    empires = prefetch_empire_expansions(
+        Empire.objects.filter(game_id=pk).select_related('player', 'race').order_by('id'), request
+    )
+    empires = [empire async for empire in empires]
+    serializer = EmpireSerializer(empires, many=True, context=sparse_context(request))
+    return versioned(render_json(serializer.data), etag)
+
+
+async def empire_bodies(request, pk, model, serializer_class):
+    """Get the bodies of one kind owned by an empire.
+
+    Args:
+        request: The HTTP request
+        pk (int): The empire ID
+        model: :class:`Planet` or :class:`AsteroidBelt`
+        serializer_class: The serializer of the model
+
+    Returns:
+        HttpResponse: List of bodies, 304 if unchanged, or 404
+    """
+    row = await Empire.objects.filter(pk=pk).values_list('game_id').afirst()
+    if row is None:
+        return not_found(Empire)
+    etag, current = await conditional(request, row[0])
+    if current:
+        return not_modified(etag)
+    bodies = [body async for body in model.objects.filter(empire_id=pk).order_by('id')]
+    serializer = serializer_class(bodies, many=True, context=sparse_context(request))
+    return versioned(render_json(serializer.data), etag)
+
+
+async def empire_planets(request, pk):
+    """Get all planets belonging to an empire."""
+    return await empire_bodies(request, pk, Planet, PlanetSerializer)
+
+
+async def empire_asteroid_belts(request, pk):
+    """Get all asteroid belts belonging to an empire."""
+    return await empire_bodies(request, pk, AsteroidBelt, AsteroidBeltSerializer)
+
+
+# Routes shared with the sync viewsets keep their write methods
+games = read_view(game_list, GameViewSet.as_view({'post': 'create'}))
+game = read_view(game_detail, GameViewSet.as_view({
+    'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'
+}))
+systems = read_view(game_systems)
+empires = read_view(game_empires)
+planets = read_view(empire_planets)
+asteroid_belts = read_view(empire_asteroid_belts)
@@ -0,0 +1,173 @@
+"""Simultaneous turns for games with several human players.
+
+Ending a turn doesn't process it right away. Each human empire marks itself
+ready with a single-row UPDATE, and the turn is processed once, by whichever
+request or timer gets there first:
+
+- :func:`end_turn` marks an empire ready and processes the turn when no
+  human empire is left to wait for, or when the turn's deadline has passed
+- :func:`advance_turn` processes a turn at most once, however many requests
+  and timers race for it
+- Games with a ``turn_duration`` get a deadline per turn. Deadlines are kept
+  on a :class:`core.timers.TimerWheel` in the server process, which
+  processes the turn when it expires
+
+An empire is ready while its ``ready_turn`` is the game's turn, so nothing
+has to be reset when the turn advances.
+"""
+
+import logging
+import threading
+from django.db import connection, transaction
+from django.utils import timezone
+from core.timers import TimerWheel
+from .models import Empire, Game, Player
+from .turn import process
+
+logger = logging.getLogger(__name__)
+
+_wheel = None
+_wheel_lock = threading.Lock()
+
+
+class BarrierError(ValueError):
+    """Raised when an empire can't end the game's turn."""
+
+
+def get_timer_wheel():
+    """Get the timer wheel holding the turn deadlines of this process, started on first use."""
+    global _wheel
+    with _wheel_lock:
+        if _wheel is None:
+            _wheel = TimerWheel()
+            _wheel.start()
+        return _wheel
+
+
+def deadline_passed(game, now=None):
+    """Check whether the game's current turn is past its deadline.
+
+    Args:
+        game (Game): The game
+        now (datetime): The current time, defaults to now
+
+    Returns:
+        bool: Whether the turn has a deadline and it has passed
+    """
+    return game.turn_deadline is not None and game.turn_deadline <= (now or timezone.now())
+
+
+def waiting_empires(game):
+    """Get the human empires that haven't ended the game's current turn.
+
+    Args:
+        game (Game): The game
+
+    Returns:
+        list: Empire IDs
+    """
+    return list(Empire.objects.filter(
+        game_id=game.id, player__player_type=Player.PlayerType.HUMAN
+    ).exclude(ready_turn=game.turn).order_by('pk').values_list('pk', flat=True))
+
+
+def advance_turn(game_id, turn):
+    """Process a turn of a game unless it has been processed already.
+
+    The conditional UPDATE claims the game row, so concurrent callers wait
+    for the first one to commit and then find the turn already advanced.
+
+    Args:
+        game_id (int): The game ID
+        turn (int): The turn to process
+
+    Returns:
+        Game: The processed game, or None if the turn was already processed
+    """
+    with transaction.atomic():
+        if not Game.objects.filter(pk=game_id, turn=turn).update(turn=turn):
+            return None
+        game = process(Game.objects.get(pk=game_id))
+    schedule_deadline(game)
+    return game
+
+
+def process_if_due(game_id, turn):
+    """Process a turn whose deadline has passed.
+
+    Args:
+        game_id (int): The game ID
+        turn (int): The turn the deadline belongs to
+
+    Returns:
+        Game: The processed game, or None if the turn was processed already
+        or its deadline moved
+    """
+    game = Game.objects.filter(pk=game_id, turn=turn).first()
+    if game is None or not deadline_passed(game):
+        return None
+    logger.info(f"Turn {turn} of game {game_id} reached its deadline")
+    return advance_turn(game_id, turn)
+
+
+def _on_deadline(game_id, turn):
+    """Process an expired turn on the timer thread and release its connection."""
+    try:
+        process_if_due(game_id, turn)
+    finally:
+        connection.close()
+
+
+def schedule_deadline(game):
+    """Put the deadline of the game's current turn on the timer wheel.
+
+    Args:
+        game (Game): The game
+    """
+    if game.turn_deadline is None:
+        return
+    game_id, turn = game.id, game.turn
+    get_timer_wheel().schedule(game_id, game.turn_deadline.timestamp(), lambda: _on_deadline(game_id, turn))
+
+
+def end_turn(game, empire_id=None):
+    """Mark an empire ready and process the turn once nobody is left to wait for.
+
+    Without an empire, the game's only human empire is meant; games of
+    computer empires are processed right away.
+
+    Args:
+        game (Game): The game
+        empire_id (int): The human empire ending the turn
+
+    Returns:
+        tuple: The game, processed if the turn advanced, and the IDs of the
+        human empires still to end the turn
+
+    Raises:
+        BarrierError: If the empire isn't a human empire of the game, or
+            none is given and several humans play
+    """
+    humans = list(Empire.objects.filter(
+        game_id=game.id, player__player_type=Player.PlayerType.HUMAN
+    ).values_list('pk', flat=True))
+    if empire_id is None:
+        if len(humans) > 1:
+            raise BarrierError('empire is required when several human empires play')
+        empire_id = humans[0] if humans else None
+    elif empire_id not in humans:
+        raise BarrierError(f'Empire {empire_id} is not a human empire of this game')
+
+    turn = game.turn
+    if empire_id is not None:
+        Empire.objects.filter(pk=empire_id).update(ready_turn=turn)
+    # Read after writing, so of two empires ending the turn at once at least one sees the other
+    waiting = waiting_empires(game) if len(humans) > 1 else []
+    if waiting and not deadline_passed(game):
+        schedule_deadline(game)
+        return game, waiting
+
+    processed = advance_turn(game.id, turn)
+    if processed is None:
+        processed = Game.objects.prefetch_related('empires', 'systems').get(pk=game.id)
+    return processed, []
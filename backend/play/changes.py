@@ -0,0 +1,130 @@
+"""Delta sync for the space conquest game.
+
+This module serves the rows of a game that changed since a given turn, so
+that clients that reconnect or step through turns can apply small diffs
+instead of reloading the full game state.
+
+Changes are recorded in the :model:`play.GameChange` log by
+:mod:`play.versioning` and pruned at the end of each turn to the last
+``GAME_CHANGE_LOG_HORIZON`` turns.
+"""
+
+import logging
+from django.conf import settings
+from celestial.models import Planet, AsteroidBelt
+from celestial.serializers import PlanetSerializer, AsteroidBeltSerializer
+from research.models import EmpireTechnology
+from .models import Empire, GameChange
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHANGE_LOG_HORIZON = 10
+
+
+class ChangesPruned(Exception):
+    """Raised when the change log no longer covers the requested turn."""
+
+
+def change_log_horizon():
+    """Get the number of turns of changes kept per game.
+
+    Returns:
+        int: The change log horizon in turns
+    """
+    return getattr(settings, 'GAME_CHANGE_LOG_HORIZON', DEFAULT_CHANGE_LOG_HORIZON)
+
+
+def prune_changes(game):
+    """Delete change log entries older than the horizon.
+
+    Args:
+        game (Game): The game to prune the change log of
+
+    Returns:
+        int: Number of entries deleted
+    """
+    oldest_kept = game.turn - change_log_horizon()
+    if oldest_kept <= 0:
+        return 0
+    deleted, _ = GameChange.objects.filter(game=game, turn__lte=oldest_kept).delete()
+    logger.debug(f"Pruned {deleted} change log entries of game {game.id} up to turn {oldest_kept}")
+    return deleted
+
+
+def changes_since(game, since_turn, context=None):
+    """Get the rows of a game that changed since the start of a turn.
+
+    Changes are stamped with the turn in which they became visible: writes
+    made during turn N and the results of processing turn N-1 are both
+    stamped N. A client that loaded the game during turn N asks for
+    ``since_turn=N`` and may receive rows it already has, but never misses
+    a change.
+
+    Rows that changed and still exist are returned with their current
+    values; rows that changed and no longer exist are listed as deleted.
+    A ``since_turn`` after the game's turn means the game was rewound since
+    the client loaded it, and the rewind's changes are stamped with the
+    earlier turn, so the client has to reload the game.
+
+    Args:
+        game (Game): The game
+        since_turn (int): The turn during which the client last loaded the game
+        context (dict): Serializer context for the returned rows
+
+    Returns:
+        dict: The changed rows by type and the deleted row IDs by type
+
+    Raises:
+        ChangesPruned: If changes since ``since_turn`` have been pruned, or
+            ``since_turn`` is after the game's turn
+    """
+    # Imported here to avoid a cycle: the serializers import play.start,
+    # which imports play.turn, which imports this module
+    from research.serializers import EmpireTechnologySerializer
+    from .serializers import EmpireSerializer
+
+    if since_turn > game.turn:
+        raise ChangesPruned(
+            f'Turn {since_turn} is after the current turn {game.turn}; the game was rewound'
+        )
+    oldest_kept = game.turn - change_log_horizon()
+    if oldest_kept > 0 and since_turn <= oldest_kept:
+        raise ChangesPruned(
+            f'Changes before turn {oldest_kept + 1} are no longer available'
+        )
+
+    changed = {kind: set() for kind in GameChange.Kind.values}
+    for kind, object_id in GameChange.objects.filter(
+        game=game, turn__gte=since_turn
+    ).values_list('kind', 'object_id'):
+        changed[kind].add(object_id)
+
+    sources = {
+        GameChange.Kind.EMPIRE: (
+            'empires',
+            Empire.objects.select_related('player', 'race'),
+            EmpireSerializer,
+        ),
+        GameChange.Kind.PLANET: ('planets', Planet.objects.all(), PlanetSerializer),
+        GameChange.Kind.ASTEROID_BELT: (
+            'asteroid_belts', AsteroidBelt.objects.all(), AsteroidBeltSerializer
+        ),
+        GameChange.Kind.RESEARCH: (
+            'research',
+            EmpireTechnology.objects.select_related('technology').prefetch_related(
+                'technology__prerequisites'
+            ),
+            EmpireTechnologySerializer,
+        ),
+    }
+    data = {
+        'game': game.id,
+        'turn': game.turn,
+        'since_turn': since_turn,
+        'deleted': {},
+    }
+    for kind, (name, queryset, serializer_class) in sources.items():
+        rows = list(queryset.filter(pk__in=changed[kind]).order_by('pk')) if changed[kind] else []
+        data[name] = serializer_class(rows, many=True, context=context or {}).data
+        data['deleted'][name] = sorted(changed[kind] - {row.pk for row in rows})
+    return data
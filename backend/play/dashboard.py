@@ -0,0 +1,136 @@
+"""Empire dashboard for the space conquest game.
+
+This module builds the summary shown on the empire screen in one pass:
+- The empire with its player and race
+- Resource storage, capacities and production totals
+- Owned planets and asteroid belts
+- A summary of research progress
+
+The dashboard is built from four queries (empire, planets, asteroid belts,
+research) and cached per game version, so repeated visits within a turn are
+served from the cache. Amounts are rendered by the same serializer fields as
+on the empire, planet and research endpoints, so a value has the same JSON
+type everywhere.
+"""
+
+import logging
+from django.conf import settings
+from django.core.cache import cache
+from celestial.models import Planet, AsteroidBelt
+from celestial.serializers import PlanetSerializer, AsteroidBeltSerializer
+from research.models import EmpireTechnology
+from research.serializers import EmpireTechnologySerializer, TechnologySerializer
+from .economy import RESOURCES, total_production, total_capacity
+from .models import Empire
+from .serializers import EmpireSerializer, PlayerSerializer, RaceSerializer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DASHBOARD_CACHE_TIMEOUT = 60 * 60
+
+
+def dashboard_cache_key(version, empire_id):
+    """Get the cache key of an empire's dashboard for a game version.
+
+    Args:
+        version (str): The game's version ETag
+        empire_id (int): The empire ID
+
+    Returns:
+        str: The cache key
+    """
+    return f'play:dashboard:{version}:{empire_id}'
+
+
+def build_dashboard(empire):
+    """Build the dashboard data for an empire.
+
+    Args:
+        empire (Empire): The empire, with player and race selected
+
+    Returns:
+        dict: The dashboard data
+    """
+    logger.debug(f"Building dashboard for empire {empire.name} (ID: {empire.id})")
+    planets = list(Planet.objects.filter(empire=empire).order_by('system_id', 'orbit'))
+    belts = list(AsteroidBelt.objects.filter(empire=empire).order_by('system_id', 'orbit'))
+    research = list(
+        EmpireTechnology.objects.filter(empire=empire)
+        .select_related('technology')
+        .order_by('technology__name')
+    )
+
+    production = total_production(planets + belts)
+    capacity = total_capacity(planets)
+    completed = [row for row in research if row.is_complete]
+    empire_fields = EmpireSerializer().fields
+    planet_fields = PlanetSerializer().fields
+    points = EmpireTechnologySerializer().fields['research_points']
+    cost = TechnologySerializer().fields['cost']
+
+    return {
+        'empire': {
+            'id': empire.id,
+            'name': empire.name,
+            'game': empire.game_id,
+            'player': PlayerSerializer(empire.player).data,
+            'race': RaceSerializer(empire.race).data,
+        },
+        'storage': {
+            resource: empire_fields[f'{resource}_storage'].to_representation(
+                getattr(empire, f'{resource}_storage')
+            )
+            for resource in RESOURCES
+        },
+        'capacities': {
+            f'{resource}_capacity': capacity[resource] for resource in RESOURCES
+        },
+        'production': {
+            resource: planet_fields[f'{resource}_production'].to_representation(amount)
+            for resource, amount in production.items()
+        },
+        'colonies': {
+            'planets': PlanetSerializer(planets, many=True).data,
+            'asteroid_belts': AsteroidBeltSerializer(belts, many=True).data,
+        },
+        'research': {
+            'total': len(research),
+            'completed': len(completed),
+            'research_points': points.to_representation(sum((row.research_points for row in research), 0)),
+            'in_progress': [
+                {
+                    'technology_id': row.technology_id,
+                    'name': row.technology.name,
+                    'research_points': points.to_representation(row.research_points),
+                    'cost': cost.to_representation(row.technology.cost),
+                }
+                for row in research if not row.is_complete
+            ],
+        },
+    }
+
+
+def get_dashboard(game, empire_id, version):
+    """Get an empire's dashboard, building it on a cache miss.
+
+    Args:
+        game (Game): The game the empire belongs to
+        empire_id (int): The empire ID
+        version (str): The game's version ETag, used as the cache key
+
+    Returns:
+        dict: The dashboard data
+
+    Raises:
+        Empire.DoesNotExist: If the empire is not part of the game
+    """
+    key = dashboard_cache_key(version, empire_id)
+    data = cache.get(key)
+    if data is not None:
+        return data
+    empire = Empire.objects.select_related('player', 'race').get(pk=empire_id, game=game)
+    data = build_dashboard(empire)
+    data['turn'] = game.turn
+    timeout = getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', DEFAULT_DASHBOARD_CACHE_TIMEOUT)
+    cache.set(key, data, timeout)
+    return data
@@ -0,0 +1,66 @@
+"""Resource economy rules for the space conquest game.
+
+This module holds the production and storage rules shared by every part of
+the game that needs them, so that API summaries and turn processing can't
+drift apart:
+
+- Summing production over planets and asteroid belts
+- Summing storage capacity over planets
+- Capping storage at capacity
+
+The functions work on any objects with the model attribute names (model
+instances, lightweight records) and don't touch the database.
+"""
+
+from decimal import Decimal
+
+RESOURCES = ('mineral', 'organic', 'radioactive', 'exotic')
+
+
+def total_production(bodies):
+    """Sum the per-turn production of planets and asteroid belts.
+
+    Args:
+        bodies (Iterable): Objects with ``<resource>_production`` attributes
+
+    Returns:
+        dict: Total production keyed by resource name
+    """
+    totals = dict.fromkeys(RESOURCES, Decimal('0'))
+    for body in bodies:
+        for resource in RESOURCES:
+            totals[resource] += getattr(body, f'{resource}_production')
+    return totals
+
+
+def total_capacity(planets):
+    """Sum the storage capacity of planets.
+
+    Args:
+        planets (Iterable): Objects with ``<resource>_storage_capacity`` attributes
+
+    Returns:
+        dict: Total capacity keyed by resource name
+    """
+    totals = dict.fromkeys(RESOURCES, Decimal('0'))
+    for planet in planets:
+        for resource in RESOURCES:
+            totals[resource] += getattr(planet, f'{resource}_storage_capacity')
+    return totals
+
+
+def next_storage(storage, production, capacity):
+    """Calculate storage after one turn of production, capped at capacity.
+
+    Args:
+        storage (dict): Current storage keyed by resource name
+        production (dict): Production per turn keyed by resource name
+        capacity (dict): Storage capacity keyed by resource name
+
+    Returns:
+        dict: New storage keyed by resource name
+    """
+    return {
+        resource: min(storage[resource] + production[resource], capacity[resource])
+        for resource in RESOURCES
+    }
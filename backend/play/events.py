@@ -0,0 +1,365 @@
+"""Server push of game events over Server-Sent Events.
+
+This module pushes turn-completed notifications to the clients of a game, so
+they don't need to poll for new turns:
+
+- Turn processing publishes a ``turn_completed`` event with the new turn and
+  the game's version ETag once its transaction commits
+- ``GET /api/games/{id}/events/`` is an async view that streams the game's
+  events as Server-Sent Events (``text/event-stream``)
+
+Events fan out through a pub/sub backend chosen with the
+``GAME_EVENTS_PUBSUB`` setting:
+
+- :class:`LocalPubSub` delivers to the subscribers of the current process.
+  It is enough when turns are only ended through the API of the process
+  serving the streams
+- :class:`PostgresPubSub` sends events with PostgreSQL ``NOTIFY``, so turns
+  processed by ``run_turn_scheduler``, ``run_turn_worker`` or another web
+  process reach the streams of every process. Timed games need it, or
+  another backend with the same ``publish`` and ``subscribe`` methods
+
+The stream is only served incrementally under an ASGI server (e.g.
+``uvicorn spacegame.asgi:application``). WSGI servers such as ``runserver``
+would buffer an endless async stream, so under WSGI the view sends the
+current turn and asks the client to reconnect after a delay instead.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections, transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.module_loading import import_string
+from .models import Game
+from .versioning import game_etag
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GAME_EVENTS_PUBSUB = 'play.events.LocalPubSub'
+
+DEFAULT_GAME_EVENTS_HEARTBEAT = 15
+
+SUBSCRIPTION_QUEUE_SIZE = 100
+
+WSGI_RECONNECT_DELAY_MS = 5000
+
+# PostgreSQL channel carrying the events of every game
+NOTIFY_CHANNEL = 'game_events'
+
+# Seconds before a listener that lost its database connection reconnects
+LISTEN_RETRY_SECONDS = 5
+
+
+class Subscription:
+    """A subscriber's queue of messages on one channel.
+
+    Messages are delivered on the event loop that created the subscription.
+    When a slow subscriber's queue is full, its oldest message is dropped.
+    """
+
+    def __init__(self, pubsub, channel):
+        self.pubsub = pubsub
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(SUBSCRIPTION_QUEUE_SIZE)
+
+    def deliver(self, message):
+        """Queue a message, from any thread."""
+        self.loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message):
+        """Queue a message on the subscription's event loop."""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout=None):
+        """Wait for the next message.
+
+        Args:
+            timeout (float): Seconds to wait
+
+        Returns:
+            dict: The message, or None if the timeout passed
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        """Stop receiving messages."""
+        self.pubsub.unsubscribe(self)
+
+
+class LocalPubSub:
+    """In-process pub/sub with channels.
+
+    A stand-in for an external pub/sub service: messages published in this
+    process reach the subscribers in this process only.
+    """
+
+    cross_process = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+
+    def subscribe(self, channel):
+        """Subscribe to a channel from a running event loop.
+
+        Args:
+            channel (str): The channel name
+
+        Returns:
+            Subscription: The subscription
+        """
+        subscription = Subscription(self, channel)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Remove a subscription."""
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.channel, None)
+
+    def subscriber_count(self, channel):
+        """Get the number of subscribers of a channel."""
+        with self._lock:
+            return len(self._subscriptions.get(channel, ()))
+
+    def publish(self, channel, message):
+        """Deliver a message to every subscriber of a channel.
+
+        Args:
+            channel (str): The channel name
+            message (dict): The message
+
+        Returns:
+            int: Number of subscribers the message was delivered to
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        delivered = 0
+        for subscription in subscriptions:
+            try:
+                subscription.deliver(message)
+                delivered += 1
+            except RuntimeError:
+                # The subscriber's event loop is closed
+                self.unsubscribe(subscription)
+        return delivered
+
+
+class PostgresPubSub(LocalPubSub):
+    """Pub/sub across processes with PostgreSQL ``LISTEN``/``NOTIFY``.
+
+    Messages are sent with ``pg_notify`` on the default database. The first
+    subscription of a process starts a thread that listens on its own
+    connection and delivers the notifications to the subscribers of the
+    process. Notifications sent while the listener reconnects are lost;
+    streams get the current turn again when their client reconnects.
+    """
+
+    cross_process = True
+
+    def __init__(self):
+        super().__init__()
+        self._listener = None
+
+    def subscribe(self, channel):
+        """Subscribe to a channel from a running event loop.
+
+        Args:
+            channel (str): The channel name
+
+        Returns:
+            Subscription: The subscription
+        """
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name='game-events', daemon=True)
+                self._listener.start()
+        return super().subscribe(channel)
+
+    def publish(self, channel, message):
+        """Send a message to the subscribers of a channel in every process.
+
+        Args:
+            channel (str): The channel name
+            message (dict): The message
+
+        Returns:
+            int: 0, as the subscribers of other processes aren't counted
+        """
+        payload = json.dumps({'channel': channel, 'message': message})
+        with connections['default'].cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [NOTIFY_CHANNEL, payload])
+        return 0
+
+    def deliver_notification(self, payload):
+        """Deliver a notification to the subscribers of this process.
+
+        Args:
+            payload (str): The notification payload sent by :meth:`publish`
+
+        Returns:
+            int: Number of subscribers the message was delivered to
+        """
+        notification = json.loads(payload)
+        return super().publish(notification['channel'], notification['message'])
+
+    def _listen(self):
+        """Deliver notifications until the process exits, reconnecting on errors."""
+        # Only needed with PostgreSQL databases
+        import psycopg
+        params = connections['default'].get_connection_params()
+        while True:
+            try:
+                with psycopg.connect(**params, autocommit=True) as connection:
+                    connection.execute(f'LISTEN {NOTIFY_CHANNEL}')
+                    for notification in connection.notifies():
+                        self.deliver_notification(notification.payload)
+            except Exception:
+                logger.exception('Game event listener lost its database connection')
+            time.sleep(LISTEN_RETRY_SECONDS)
+
+
+_pubsub = None
+_pubsub_lock = threading.Lock()
+
+
+def get_pubsub():
+    """Get the process-wide pub/sub backend configured by ``GAME_EVENTS_PUBSUB``."""
+    global _pubsub
+    with _pubsub_lock:
+        if _pubsub is None:
+            _pubsub = import_string(
+                getattr(settings, 'GAME_EVENTS_PUBSUB', DEFAULT_GAME_EVENTS_PUBSUB)
+            )()
+        return _pubsub
+
+
+def local_pubsub_warning():
+    """Explain why events published by this process may not reach any stream.
+
+    Turn processes such as the scheduler don't serve event streams, so
+    their events only reach clients through a cross-process backend.
+
+    Returns:
+        str: The warning, or None if the backend delivers across processes
+    """
+    pubsub = get_pubsub()
+    if pubsub.cross_process:
+        return None
+    return (
+        f'GAME_EVENTS_PUBSUB is {type(pubsub).__name__}, which only delivers to this process: '
+        'event streams will not get the turns processed here. Use play.events.PostgresPubSub'
+    )
+
+
+def game_channel(game_id):
+    """Get the pub/sub channel of a game's events."""
+    return f'game:{game_id}'
+
+
+def turn_completed_event(game_id):
+    """Build the turn-completed event for a game's current state.
+
+    Args:
+        game_id (int): The game ID
+
+    Returns:
+        dict: The event, or None if the game doesn't exist
+    """
+    turn = Game.objects.filter(pk=game_id).values_list('turn', flat=True).first()
+    if turn is None:
+        return None
+    return {'event': 'turn_completed', 'game': game_id, 'turn': turn, 'version': game_etag(game_id)}
+
+
+def publish_turn_completed(game_id):
+    """Notify the subscribers of a game that a turn was processed.
+
+    Publishes once the current transaction commits, so subscribers that
+    re-fetch the game see the new turn.
+
+    Args:
+        game_id (int): The game ID
+    """
+    def publish():
+        event = turn_completed_event(game_id)
+        if event is not None:
+            delivered = get_pubsub().publish(game_channel(game_id), event)
+            logger.debug(f"Published turn {event['turn']} of game {game_id} to {delivered} subscribers")
+
+    transaction.on_commit(publish)
+
+
+def format_event(message):
+    """Format a message as a Server-Sent Event.
+
+    Args:
+        message (dict): The message, with its type in ``event``
+
+    Returns:
+        str: The event in ``text/event-stream`` format
+    """
+    return f"event: {message['event']}\ndata: {json.dumps(message)}\n\n"
+
+
+async def game_events(request, game_id):
+    """Stream the events of a game as Server-Sent Events.
+
+    The stream starts with a ``turn_completed`` event for the current turn,
+    so clients can check their state on (re)connect, then pushes an event
+    for every processed turn. Comment lines are sent as heartbeats.
+
+    Args:
+        request: The HTTP request
+        game_id (int): The game ID
+
+    Returns:
+        StreamingHttpResponse: The event stream, the current turn with a
+        reconnect delay under WSGI, or 404 if the game doesn't exist
+    """
+    if not await Game.objects.filter(pk=game_id).aexists():
+        return JsonResponse({'error': 'Game not found'}, status=404)
+    if not isinstance(request, ASGIRequest):
+        current = await sync_to_async(turn_completed_event)(game_id)
+        response = HttpResponse(
+            f'retry: {WSGI_RECONNECT_DELAY_MS}\n' + format_event(current),
+            content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        return response
+    heartbeat = getattr(settings, 'GAME_EVENTS_HEARTBEAT', DEFAULT_GAME_EVENTS_HEARTBEAT)
+
+    async def stream():
+        # Subscribe before reading the current turn, so no turn is missed
+        subscription = get_pubsub().subscribe(game_channel(game_id))
+        try:
+            current = await sync_to_async(turn_completed_event)(game_id)
+            if current is None:
+                return
+            yield format_event(current)
+            while True:
+                message = await subscription.get(heartbeat)
+                yield ': heartbeat\n\n' if message is None else format_event(message)
+        finally:
+            subscription.close()
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
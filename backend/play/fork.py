@@ -0,0 +1,127 @@
+"""Game forking for the space conquest game.
+
+A fork is a new game that starts as a copy of another game at its current
+turn, for what-if branches played by players or evaluated by the AI. The
+copy is made in the database with one ``INSERT ... SELECT`` per table, so no
+row is loaded into Python however large the galaxy is.
+
+IDs are remapped by offsetting: the copies of a table's rows get their IDs
+shifted past the table's current maximum, and foreign keys to copied tables
+are shifted by the same offset. On PostgreSQL each table is locked against
+concurrent inserts while it's copied, and ID sequences are moved past the
+copies afterwards.
+
+Forks don't copy the source game's change log or turn snapshots; the fork's
+first processed turn records a keyframe.
+"""
+
+import logging
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from celestial.models import Planet, AsteroidBelt, System, Star
+from research.models import EmpireTechnology
+from .models import Player, Empire, Game
+
+logger = logging.getLogger(__name__)
+
+
+def fork_steps():
+    """Get the copied tables of a game, in insert order.
+
+    Every ``WHERE`` clause selects the rows of the source game and takes its
+    ID for each ``%s`` placeholder.
+
+    Returns:
+        list: ``(model, where, {foreign key column: referenced model})`` tuples
+    """
+    empire = Empire._meta.db_table
+    system = System._meta.db_table
+    return [
+        (Player, f'id IN (SELECT player_id FROM {empire} WHERE game_id = %s)', {}),
+        (Star, f'id IN (SELECT star_id FROM {system} WHERE game_id = %s)', {}),
+        (System, 'game_id = %s', {'star_id': Star}),
+        (Empire, 'game_id = %s', {'player_id': Player}),
+        (Planet, f'system_id IN (SELECT id FROM {system} WHERE game_id = %s)',
+         {'system_id': System, 'empire_id': Empire}),
+        (AsteroidBelt, f'system_id IN (SELECT id FROM {system} WHERE game_id = %s)',
+         {'system_id': System, 'empire_id': Empire}),
+        (EmpireTechnology, f'empire_id IN (SELECT id FROM {empire} WHERE game_id = %s)',
+         {'empire_id': Empire}),
+    ]
+
+
+def _id_offset(cursor, model, where, game_id):
+    """Get the shift that moves a game's rows of a table past the table's last ID."""
+    table = connection.ops.quote_name(model._meta.db_table)
+    cursor.execute(
+        f'SELECT (SELECT COALESCE(MAX(id), 0) FROM {table}) - MIN(id) + 1 FROM {table} WHERE {where}',
+        [game_id]
+    )
+    return cursor.fetchone()[0] or 0
+
+
+def _copy_sql(model, where, references):
+    """Build the ``INSERT ... SELECT`` that copies a game's rows of a table.
+
+    Placeholders are, in order: the table's ID offset, the offset of each
+    referenced table, the new game ID if the table has a game column, and
+    the source game ID.
+    """
+    quote = connection.ops.quote_name
+    columns, values = [], []
+    for field in model._meta.concrete_fields:
+        column = field.column
+        columns.append(quote(column))
+        if column == 'id' or column in references:
+            values.append(f'{quote(column)} + %s')
+        elif column == 'game_id':
+            values.append('%s')
+        else:
+            values.append(quote(column))
+    return (
+        f'INSERT INTO {quote(model._meta.db_table)} ({", ".join(columns)}) '
+        f'SELECT {", ".join(values)} FROM {quote(model._meta.db_table)} WHERE {where}'
+    )
+
+
+@transaction.atomic
+def fork_game(game):
+    """Copy a game at its current turn into a new game.
+
+    The new game's turn starts over: no empire has ended it yet, and its
+    deadline is a full turn duration away.
+
+    Args:
+        game (Game): The source game
+
+    Returns:
+        Game: The new game
+    """
+    fork = Game(turn=game.turn, turn_duration=game.turn_duration)
+    fork.turn_deadline = fork.next_turn_deadline()
+    fork.save()
+    offsets = {}
+    copied = {}
+    with connection.cursor() as cursor:
+        for model, where, references in fork_steps():
+            if connection.vendor == 'postgresql':
+                # Keep concurrent inserts out of the ID range being copied into
+                cursor.execute(
+                    f'LOCK TABLE {connection.ops.quote_name(model._meta.db_table)} IN SHARE ROW EXCLUSIVE MODE'
+                )
+            offsets[model] = _id_offset(cursor, model, where, game.id)
+            params = []
+            for field in model._meta.concrete_fields:
+                if field.column == 'id':
+                    params.append(offsets[model])
+                elif field.column in references:
+                    params.append(offsets[references[field.column]])
+                elif field.column == 'game_id':
+                    params.append(fork.id)
+            cursor.execute(_copy_sql(model, where, references), params + [game.id])
+            copied[model._meta.label] = cursor.rowcount
+        for sql in connection.ops.sequence_reset_sql(no_style(), [model for model, _, _ in fork_steps()]):
+            cursor.execute(sql)
+    Empire.objects.filter(game=fork).update(ready_turn=None)
+    logger.info(f"Forked game {game.id} at turn {game.turn} into game {fork.id}: {copied}")
+    return fork
@@ -0,0 +1,104 @@
+"""Galaxy generation rules for the space conquest game.
+
+This module holds the shape of a new galaxy, shared by game setup
+(:mod:`play.start`) and the headless simulator (:mod:`play.simulation`), so
+that simulated games start exactly like live ones:
+
+- Galaxy sizes and their system counts
+- System placement
+- The planet and asteroid belt of every new system
+
+It doesn't touch the database.
+"""
+
+from enum import Enum
+
+
+class GalaxySize(str, Enum):
+    """Enumeration of available galaxy sizes and their properties.
+
+    Each size determines the number of star systems in the galaxy:
+    - TINY: 2 systems
+    - SMALL: 5 systems
+    - MEDIUM: 10 systems
+    - LARGE: 15 systems
+    """
+    TINY = "tiny"
+    SMALL = "small"
+    MEDIUM = "medium"
+    LARGE = "large"
+
+    @classmethod
+    def choices(cls):
+        """Get list of valid galaxy size choices.
+
+        Returns:
+            list: List of valid galaxy size values
+        """
+        return [size.value for size in cls]
+
+    @property
+    def system_count(self):
+        """Get the number of star systems for this galaxy size.
+
+        Returns:
+            int: Number of star systems
+        """
+        return GALAXY_SIZE_SYSTEM_COUNTS[self]
+
+# Move system counts to a separate dict to keep the enum clean
+GALAXY_SIZE_SYSTEM_COUNTS = {
+    GalaxySize.TINY: 2,
+    GalaxySize.SMALL: 5,
+    GalaxySize.MEDIUM: 10,
+    GalaxySize.LARGE: 15
+}
+
+# The terran planet in orbit 1 of every new system
+TERRAN_PLANET = {
+    'orbit': 1,
+    'mineral_production': 75,
+    'organic_production': 75,
+    'radioactive_production': 25,
+    'exotic_production': 25,
+    'mineral_storage_capacity': 150,
+    'organic_storage_capacity': 150,
+    'radioactive_storage_capacity': 100,
+    'exotic_storage_capacity': 100,
+}
+
+# The asteroid belt in orbit 2 of every new system
+ASTEROID_BELT = {
+    'orbit': 2,
+    'mineral_production': 100,
+    'organic_production': 25,
+    'radioactive_production': 75,
+    'exotic_production': 50,
+}
+
+
+def system_coordinates(index):
+    """Get the position of the n-th system of a galaxy.
+
+    Uses a simple placement with fixed spacing along the diagonal.
+
+    Args:
+        index (int): The system's index, starting at 0
+
+    Returns:
+        tuple: ``(x, y)`` coordinates
+    """
+    return index * 2, index * 2
+
+
+def colony_count(empire_count, system_count):
+    """Get the number of systems a galaxy needs so every empire gets a colony.
+
+    Args:
+        empire_count (int): Number of empires
+        system_count (int): Number of systems of the galaxy size
+
+    Returns:
+        int: Number of systems to create
+    """
+    return max(empire_count, system_count)
@@ -0,0 +1,239 @@
+"""Per-turn snapshots and rewind for the space conquest game.
+
+At the end of each turn, :func:`record_turn_snapshot` stores the game's
+mutable state as :model:`play.TurnSnapshot` rows:
+
+- empire storage
+- planet and asteroid belt owners
+- research points
+
+Snapshots are copy-on-write deltas. Each one holds only the rows that the
+game's change log (see :mod:`play.changes`) lists as changed since the
+previous snapshot, written with a single INSERT, so a turn costs the same
+however large the galaxy is. Every ``GAME_SNAPSHOT_KEYFRAME_INTERVAL`` turns,
+and whenever the change log no longer covers the previous snapshot, a
+keyframe with every row is written instead, which bounds the number of
+deltas a rewind reads.
+
+:func:`rewind_game` restores the state recorded for an earlier turn by
+folding the deltas since the last keyframe, and writes only the rows whose
+values differ. Rows created after that turn keep their current values.
+"""
+
+import logging
+from django.conf import settings
+from django.db import transaction
+from celestial.bulk import reassign_owners
+from celestial.models import Planet, AsteroidBelt
+from research.models import EmpireTechnology
+from .changes import change_log_horizon
+from .economy import RESOURCES
+from .events import publish_turn_completed
+from .models import Empire, GameChange, Order, TurnSnapshot
+from .versioning import deferred_version_bumps, record_changes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_KEYFRAME_INTERVAL = 20
+
+STORAGE_FIELDS = [f'{resource}_storage' for resource in RESOURCES]
+
+
+class RewindError(ValueError):
+    """Raised when a game can't be rewound to the requested turn."""
+
+
+def keyframe_interval():
+    """Get the number of turns between full snapshots.
+
+    Returns:
+        int: The keyframe interval in turns
+    """
+    return getattr(settings, 'GAME_SNAPSHOT_KEYFRAME_INTERVAL', DEFAULT_SNAPSHOT_KEYFRAME_INTERVAL)
+
+
+def _storage_values(storage):
+    """Convert an empire's storage amounts to their stored integers."""
+    fields = [Empire._meta.get_field(name) for name in STORAGE_FIELDS]
+    return [field.get_prep_value(value) for field, value in zip(fields, storage)]
+
+
+def _storage_amounts(values):
+    """Convert stored storage integers back to amounts."""
+    fields = [Empire._meta.get_field(name) for name in STORAGE_FIELDS]
+    return [field.from_db_value(value, None, None) for field, value in zip(fields, values)]
+
+
+def capture_state(game, changed=None):
+    """Read the snapshotted state of a game.
+
+    Args:
+        game (Game): The game
+        changed (dict): IDs of the rows to read by change kind, or None for every row
+
+    Returns:
+        dict: Snapshot data with ``empires``, ``planets``, ``asteroid_belts``
+        and ``research`` maps keyed by row ID
+    """
+    def rows(queryset, kind):
+        if changed is None:
+            return queryset
+        return queryset.filter(pk__in=changed[kind]) if changed[kind] else queryset.none()
+
+    empires = rows(Empire.objects.filter(game=game), GameChange.Kind.EMPIRE)
+    planets = rows(Planet.objects.filter(system__game=game), GameChange.Kind.PLANET)
+    belts = rows(AsteroidBelt.objects.filter(system__game=game), GameChange.Kind.ASTEROID_BELT)
+    research = rows(EmpireTechnology.objects.filter(empire__game=game), GameChange.Kind.RESEARCH)
+    return {
+        'empires': {
+            str(pk): _storage_values(storage)
+            for pk, *storage in empires.values_list('pk', *STORAGE_FIELDS)
+        },
+        'planets': {str(pk): owner for pk, owner in planets.values_list('pk', 'empire_id')},
+        'asteroid_belts': {str(pk): owner for pk, owner in belts.values_list('pk', 'empire_id')},
+        'research': {
+            str(pk): str(points) for pk, points in research.values_list('pk', 'research_points')
+        },
+    }
+
+
+def record_turn_snapshot(game):
+    """Snapshot the state of a game at the start of its current turn.
+
+    Args:
+        game (Game): The game, after its turn counter was advanced
+
+    Returns:
+        TurnSnapshot: The new snapshot
+    """
+    previous = TurnSnapshot.objects.filter(game=game, turn__lt=game.turn).order_by('-turn').values_list(
+        'turn', flat=True
+    ).first()
+    last_keyframe = TurnSnapshot.objects.filter(game=game, turn__lt=game.turn, full=True).order_by(
+        '-turn'
+    ).values_list('turn', flat=True).first()
+    full = (
+        previous is None
+        or last_keyframe is None
+        or game.turn - last_keyframe >= keyframe_interval()
+        # The change log no longer lists everything since the previous snapshot
+        or previous <= game.turn - change_log_horizon()
+    )
+    if full:
+        data = capture_state(game)
+    else:
+        # Changes made during the previous snapshot's turn are stamped with it
+        changed = {kind: set() for kind in GameChange.Kind.values}
+        for kind, object_id in GameChange.objects.filter(
+            game=game, turn__gte=previous
+        ).values_list('kind', 'object_id'):
+            changed[kind].add(object_id)
+        data = capture_state(game, changed)
+
+    # A rewound game replays turns it had already played
+    TurnSnapshot.objects.filter(game=game, turn__gte=game.turn).delete()
+    snapshot = TurnSnapshot.objects.create(game=game, turn=game.turn, full=full, data=data)
+    logger.debug(
+        f"Recorded {'keyframe' if full else 'delta'} snapshot of game {game.id} turn {game.turn}: "
+        f"{sum(len(rows) for rows in data.values())} rows"
+    )
+    return snapshot
+
+
+def state_at(game, turn):
+    """Rebuild the snapshotted state of a game at the start of a turn.
+
+    Args:
+        game (Game): The game
+        turn (int): The turn
+
+    Returns:
+        dict: Snapshot data with every row recorded up to the turn
+
+    Raises:
+        RewindError: If no snapshot covers the turn
+    """
+    if turn > game.turn:
+        raise RewindError(f'Turn {turn} has not been played yet')
+    keyframe = TurnSnapshot.objects.filter(game=game, turn__lte=turn, full=True).order_by(
+        '-turn'
+    ).values_list('turn', flat=True).first()
+    snapshots = list(TurnSnapshot.objects.filter(
+        game=game, turn__gte=keyframe or 0, turn__lte=turn
+    ).order_by('turn').values_list('turn', 'data'))
+    if keyframe is None or snapshots[-1][0] != turn:
+        raise RewindError(f'No snapshot of turn {turn}')
+    state = {'empires': {}, 'planets': {}, 'asteroid_belts': {}, 'research': {}}
+    for _, data in snapshots:
+        for name, rows in data.items():
+            state[name].update(rows)
+    return state
+
+
+@transaction.atomic
+def rewind_game(game, turn):
+    """Restore a game to the start of an earlier turn.
+
+    Empire storage, body owners and research points are restored and the
+    turn counter is set back. Snapshots and change log entries of later
+    turns are discarded, and so are pending orders. Every empire has to end
+    the restored turn again, and its deadline restarts.
+
+    Args:
+        game (Game): The game
+        turn (int): The turn to rewind to
+
+    Returns:
+        Game: The rewound game
+
+    Raises:
+        RewindError: If no snapshot covers the turn
+    """
+    state = state_at(game, turn)
+    empire_ids = set(Empire.objects.filter(game=game).values_list('pk', flat=True))
+
+    with deferred_version_bumps():
+        game.turn = turn
+        game.turn_deadline = game.next_turn_deadline()
+        game.save()
+        Empire.objects.filter(game=game).update(ready_turn=None)
+
+        empires = []
+        for pk, *storage in Empire.objects.filter(
+            game=game, pk__in=[int(pk) for pk in state['empires']]
+        ).values_list('pk', *STORAGE_FIELDS):
+            restored = _storage_amounts(state['empires'][str(pk)])
+            if list(storage) != restored:
+                empires.append(Empire(pk=pk, **dict(zip(STORAGE_FIELDS, restored))))
+        Empire.objects.bulk_update(empires, STORAGE_FIELDS)
+        record_changes(game.id, GameChange.Kind.EMPIRE, [empire.pk for empire in empires])
+
+        for name, model in (('planets', Planet), ('asteroid_belts', AsteroidBelt)):
+            existing = set(model.objects.filter(
+                system__game=game, pk__in=[int(pk) for pk in state[name]]
+            ).values_list('pk', flat=True))
+            reassign_owners(model, {
+                int(pk): owner if owner in empire_ids else None
+                for pk, owner in state[name].items() if int(pk) in existing
+            })
+
+        research = []
+        for technology in EmpireTechnology.objects.filter(
+            empire__game=game, pk__in=[int(pk) for pk in state['research']]
+        ).only('pk', 'research_points'):
+            restored = EmpireTechnology._meta.get_field('research_points').to_python(
+                state['research'][str(technology.pk)]
+            )
+            if technology.research_points != restored:
+                technology.research_points = restored
+                research.append(technology)
+        EmpireTechnology.objects.bulk_update(research, ['research_points'])
+        record_changes(game.id, GameChange.Kind.RESEARCH, [technology.pk for technology in research])
+
+        TurnSnapshot.objects.filter(game=game, turn__gt=turn).delete()
+        GameChange.objects.filter(game=game, turn__gt=turn).delete()
+        Order.objects.filter(game=game, turn__gte=turn).delete()
+
+    publish_turn_completed(game.id)
+    logger.info(f"Rewound game {game.id} to turn {turn}")
+    return game
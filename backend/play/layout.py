@@ -0,0 +1,190 @@
+"""Galaxy layout cache for the space conquest game.
+
+After a game has started, its systems, stars, orbits and body attributes
+only change through explicit celestial edits, while the owners of planets
+and asteroid belts change every turn. This module splits the serialized
+systems of a game into:
+
+- The layout: every system with its star, planets and asteroid belts, cached
+  per game in the Django cache until a celestial edit invalidates it. Saves
+  and deletes of systems, stars and bodies invalidate it through the
+  version bump (see :mod:`play.signals`); bulk writes call
+  :func:`invalidate_layout` themselves
+- The ownership overlay: the owner of each owned body, read fresh with a
+  single query on every request
+
+Any Django cache backend works (locmem, file, memcached, redis), since the
+layout is stored as plain lists and dicts.
+"""
+
+import logging
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Value, CharField
+from celestial.models import Planet, AsteroidBelt, System
+from celestial.serializers import SystemSerializer
+from .models import Game
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GALAXY_LAYOUT_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def layout_cache_key(game_id, created):
+    """Get the cache key of a game's galaxy layout.
+
+    The key includes the game's creation time, so a layout is never served
+    for a different game that reuses a deleted game's ID.
+
+    Args:
+        game_id (int): The game ID
+        created (datetime): The game's creation time
+
+    Returns:
+        str: The cache key
+    """
+    return f'play:layout:{game_id}:{int(created.timestamp() * 1000000)}'
+
+
+def build_layout(game_id):
+    """Serialize the systems of a game without their owners.
+
+    Args:
+        game_id (int): The game ID
+
+    Returns:
+        list: The serialized systems, with every ``empire`` set to None
+    """
+    return _render_layout(_layout_systems(game_id))
+
+
+async def abuild_layout(game_id):
+    """Async version of :func:`build_layout` using the async ORM."""
+    return _render_layout([system async for system in _layout_systems(game_id)])
+
+
+def _layout_systems(game_id):
+    """Get the systems of a game with everything the layout renders."""
+    return System.objects.filter(game_id=game_id).select_related('star').prefetch_related(
+        'planets', 'asteroid_belts'
+    ).order_by('id')
+
+
+def _render_layout(systems):
+    """Serialize systems and clear the owners of their bodies."""
+    layout = [dict(system) for system in SystemSerializer(systems, many=True).data]
+    for system in layout:
+        system['planets'] = [dict(planet, empire=None) for planet in system['planets']]
+        system['asteroid_belts'] = [dict(belt, empire=None) for belt in system['asteroid_belts']]
+    return layout
+
+
+def get_layout(game):
+    """Get the cached galaxy layout of a game, building it on a miss.
+
+    Args:
+        game (Game): The game
+
+    Returns:
+        list: The serialized systems, with every ``empire`` set to None
+    """
+    key = layout_cache_key(game.id, game.created)
+    layout = cache.get(key)
+    if layout is None:
+        logger.debug(f"Building galaxy layout for game {game.id}")
+        layout = build_layout(game.id)
+        cache.set(key, layout, _layout_timeout())
+    return layout
+
+
+async def aget_layout(game):
+    """Async version of :func:`get_layout`."""
+    key = layout_cache_key(game.id, game.created)
+    layout = await cache.aget(key)
+    if layout is None:
+        logger.debug(f"Building galaxy layout for game {game.id}")
+        layout = await abuild_layout(game.id)
+        await cache.aset(key, layout, _layout_timeout())
+    return layout
+
+
+def _layout_timeout():
+    """Get the seconds a galaxy layout stays cached."""
+    return getattr(settings, 'GALAXY_LAYOUT_CACHE_TIMEOUT', DEFAULT_GALAXY_LAYOUT_CACHE_TIMEOUT)
+
+
+def get_ownership(game_id):
+    """Get the owners of the owned planets and asteroid belts of a game.
+
+    Args:
+        game_id (int): The game ID
+
+    Returns:
+        dict: ``{'planet': {id: empire_id}, 'asteroid_belt': {id: empire_id}}``
+    """
+    owners = {'planet': {}, 'asteroid_belt': {}}
+    for kind, body_id, empire_id in _ownership_rows(game_id):
+        owners[kind][body_id] = empire_id
+    return owners
+
+
+async def aget_ownership(game_id):
+    """Async version of :func:`get_ownership`."""
+    owners = {'planet': {}, 'asteroid_belt': {}}
+    async for kind, body_id, empire_id in _ownership_rows(game_id):
+        owners[kind][body_id] = empire_id
+    return owners
+
+
+def _ownership_rows(game_id):
+    """Get ``(kind, id, empire_id)`` rows of a game's owned bodies in one query."""
+    planets = Planet.objects.filter(system__game_id=game_id, empire__isnull=False).annotate(
+        kind=Value('planet', output_field=CharField())
+    ).values_list('kind', 'id', 'empire_id')
+    belts = AsteroidBelt.objects.filter(system__game_id=game_id, empire__isnull=False).annotate(
+        kind=Value('asteroid_belt', output_field=CharField())
+    ).values_list('kind', 'id', 'empire_id')
+    return planets.union(belts, all=True)
+
+
+def get_systems(game):
+    """Get the serialized systems of a game with their current owners.
+
+    Args:
+        game (Game): The game
+
+    Returns:
+        list: The serialized systems, as rendered by SystemSerializer
+    """
+    return _overlay_owners(get_layout(game), get_ownership(game.id))
+
+
+async def aget_systems(game):
+    """Async version of :func:`get_systems`."""
+    return _overlay_owners(await aget_layout(game), await aget_ownership(game.id))
+
+
+def _overlay_owners(layout, owners):
+    """Set the current owner of every body of a layout."""
+    for system in layout:
+        for planet in system['planets']:
+            planet['empire'] = owners['planet'].get(planet['id'])
+        for belt in system['asteroid_belts']:
+            belt['empire'] = owners['asteroid_belt'].get(belt['id'])
+    return layout
+
+
+def invalidate_layout(game_ids):
+    """Drop the cached layouts of games after celestial edits.
+
+    Args:
+        game_ids (Iterable[int]): IDs of the edited games; None is ignored
+    """
+    game_ids = {game_id for game_id in game_ids if game_id is not None}
+    if not game_ids:
+        return
+    cache.delete_many([
+        layout_cache_key(game_id, created)
+        for game_id, created in Game.objects.filter(pk__in=game_ids).values_list('id', 'created')
+    ])
+
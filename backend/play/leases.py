@@ -0,0 +1,88 @@
+"""Database leases for sharing work between processes.
+
+A :class:`play.models.Lease` row names a piece of work and the process
+holding it until the lease expires. Taking, renewing and releasing a lease
+are single conditional statements, so any number of processes on any number
+of machines can compete for the same work safely:
+
+- :func:`acquire_lease` takes a free or expired lease, or renews one the
+  caller already holds
+- :func:`release_lease` gives a lease up before it expires
+- :func:`lease_holders` lists the live leases with a name prefix
+
+Expiry times come from the clock of the process taking the lease, so hosts
+sharing leases need clocks synchronized well within the lease duration.
+"""
+
+import os
+import socket
+import uuid
+from datetime import timedelta
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import Lease
+
+
+def lease_owner():
+    """Get a name identifying this process among lease holders.
+
+    Returns:
+        str: Host name, process ID and a random suffix
+    """
+    return f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+
+
+def acquire_lease(name, owner, seconds, now=None):
+    """Take or renew a lease.
+
+    Args:
+        name (str): What the lease covers
+        owner (str): The process taking the lease
+        seconds (float): How long the lease lasts
+        now (datetime): The current time, defaults to now
+
+    Returns:
+        bool: Whether the owner holds the lease now
+    """
+    now = now or timezone.now()
+    expires = now + timedelta(seconds=seconds)
+    if Lease.objects.filter(name=name).filter(Q(owner=owner) | Q(expires__lte=now)).update(
+        owner=owner, expires=expires
+    ):
+        return True
+    try:
+        with transaction.atomic():
+            Lease.objects.create(name=name, owner=owner, expires=expires)
+    except IntegrityError:
+        return False
+    return True
+
+
+def release_lease(name, owner):
+    """Give up a lease the owner holds.
+
+    Args:
+        name (str): What the lease covers
+        owner (str): The process holding the lease
+
+    Returns:
+        bool: Whether the owner held the lease
+    """
+    deleted, _ = Lease.objects.filter(name=name, owner=owner).delete()
+    return bool(deleted)
+
+
+def lease_holders(prefix, now=None):
+    """Get the holders of the live leases whose names start with a prefix.
+
+    Args:
+        prefix (str): The name prefix
+        now (datetime): The current time, defaults to now
+
+    Returns:
+        dict: Owners by lease name
+    """
+    return dict(Lease.objects.filter(
+        name__startswith=prefix, expires__gt=now or timezone.now()
+    ).values_list('name', 'owner'))
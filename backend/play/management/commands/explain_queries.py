@@ -0,0 +1,114 @@
+"""Check the query plans of the hot game queries for sequential scans.
+
+Usage::
+
+    python manage.py explain_queries [--game ID] [--verbose] [--fail-on-scan]
+
+Runs ``EXPLAIN`` on each hot query of the game API and turn processing and
+flags plans that read a whole table instead of using an index. On PostgreSQL
+the plans are built with ``enable_seqscan`` off, so small development tables
+don't hide a missing index; a query that still gets a ``Seq Scan`` has no
+usable index. On SQLite, full table ``SCAN`` steps are flagged.
+"""
+
+import re
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Sum
+from celestial.models import Planet, AsteroidBelt, System
+from research.models import EmpireTechnology
+from play.models import Empire, Game, GameChange
+
+# Plan steps that read every row of a table, by database vendor
+SCAN_PATTERNS = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'sqlite': re.compile(r'\bSCAN (\w+)(?! USING)(?!\w)'),
+}
+
+PRODUCTION_FIELDS = [
+    'mineral_production', 'organic_production', 'radioactive_production', 'exotic_production'
+]
+
+
+def hot_queries(game_id, empire_id, system_id, technology_id):
+    """Build the hot queries of a game.
+
+    Args:
+        game_id (int): The game ID
+        empire_id (int): An empire of the game
+        system_id (int): A system of the game
+        technology_id (int): A technology
+
+    Returns:
+        list: ``(name, queryset)`` pairs
+    """
+    return [
+        ('systems of game', System.objects.filter(game_id=game_id).order_by('id')),
+        ('empires of game', Empire.objects.filter(game_id=game_id)),
+        ('planets of empire', Planet.objects.filter(empire_id=empire_id)),
+        ('planet production of empire', Planet.objects.filter(empire_id=empire_id).values(
+            'empire_id').annotate(**{field: Sum(field) for field in PRODUCTION_FIELDS})),
+        ('planet in orbit', Planet.objects.filter(system_id=system_id, orbit=1)),
+        ('asteroid belts of empire', AsteroidBelt.objects.filter(empire_id=empire_id)),
+        ('asteroid belt production of empire', AsteroidBelt.objects.filter(empire_id=empire_id).values(
+            'empire_id').annotate(**{field: Sum(field) for field in PRODUCTION_FIELDS})),
+        ('asteroid belt in orbit', AsteroidBelt.objects.filter(system_id=system_id, orbit=1)),
+        ('research of empire', EmpireTechnology.objects.filter(empire_id=empire_id)),
+        ('research of empire technology', EmpireTechnology.objects.filter(
+            empire_id=empire_id, technology_id=technology_id)),
+        ('changes since turn', GameChange.objects.filter(game_id=game_id, turn__gt=0)),
+    ]
+
+
+def sequential_scans(plan, vendor=None):
+    """Find the tables a query plan reads in full.
+
+    Args:
+        plan (str): The ``EXPLAIN`` output
+        vendor (str): The database vendor, defaults to the connection's
+
+    Returns:
+        list: Names of the scanned tables
+    """
+    pattern = SCAN_PATTERNS.get(vendor or connection.vendor)
+    return pattern.findall(plan) if pattern else []
+
+
+class Command(BaseCommand):
+    help = 'Run EXPLAIN on the hot game queries and flag sequential scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--game', type=int, help='Game whose rows the queries look up')
+        parser.add_argument('--verbose', action='store_true', help='Print every query plan')
+        parser.add_argument('--fail-on-scan', action='store_true',
+                            help='Exit with an error if any query scans a table')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in SCAN_PATTERNS:
+            raise CommandError(f'Sequential scan detection is not supported on {connection.vendor}')
+        game_id = options['game'] or Game.objects.values_list('id', flat=True).first() or 1
+        empire_id = Empire.objects.filter(game_id=game_id).values_list('id', flat=True).first() or 1
+        system_id = System.objects.filter(game_id=game_id).values_list('id', flat=True).first() or 1
+        technology_id = EmpireTechnology.objects.filter(empire_id=empire_id).values_list(
+            'technology_id', flat=True
+        ).first() or 1
+
+        flagged = []
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            for name, queryset in hot_queries(game_id, empire_id, system_id, technology_id):
+                plan = queryset.explain()
+                scans = sequential_scans(plan)
+                if scans:
+                    flagged.append(name)
+                    self.stdout.write(self.style.WARNING(f"SEQ SCAN  {name}: {', '.join(scans)}"))
+                else:
+                    self.stdout.write(f'index     {name}')
+                if options['verbose'] or scans:
+                    self.stdout.write(f'    {plan}'.replace('\n', '\n    '))
+
+        if flagged and options['fail_on_scan']:
+            raise CommandError(f'{len(flagged)} queries scan a table: {", ".join(flagged)}')
+        self.stdout.write(f'{len(flagged)} of {len(hot_queries(0, 0, 0, 0))} queries scan a table')
@@ -0,0 +1,184 @@
+"""Load test the sync and async read endpoints of a running server.
+
+Usage::
+
+    uvicorn spacegame.asgi:application --workers 1 &
+    python manage.py load_test_reads --base-url http://127.0.0.1:8000 --concurrency 200
+
+Issues the same mix of game reads against the sync viewsets under ``/api/``
+and the async views under ``/api/async/`` with many concurrent clients, and
+reports throughput, latency percentiles and errors for each. ``--slow-client``
+holds every connection open for a while before reading the response, the
+way slow mobile clients do; sync workers stay blocked for the whole time
+while an async worker keeps serving other requests.
+"""
+
+import json
+import math
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from urllib.request import urlopen
+from django.core.management.base import BaseCommand, CommandError
+
+PREFIXES = {'sync': '/api/', 'async': '/api/async/'}
+
+
+def read_paths(game_id, empire_id):
+    """Get the read endpoints exercised by the load test, relative to the API prefix."""
+    paths = [
+        'games/', f'games/{game_id}/', f'games/{game_id}/systems/',
+        f'games/{game_id}/empires/', 'technologies/',
+    ]
+    if empire_id is not None:
+        paths += [f'empires/{empire_id}/planets/', f'empires/{empire_id}/asteroid-belts/']
+    return paths
+
+
+def percentile(values, fraction):
+    """Get a percentile of a list of numbers by the nearest-rank method."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(latencies, errors, elapsed):
+    """Summarize one load test run.
+
+    Args:
+        latencies (list): Seconds taken by each successful request
+        errors (int): Number of failed requests
+        elapsed (float): Wall-clock seconds of the run
+
+    Returns:
+        dict: Request count, errors, requests per second and latency percentiles in ms
+    """
+    requests = len(latencies) + errors
+    return {
+        'requests': requests,
+        'errors': errors,
+        'rps': requests / elapsed if elapsed else 0.0,
+        'p50': percentile(latencies, 0.5) * 1000,
+        'p95': percentile(latencies, 0.95) * 1000,
+        'max': max(latencies, default=0.0) * 1000,
+    }
+
+
+def fetch(url, timeout, slow_client=0.0):
+    """GET a URL and read the full response.
+
+    With ``slow_client`` the request is sent over a raw socket and the
+    response is read only after the delay, keeping the connection open.
+
+    Returns:
+        float: Seconds taken
+
+    Raises:
+        OSError: If the request fails or returns an error status
+    """
+    start = time.monotonic()
+    if not slow_client:
+        with urlopen(url, timeout=timeout) as response:
+            response.read()
+        return time.monotonic() - start
+
+    parts = urlsplit(url)
+    path = parts.path + (f'?{parts.query}' if parts.query else '')
+    with socket.create_connection((parts.hostname, parts.port or 80), timeout=timeout) as conn:
+        conn.sendall(
+            f'GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\nConnection: close\r\n\r\n'.encode('ascii')
+        )
+        time.sleep(slow_client)
+        response = b''
+        while chunk := conn.recv(65536):
+            response += chunk
+    status = response.split(b' ', 2)[1:2]
+    if status != [b'200']:
+        raise OSError(f'Unexpected response status {status}')
+    return time.monotonic() - start
+
+
+def run_load(urls, total, concurrency, timeout, slow_client=0.0):
+    """Request URLs round-robin from concurrent clients.
+
+    Args:
+        urls (list): URLs to request
+        total (int): Number of requests
+        concurrency (int): Number of concurrent clients
+        timeout (float): Seconds before a request fails
+        slow_client (float): Seconds each client holds its connection
+
+    Returns:
+        dict: The run summary, see :func:`summarize`
+    """
+    def request(i):
+        try:
+            return fetch(urls[i % len(urls)], timeout, slow_client)
+        except OSError:
+            return None
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(request, range(total)))
+    elapsed = time.monotonic() - start
+    latencies = [result for result in results if result is not None]
+    return summarize(latencies, len(results) - len(latencies), elapsed)
+
+
+class Command(BaseCommand):
+    help = 'Compare throughput and latency of the sync and async read endpoints of a running server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000',
+                            help='Root URL of the running server')
+        parser.add_argument('--game', type=int, help='Game to read (defaults to the first game)')
+        parser.add_argument('--requests', type=int, default=1000, help='Requests per mode')
+        parser.add_argument('--concurrency', type=int, default=50, help='Concurrent clients')
+        parser.add_argument('--timeout', type=float, default=30.0, help='Seconds per request')
+        parser.add_argument('--slow-client', type=float, default=0.0,
+                            help='Seconds each client holds its connection before reading')
+        parser.add_argument('--mode', choices=['both', *PREFIXES], default='both',
+                            help='Endpoints to test')
+
+    def handle(self, *args, **options):
+        base_url = options['base_url'].rstrip('/')
+        game_id, empire_id = self.pick_game(base_url, options['game'], options['timeout'])
+        paths = read_paths(game_id, empire_id)
+        modes = list(PREFIXES) if options['mode'] == 'both' else [options['mode']]
+        self.stdout.write(
+            f"Game {game_id}: {options['requests']} requests per mode, "
+            f"{options['concurrency']} concurrent clients"
+        )
+
+        results = {}
+        for mode in modes:
+            urls = [f'{base_url}{PREFIXES[mode]}{path}' for path in paths]
+            results[mode] = run_load(
+                urls, options['requests'], options['concurrency'],
+                options['timeout'], options['slow_client']
+            )
+            self.stdout.write(
+                '{mode:>6}: {rps:8.1f} req/s  p50 {p50:7.1f} ms  p95 {p95:7.1f} ms  '
+                'max {max:7.1f} ms  errors {errors}'.format(mode=mode, **results[mode])
+            )
+        if len(results) == 2 and results['sync']['rps']:
+            self.stdout.write(
+                f"async/sync throughput: {results['async']['rps'] / results['sync']['rps']:.2f}x"
+            )
+
+    def pick_game(self, base_url, game_id, timeout):
+        """Get the game to read and one of its empires from the server."""
+        try:
+            if game_id is None:
+                with urlopen(f'{base_url}/api/games/?page_size=1', timeout=timeout) as response:
+                    games = json.load(response)['results']
+                if not games:
+                    raise CommandError('The server has no games; start one first')
+                game_id = games[0]['id']
+            with urlopen(f'{base_url}/api/games/{game_id}/', timeout=timeout) as response:
+                empires = json.load(response)['empires']
+        except OSError as e:
+            raise CommandError(f'Could not read game from {base_url}: {e}')
+        return game_id, (empires[0] if empires else None)
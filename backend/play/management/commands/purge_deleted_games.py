@@ -0,0 +1,26 @@
+"""Purge the rows of deleted games.
+
+Usage::
+
+    python manage.py purge_deleted_games [--orphan-stars]
+
+Games deleted through the API are purged in the background right away; this
+command finishes purges that were interrupted, e.g. by a restart.
+"""
+
+from django.core.management.base import BaseCommand
+from play.purge import purge_deleted_games, purge_orphan_stars
+
+
+class Command(BaseCommand):
+    help = 'Purge soft-deleted games and, optionally, stars without a system'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orphan-stars', action='store_true',
+                            help='Also delete stars that no system points to')
+
+    def handle(self, *args, **options):
+        game_ids = purge_deleted_games()
+        self.stdout.write(f'Purged {len(game_ids)} deleted games')
+        if options['orphan_stars']:
+            self.stdout.write(f'Deleted {purge_orphan_stars()} orphaned stars')
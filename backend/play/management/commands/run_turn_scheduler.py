@@ -0,0 +1,66 @@
+"""Advance games whose turn deadline has passed.
+
+Usage::
+
+    python manage.py run_turn_scheduler [--workers N] [--batch-size N] [--lease SECONDS]
+        [--horizon SECONDS] [--max-backlog N] [--poll SECONDS] [--once]
+
+Runs a :class:`play.scheduler.TurnScheduler` until interrupted. Any number of
+schedulers can run against the same database; they share the due games
+through per-game leases. Computer empires decide in a pool of ``AI_WORKERS``
+processes started with the scheduler.
+"""
+
+import signal
+import threading
+from django.core.management.base import BaseCommand
+from play.ai import start_pool
+from play.events import local_pubsub_warning
+from play.scheduler import (
+    TurnScheduler, DEFAULT_WORKERS, DEFAULT_LEASE_SECONDS, DEFAULT_HORIZON, DEFAULT_MAX_BACKLOG
+)
+
+
+class Command(BaseCommand):
+    help = 'Process the turns of games whose turn deadline has passed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                            help='Games processed in parallel')
+        parser.add_argument('--batch-size', type=int, help='Games taken per batch (default: --workers)')
+        parser.add_argument('--lease', type=float, default=DEFAULT_LEASE_SECONDS,
+                            help='Seconds a game stays leased to this scheduler')
+        parser.add_argument('--horizon', type=float, default=DEFAULT_HORIZON,
+                            help='Seconds ahead that deadlines are loaded')
+        parser.add_argument('--max-backlog', type=int, default=DEFAULT_MAX_BACKLOG,
+                            help='Overdue games queued before loading new deadlines pauses')
+        parser.add_argument('--poll', type=float, default=1.0, help='Seconds between checks when idle')
+        parser.add_argument('--once', action='store_true', help='Process one batch and exit')
+
+    def handle(self, *args, **options):
+        warning = local_pubsub_warning()
+        if warning:
+            self.stderr.write(self.style.WARNING(warning))
+        # Forked before the scheduler starts its threads
+        start_pool()
+        scheduler = TurnScheduler(
+            workers=options['workers'], batch_size=options['batch_size'],
+            lease_seconds=options['lease'], horizon=options['horizon'],
+            max_backlog=options['max_backlog']
+        )
+        if options['once']:
+            stats = scheduler.run_once()
+            self.stdout.write(
+                f"Processed {stats['processed']} games, skipped {stats['skipped']}, "
+                f"{stats['backlog']} overdue"
+            )
+            return
+
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        self.stdout.write(f'Turn scheduler {scheduler.owner} started')
+        try:
+            scheduler.run(stop, options['poll'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(f'Turn scheduler stopped after processing {scheduler.processed} games')
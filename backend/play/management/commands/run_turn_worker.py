@@ -0,0 +1,90 @@
+"""Process the overdue turns of a share of the game partitions.
+
+Usage::
+
+    python manage.py run_turn_worker [--partitions N] [--workers N] [--batch-size N] [--lease SECONDS]
+        [--poll SECONDS] [--metrics-interval SECONDS] [--metrics-file PATH] [--rounds N]
+
+Runs a :class:`play.workers.TurnWorker` until interrupted. Start one per
+machine or process; the workers split the partitions between them and take
+over the partitions of workers that stop. Every ``--metrics-interval``
+seconds the worker writes its throughput and lag as a JSON line, and to
+``--metrics-file`` in the Prometheus text format if given. Computer empires decide in a pool of
+``AI_WORKERS`` processes started with the worker.
+"""
+
+import json
+import os
+import signal
+import threading
+import time
+from django.core.management.base import BaseCommand, CommandError
+from play.ai import start_pool
+from play.events import local_pubsub_warning
+from play.workers import TurnWorker, DEFAULT_PARTITIONS, DEFAULT_WORKER_LEASE_SECONDS, format_metrics
+from play.scheduler import DEFAULT_WORKERS
+
+
+class Command(BaseCommand):
+    help = 'Process the overdue turns of a share of the game partitions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--partitions', type=int, default=DEFAULT_PARTITIONS,
+                            help='Number of game partitions, the same for every worker')
+        parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                            help='Games processed in parallel')
+        parser.add_argument('--batch-size', type=int, help='Games taken per batch (default: --workers)')
+        parser.add_argument('--lease', type=float, default=DEFAULT_WORKER_LEASE_SECONDS,
+                            help='Seconds partition leases last without renewal')
+        parser.add_argument('--poll', type=float, default=1.0, help='Seconds between rounds when idle')
+        parser.add_argument('--metrics-interval', type=float, default=10.0,
+                            help='Seconds between metrics reports')
+        parser.add_argument('--metrics-file', help='File to write Prometheus metrics to')
+        parser.add_argument('--rounds', type=int, help='Stop after this many rounds')
+
+    def handle(self, *args, **options):
+        if options['partitions'] < 1:
+            raise CommandError('--partitions must be at least 1')
+        if options['poll'] * 2 >= options['lease']:
+            raise CommandError('--lease must be more than twice --poll, or leases lapse between rounds')
+        warning = local_pubsub_warning()
+        if warning:
+            self.stderr.write(self.style.WARNING(warning))
+        # Forked before the worker starts its threads
+        start_pool()
+        worker = TurnWorker(
+            partitions=options['partitions'], workers=options['workers'],
+            batch_size=options['batch_size'], lease_seconds=options['lease']
+        )
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        self.stdout.write(f'Turn worker {worker.owner} started')
+
+        rounds = 0
+        reported = time.monotonic()
+        try:
+            while not stop.is_set():
+                stats = worker.run_once()
+                rounds += 1
+                if time.monotonic() - reported >= options['metrics_interval'] or rounds == options['rounds']:
+                    self.report(worker, options['metrics_file'])
+                    reported = time.monotonic()
+                if rounds == options['rounds']:
+                    break
+                if stats['processed'] + stats['skipped'] < worker.batch_size:
+                    stop.wait(options['poll'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            worker.shutdown()
+        self.stdout.write(f'Turn worker stopped after processing {worker.processed} games')
+
+    def report(self, worker, path):
+        """Write the worker's metrics as a JSON line and, if given, a Prometheus file."""
+        metrics = worker.metrics()
+        self.stdout.write(json.dumps(dict(metrics, worker=worker.owner)))
+        if path:
+            # Written to a temporary file and renamed, so scrapers never read half a file
+            with open(f'{path}.tmp', 'w') as stream:
+                stream.write(format_metrics(metrics, worker.owner))
+            os.replace(f'{path}.tmp', path)
@@ -0,0 +1,66 @@
+"""Play many games of computer empires in memory and write their statistics.
+
+Usage::
+
+    python manage.py simulate_games [--games N] [--turns N] [--galaxy-size SIZE]
+        [--empires MIN-MAX] [--seed N] [--workers N] [--format csv|ndjson] [--output PATH]
+
+Games are set up and played with the same rules as live games (see
+:mod:`play.simulation`) without touching the database, spread over one
+process per CPU. One summary row per game is written to ``--output``
+(standard output by default).
+"""
+
+import sys
+import time
+from django.core.management.base import BaseCommand, CommandError
+from play.galaxy import GalaxySize
+from play.simulation import OUTPUT_FORMATS, make_specs, run_simulations, write_results
+
+
+def empire_range(value):
+    """Parse an empire count or a ``MIN-MAX`` range."""
+    low, _, high = value.partition('-')
+    try:
+        low, high = int(low), int(high or low)
+    except ValueError:
+        raise CommandError(f'Invalid empire count: {value}')
+    if low < 1 or high < low:
+        raise CommandError(f'Invalid empire count: {value}')
+    return low, high
+
+
+class Command(BaseCommand):
+    help = 'Simulate games of computer empires in memory and write per-game statistics'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--games', type=int, default=1000, help='Number of games')
+        parser.add_argument('--turns', type=int, default=100, help='Turns played per game')
+        parser.add_argument('--galaxy-size', choices=GalaxySize.choices() + ['random'], default='random',
+                            help='Galaxy size, or random per game')
+        parser.add_argument('--empires', default='2-8',
+                            help='Number of empires, or a MIN-MAX range drawn per game')
+        parser.add_argument('--seed', type=int, default=0, help='Seed for repeatable runs')
+        parser.add_argument('--workers', type=int, help='Worker processes (default: one per CPU)')
+        parser.add_argument('--format', choices=OUTPUT_FORMATS, default='csv', help='Output format')
+        parser.add_argument('--output', default='-', help='Output file, - for standard output')
+
+    def handle(self, *args, **options):
+        specs = make_specs(
+            options['games'], options['turns'], options['galaxy_size'],
+            empire_range(options['empires']), options['seed']
+        )
+        started = time.perf_counter()
+        results = run_simulations(specs, options['workers'])
+        if options['output'] == '-':
+            count = write_results(results, self.stdout, options['format'])
+            report = sys.stderr
+        else:
+            with open(options['output'], 'w', newline='') as stream:
+                count = write_results(results, stream, options['format'])
+            report = self.stdout
+        elapsed = time.perf_counter() - started
+        report.write(
+            f'Simulated {count} games of {options["turns"]} turns in {elapsed:.2f}s '
+            f'({count / elapsed if elapsed else 0:.0f} games/s)\n'
+        )
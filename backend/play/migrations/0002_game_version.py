@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("play", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="game",
+            name="version",
+            field=models.PositiveBigIntegerField(
+                default=0,
+                help_text="Mutation counter bumped by every write to the game's state",
+            ),
+        ),
+    ]
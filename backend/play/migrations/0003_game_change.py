@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("play", "0002_game_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GameChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "turn",
+                    models.PositiveIntegerField(
+                        help_text="The game turn in which the change became visible"
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("empire", "Empire"),
+                            ("planet", "Planet"),
+                            ("asteroid_belt", "Asteroid Belt"),
+                            ("research", "Research"),
+                        ],
+                        help_text="The type of the changed row",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "object_id",
+                    models.PositiveBigIntegerField(
+                        help_text="The primary key of the changed row"
+                    ),
+                ),
+                (
+                    "game",
+                    models.ForeignKey(
+                        help_text="The game the changed row belongs to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="changes",
+                        to="play.game",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["game", "turn"], name="play_change_game_turn_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("play", "0003_game_change"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="game",
+            name="deleted",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the game was deleted; its rows are purged in the background",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("play", "0004_game_deleted"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TurnSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "turn",
+                    models.PositiveIntegerField(
+                        help_text="The turn whose starting state the snapshot records"
+                    ),
+                ),
+                (
+                    "full",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Whether the snapshot holds every row rather than the rows changed since the previous one",
+                    ),
+                ),
+                (
+                    "data",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Empire storage, body owners and research points by row ID",
+                    ),
+                ),
+                (
+                    "game",
+                    models.ForeignKey(
+                        help_text="The game the snapshot belongs to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="turn_snapshots",
+                        to="play.game",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("game", "turn"), name="play_snapshot_game_turn_uniq"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("play", "0005_turn_snapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Order",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "turn",
+                    models.PositiveIntegerField(
+                        help_text="The turn the order was submitted in"
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("colonize_planet", "Colonize Planet"),
+                            ("colonize_asteroid_belt", "Colonize Asteroid Belt"),
+                            ("research", "Research"),
+                        ],
+                        help_text="What the order does",
+                        max_length=30,
+                    ),
+                ),
+                (
+                    "target",
+                    models.PositiveBigIntegerField(
+                        help_text="The ID of the planet, asteroid belt or empire technology the order targets"
+                    ),
+                ),
+                (
+                    "amount",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        help_text="Research points to allocate, for research orders",
+                        max_digits=10,
+                        null=True,
+                    ),
+                ),
+                (
+                    "empire",
+                    models.ForeignKey(
+                        help_text="The ordering empire",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="orders",
+                        to="play.empire",
+                    ),
+                ),
+                (
+                    "game",
+                    models.ForeignKey(
+                        help_text="The game the order belongs to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="orders",
+                        to="play.game",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["game", "turn"], name="play_order_game_turn_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("play", "0006_order"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="empire",
+            name="ready_turn",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="The last turn the empire ended; it is ready while this is the game's turn",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="game",
+            name="turn_deadline",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the current turn is processed at the latest",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="game",
+            name="turn_duration",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Seconds a turn may last before it is processed without waiting for every human empire",
+                null=True,
+            ),
+        ),
+    ]
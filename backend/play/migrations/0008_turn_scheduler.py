@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("play", "0007_turn_barrier"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Lease",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="What the lease covers, e.g. game:12",
+                        max_length=100,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "owner",
+                    models.CharField(
+                        help_text="The process holding the lease", max_length=200
+                    ),
+                ),
+                (
+                    "expires",
+                    models.DateTimeField(
+                        help_text="When the lease lapses unless renewed"
+                    ),
+                ),
+            ],
+        ),
+        migrations.AlterField(
+            model_name="game",
+            name="turn_deadline",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                help_text="When the current turn is processed at the latest",
+                null=True,
+            ),
+        ),
+    ]
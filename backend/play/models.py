@@ -9,8 +9,10 @@ This module defines the core data models for the game, including:
 These models form the foundation of the game's data structure and business logic.
 """
 
+from datetime import timedelta
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from celestial.models import Planet, AsteroidBelt, System
 from core.fields import FixedPointField
 from django.db.models import Sum
@@ -70,6 +72,7 @@ class Empire(models.Model):
         organic_storage (FixedPoint): Current organic resource storage
         radioactive_storage (FixedPoint): Current radioactive resource storage
         exotic_storage (FixedPoint): Current exotic resource storage
+        ready_turn (int): The last turn the empire ended, see :mod:`play.barrier`
     """
     name = models.CharField(max_length=100)
     player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name='empires')
@@ -89,6 +92,12 @@ class Empire(models.Model):
     radioactive_storage = FixedPointField(default=0)
     exotic_storage = FixedPointField(default=0)
 
+    ready_turn = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="The last turn the empire ended; it is ready while this is the game's turn"
+    )
+
     def __str__(self):
         return f"{self.name} ({self.race.name})"
 
@@ -153,6 +162,14 @@ class Empire(models.Model):
     class Meta:
         app_label = 'play'
 
+class ActiveGameManager(models.Manager):
+    """Manager of the games that haven't been deleted."""
+
+    def get_queryset(self):
+        """Exclude soft-deleted games awaiting purge."""
+        return super().get_queryset().filter(deleted__isnull=True)
+
+
 class Game(models.Model):
     """Represents a game session in the space conquest game.
     
@@ -166,6 +183,15 @@ class Game(models.Model):
         turn (int): Current turn number of the game
         created (datetime): When the game was created
         modified (datetime): When the game was last modified
+        version (int): Mutation counter bumped by every write to the game's state
+        deleted (datetime): When the game was deleted, its rows are purged
+            in the background (see :mod:`play.purge`)
+        turn_duration (int): Seconds a turn may last before it is processed
+            without waiting for every human empire, or None to always wait
+        turn_deadline (datetime): When the current turn is processed at the
+            latest (see :mod:`play.barrier`)
+    
+    ``Game.objects`` excludes deleted games; ``Game.all_objects`` includes them.
     """
     turn = models.PositiveIntegerField(
         default=0,
@@ -179,6 +205,29 @@ class Game(models.Model):
         auto_now=True,
         help_text="When the game was last modified"
     )
+    version = models.PositiveBigIntegerField(
+        default=0,
+        help_text="Mutation counter bumped by every write to the game's state"
+    )
+    deleted = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the game was deleted; its rows are purged in the background"
+    )
+    turn_duration = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Seconds a turn may last before it is processed without waiting for every human empire"
+    )
+    turn_deadline = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="When the current turn is processed at the latest"
+    )
+
+    objects = ActiveGameManager()
+    all_objects = models.Manager()
 
     def clean(self):
         """Validate that game meets minimum requirements.
@@ -198,8 +247,210 @@ class Game(models.Model):
         if self.systems.count() < 2:
             raise ValidationError('Game must have at least 2 star systems.')
 
+    def save(self, *args, **kwargs):
+        """Save the game without overwriting its mutation counter.
+        
+        The counter is incremented with UPDATE queries by
+        :mod:`play.versioning`, so a full save of a stale instance must not
+        write its old value back.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'version'
+            ]
+        super().save(*args, **kwargs)
+
+    def next_turn_deadline(self):
+        """Get the deadline of a turn starting now.
+        
+        Returns:
+            datetime: Now plus the turn duration, or None without a duration
+        """
+        if not self.turn_duration:
+            return None
+        return timezone.now() + timedelta(seconds=self.turn_duration)
+
     def __str__(self):
         return f"Game {self.id} (Turn {self.turn})"
 
     class Meta:
         app_label = 'play'
+
+class GameChange(models.Model):
+    """Records that a game-scoped row changed during a turn.
+    
+    The change log backs delta sync: clients that already hold a game's state
+    as of some turn fetch only the rows that changed after it. Entries only
+    identify the row; the current values are read when the delta is served.
+    Entries older than ``GAME_CHANGE_LOG_HORIZON`` turns are pruned at the
+    end of each turn.
+    
+    Attributes:
+        game (Game): The game the changed row belongs to
+        turn (int): The game turn in which the change became visible
+        kind (str): The type of the changed row
+        object_id (int): The primary key of the changed row
+    """
+    class Kind(models.TextChoices):
+        EMPIRE = 'empire', 'Empire'
+        PLANET = 'planet', 'Planet'
+        ASTEROID_BELT = 'asteroid_belt', 'Asteroid Belt'
+        RESEARCH = 'research', 'Research'
+
+    game = models.ForeignKey(
+        Game,
+        on_delete=models.CASCADE,
+        related_name='changes',
+        help_text="The game the changed row belongs to"
+    )
+    turn = models.PositiveIntegerField(
+        help_text="The game turn in which the change became visible"
+    )
+    kind = models.CharField(
+        max_length=20,
+        choices=Kind.choices,
+        help_text="The type of the changed row"
+    )
+    object_id = models.PositiveBigIntegerField(
+        help_text="The primary key of the changed row"
+    )
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.object_id} changed in turn {self.turn}"
+
+    class Meta:
+        app_label = 'play'
+        indexes = [models.Index(fields=['game', 'turn'], name='play_change_game_turn_idx')]
+
+
+class TurnSnapshot(models.Model):
+    """The mutable state of a game at the start of a turn.
+    
+    Snapshots back rewinding a game to an earlier turn. They are copy-on-write:
+    each one holds only the rows that changed since the previous snapshot,
+    except for keyframes, which hold every row. See :mod:`play.history`.
+    
+    Attributes:
+        game (Game): The game the snapshot belongs to
+        turn (int): The turn whose starting state the snapshot records
+        full (bool): Whether the snapshot holds every row rather than a delta
+        data (dict): Empire storage, body owners and research points by row ID
+    """
+    game = models.ForeignKey(
+        Game,
+        on_delete=models.CASCADE,
+        related_name='turn_snapshots',
+        help_text="The game the snapshot belongs to"
+    )
+    turn = models.PositiveIntegerField(
+        help_text="The turn whose starting state the snapshot records"
+    )
+    full = models.BooleanField(
+        default=False,
+        help_text="Whether the snapshot holds every row rather than the rows changed since the previous one"
+    )
+    data = models.JSONField(
+        default=dict,
+        help_text="Empire storage, body owners and research points by row ID"
+    )
+
+    def __str__(self):
+        return f"Game {self.game_id} turn {self.turn} {'keyframe' if self.full else 'delta'}"
+
+    class Meta:
+        app_label = 'play'
+        constraints = [
+            models.UniqueConstraint(fields=['game', 'turn'], name='play_snapshot_game_turn_uniq'),
+        ]
+
+class Order(models.Model):
+    """An order an empire submits during a turn, resolved when the turn ends.
+    
+    Orders are append-only: a player changes an order by submitting it again,
+    and the last order for the same empire, kind and target wins. At the end
+    of the turn the game's orders are grouped by kind and resolved together,
+    see :mod:`play.orders`.
+    
+    Attributes:
+        game (Game): The game the order belongs to
+        empire (Empire): The ordering empire
+        turn (int): The turn the order was submitted in
+        kind (str): What the order does
+        target (int): The ID of the planet, asteroid belt or empire technology the order targets
+        amount (Decimal): Research points to allocate, for research orders
+    """
+    class Kind(models.TextChoices):
+        COLONIZE_PLANET = 'colonize_planet', 'Colonize Planet'
+        COLONIZE_ASTEROID_BELT = 'colonize_asteroid_belt', 'Colonize Asteroid Belt'
+        RESEARCH = 'research', 'Research'
+
+    game = models.ForeignKey(
+        Game,
+        on_delete=models.CASCADE,
+        related_name='orders',
+        help_text="The game the order belongs to"
+    )
+    empire = models.ForeignKey(
+        Empire,
+        on_delete=models.CASCADE,
+        related_name='orders',
+        help_text="The ordering empire"
+    )
+    turn = models.PositiveIntegerField(
+        help_text="The turn the order was submitted in"
+    )
+    kind = models.CharField(
+        max_length=30,
+        choices=Kind.choices,
+        help_text="What the order does"
+    )
+    target = models.PositiveBigIntegerField(
+        help_text="The ID of the planet, asteroid belt or empire technology the order targets"
+    )
+    amount = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text="Research points to allocate, for research orders"
+    )
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.target} by empire {self.empire_id} in turn {self.turn}"
+
+    class Meta:
+        app_label = 'play'
+        indexes = [models.Index(fields=['game', 'turn'], name='play_order_game_turn_idx')]
+
+class Lease(models.Model):
+    """A named, expiring claim on work shared between processes.
+    
+    Turn schedulers and workers hold leases on the games and partitions they
+    are processing, so several processes or machines share the work without
+    doing it twice. A lease is free again once it expires, which is how work
+    moves away from a process that died. See :mod:`play.leases`.
+    
+    Attributes:
+        name (str): What the lease covers, e.g. ``game:12``
+        owner (str): The process holding the lease
+        expires (datetime): When the lease lapses unless renewed
+    """
+    name = models.CharField(
+        max_length=100,
+        unique=True,
+        help_text="What the lease covers, e.g. game:12"
+    )
+    owner = models.CharField(
+        max_length=200,
+        help_text="The process holding the lease"
+    )
+    expires = models.DateTimeField(
+        help_text="When the lease lapses unless renewed"
+    )
+
+    def __str__(self):
+        return f"{self.name} held by {self.owner} until {self.expires}"
+
+    class Meta:
+        app_label = 'play'
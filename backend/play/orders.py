@@ -0,0 +1,170 @@
+"""Player orders for the space conquest game.
+
+During a turn players queue :class:`play.models.Order` rows: submitting is a
+single bulk INSERT, and nothing else is written until the turn ends. Then
+:func:`resolve_orders` reads the turn's orders with one query, groups them
+by kind and resolves each group together on the turn's
+:class:`play.state.GameState`, which writes the results back with the rest
+of the turn in one bulk flush:
+
+- Colonization orders are each empire's ranked claims, resolved like the
+  computer empires' claims by :func:`play.ai.apply_orders`: an empire
+  colonizes the first of its ordered bodies that is still unowned, at most
+  one per turn, and contested bodies go to the empire with the lowest ID
+- Research orders add their points to the empire's research, at most
+  ``RESEARCH_POINTS_PER_TURN`` per empire and turn in all
+
+Orders are append-only; the last order for the same empire, kind and target
+wins. Resolved orders are deleted by :func:`prune_orders`.
+"""
+
+import logging
+from decimal import Decimal
+from django.conf import settings
+from research.models import EmpireTechnology
+from .ai import apply_orders
+from .models import Order
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESEARCH_POINTS_PER_TURN = 100
+
+# Order kinds that colonize a body, with the game state table holding the body
+COLONIZE_KINDS = {
+    Order.Kind.COLONIZE_PLANET: 'planets',
+    Order.Kind.COLONIZE_ASTEROID_BELT: 'asteroid_belts',
+}
+
+
+def research_budget():
+    """Get the research points an empire may allocate per turn.
+
+    Returns:
+        Decimal: The budget
+    """
+    return Decimal(getattr(settings, 'RESEARCH_POINTS_PER_TURN', DEFAULT_RESEARCH_POINTS_PER_TURN))
+
+
+def _max_research_points():
+    """Get the largest value the research points column holds."""
+    field = EmpireTechnology._meta.get_field('research_points')
+    return Decimal(10) ** (field.max_digits - field.decimal_places) - Decimal(1).scaleb(-field.decimal_places)
+
+
+def research_allocations(game):
+    """Get the research points each empire has allocated this turn so far.
+
+    Args:
+        game (Game): The game
+
+    Returns:
+        dict: ``{(empire_id, target): amount}`` of the last research order
+        of each empire and target
+    """
+    return {
+        (empire_id, target): amount
+        for empire_id, target, amount in Order.objects.filter(
+            game_id=game.id, turn=game.turn, kind=Order.Kind.RESEARCH
+        ).order_by('pk').values_list('empire_id', 'target', 'amount')
+    }
+
+
+def submit_orders(game, orders):
+    """Queue orders for the game's current turn with one bulk insert.
+
+    Args:
+        game (Game): The game
+        orders (list): Dicts with ``empire``, ``kind``, ``target`` and optional ``amount``
+
+    Returns:
+        list: The created :class:`play.models.Order` rows
+    """
+    return Order.objects.bulk_create([
+        Order(
+            game=game, empire_id=order['empire'], turn=game.turn,
+            kind=order['kind'], target=order['target'], amount=order.get('amount')
+        )
+        for order in orders
+    ])
+
+
+def pending_orders(game):
+    """Get the current orders of the game's turn, grouped by kind.
+
+    Args:
+        game (Game): The game
+
+    Returns:
+        dict: Lists of ``(order_id, empire_id, target, amount)`` by order
+        kind, in submission order, keeping only the last order for each
+        empire and target
+    """
+    latest = {}
+    for pk, empire_id, kind, target, amount in Order.objects.filter(
+        game_id=game.id, turn=game.turn
+    ).order_by('pk').values_list('pk', 'empire_id', 'kind', 'target', 'amount'):
+        latest.pop((kind, empire_id, target), None)
+        latest[(kind, empire_id, target)] = (pk, amount)
+    grouped = {kind: [] for kind in Order.Kind.values}
+    for (kind, empire_id, target), (pk, amount) in latest.items():
+        grouped[kind].append((pk, empire_id, target, amount))
+    return grouped
+
+
+def resolve_orders(state):
+    """Resolve the orders of the state's game turn on the state.
+
+    Args:
+        state (GameState): The game state, changed in memory
+
+    Returns:
+        dict: Number of resolved orders by kind
+    """
+    grouped = pending_orders(state.game)
+
+    claims = {}
+    for pk, empire_id, table, target in sorted(
+        (pk, empire_id, table, target)
+        for kind, table in COLONIZE_KINDS.items()
+        for pk, empire_id, target, _ in grouped[kind]
+        if target in getattr(state, table)
+    ):
+        claims.setdefault(empire_id, []).append((table, target))
+    claimed = apply_orders(state, [
+        {'empire': empire_id, 'claims': ranked}
+        for empire_id, ranked in claims.items() if empire_id in state.empires
+    ])
+
+    # Orders are validated against the budget, but concurrent submissions
+    # can still exceed it, so it is enforced again in submission order
+    researched = 0
+    budgets = {}
+    most = _max_research_points()
+    for _, empire_id, target, amount in sorted(grouped[Order.Kind.RESEARCH]):
+        research = state.research.get(target)
+        if research is None or research.empire_id != empire_id:
+            continue
+        budget = budgets.get(empire_id, research_budget())
+        amount = min(amount, budget)
+        if amount <= 0:
+            continue
+        budgets[empire_id] = budget - amount
+        research.research_points = min(research.research_points + amount, most)
+        researched += 1
+
+    resolved = {'colonize': len(claimed), 'research': researched}
+    logger.debug(f"Resolved orders of game {state.game.id} turn {state.game.turn}: {resolved}")
+    return resolved
+
+
+def prune_orders(game):
+    """Delete the game's orders of turns that have ended.
+
+    Args:
+        game (Game): The game
+
+    Returns:
+        int: Number of deleted orders
+    """
+    deleted, _ = Order.objects.filter(game_id=game.id, turn__lt=game.turn).delete()
+    return deleted
@@ -0,0 +1,147 @@
+"""Fast game deletion for the space conquest game.
+
+Deleting a game through Django's collector loads every empire, system, star,
+planet and asteroid belt of the game into memory and deletes them in
+batches, and it never reaches the stars, which the game's systems point to
+rather than the other way around. This module deletes games in two steps:
+
+- :func:`soft_delete_game` marks the game deleted with one UPDATE, which hides
+  it from ``Game.objects`` and the API immediately
+- :func:`purge_game` then runs in a background thread once the transaction
+  commits, removing the game's rows with one set-based ``DELETE`` per table
+  keyed by the game, including its stars and its players
+
+Purges that were interrupted are finished by ``manage.py purge_deleted_games``,
+which can also remove stars left without a system by earlier deletions.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connection, connections, transaction
+from django.utils import timezone
+from celestial.models import Planet, AsteroidBelt, System, Star
+from research.models import EmpireTechnology
+from .models import Player, Empire, Game, GameChange, TurnSnapshot, Order
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def purge_steps():
+    """Get the set-based deletes that purge a game, in order.
+
+    Every statement takes the game ID for each ``%s`` placeholder. Foreign
+    keys are checked at commit, so stars can be deleted before the systems
+    that point to them.
+
+    Returns:
+        list: ``(model, sql)`` pairs
+    """
+    game = Game._meta.db_table
+    empire = Empire._meta.db_table
+    system = System._meta.db_table
+    player = Player._meta.db_table
+    return [
+        (EmpireTechnology, f'DELETE FROM {EmpireTechnology._meta.db_table} WHERE empire_id IN '
+                           f'(SELECT id FROM {empire} WHERE game_id = %s)'),
+        (GameChange, f'DELETE FROM {GameChange._meta.db_table} WHERE game_id = %s'),
+        (TurnSnapshot, f'DELETE FROM {TurnSnapshot._meta.db_table} WHERE game_id = %s'),
+        (Order, f'DELETE FROM {Order._meta.db_table} WHERE game_id = %s'),
+        (Planet, f'DELETE FROM {Planet._meta.db_table} WHERE system_id IN '
+                 f'(SELECT id FROM {system} WHERE game_id = %s)'),
+        (AsteroidBelt, f'DELETE FROM {AsteroidBelt._meta.db_table} WHERE system_id IN '
+                       f'(SELECT id FROM {system} WHERE game_id = %s)'),
+        (Star, f'DELETE FROM {Star._meta.db_table} WHERE id IN '
+               f'(SELECT star_id FROM {system} WHERE game_id = %s)'),
+        (System, f'DELETE FROM {system} WHERE game_id = %s'),
+        # Players are created per game; keep any that also play elsewhere
+        (Player, f'DELETE FROM {player} WHERE id IN (SELECT player_id FROM {empire} WHERE game_id = %s) '
+                 f'AND NOT EXISTS (SELECT 1 FROM {empire} other WHERE other.player_id = {player}.id '
+                 f'AND (other.game_id <> %s OR other.game_id IS NULL))'),
+        (Empire, f'DELETE FROM {empire} WHERE game_id = %s'),
+        (Game, f'DELETE FROM {game} WHERE id = %s'),
+    ]
+
+
+def purge_game(game_id):
+    """Delete a game and all of its rows with set-based deletes.
+
+    Bypasses the ORM collector and delete signals: nothing is loaded into
+    memory and no version bumps or change records are written for a game
+    that is going away.
+
+    Args:
+        game_id (int): The game ID
+
+    Returns:
+        dict: Number of deleted rows by model label
+    """
+    deleted = {}
+    with transaction.atomic(), connection.cursor() as cursor:
+        for model, sql in purge_steps():
+            cursor.execute(sql, [game_id] * sql.count('%s'))
+            deleted[model._meta.label] = cursor.rowcount
+    logger.info(f"Purged game {game_id}: {deleted}")
+    return deleted
+
+
+def purge_orphan_stars():
+    """Delete stars that no system points to.
+
+    Returns:
+        int: Number of deleted stars
+    """
+    star = Star._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {star} WHERE NOT EXISTS '
+            f'(SELECT 1 FROM {System._meta.db_table} WHERE star_id = {star}.id)'
+        )
+        return cursor.rowcount
+
+
+def purge_deleted_games():
+    """Purge every soft-deleted game.
+
+    Returns:
+        list: IDs of the purged games
+    """
+    game_ids = list(Game.all_objects.filter(deleted__isnull=False).values_list('id', flat=True))
+    for game_id in game_ids:
+        purge_game(game_id)
+    return game_ids
+
+
+def _purge_in_background(game_id):
+    """Purge a game on the executor thread and release its connections."""
+    try:
+        purge_game(game_id)
+    except Exception:
+        logger.exception(f"Purging game {game_id} failed; purge_deleted_games will retry it")
+    finally:
+        connections.close_all()
+
+
+def get_executor():
+    """Get the single background thread that purges deleted games."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='game-purge')
+        return _executor
+
+
+def soft_delete_game(game):
+    """Hide a game immediately and purge its rows in the background.
+
+    The purge starts once the current transaction commits.
+
+    Args:
+        game (Game): The game to delete
+    """
+    Game.all_objects.filter(pk=game.pk).update(deleted=timezone.now())
+    game_id = game.pk
+    transaction.on_commit(lambda: get_executor().submit(_purge_in_background, game_id))
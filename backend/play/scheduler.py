@@ -0,0 +1,207 @@
+"""Turn scheduler for games with turn deadlines.
+
+Games with a ``turn_duration`` advance when their turn deadline passes, even
+if nobody ends the turn. ``python manage.py run_turn_scheduler`` runs a
+:class:`TurnScheduler`, which:
+
+- Keeps a priority queue (a heap) of the upcoming turn deadlines, loaded
+  from the database a short horizon ahead
+- Takes the games that came due in batches and processes each batch in
+  parallel on a thread pool, with :func:`play.barrier.process_if_due`
+- Holds a :class:`play.models.Lease` on each game while processing it, so
+  several schedulers, on one machine or many, share the work; a game whose
+  scheduler died is picked up by another once the lease expires
+- Applies backpressure: it leases no more games than a batch, leaving the
+  rest to other schedulers, and stops loading new deadlines while its
+  backlog of overdue games is above ``max_backlog``
+
+Turns are still processed at most once, as :func:`play.barrier.advance_turn`
+claims each turn with a conditional UPDATE of the game row.
+"""
+
+import heapq
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.db import connection
+from django.utils import timezone
+from .barrier import process_if_due
+from .leases import acquire_lease, lease_owner, release_lease
+from .models import Game
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+
+DEFAULT_LEASE_SECONDS = 60
+
+DEFAULT_HORIZON = 60
+
+DEFAULT_MAX_BACKLOG = 1000
+
+
+class TurnScheduler:
+    """Process games whose turn deadline has passed.
+
+    Args:
+        owner (str): Name of this scheduler among lease holders
+        workers (int): Games processed in parallel; 1 processes in the calling thread
+        batch_size (int): Games taken per batch, defaults to ``workers``
+        lease_seconds (float): How long a game's lease lasts, longer than processing a turn takes
+        horizon (float): Seconds ahead of now that deadlines are loaded
+        max_backlog (int): Overdue games queued before loading new deadlines pauses
+    """
+
+    def __init__(self, owner=None, workers=DEFAULT_WORKERS, batch_size=None,
+                 lease_seconds=DEFAULT_LEASE_SECONDS, horizon=DEFAULT_HORIZON,
+                 max_backlog=DEFAULT_MAX_BACKLOG):
+        self.owner = owner or lease_owner()
+        self.workers = workers
+        self.batch_size = batch_size or workers
+        self.lease_seconds = lease_seconds
+        self.horizon = timedelta(seconds=horizon)
+        self.max_backlog = max_backlog
+        self._executor = None
+        self.reset()
+        self.processed = 0
+
+    def reset(self):
+        """Forget the queued deadlines."""
+        self._heap = []
+        self._queued = {}
+
+    def games(self):
+        """Get the games this scheduler serves.
+
+        Returns:
+            QuerySet: The games
+        """
+        return Game.objects.all()
+
+    def load(self, now):
+        """Queue the turn deadlines up to the horizon.
+
+        Args:
+            now (datetime): The current time
+
+        Returns:
+            int: Number of newly queued deadlines
+        """
+        queued = 0
+        for game_id, turn, deadline in self.games().filter(
+            turn_deadline__lte=now + self.horizon
+        ).values_list('pk', 'turn', 'turn_deadline'):
+            if self._queued.get(game_id) != (deadline, turn):
+                # An earlier entry of the game stays in the heap and is skipped when popped
+                self._queued[game_id] = (deadline, turn)
+                heapq.heappush(self._heap, (deadline, game_id, turn))
+                queued += 1
+        return queued
+
+    def backlog(self, now):
+        """Count the queued games that are overdue.
+
+        Args:
+            now (datetime): The current time
+
+        Returns:
+            int: Number of overdue games
+        """
+        return sum(1 for deadline, _ in self._queued.values() if deadline <= now)
+
+    def take_due(self, now, limit):
+        """Pop up to ``limit`` overdue games, earliest deadline first.
+
+        Args:
+            now (datetime): The current time
+            limit (int): Most games to take
+
+        Returns:
+            list: ``(game_id, turn)`` pairs
+        """
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < limit:
+            deadline, game_id, turn = heapq.heappop(self._heap)
+            if self._queued.get(game_id) != (deadline, turn):
+                continue
+            del self._queued[game_id]
+            due.append((game_id, turn))
+        return due
+
+    def _process(self, game_id, turn):
+        """Process a leased game's turn and give the lease back."""
+        try:
+            return process_if_due(game_id, turn)
+        except Exception:
+            logger.exception(f"Processing turn {turn} of game {game_id} failed")
+            return None
+        finally:
+            release_lease(f'game:{game_id}', self.owner)
+
+    def _process_in_thread(self, task):
+        """Process a game on a pool thread and release the thread's connection."""
+        try:
+            return self._process(*task)
+        finally:
+            connection.close()
+
+    def run_once(self, now=None):
+        """Load deadlines and process one batch of overdue games.
+
+        Args:
+            now (datetime): The current time, defaults to now
+
+        Returns:
+            dict: Numbers of ``processed`` games, games ``skipped`` because
+            another process holds them or already advanced them, and the
+            ``backlog`` of overdue games left queued
+        """
+        now = now or timezone.now()
+        if self.backlog(now) < self.max_backlog:
+            self.load(now)
+        else:
+            logger.warning(f"Turn scheduler backlog of {self.backlog(now)} games; not loading new deadlines")
+
+        batch = [
+            (game_id, turn) for game_id, turn in self.take_due(now, self.batch_size)
+            if acquire_lease(f'game:{game_id}', self.owner, self.lease_seconds)
+        ]
+        if self.workers == 1:
+            results = [self._process(*task) for task in batch]
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='turn-scheduler')
+            results = list(self._executor.map(self._process_in_thread, batch))
+
+        processed = sum(1 for result in results if result is not None)
+        self.processed += processed
+        stats = {'processed': processed, 'skipped': len(results) - processed, 'backlog': self.backlog(now)}
+        if batch:
+            logger.info(f"Turn scheduler {self.owner}: {stats}")
+        return stats
+
+    def run(self, stop=None, poll=1.0):
+        """Process batches until stopped.
+
+        Full batches are followed by the next one right away; otherwise the
+        scheduler sleeps ``poll`` seconds.
+
+        Args:
+            stop (threading.Event): Set to stop the scheduler
+            poll (float): Seconds between checks when nothing is due
+        """
+        stop = stop or threading.Event()
+        try:
+            while not stop.is_set():
+                stats = self.run_once()
+                if stats['processed'] + stats['skipped'] < self.batch_size:
+                    stop.wait(poll)
+        finally:
+            self.close()
+
+    def close(self):
+        """Shut the thread pool down."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
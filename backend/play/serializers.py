@@ -6,18 +6,28 @@ This module provides serializers for converting game models to/from JSON:
 - EmpireSerializer: Handles empire data
 - GameSerializer: Handles game data
 - StartGameSerializer: Handles new game creation requests
+- OwnershipSerializer: Handles batch ownership reassignment requests
+- OrderBatchSerializer: Handles batch order submission requests
 
 These serializers handle data validation, transformation, and API response formatting.
 """
 
+from decimal import Decimal
+from django.db import transaction
 from rest_framework import serializers
-from .models import Player, Race, Empire, Game
+from .models import Player, Race, Empire, Game, Order
 from celestial.models import System, Planet, AsteroidBelt
 from celestial.serializers import PlanetSerializer, AsteroidBeltSerializer
 from .start import GalaxySize
+from core.serializers import SparseFieldsetMixin, PrimaryKeyListField
+from celestial.bulk import set_owned_bodies, reassign_owners
+from research.models import EmpireTechnology
+from .economy import total_capacity
+from .versioning import deferred_version_bumps
+from .orders import research_allocations, research_budget, submit_orders
 
 
-class PlayerSerializer(serializers.ModelSerializer):
+class PlayerSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Player model.
     
     Handles conversion of Player instances to/from JSON for API responses.
@@ -28,7 +38,7 @@ class PlayerSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class RaceSerializer(serializers.ModelSerializer):
+class RaceSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Race model.
     
     Handles conversion of Race instances to/from JSON for API responses.
@@ -39,11 +49,15 @@ class RaceSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class EmpireSerializer(serializers.ModelSerializer):
+class EmpireSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Empire model.
     
     Handles conversion of Empire instances to/from JSON for API responses.
     Includes related player and race information.
+    
+    The nested ``planets`` and ``asteroid_belts`` and the aggregated
+    ``resource_capacities`` are only rendered when requested with
+    ``?expand=`` or ``?fields=``.
     """
     player = PlayerSerializer(read_only=True)
     player_id = serializers.PrimaryKeyRelatedField(
@@ -59,20 +73,18 @@ class EmpireSerializer(serializers.ModelSerializer):
         write_only=True,
         help_text="The race of this empire"
     )
-    planets = PlanetSerializer(many=True, read_only=True)
-    planet_ids = serializers.PrimaryKeyRelatedField(
+    planets = PlanetSerializer(many=True, read_only=True, source='owned_planets')
+    planet_ids = PrimaryKeyListField(
         queryset=Planet.objects.all(),
         source='planets',
-        many=True,
         write_only=True,
         required=False,
         help_text="The planets controlled by this empire"
     )
-    asteroid_belts = AsteroidBeltSerializer(many=True, read_only=True)
-    asteroid_belt_ids = serializers.PrimaryKeyRelatedField(
+    asteroid_belts = AsteroidBeltSerializer(many=True, read_only=True, source='owned_asteroid_belts')
+    asteroid_belt_ids = PrimaryKeyListField(
         queryset=AsteroidBelt.objects.all(),
         source='asteroid_belts',
-        many=True,
         write_only=True,
         required=False,
         help_text="The asteroid belts controlled by this empire"
@@ -90,16 +102,23 @@ class EmpireSerializer(serializers.ModelSerializer):
             'exotic_storage', 'resource_capacities'
         ]
         read_only_fields = ['id']
+        expandable_fields = ['planets', 'asteroid_belts', 'resource_capacities']
 
     def get_resource_capacities(self, obj):
         """Calculate total resource storage capacities.
         
+        Sums the prefetched planets when available instead of running one
+        aggregate query per resource.
+        
         Args:
             obj (Empire): The empire instance
             
         Returns:
             dict: Total storage capacities for each resource type
         """
+        if 'owned_planets' in getattr(obj, '_prefetched_objects_cache', {}):
+            capacity = total_capacity(obj.owned_planets.all())
+            return {f'{resource}_capacity': value for resource, value in capacity.items()}
         return {
             'mineral_capacity': obj.mineral_capacity,
             'organic_capacity': obj.organic_capacity,
@@ -121,33 +140,22 @@ class EmpireSerializer(serializers.ModelSerializer):
         planets = validated_data.pop('planets', None)
         asteroid_belts = validated_data.pop('asteroid_belts', None)
         
-        # Update other fields
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-        
-        # Update planets if provided
-        if planets is not None:
-            for planet in instance.planets.all():
-                planet.empire = None
-                planet.save()
-            for planet in planets:
-                planet.empire = instance
-                planet.save()
-        
-        # Update asteroid belts if provided
-        if asteroid_belts is not None:
-            for belt in instance.asteroid_belts.all():
-                belt.empire = None
-                belt.save()
-            for belt in asteroid_belts:
-                belt.empire = instance
-                belt.save()
+        with transaction.atomic(), deferred_version_bumps():
+            # Update other fields
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.save()
+            
+            # Reassign ownership with set-based updates
+            if planets is not None:
+                set_owned_bodies(Planet, instance, planets)
+            if asteroid_belts is not None:
+                set_owned_bodies(AsteroidBelt, instance, asteroid_belts)
         
         return instance
 
 
-class GameSerializer(serializers.ModelSerializer):
+class GameSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Game model.
     
     Handles conversion of Game instances to/from JSON for API responses.
@@ -166,8 +174,8 @@ class GameSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Game
-        fields = ['id', 'turn', 'empires', 'systems', 'created', 'modified']
-        read_only_fields = ['id', 'created', 'modified']
+        fields = ['id', 'turn', 'empires', 'systems', 'created', 'modified', 'turn_duration', 'turn_deadline']
+        read_only_fields = ['id', 'created', 'modified', 'turn_deadline']
 
     def validate(self, data):
         """Validate that game meets minimum requirements.
@@ -259,3 +267,167 @@ class StartGameSerializer(serializers.Serializer):
         if not data.get('galaxy_size'):
             raise serializers.ValidationError({'galaxy_size': 'This field is required'})
         return data
+
+
+class OwnershipChangeSerializer(serializers.Serializer):
+    """Serializer for the new owner of one planet or asteroid belt."""
+    id = serializers.IntegerField(help_text="The planet or asteroid belt ID")
+    empire = serializers.IntegerField(
+        allow_null=True,
+        help_text="The new owning empire, or null to release the body"
+    )
+
+
+class OwnershipSerializer(serializers.Serializer):
+    """Serializer for reassigning the owners of many bodies in a game.
+    
+    All bodies and empires are validated against the game with one query
+    per type, and the owners are written with one UPDATE per target empire.
+    The game is passed in the ``game`` context key.
+    """
+    planets = OwnershipChangeSerializer(many=True, required=False)
+    asteroid_belts = OwnershipChangeSerializer(many=True, required=False)
+
+    def validate(self, data):
+        """Validate that all bodies and empires belong to the game.
+        
+        Args:
+            data (dict): The data to validate
+            
+        Returns:
+            dict: The validated data
+            
+        Raises:
+            ValidationError: With per-body errors, in request order
+        """
+        game = self.context['game']
+        empire_ids = set(game.empires.values_list('id', flat=True))
+        errors = {}
+        for name, model in (('planets', Planet), ('asteroid_belts', AsteroidBelt)):
+            changes = data.get(name, [])
+            if not changes:
+                continue
+            body_ids = set(model.objects.filter(
+                pk__in=[change['id'] for change in changes], system__game=game
+            ).values_list('pk', flat=True))
+            change_errors = []
+            for change in changes:
+                change_error = {}
+                if change['id'] not in body_ids:
+                    change_error['id'] = [f'Invalid pk "{change["id"]}" - object does not exist in this game.']
+                if change['empire'] is not None and change['empire'] not in empire_ids:
+                    change_error['empire'] = [f'Invalid pk "{change["empire"]}" - empire does not exist in this game.']
+                change_errors.append(change_error)
+            if any(change_errors):
+                errors[name] = change_errors
+        if errors:
+            raise serializers.ValidationError(errors)
+        return data
+
+    def save(self):
+        """Reassign the owners of the bodies.
+        
+        Returns:
+            dict: IDs of the planets and asteroid belts whose owner changed
+        """
+        with transaction.atomic(), deferred_version_bumps():
+            return {
+                name: reassign_owners(model, {
+                    change['id']: change['empire'] for change in self.validated_data.get(name, [])
+                })
+                for name, model in (('planets', Planet), ('asteroid_belts', AsteroidBelt))
+            }
+
+
+class OrderSerializer(serializers.Serializer):
+    """Serializer for one order submitted during a turn."""
+    empire = serializers.IntegerField(help_text="The ordering empire")
+    kind = serializers.ChoiceField(choices=Order.Kind.choices, help_text="What the order does")
+    target = serializers.IntegerField(
+        min_value=1,
+        help_text="The planet or asteroid belt to colonize, or the empire technology to research"
+    )
+    amount = serializers.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        min_value=Decimal('0.01'),
+        required=False,
+        help_text="Research points to allocate, required for research orders"
+    )
+
+
+class OrderBatchSerializer(serializers.Serializer):
+    """Serializer for submitting many orders for a game's current turn.
+    
+    Empires and targets are validated against the game with one query per
+    type, and the orders are written with one bulk INSERT. The game is
+    passed in the ``game`` context key.
+    """
+    orders = OrderSerializer(many=True, allow_empty=False)
+
+    def validate_orders(self, orders):
+        """Validate that all empires and targets belong to the game.
+        
+        Args:
+            orders (list): The orders to validate
+            
+        Returns:
+            list: The validated orders
+            
+        Raises:
+            ValidationError: With per-order errors, in request order
+        """
+        game = self.context['game']
+        empire_ids = set(game.empires.values_list('id', flat=True))
+        targets = {}
+        for kind, model in ((Order.Kind.COLONIZE_PLANET, Planet), (Order.Kind.COLONIZE_ASTEROID_BELT, AsteroidBelt)):
+            ids = [order['target'] for order in orders if order['kind'] == kind]
+            targets[kind] = {
+                pk: None for pk in model.objects.filter(pk__in=ids, system__game=game).values_list('pk', flat=True)
+            } if ids else {}
+        ids = [order['target'] for order in orders if order['kind'] == Order.Kind.RESEARCH]
+        targets[Order.Kind.RESEARCH] = dict(EmpireTechnology.objects.filter(
+            pk__in=ids, empire__game=game
+        ).values_list('pk', 'empire_id')) if ids else {}
+
+        # Research allocated this turn, with these orders replacing earlier ones
+        allocations = research_allocations(game) if ids else {}
+        for order in orders:
+            if order['kind'] == Order.Kind.RESEARCH and order.get('amount') is not None:
+                allocations[(order['empire'], order['target'])] = order['amount']
+        allocated = {}
+        for (empire_id, _), amount in allocations.items():
+            allocated[empire_id] = allocated.get(empire_id, 0) + amount
+        budget = research_budget()
+
+        errors = []
+        for order in orders:
+            error = {}
+            if order['empire'] not in empire_ids:
+                error['empire'] = [f'Invalid pk "{order["empire"]}" - empire does not exist in this game.']
+            if order['target'] not in targets[order['kind']]:
+                error['target'] = [f'Invalid pk "{order["target"]}" - object does not exist in this game.']
+            elif order['kind'] == Order.Kind.RESEARCH:
+                if targets[order['kind']][order['target']] != order['empire']:
+                    error['target'] = [f'Invalid pk "{order["target"]}" - research belongs to another empire.']
+                if order.get('amount') is None:
+                    error['amount'] = ['This field is required for research orders.']
+                elif allocated[order['empire']] > budget:
+                    error['amount'] = [
+                        f'Research orders allocate {allocated[order["empire"]]} points this turn, '
+                        f'more than the {budget} per turn.'
+                    ]
+            errors.append(error)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return orders
+
+    def save(self):
+        """Queue the orders for the game's current turn.
+        
+        Returns:
+            dict: The ``turn`` the orders were queued for and their IDs
+        """
+        game = self.context['game']
+        orders = submit_orders(game, self.validated_data['orders'])
+        return {'turn': game.turn, 'orders': [order.pk for order in orders]}
@@ -0,0 +1,125 @@
+"""Signal handlers that keep game versions and the change log current.
+
+Every save or delete of a row that belongs to a game bumps that game's
+mutation counter (see :mod:`play.versioning`), so cached copies of the
+game's resources are revalidated by clients. Empires, planets, asteroid
+belts and research rows are also recorded in the game's change log, and
+writes to systems, stars, planets and asteroid belts drop the game's cached
+galaxy layout, whether they come from the API, the admin or a script.
+
+Bulk writes that bypass ``save()`` (``QuerySet.update``, ``bulk_create``)
+must call :func:`play.versioning.record_changes` or
+:func:`play.versioning.bump_game_versions` themselves.
+"""
+
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from celestial.models import System, Star, Planet, AsteroidBelt
+from research.models import EmpireTechnology
+from .models import Empire, Game, GameChange
+from .versioning import record_changes, record_changes_by_lookup
+
+CHANGE_KINDS = {
+    Empire: GameChange.Kind.EMPIRE,
+    Planet: GameChange.Kind.PLANET,
+    AsteroidBelt: GameChange.Kind.ASTEROID_BELT,
+    EmpireTechnology: GameChange.Kind.RESEARCH,
+}
+
+# Models rendered in the cached galaxy layout (see play.layout)
+LAYOUT_MODELS = (System, Star, Planet, AsteroidBelt)
+
+
+def game_id_for(instance):
+    """Get the ID of the game a game-scoped row belongs to.
+
+    Args:
+        instance: An Empire, System, Star, Planet, AsteroidBelt or EmpireTechnology
+
+    Returns:
+        int: The game ID, or None if the row isn't attached to a game
+    """
+    if isinstance(instance, (Empire, System)):
+        return instance.game_id
+    if isinstance(instance, (Planet, AsteroidBelt)):
+        if instance.system_id is None:
+            return None
+        return System.objects.filter(pk=instance.system_id).values_list('game_id', flat=True).first()
+    if isinstance(instance, Star):
+        return System.objects.filter(star_id=instance.pk).values_list('game_id', flat=True).first()
+    if isinstance(instance, EmpireTechnology):
+        return Empire.objects.filter(pk=instance.empire_id).values_list('game_id', flat=True).first()
+    return None
+
+
+def game_lookup_for(instance):
+    """Find the game ID of a game-scoped row without a query if possible.
+
+    The game ID is taken from the row itself or from a loaded related row;
+    otherwise the row that holds it is named, so the lookup can be deferred.
+
+    Args:
+        instance: An Empire, System, Star, Planet, AsteroidBelt or EmpireTechnology
+
+    Returns:
+        tuple: ``(game_id, None)`` if the game ID is known, or
+        ``(None, (model, field, value))`` naming the row holding it
+    """
+    if isinstance(instance, (Empire, System)):
+        return instance.game_id, None
+    if isinstance(instance, (Planet, AsteroidBelt)):
+        if instance.system_id is None:
+            return None, None
+        if type(instance).system.is_cached(instance):
+            return instance.system.game_id, None
+        return None, (System, 'pk', instance.system_id)
+    if isinstance(instance, Star):
+        if Star.system.is_cached(instance):
+            return instance.system.game_id, None
+        return None, (System, 'star_id', instance.pk)
+    if isinstance(instance, EmpireTechnology):
+        if EmpireTechnology.empire.is_cached(instance):
+            return instance.empire.game_id, None
+        return None, (Empire, 'pk', instance.empire_id)
+    return None, None
+
+
+def record_write(instance, game_id, layout):
+    """Bump the owning game's version and log the change if the row is tracked."""
+    record_changes(game_id, CHANGE_KINDS.get(type(instance)), [instance.pk], layout)
+
+
+@receiver(post_save, sender=Empire)
+@receiver(post_save, sender=System)
+@receiver(post_save, sender=Star)
+@receiver(post_save, sender=Planet)
+@receiver(post_save, sender=AsteroidBelt)
+@receiver(post_save, sender=EmpireTechnology)
+def record_save(sender, instance, update_fields=None, **kwargs):
+    """Record a saved game-scoped row.
+
+    When the game ID isn't at hand, looking it up is left to the version
+    bump, which resolves the lookups of a whole
+    :func:`play.versioning.deferred_version_bumps` block at once.
+    """
+    # The layout leaves owners out, so saving only a body's owner keeps it
+    layout = isinstance(instance, LAYOUT_MODELS) and not (update_fields and set(update_fields) <= {'empire'})
+    game_id, lookup = game_lookup_for(instance)
+    if lookup is None:
+        record_write(instance, game_id, layout)
+    else:
+        record_changes_by_lookup(*lookup, CHANGE_KINDS.get(type(instance)), [instance.pk], layout)
+
+
+@receiver(post_delete, sender=Empire)
+@receiver(post_delete, sender=System)
+@receiver(post_delete, sender=Planet)
+@receiver(post_delete, sender=AsteroidBelt)
+@receiver(post_delete, sender=EmpireTechnology)
+def record_delete(sender, instance, origin=None, **kwargs):
+    """Record a deleted game-scoped row, unless its whole game is being deleted."""
+    if isinstance(origin, Game) or (isinstance(origin, QuerySet) and origin.model is Game):
+        return
+    # Resolved right away, as the related rows may be deleted next
+    record_write(instance, game_id_for(instance), isinstance(instance, LAYOUT_MODELS))
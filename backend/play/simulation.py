@@ -0,0 +1,197 @@
+"""Headless game simulation for the space conquest game.
+
+This module plays whole games of computer empires in memory, without the
+database, for balance tuning and regression testing of the economy:
+
+- :func:`generate_state` builds a new game's :class:`play.state.GameState`
+  from the galaxy rules in :mod:`play.galaxy`, like :func:`play.start.start_game`
+- :func:`simulate_game` plays it with :func:`play.ai.run_ai_phase` and
+  :func:`play.turn.produce_resources`, the phases of live turns, and
+  summarizes the outcome
+- :func:`run_simulations` spreads games over a process pool
+- :func:`write_results` writes the summaries as CSV or NDJSON
+
+Because setup and turns go through the same rules as live games, simulated
+and live economies can't drift apart.
+
+``python manage.py simulate_games`` runs simulations from the command line.
+"""
+
+import csv
+import json
+import multiprocessing
+import random
+from decimal import Decimal
+from .ai import run_ai_phase
+from .economy import RESOURCES
+from .galaxy import GalaxySize, TERRAN_PLANET, ASTEROID_BELT, colony_count
+from .state import GameState, EmpireState, PlanetState, AsteroidBeltState
+from .turn import produce_resources
+
+OUTPUT_FORMATS = ('csv', 'ndjson')
+
+
+def _amounts(values):
+    """Convert a template's numbers to the decimal amounts the models hold."""
+    return {
+        name: Decimal(value) if name != 'orbit' else value
+        for name, value in values.items()
+    }
+
+
+def generate_state(galaxy_size, empire_count):
+    """Build the state of a new game of computer empires.
+
+    Every empire gets the planet of one system as its colony, and the galaxy
+    is grown if there are more empires than systems.
+
+    Args:
+        galaxy_size (str): A :class:`play.galaxy.GalaxySize` value
+        empire_count (int): Number of empires
+
+    Returns:
+        GameState: The game's state, not tied to a stored game
+    """
+    system_count = colony_count(empire_count, GalaxySize(galaxy_size).system_count)
+    planet, belt = _amounts(TERRAN_PLANET), _amounts(ASTEROID_BELT)
+    empires = [
+        EmpireState(
+            id=i + 1, name=f"Computer Empire {i + 1}", player_id=i + 1,
+            **{f'{resource}_storage': Decimal('0') for resource in RESOURCES}
+        )
+        for i in range(empire_count)
+    ]
+    planets = [
+        PlanetState(id=i + 1, system_id=i + 1, empire_id=i + 1 if i < empire_count else None, **planet)
+        for i in range(system_count)
+    ]
+    belts = [
+        AsteroidBeltState(id=i + 1, system_id=i + 1, empire_id=None, **belt)
+        for i in range(system_count)
+    ]
+    return GameState(None, empires, planets, belts)
+
+
+def make_specs(games, turns, galaxy_size='random', empires=(2, 8), seed=0):
+    """Describe the games of a simulation run.
+
+    Args:
+        games (int): Number of games
+        turns (int): Turns played per game
+        galaxy_size (str): A galaxy size, or ``random`` to draw one per game
+        empires (tuple): Smallest and largest number of empires, drawn per game
+        seed (int): Seed of the random draws, for repeatable runs
+
+    Returns:
+        list: Game specifications for :func:`simulate_game`
+    """
+    rng = random.Random(seed)
+    sizes = GalaxySize.choices()
+    return [
+        {
+            'game': index,
+            'galaxy_size': rng.choice(sizes) if galaxy_size == 'random' else galaxy_size,
+            'empires': rng.randint(*empires),
+            'turns': turns,
+        }
+        for index in range(games)
+    ]
+
+
+def simulate_game(spec):
+    """Play a game in memory and summarize it.
+
+    Like a live game, the game is processed once when it starts, and
+    computer empires act from the first played turn on. The AI searches to
+    its full depth rather than within a time budget, so runs are repeatable.
+
+    Args:
+        spec (dict): ``game``, ``galaxy_size``, ``empires`` and ``turns``
+
+    Returns:
+        dict: The spec with the number of systems, the mean number of bodies
+        owned per empire and, per resource, the mean, minimum and maximum
+        final storage and the mean turn at which empires first filled their
+        storage (None if none did)
+    """
+    state = generate_state(spec['galaxy_size'], spec['empires'])
+    filled = {resource: {} for resource in RESOURCES}
+    for turn in range(1, spec['turns'] + 2):
+        if turn > 1:
+            run_ai_phase(state, list(state.empires), budget=float('inf'), parallel=False)
+        holdings = state.holdings()
+        capacity = {empire_id: state.capacity(empire_id, holdings) for empire_id in state.empires}
+        produce_resources(state)
+        for resource in RESOURCES:
+            for empire in state.empires.values():
+                if (empire.id not in filled[resource]
+                        and getattr(empire, f'{resource}_storage') >= capacity[empire.id][resource]):
+                    filled[resource][empire.id] = turn
+
+    holdings = state.holdings()
+    result = dict(
+        spec, systems=len(state.planets),
+        bodies_owned_mean=round(
+            sum(len(planets) + len(belts) for planets, belts in holdings.values()) / len(holdings), 2
+        ) if holdings else 0.0
+    )
+    for resource in RESOURCES:
+        storage = [float(getattr(empire, f'{resource}_storage')) for empire in state.empires.values()]
+        result[f'{resource}_storage_mean'] = round(sum(storage) / len(storage), 2) if storage else 0.0
+        result[f'{resource}_storage_min'] = min(storage, default=0.0)
+        result[f'{resource}_storage_max'] = max(storage, default=0.0)
+        turns = list(filled[resource].values())
+        result[f'{resource}_filled_turn'] = round(sum(turns) / len(turns), 2) if turns else None
+    return result
+
+
+def _init_worker():
+    """Set up Django in worker processes started without a copy of the parent."""
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def run_simulations(specs, workers=None, chunksize=16):
+    """Simulate games, in parallel across processes.
+
+    Args:
+        specs (list): Game specifications from :func:`make_specs`
+        workers (int): Number of processes, defaults to the number of CPUs;
+            1 simulates in this process
+        chunksize (int): Games handed to a process at a time
+
+    Yields:
+        dict: Game summaries, in the order of the specs
+    """
+    if workers == 1:
+        yield from map(simulate_game, specs)
+        return
+    with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+        yield from pool.imap(simulate_game, specs, chunksize)
+
+
+def write_results(results, stream, output_format='csv'):
+    """Write game summaries as they arrive.
+
+    Args:
+        results (Iterable): Game summaries from :func:`run_simulations`
+        stream: The text stream to write to
+        output_format (str): ``csv`` or ``ndjson``
+
+    Returns:
+        int: Number of written summaries
+    """
+    count = 0
+    writer = None
+    for result in results:
+        if output_format == 'ndjson':
+            stream.write(json.dumps(result) + '\n')
+        else:
+            if writer is None:
+                writer = csv.DictWriter(stream, fieldnames=list(result))
+                writer.writeheader()
+            writer.writerow(result)
+        count += 1
+    return count
@@ -0,0 +1,248 @@
+"""Compact save-game snapshots for the space conquest game.
+
+A snapshot holds an entire game (the game, its players, empires, stars,
+systems, planets, asteroid belts and research) in a versioned, compressed,
+columnar document, for save slots, backups and moving games between servers:
+
+- :func:`export_snapshot` reads each table with one query
+- :func:`import_snapshot` recreates the game with one bulk insert per table,
+  remapping every ID, so export and import cost a constant number of
+  statements however large the galaxy is
+
+Document layout (gzip-compressed JSON)::
+
+    {
+        "format": "spacegame-snapshot",
+        "version": 1,
+        "game": {"id": 7, "turn": 12, "turn_duration": 3600},
+        "races": {"7": "Human"},
+        "technologies": {"3": "Basic Mining"},
+        "tables": {
+            "empires": {"id": [1, 2], "name": ["Human Empire", "Zorg"], ...},
+            ...
+        }
+    }
+
+Each table maps column names to lists of values, row ``i`` being the
+``i``-th value of every column. Fixed-point columns hold their stored
+integers. Columns added to the models after a snapshot was written are
+missing from it, and get their default on import. An imported game with a
+turn duration starts a full turn before its deadline. Races and technologies
+are shared reference data, so they are matched by name on import; missing
+races are created, missing technologies are an error.
+"""
+
+import datetime
+import gzip
+import json
+import zlib
+from decimal import Decimal
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from celestial.models import Planet, AsteroidBelt, System, Star
+from core.fields import FixedPointField
+from research.models import Technology, EmpireTechnology
+from .models import Player, Race, Empire, Game
+
+SNAPSHOT_FORMAT = 'spacegame-snapshot'
+
+SNAPSHOT_VERSION = 1
+
+SNAPSHOT_CONTENT_TYPE = 'application/gzip'
+
+DEFAULT_GAME_SNAPSHOT_MAX_SIZE = 64 * 1024 * 1024
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot can't be read or restored."""
+
+
+# (table, model, lookup from the model to the game ID, {column: referenced table}),
+# in insert order. References to "races" and "technologies" are matched by name.
+SNAPSHOT_TABLES = [
+    ('players', Player, 'empires__game', {}),
+    ('stars', Star, 'system__game', {}),
+    ('systems', System, 'game', {'star_id': 'stars'}),
+    ('empires', Empire, 'game', {'player_id': 'players', 'race_id': 'races'}),
+    ('planets', Planet, 'system__game', {'system_id': 'systems', 'empire_id': 'empires'}),
+    ('asteroid_belts', AsteroidBelt, 'system__game', {'system_id': 'systems', 'empire_id': 'empires'}),
+    ('empire_technologies', EmpireTechnology, 'empire__game',
+     {'empire_id': 'empires', 'technology_id': 'technologies'}),
+]
+
+
+def _columns(model):
+    """Get the fields of a model stored in snapshots, keyed by column name."""
+    return {
+        field.attname: field for field in model._meta.concrete_fields
+        if field.attname != 'game_id'
+    }
+
+
+def _encode(field, value):
+    """Convert a model value to a JSON value."""
+    if value is None:
+        return None
+    if isinstance(field, FixedPointField):
+        return field.get_prep_value(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def _decode(field, value):
+    """Convert a JSON value back to a model value."""
+    if value is None:
+        return None
+    if isinstance(field, FixedPointField):
+        # Stored integers, not decimal amounts
+        return Decimal(value) / field.scale
+    return field.to_python(value)
+
+
+def export_snapshot(game):
+    """Build the snapshot document of a game.
+
+    Args:
+        game (Game): The game
+
+    Returns:
+        dict: The snapshot document
+    """
+    tables = {}
+    for name, model, lookup, _ in SNAPSHOT_TABLES:
+        columns = _columns(model)
+        rows = model.objects.filter(**{lookup: game.id}).order_by('pk').distinct().values_list(*columns)
+        values = list(zip(*rows)) or [()] * len(columns)
+        tables[name] = {
+            column: [_encode(field, value) for value in column_values]
+            for (column, field), column_values in zip(columns.items(), values)
+        }
+    race_ids = set(tables['empires']['race_id'])
+    technology_ids = set(tables['empire_technologies']['technology_id'])
+    return {
+        'format': SNAPSHOT_FORMAT,
+        'version': SNAPSHOT_VERSION,
+        'game': {'id': game.id, 'turn': game.turn, 'turn_duration': game.turn_duration},
+        'races': {str(pk): name for pk, name in Race.objects.filter(pk__in=race_ids).values_list('id', 'name')},
+        'technologies': {
+            str(pk): name
+            for pk, name in Technology.objects.filter(pk__in=technology_ids).values_list('id', 'name')
+        },
+        'tables': tables,
+    }
+
+
+def encode_snapshot(document):
+    """Compress a snapshot document.
+
+    Args:
+        document (dict): The snapshot document
+
+    Returns:
+        bytes: The gzip-compressed JSON
+    """
+    return gzip.compress(json.dumps(document, separators=(',', ':')).encode('utf-8'))
+
+
+def decode_snapshot(data):
+    """Decompress and check a snapshot.
+
+    At most ``GAME_SNAPSHOT_MAX_SIZE`` bytes are decompressed, so a small
+    upload can't expand into an unbounded amount of memory.
+
+    Args:
+        data (bytes): The gzip-compressed JSON
+
+    Returns:
+        dict: The snapshot document
+
+    Raises:
+        SnapshotError: If the data isn't a snapshot of a supported version,
+            or is larger than allowed
+    """
+    limit = getattr(settings, 'GAME_SNAPSHOT_MAX_SIZE', DEFAULT_GAME_SNAPSHOT_MAX_SIZE)
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        raw = decompressor.decompress(data, limit + 1)
+    except zlib.error as e:
+        raise SnapshotError(f'Not a compressed snapshot: {e}')
+    if len(raw) > limit:
+        raise SnapshotError(f'Snapshot is larger than {limit} bytes')
+    if not decompressor.eof:
+        raise SnapshotError('Not a compressed snapshot: truncated data')
+    try:
+        document = json.loads(raw)
+    except ValueError as e:
+        raise SnapshotError(f'Not a compressed snapshot: {e}')
+    if not isinstance(document, dict) or document.get('format') != SNAPSHOT_FORMAT:
+        raise SnapshotError('Not a game snapshot')
+    if document.get('version') != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {document.get('version')}")
+    return document
+
+
+def _reference_ids(document):
+    """Map the race and technology IDs of a snapshot to this server's IDs."""
+    races = document.get('races', {})
+    Race.objects.bulk_create([Race(name=name) for name in set(races.values())], ignore_conflicts=True)
+    race_ids = dict(Race.objects.filter(name__in=races.values()).values_list('name', 'id'))
+
+    technologies = document.get('technologies', {})
+    technology_ids = dict(
+        Technology.objects.filter(name__in=technologies.values()).values_list('name', 'id')
+    )
+    missing = set(technologies.values()) - set(technology_ids)
+    if missing:
+        raise SnapshotError(f"Unknown technologies: {', '.join(sorted(missing))}")
+    return {
+        'races': {int(pk): race_ids[name] for pk, name in races.items()},
+        'technologies': {int(pk): technology_ids[name] for pk, name in technologies.items()},
+    }
+
+
+@transaction.atomic
+def import_snapshot(document):
+    """Restore a snapshot as a new game.
+
+    Args:
+        document (dict): The snapshot document, see :func:`decode_snapshot`
+
+    Returns:
+        Game: The new game
+
+    Raises:
+        SnapshotError: If the snapshot is inconsistent
+    """
+    try:
+        ids = _reference_ids(document)
+        # Snapshots before turn timers have no turn duration
+        game = Game(turn=document['game']['turn'], turn_duration=document['game'].get('turn_duration'))
+        game.turn_deadline = game.next_turn_deadline()
+        game.save()
+        for name, model, lookup, references in SNAPSHOT_TABLES:
+            columns = _columns(model)
+            scoped = any(field.attname == 'game_id' for field in model._meta.concrete_fields)
+            table = document['tables'][name]
+            old_ids = table['id']
+            rows = []
+            for i in range(len(old_ids)):
+                values = {
+                    column: _decode(field, table[column][i]) if column in table else field.get_default()
+                    for column, field in columns.items() if column != 'id'
+                }
+                for column, referenced in references.items():
+                    if values[column] is not None:
+                        values[column] = ids[referenced][values[column]]
+                if scoped:
+                    values['game_id'] = game.id
+                rows.append(model(**values))
+            created = model.objects.bulk_create(rows)
+            ids[name] = dict(zip(old_ids, (row.pk for row in created)))
+    except SnapshotError:
+        raise
+    except (KeyError, IndexError, TypeError, ValueError, IntegrityError) as e:
+        raise SnapshotError(f'Invalid snapshot: {e!r}')
+    return game
@@ -12,53 +12,16 @@ all required components are properly initialized.
 
 import logging
 from django.db import transaction
-from enum import Enum
 from play.models import Player, Race, Empire, Game
 from play import turn
+from play.galaxy import (
+    GalaxySize, GALAXY_SIZE_SYSTEM_COUNTS, TERRAN_PLANET, ASTEROID_BELT, system_coordinates, colony_count
+)
+from play.versioning import deferred_version_bumps
 from celestial.models import System, Star, Planet, AsteroidBelt
 
 logger = logging.getLogger(__name__)
 
-class GalaxySize(str, Enum):
-    """Enumeration of available galaxy sizes and their properties.
-    
-    Each size determines the number of star systems in the galaxy:
-    - TINY: 2 systems
-    - SMALL: 5 systems
-    - MEDIUM: 10 systems
-    - LARGE: 15 systems
-    """
-    TINY = "tiny"
-    SMALL = "small"
-    MEDIUM = "medium"
-    LARGE = "large"
-
-    @classmethod
-    def choices(cls):
-        """Get list of valid galaxy size choices.
-        
-        Returns:
-            list: List of valid galaxy size values
-        """
-        return [size.value for size in cls]
-
-    @property
-    def system_count(self):
-        """Get the number of star systems for this galaxy size.
-        
-        Returns:
-            int: Number of star systems
-        """
-        return GALAXY_SIZE_SYSTEM_COUNTS[self]
-
-# Move system counts to a separate dict to keep the enum clean
-GALAXY_SIZE_SYSTEM_COUNTS = {
-    GalaxySize.TINY: 2,
-    GalaxySize.SMALL: 5,
-    GalaxySize.MEDIUM: 10,
-    GalaxySize.LARGE: 15
-}
-
 def create_star_system(game, x, y):
     """Create a single star system at the specified coordinates.
     
@@ -80,29 +43,11 @@ def create_star_system(game, x, y):
     )
     
     # Add a terran planet in orbit 1
-    planet = Planet.objects.create(
-        system=system,
-        orbit=1,
-        mineral_production=75,
-        organic_production=75,
-        radioactive_production=25,
-        exotic_production=25,
-        mineral_storage_capacity=150,
-        organic_storage_capacity=150,
-        radioactive_storage_capacity=100,
-        exotic_storage_capacity=100
-    )
+    planet = Planet.objects.create(system=system, **TERRAN_PLANET)
     logger.debug(f"Created terran planet in orbit 1 of system {system.id}")
     
     # Add an asteroid belt in orbit 2
-    belt = AsteroidBelt.objects.create(
-        system=system,
-        orbit=2,
-        mineral_production=100,
-        organic_production=25,
-        radioactive_production=75,
-        exotic_production=50
-    )
+    belt = AsteroidBelt.objects.create(system=system, **ASTEROID_BELT)
     logger.debug(f"Created asteroid belt in orbit 2 of system {system.id}")
     
     return system
@@ -118,14 +63,14 @@ def create_star_systems(game, count):
         list: List of created System instances
         
     Note:
-        Currently uses a simple placement algorithm with fixed spacing.
+        Currently uses a simple placement algorithm with fixed spacing
+        (see :func:`play.galaxy.system_coordinates`).
         Future versions may implement more sophisticated galaxy generation.
     """
     logger.info(f"Creating {count} star systems for game {game.id}")
     systems = []
     for i in range(count):
-        x = i * 2
-        y = i * 2
+        x, y = system_coordinates(i)
         system = create_star_system(game, x, y)
         systems.append(system)
     logger.info(f"Successfully created {len(systems)} star systems")
@@ -175,12 +120,11 @@ def assign_colony_planets(game):
     total_systems = len(systems)
     logger.debug(f"Found {total_systems} existing systems")
     
-    systems_needed = max(total_empires - total_systems, 0)
+    systems_needed = colony_count(total_empires, total_systems) - total_systems
     if systems_needed > 0:
         logger.info(f"Creating {systems_needed} additional systems for colony assignment")
         for i in range(systems_needed):
-            x = (total_systems + i) * 2
-            y = (total_systems + i) * 2
+            x, y = system_coordinates(total_systems + i)
             system = create_star_system(game, x, y)
             systems.append(system)
     
@@ -245,29 +189,31 @@ def start_game(data):
     else:
         logger.debug("Using existing Human race")
     
-    # Create game
-    game = Game.objects.create(turn=0)
-    logger.info(f"Created new game with ID {game.id}")
+    # Bump the new game's version once rather than once per created row
+    with deferred_version_bumps():
+        # Create game
+        game = Game.objects.create(turn=0)
+        logger.info(f"Created new game with ID {game.id}")
     
-    # Create star systems based on galaxy size
-    create_star_systems(game, GALAXY_SIZE_SYSTEM_COUNTS[galaxy_size])
+        # Create star systems based on galaxy size
+        create_star_systems(game, GALAXY_SIZE_SYSTEM_COUNTS[galaxy_size])
     
-    # Create human player and empire
-    human_player = Player.objects.create(player_type=Player.PlayerType.HUMAN)
-    human_empire = Empire.objects.create(
-        name=data['player_empire_name'],
-        player=human_player,
-        race=race,
-        game=game
-    )
-    logger.info(f"Created human empire '{human_empire.name}' with ID {human_empire.id}")
+        # Create human player and empire
+        human_player = Player.objects.create(player_type=Player.PlayerType.HUMAN)
+        human_empire = Empire.objects.create(
+            name=data['player_empire_name'],
+            player=human_player,
+            race=race,
+            game=game
+        )
+        logger.info(f"Created human empire '{human_empire.name}' with ID {human_empire.id}")
     
-    # Create computer empires
-    create_computer_empires(game, data['computer_empire_count'], race)
+        # Create computer empires
+        create_computer_empires(game, data['computer_empire_count'], race)
     
-    # Assign colony planets to all empires
-    assign_colony_planets(game)
-    game = turn.process(game)
+        # Assign colony planets to all empires
+        assign_colony_planets(game)
+        game = turn.process(game)
     
     logger.info(f"Successfully completed game initialization for game {game.id}")
     return game 
\ No newline at end of file
@@ -0,0 +1,225 @@
+"""In-memory game state for the space conquest game.
+
+:class:`GameState` holds a game's empires, planets, asteroid belts and
+research as compact ``__slots__`` records, loaded with one query per table.
+Turn processing, and later AI and combat phases, work on the records
+instead of model instances, so a phase costs no queries however many rows
+it reads or changes.
+
+Records remember the values they were loaded with. :meth:`GameState.flush`
+writes back only the rows whose tracked values changed, with one bulk
+UPDATE per table, and records them in the game's change log (see
+:mod:`play.versioning`).
+
+The records carry the model attribute names, so the rules in
+:mod:`play.economy` apply to them unchanged.
+"""
+
+import logging
+from celestial.models import Planet, AsteroidBelt
+from research.models import EmpireTechnology
+from .economy import RESOURCES, total_production, total_capacity
+from .models import Empire, GameChange
+from .versioning import deferred_version_bumps, record_changes
+
+logger = logging.getLogger(__name__)
+
+PRODUCTION_FIELDS = tuple(f'{resource}_production' for resource in RESOURCES)
+
+CAPACITY_FIELDS = tuple(f'{resource}_storage_capacity' for resource in RESOURCES)
+
+STORAGE_FIELDS = tuple(f'{resource}_storage' for resource in RESOURCES)
+
+
+class Record:
+    """A row of a game table held in memory.
+
+    Subclasses list their columns in ``__slots__``; ``tracked`` names the
+    columns that are written back when they change.
+    """
+    __slots__ = ('_loaded',)
+    tracked = ()
+
+    def __init__(self, **values):
+        for name, value in values.items():
+            setattr(self, name, value)
+        self.mark_clean()
+
+    def _tracked_values(self):
+        """Get the current values of the tracked columns."""
+        return tuple(getattr(self, name) for name in self.tracked)
+
+    def changed_fields(self):
+        """Get the tracked columns whose values changed since loading or flushing.
+
+        Returns:
+            list: Column names
+        """
+        return [
+            name for name, old, new in zip(self.tracked, self._loaded, self._tracked_values())
+            if old != new
+        ]
+
+    @property
+    def dirty(self):
+        """Whether any tracked column changed since loading or flushing."""
+        return self._loaded != self._tracked_values()
+
+    def mark_clean(self):
+        """Treat the current values as the stored ones."""
+        self._loaded = self._tracked_values()
+
+    def __repr__(self):
+        return f'<{type(self).__name__} {self.id}>'
+
+
+class EmpireState(Record):
+    """An empire and its resource storage."""
+    __slots__ = ('id', 'name', 'player_id') + STORAGE_FIELDS
+    tracked = STORAGE_FIELDS
+
+
+class AsteroidBeltState(Record):
+    """An asteroid belt, its owner and its production."""
+    __slots__ = ('id', 'system_id', 'orbit', 'empire_id') + PRODUCTION_FIELDS
+    tracked = ('empire_id',) + PRODUCTION_FIELDS
+
+
+class PlanetState(Record):
+    """A planet, its owner, production and storage capacity."""
+    __slots__ = ('id', 'system_id', 'orbit', 'empire_id') + PRODUCTION_FIELDS + CAPACITY_FIELDS
+    tracked = ('empire_id',) + PRODUCTION_FIELDS + CAPACITY_FIELDS
+
+
+class ResearchState(Record):
+    """An empire's progress on a technology."""
+    __slots__ = ('id', 'empire_id', 'technology_id', 'research_points')
+    tracked = ('research_points',)
+
+
+# (attribute, record class, model, change kind, lookup from the model to the game ID)
+TABLES = [
+    ('empires', EmpireState, Empire, GameChange.Kind.EMPIRE, 'game'),
+    ('planets', PlanetState, Planet, GameChange.Kind.PLANET, 'system__game'),
+    ('asteroid_belts', AsteroidBeltState, AsteroidBelt, GameChange.Kind.ASTEROID_BELT, 'system__game'),
+    ('research', ResearchState, EmpireTechnology, GameChange.Kind.RESEARCH, 'empire__game'),
+]
+
+
+class GameState:
+    """The mutable state of a game, held in memory.
+
+    Attributes:
+        game (Game): The game
+        empires (dict): :class:`EmpireState` records by ID
+        planets (dict): :class:`PlanetState` records by ID
+        asteroid_belts (dict): :class:`AsteroidBeltState` records by ID
+        research (dict): :class:`ResearchState` records by ID
+    """
+
+    def __init__(self, game, empires=(), planets=(), asteroid_belts=(), research=()):
+        self.game = game
+        self.empires = {record.id: record for record in empires}
+        self.planets = {record.id: record for record in planets}
+        self.asteroid_belts = {record.id: record for record in asteroid_belts}
+        self.research = {record.id: record for record in research}
+
+    @classmethod
+    def load(cls, game):
+        """Load the state of a game with one query per table.
+
+        Args:
+            game (Game): The game
+
+        Returns:
+            GameState: The game's state
+        """
+        tables = {}
+        for name, record_class, model, _, lookup in TABLES:
+            columns = [column for column in record_class.__slots__]
+            tables[name] = [
+                record_class(**dict(zip(columns, row)))
+                for row in model.objects.filter(**{lookup: game.id}).order_by('pk').values_list(*columns)
+            ]
+        return cls(game, **tables)
+
+    def holdings(self):
+        """Group the planets and asteroid belts by owner.
+
+        Returns:
+            dict: ``(planets, asteroid_belts)`` lists by empire ID
+        """
+        holdings = {empire_id: ([], []) for empire_id in self.empires}
+        for planet in self.planets.values():
+            if planet.empire_id in holdings:
+                holdings[planet.empire_id][0].append(planet)
+        for belt in self.asteroid_belts.values():
+            if belt.empire_id in holdings:
+                holdings[belt.empire_id][1].append(belt)
+        return holdings
+
+    def production(self, empire_id, holdings=None):
+        """Sum the per-turn production of an empire's planets and asteroid belts.
+
+        Args:
+            empire_id (int): The empire ID
+            holdings (dict): Result of :meth:`holdings`, to reuse across empires
+
+        Returns:
+            dict: Total production keyed by resource name
+        """
+        planets, belts = (holdings or self.holdings())[empire_id]
+        return total_production(planets + belts)
+
+    def capacity(self, empire_id, holdings=None):
+        """Sum the storage capacity of an empire's planets.
+
+        Args:
+            empire_id (int): The empire ID
+            holdings (dict): Result of :meth:`holdings`, to reuse across empires
+
+        Returns:
+            dict: Total capacity keyed by resource name
+        """
+        planets, _ = (holdings or self.holdings())[empire_id]
+        return total_capacity(planets)
+
+    def dirty(self):
+        """Get the records changed since loading or the last flush.
+
+        Returns:
+            dict: Lists of dirty records by table attribute name
+        """
+        return {
+            name: [record for record in getattr(self, name).values() if record.dirty]
+            for name, *_ in TABLES
+        }
+
+    def flush(self):
+        """Write the changed records back with one bulk UPDATE per table.
+
+        Only the changed rows are written, and only the tracked columns that
+        changed in some of them. The rows are recorded in the change log.
+
+        Returns:
+            dict: Number of written rows by table attribute name
+        """
+        written = {}
+        dirty = self.dirty()
+        with deferred_version_bumps():
+            for name, _, model, kind, _ in TABLES:
+                records = dirty[name]
+                written[name] = len(records)
+                if not records:
+                    continue
+                fields = sorted({field for record in records for field in record.changed_fields()})
+                model.objects.bulk_update(
+                    [model(pk=record.id, **{field: getattr(record, field) for field in fields})
+                     for record in records],
+                    [model._meta.get_field(field).name for field in fields]
+                )
+                record_changes(self.game.id, kind, [record.id for record in records])
+                for record in records:
+                    record.mark_clean()
+        logger.debug(f"Flushed state of game {self.game.id}: {written}")
+        return written
@@ -0,0 +1,64 @@
+"""Builders of test games shared by the play test modules."""
+
+from play.models import Game, Empire, Player, Race
+from celestial.models import Planet, AsteroidBelt, System, Star
+from research.models import Technology, EmpireTechnology
+
+
+def create_game(race, systems=2):
+    """Create a game with two empires, research, changes and systems with bodies."""
+    game = Game.objects.create(turn=1)
+    technology, _ = Technology.objects.get_or_create(
+        name="Mining", defaults={'description': '', 'category': 'physics', 'cost': 10}
+    )
+    empires = [
+        Empire.objects.create(name=f"Empire {i}", player=Player.objects.create(), race=race, game=game)
+        for i in range(2)
+    ]
+    for empire in empires:
+        EmpireTechnology.objects.create(empire=empire, technology=technology)
+    for i in range(systems):
+        system = System.objects.create(x=i, y=0, star=Star.objects.create(star_type="yellow"), game=game)
+        Planet.objects.create(system=system, orbit=1, empire=empires[i % 2])
+        AsteroidBelt.objects.create(system=system, orbit=2)
+    return game
+
+
+def create_empire_game(name="Test", planets=1):
+    """Create a game with an empire, a system, owned planets and an asteroid belt.
+
+    Returns:
+        tuple: The game and its empire
+    """
+    game = Game.objects.create(turn=0)
+    empire = Empire.objects.create(
+        name=f"{name} Empire",
+        player=Player.objects.create(),
+        race=Race.objects.create(name=f"{name} Race"),
+        game=game
+    )
+    system = System.objects.create(x=1, y=1, star=Star.objects.create(star_type="yellow"), game=game)
+    for orbit in range(1, planets + 1):
+        Planet.objects.create(system=system, orbit=orbit, empire=empire)
+    AsteroidBelt.objects.create(system=system, orbit=planets + 1, empire=empire)
+    return game, empire
+
+
+def game_contents(game):
+    """Get the rows of a game without their IDs, for comparing games."""
+    return {
+        'turn': game.turn,
+        'empires': sorted(Empire.objects.filter(game=game).values_list(
+            'name', 'race__name', 'player__player_type', 'mineral_storage', 'exotic_storage'
+        )),
+        'systems': sorted(System.objects.filter(game=game).values_list('x', 'y', 'star__star_type')),
+        'planets': sorted(Planet.objects.filter(system__game=game).values_list(
+            'system__x', 'orbit', 'empire__name', 'mineral_production', 'mineral_storage_capacity'
+        )),
+        'asteroid_belts': sorted(AsteroidBelt.objects.filter(system__game=game).values_list(
+            'system__x', 'orbit', 'empire__name', 'exotic_production'
+        )),
+        'research': sorted(EmpireTechnology.objects.filter(empire__game=game).values_list(
+            'empire__name', 'technology__name', 'research_points'
+        )),
+    }
@@ -0,0 +1,121 @@
+"""Tests for the computer empire AI.
+
+This module verifies that the AI ranks claims within its time budget, that
+contested bodies are resolved deterministically, that only computer empires
+act during turn processing, and that deciding in a process pool gives the
+same orders as deciding in-process.
+"""
+
+from django.test import TestCase, override_settings
+from play.ai import (
+    RANKED_CLAIMS, apply_orders, decide_orders, get_pool, run_ai_phase, shutdown_pool, snapshot, start_pool
+)
+from play.models import Empire, Player
+from play.simulation import generate_state
+from play.start import start_game
+from play.state import GameState
+from play.turn import process
+from celestial.models import Planet, AsteroidBelt
+
+
+class DecideOrdersTests(TestCase):
+    """Test suite for ranking an empire's claims."""
+
+    def test_ranks_claims(self):
+        """Test that a full search ranks the best bodies first"""
+        state = generate_state('small', 2)
+        decision = decide_orders(snapshot(state), 1, float('inf'))
+        self.assertEqual(decision['empire'], 1)
+        self.assertGreater(decision['depth'], 0)
+        self.assertEqual(len(decision['claims']), RANKED_CLAIMS)
+        # Planets add storage capacity, which the empire needs before production counts
+        self.assertEqual(decision['claims'][0][0], 'planets')
+        free = {('planets', planet.id) for planet in state.planets.values() if planet.empire_id is None}
+        free |= {('asteroid_belts', belt.id) for belt in state.asteroid_belts.values()}
+        self.assertTrue(set(decision['claims']) <= free)
+
+    def test_exhausted_budget(self):
+        """Test that an empire out of time still gets the heuristic ranking"""
+        state = generate_state('small', 2)
+        decision = decide_orders(snapshot(state), 1, -1)
+        self.assertEqual(decision['depth'], 0)
+        self.assertEqual(len(decision['claims']), RANKED_CLAIMS)
+
+    def test_nothing_to_claim(self):
+        """Test that an empire makes no claims when every body is owned"""
+        state = generate_state('tiny', 2)
+        for belt in state.asteroid_belts.values():
+            belt.empire_id = 1
+        decision = decide_orders(snapshot(state), 2, float('inf'))
+        self.assertEqual(decision['claims'], [])
+
+
+class ApplyOrdersTests(TestCase):
+    """Test suite for applying claims to the game state."""
+
+    def test_contested_claims(self):
+        """Test that the lowest empire ID wins a contested body and the other takes its next choice"""
+        state = generate_state('small', 2)
+        decisions = [
+            {'empire': 2, 'claims': [('planets', 3), ('asteroid_belts', 1)], 'depth': 1},
+            {'empire': 1, 'claims': [('planets', 3), ('planets', 4)], 'depth': 1},
+        ]
+        claimed = apply_orders(state, decisions)
+        self.assertEqual(claimed, {1: ('planets', 3), 2: ('asteroid_belts', 1)})
+        self.assertEqual(state.planets[3].empire_id, 1)
+        self.assertIsNone(state.planets[4].empire_id)
+        self.assertEqual(state.asteroid_belts[1].empire_id, 2)
+
+    def test_run_without_pool(self):
+        """Test that a phase decides and claims one body per empire"""
+        state = generate_state('medium', 3)
+        claimed = run_ai_phase(state, [1, 2, 3], budget=float('inf'), parallel=False)
+        self.assertEqual(len(claimed), 3)
+        self.assertEqual(len(set(claimed.values())), 3)
+        self.assertEqual(len(state.dirty()['planets']) + len(state.dirty()['asteroid_belts']), 3)
+
+
+class AIPhaseTests(TestCase):
+    """Test suite for the AI phase of turn processing."""
+
+    def setUp(self):
+        """Start a game with a player and two computer empires."""
+        self.game = start_game({'player_empire_name': 'Player', 'computer_empire_count': 2, 'galaxy_size': 'small'})
+        self.player_empire = Empire.objects.get(game=self.game, player__player_type=Player.PlayerType.HUMAN)
+
+    def owned(self):
+        """Count owned bodies by empire ID."""
+        counts = {}
+        for model in (Planet, AsteroidBelt):
+            for empire_id in model.objects.filter(system__game=self.game).values_list('empire_id', flat=True):
+                if empire_id is not None:
+                    counts[empire_id] = counts.get(empire_id, 0) + 1
+        return counts
+
+    def test_process_claims_for_computer_empires(self):
+        """Test that ending a turn claims one body for each computer empire only"""
+        before = self.owned()
+        process(self.game)
+        after = self.owned()
+        self.assertEqual(after[self.player_empire.id], before[self.player_empire.id])
+        computers = Empire.objects.filter(game=self.game, player__player_type=Player.PlayerType.COMPUTER)
+        for empire in computers:
+            self.assertEqual(after[empire.id], before[empire.id] + 1)
+
+    @override_settings(AI_WORKERS=2, AI_TURN_BUDGET=60)
+    def test_pool_matches_in_process(self):
+        """Test that deciding in the process pool gives the in-process orders"""
+        state = GameState.load(self.game)
+        empire_ids = list(Empire.objects.filter(
+            game=self.game, player__player_type=Player.PlayerType.COMPUTER
+        ).values_list('pk', flat=True))
+        serial = run_ai_phase(GameState.load(self.game), empire_ids, parallel=False)
+        self.assertIsNotNone(start_pool())
+        self.addCleanup(shutdown_pool)
+        self.assertEqual(run_ai_phase(state, empire_ids), serial)
+
+    @override_settings(AI_WORKERS=2)
+    def test_pool_not_started_by_turns(self):
+        """Test that processing a turn decides in process until a pool is started"""
+        process(self.game)
+        self.assertIsNone(get_pool())
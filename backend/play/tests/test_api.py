@@ -16,7 +16,7 @@ class PlayerAPITests(APITestCase):
         """Test retrieving a list of players"""
         response = self.client.get(self.player_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
 
     def test_create_player(self):
         """Test creating a new player"""
@@ -77,8 +77,8 @@ class RaceAPITests(APITestCase):
         url = reverse('race-list')
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['name'], 'Vulcans')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['name'], 'Vulcans')
 
     def test_retrieve_race(self):
         """Test retrieving a specific race"""
@@ -175,8 +175,8 @@ class EmpireAPITests(APITestCase):
         """Test retrieving a list of empires"""
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['name'], 'Test Empire')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['name'], 'Test Empire')
 
     def test_create_empire(self):
         """Test creating a new empire"""
@@ -193,7 +193,7 @@ class EmpireAPITests(APITestCase):
     def test_retrieve_empire(self):
         """Test retrieving a specific empire"""
         url = reverse('empire-detail', args=[self.empire.id])
-        response = self.client.get(url)
+        response = self.client.get(url, {'expand': 'resource_capacities'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['name'], 'Test Empire')
         self.assertEqual(response.data['player']['id'], self.player.id)
@@ -241,7 +241,7 @@ class EmpireAPITests(APITestCase):
             'race_id': self.race.id,
             'planet_ids': [self.planet1.id]  # Remove planet2
         }
-        response = self.client.put(url, data, format='json')
+        response = self.client.put(f'{url}?expand=planets,resource_capacities', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['planets']), 1)
         self.assertEqual(response.data['planets'][0]['id'], self.planet1.id)
@@ -261,7 +261,7 @@ class EmpireAPITests(APITestCase):
             'race_id': self.race.id,
             'asteroid_belt_ids': []  # Remove all asteroid belts
         }
-        response = self.client.put(url, data, format='json')
+        response = self.client.put(f'{url}?expand=asteroid_belts', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['asteroid_belts']), 0)
 
@@ -402,7 +402,7 @@ class GameAPITest(APITestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_get_game_detail(self):
         """Test getting details of a specific game"""
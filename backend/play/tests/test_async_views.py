@@ -0,0 +1,154 @@
+"""Tests for the async read views.
+
+This module verifies that the async read endpoints under ``/api/async/``
+return the same data, pages and ETags as the sync viewsets, delegate writes
+to them, and can replace them under ``/api/`` with ``ASYNC_READ_VIEWS``.
+"""
+
+import importlib
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import LiveServerTestCase, TestCase, override_settings
+from django.urls import clear_url_caches, resolve, reverse
+from play.management.commands.load_test_reads import percentile, summarize
+from research.models import Technology
+from .factories import create_empire_game
+
+
+@override_settings(GAME_READ_COALESCE_TIMEOUT=0)
+class AsyncReadViewTests(TestCase):
+    """Test suite comparing the async read views with the sync viewsets."""
+
+    def setUp(self):
+        """Create two games and a technology tree."""
+        cache.clear()
+        self.game, self.empire = create_empire_game(planets=2)
+        self.other_game, _ = create_empire_game("Other")
+        basic = Technology.objects.create(name="Basic", description="", category="physics", cost=10)
+        advanced = Technology.objects.create(name="Advanced", description="", category="physics", cost=20)
+        advanced.prerequisites.add(basic)
+
+    async def assertSameAsSync(self, name, args=(), params=None):
+        """Assert that an async route returns the same status, data and ETag as its sync route."""
+        sync = await self.async_client.get(reverse(name, args=args), params or {})
+        response = await self.async_client.get(reverse(f'async:{name}', args=args), params or {})
+        self.assertEqual(response.status_code, sync.status_code)
+        self.assertEqual(response.json(), sync.json())
+        self.assertEqual(response.get('ETag'), sync.get('ETag'))
+        return response
+
+    async def test_game_routes_match_sync(self):
+        """Test that game detail, systems and empires match the sync viewsets"""
+        args = [self.game.id]
+        response = await self.assertSameAsSync('game-detail', args)
+        self.assertIsNotNone(response['ETag'])
+        await self.assertSameAsSync('game-systems', args)
+        await self.assertSameAsSync('game-systems', args, {'fields': 'id,planets'})
+        await self.assertSameAsSync('game-empires', args)
+        await self.assertSameAsSync('game-empires', args, {'expand': 'planets,resource_capacities'})
+
+    async def test_empire_routes_match_sync(self):
+        """Test that empire planets and asteroid belts match the sync viewset"""
+        response = await self.assertSameAsSync('empire-planets', [self.empire.id])
+        self.assertEqual(len(response.json()), 2)
+        await self.assertSameAsSync('empire-asteroid-belts', [self.empire.id])
+        response = await self.async_client.get(reverse('async:empire-planets', args=[0]))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_list_pages_match_sync(self):
+        """Test that list pages match and their cursors work on both routes"""
+        await self.assertSameAsSync('technology-list')
+        url = reverse('async:game-list')
+        first = (await self.async_client.get(url, {'page_size': 1})).json()
+        sync_first = (await self.async_client.get(reverse('game-list'), {'page_size': 1})).json()
+        self.assertEqual(first['results'], sync_first['results'])
+        self.assertIsNone(first['previous'])
+
+        second = (await self.async_client.get(first['next'])).json()
+        self.assertEqual([game['id'] for game in second['results']], [self.other_game.id])
+        self.assertIsNone(second['next'])
+        # Async cursors are accepted by the sync viewset
+        sync_second = (await self.async_client.get(
+            sync_first['next'].split('?')[0] + '?' + second['previous'].split('?')[1]
+        )).json()
+        self.assertEqual(sync_second['results'], first['results'])
+        back = (await self.async_client.get(second['previous'])).json()
+        self.assertEqual(back['results'], first['results'])
+
+        response = await self.async_client.get(url, {'cursor': 'invalid'})
+        self.assertEqual(response.status_code, 404)
+
+    async def test_not_modified(self):
+        """Test that a current If-None-Match is answered with 304"""
+        url = reverse('async:game-systems', args=[self.game.id])
+        etag = (await self.async_client.get(url))['ETag']
+        response = await self.async_client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    async def test_unknown_game(self):
+        """Test that unknown games are not found"""
+        for name in ('async:game-detail', 'async:game-systems', 'async:game-empires'):
+            response = await self.async_client.get(reverse(name, args=[0]))
+            self.assertEqual(response.status_code, 404)
+
+    async def test_writes_are_delegated(self):
+        """Test that writes to shared routes reach the sync viewsets"""
+        response = await self.async_client.post(reverse('async:game-list'), {}, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['turn'], 0)
+        response = await self.async_client.delete(reverse('async:game-detail', args=[response.json()['id']]))
+        self.assertEqual(response.status_code, 204)
+        response = await self.async_client.post(reverse('async:game-systems', args=[self.game.id]))
+        self.assertEqual(response.status_code, 405)
+
+
+class AsyncReadViewSettingTests(TestCase):
+    """Test suite for serving the async views under ``/api/``."""
+
+    def reload_urls(self):
+        """Rebuild the URL configuration from the current settings."""
+        import spacegame.urls
+        importlib.reload(spacegame.urls)
+        clear_url_caches()
+
+    def test_setting_routes_reads_to_async_views(self):
+        """Test that ASYNC_READ_VIEWS puts the async views in front of the sync viewsets"""
+        try:
+            with override_settings(ASYNC_READ_VIEWS=True):
+                self.reload_urls()
+                self.assertEqual(resolve('/api/games/').namespace, 'async-default')
+                self.assertEqual(resolve('/api/technologies/').url_name, 'technology-list')
+                # Routes without an async view still reach the sync viewsets
+                self.assertEqual(resolve('/api/planets/').url_name, 'planet-list')
+                self.assertEqual(self.client.get('/api/games/').status_code, 200)
+        finally:
+            self.reload_urls()
+        self.assertEqual(resolve('/api/games/').namespace, '')
+
+
+class LoadTestCommandTests(LiveServerTestCase):
+    """Test suite for the read load test command."""
+
+    def test_percentiles(self):
+        """Test the run summary"""
+        self.assertEqual(percentile([0.3, 0.1, 0.2], 0.5), 0.2)
+        self.assertEqual(percentile([], 0.95), 0.0)
+        summary = summarize([0.1, 0.2], errors=2, elapsed=2.0)
+        self.assertEqual(summary['requests'], 4)
+        self.assertEqual(summary['rps'], 2.0)
+        self.assertAlmostEqual(summary['max'], 200.0)
+
+    def test_runs_against_server(self):
+        """Test that the command loads both route sets of a live server without errors"""
+        create_empire_game()
+        out = StringIO()
+        call_command(
+            'load_test_reads', '--base-url', self.live_server_url,
+            '--requests', '14', '--concurrency', '2', stdout=out
+        )
+        output = out.getvalue()
+        self.assertIn('async/sync throughput', output)
+        self.assertEqual(output.count('errors 0'), 2)
@@ -0,0 +1,123 @@
+"""Tests for simultaneous turns.
+
+This module verifies that ending a turn marks human empires ready with a
+single-row update, that the turn is processed once when the last human
+empire is ready or its deadline has passed, and never twice, and that
+rewound and forked games start their turn over.
+"""
+
+from datetime import timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from play.barrier import advance_turn, process_if_due
+from play.fork import fork_game
+from play.history import rewind_game
+from play.models import Empire, Game, Race
+from .factories import create_game
+
+
+class TurnBarrierTests(APITestCase):
+    """Test suite for ending turns in games with several human empires."""
+
+    def setUp(self):
+        """Create a game with two human empires."""
+        self.race = Race.objects.create(name="Test Race")
+        self.game = create_game(self.race)
+        self.empires = list(Empire.objects.filter(game=self.game).order_by('pk'))
+        self.url = reverse('game-end-turn', args=[self.game.id])
+
+    def end_turn(self, empire=None):
+        """End the turn for an empire and return the response."""
+        return self.client.post(self.url, {} if empire is None else {'empire': empire.id}, format='json')
+
+    def test_turn_waits_for_every_human(self):
+        """Test that the turn is processed when the last human empire ends it"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.end_turn(self.empires[0])
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['turn'], 1)
+        self.assertEqual(response.data['waiting_for'], [self.empires[1].id])
+        writes = [query['sql'] for query in queries if not query['sql'].startswith('SELECT')]
+        self.assertEqual(len(writes), 1)
+        self.assertIn('ready_turn', writes[0])
+
+        # Ending the turn again changes nothing
+        self.assertEqual(self.end_turn(self.empires[0]).status_code, status.HTTP_202_ACCEPTED)
+
+        response = self.end_turn(self.empires[1])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['turn'], 2)
+        self.assertNotIn('waiting_for', response.data)
+        # Readiness belongs to the ended turn
+        self.assertEqual(self.end_turn(self.empires[0]).data['waiting_for'], [self.empires[1].id])
+
+    def test_invalid_empire(self):
+        """Test that the empire is required with several humans and must be one of them"""
+        response = self.end_turn()
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('empire is required', response.data['error'])
+        other = Empire.objects.filter(game=create_game(self.race)).first()
+        response = self.end_turn(other)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.post(self.url, {'empire': 'x'}, format='json').status_code, 400)
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.turn, 1)
+
+    def test_deadline_passed(self):
+        """Test that a turn past its deadline is processed without waiting"""
+        Game.objects.filter(pk=self.game.id).update(
+            turn_duration=3600, turn_deadline=timezone.now() - timedelta(seconds=1)
+        )
+        response = self.end_turn(self.empires[0])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['turn'], 2)
+        # The next turn gets its own deadline
+        deadline = Game.objects.get(pk=self.game.id).turn_deadline
+        self.assertAlmostEqual(
+            (deadline - timezone.now()).total_seconds(), 3600, delta=60
+        )
+
+    def test_expired_deadline_processes_once(self):
+        """Test that an expired deadline processes the turn once and a pending one doesn't"""
+        Game.objects.filter(pk=self.game.id).update(turn_deadline=timezone.now() + timedelta(hours=1))
+        self.assertIsNone(process_if_due(self.game.id, 1))
+
+        Game.objects.filter(pk=self.game.id).update(turn_deadline=timezone.now() - timedelta(seconds=1))
+        game = process_if_due(self.game.id, 1)
+        self.assertEqual(game.turn, 2)
+        self.assertIsNone(game.turn_deadline)
+        self.assertIsNone(process_if_due(self.game.id, 1))
+        self.assertIsNone(advance_turn(self.game.id, 1))
+        self.assertEqual(Game.objects.get(pk=self.game.id).turn, 2)
+
+    def test_rewind_starts_turn_over(self):
+        """Test that after a rewind every human empire has to end the turn again"""
+        Game.objects.filter(pk=self.game.id).update(turn_duration=3600)
+        for _ in range(2):
+            self.end_turn(self.empires[0])
+            self.end_turn(self.empires[1])
+        game = Game.objects.get(pk=self.game.id)
+        self.assertEqual(game.turn, 3)
+        game.turn_deadline = timezone.now() - timedelta(seconds=1)
+        game.save()
+
+        rewind_game(game, 2)
+        self.assertFalse(Empire.objects.filter(game=self.game, ready_turn__isnull=False).exists())
+        self.assertGreater(Game.objects.get(pk=self.game.id).turn_deadline, timezone.now())
+        response = self.end_turn(self.empires[0])
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['waiting_for'], [self.empires[1].id])
+
+    def test_fork_starts_turn_over(self):
+        """Test that a forked game waits for every human empire"""
+        self.end_turn(self.empires[0])
+        fork = fork_game(Game.objects.get(pk=self.game.id))
+        self.assertFalse(Empire.objects.filter(game=fork, ready_turn__isnull=False).exists())
+        self.assertIsNone(fork.turn_deadline)
+        empire = Empire.objects.filter(game=fork).order_by('pk').first()
+        response = self.client.post(reverse('game-end-turn', args=[fork.id]), {'empire': empire.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
@@ -0,0 +1,112 @@
+"""Tests for the change log and the delta sync endpoint.
+
+This module verifies that writes and turn processing record changes, that
+the changes endpoint returns only rows changed after the requested turn, and
+that the change log is pruned to the configured horizon.
+"""
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from play.models import Game, GameChange, Empire, Player, Race
+from play.turn import process
+from celestial.models import Planet, AsteroidBelt, System, Star
+from research.models import Technology, EmpireTechnology
+
+
+class ChangeLogTests(APITestCase):
+    """Test suite for the change log and delta sync."""
+
+    def setUp(self):
+        """Create a game with two empires, a planet and an asteroid belt."""
+        self.game = Game.objects.create(turn=0)
+        race = Race.objects.create(name="Test Race")
+        self.empire = Empire.objects.create(
+            name="Test Empire", player=Player.objects.create(), race=race, game=self.game
+        )
+        self.other_empire = Empire.objects.create(
+            name="Other Empire", player=Player.objects.create(), race=race, game=self.game
+        )
+        system = System.objects.create(
+            x=1, y=1, star=Star.objects.create(star_type="yellow"), game=self.game
+        )
+        self.planet = Planet.objects.create(
+            system=system, orbit=1, empire=self.empire, mineral_storage_capacity=1000
+        )
+        self.belt = AsteroidBelt.objects.create(system=system, orbit=2)
+        self.game = process(self.game)
+        self.url = reverse('game-changes', args=[self.game.id])
+
+    def test_process_records_changed_empires(self):
+        """Test that turn processing logs the empires whose storage changed"""
+        changes = GameChange.objects.filter(game=self.game, turn=1, kind=GameChange.Kind.EMPIRE)
+        # The other empire owns nothing, so its storage stays empty
+        self.assertEqual(set(changes.values_list('object_id', flat=True)), {self.empire.id})
+
+    def test_changes_since_current_turn(self):
+        """Test that writes during a turn are returned for that turn"""
+        self.belt.empire = self.other_empire
+        self.belt.save()
+        response = self.client.get(self.url, {'since_turn': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['turn'], 1)
+        self.assertEqual([e['id'] for e in response.data['empires']], [self.empire.id])
+        self.assertEqual(response.data['asteroid_belts'][0]['empire'], self.other_empire.id)
+        self.assertEqual(response.data['planets'], [])
+
+        # A turn the game hasn't reached means it was rewound; the client reloads
+        response = self.client.get(self.url, {'since_turn': 2})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_changes_after_turn(self):
+        """Test that only rows changed after the given turn are returned"""
+        process(self.game)
+        self.planet.empire = self.other_empire
+        self.planet.save()
+        technology = Technology.objects.create(
+            name="Mining", description="", category=Technology.Category.RESOURCES
+        )
+        research = EmpireTechnology.objects.create(technology=technology, empire=self.empire)
+        self.game = process(self.game)
+
+        response = self.client.get(self.url, {'since_turn': 2})
+        self.assertEqual(response.data['turn'], 3)
+        self.assertEqual([p['id'] for p in response.data['planets']], [self.planet.id])
+        self.assertEqual(response.data['planets'][0]['empire'], self.other_empire.id)
+        self.assertEqual([r['id'] for r in response.data['research']], [research.id])
+        self.assertEqual(response.data['asteroid_belts'], [])
+        self.assertEqual(len(response.data['empires']), 2)
+
+    def test_deleted_rows(self):
+        """Test that deleted rows are listed as deleted"""
+        belt_id = self.belt.id
+        self.belt.delete()
+        response = self.client.get(self.url, {'since_turn': 1})
+        self.assertEqual(response.data['asteroid_belts'], [])
+        self.assertEqual(response.data['deleted']['asteroid_belts'], [belt_id])
+
+    def test_invalid_since_turn(self):
+        """Test that since_turn is required and must be an integer"""
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'since_turn': '-1'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(GAME_CHANGE_LOG_HORIZON=2)
+    def test_pruned_to_horizon(self):
+        """Test that old changes are pruned and requesting them returns 410"""
+        for _ in range(3):
+            self.game = process(self.game)
+        self.assertEqual(self.game.turn, 4)
+        self.assertFalse(GameChange.objects.filter(game=self.game, turn__lte=2).exists())
+        self.assertTrue(GameChange.objects.filter(game=self.game, turn=3).exists())
+
+        response = self.client.get(self.url, {'since_turn': 2})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        response = self.client.get(self.url, {'since_turn': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_game_delete(self):
+        """Test that deleting a game removes its change log"""
+        self.game.delete()
+        self.assertFalse(GameChange.objects.exists())
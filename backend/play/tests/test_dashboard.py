@@ -0,0 +1,129 @@
+"""Tests for the empire dashboard endpoint.
+
+This module verifies that the dashboard returns an empire's storage,
+capacities, production, colonies and research in one response, that it uses
+a fixed number of queries, and that it is cached per game version.
+"""
+
+from decimal import Decimal
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from play.models import Game, Empire, Player, Race
+from play.turn import process
+from celestial.models import Planet, AsteroidBelt, System, Star
+from research.models import Technology, EmpireTechnology
+
+
+@override_settings(GAME_READ_COALESCE_TIMEOUT=0)
+class DashboardAPITests(APITestCase):
+    """Test suite for the empire dashboard.
+
+    Request coalescing is disabled so each request reaches the dashboard cache.
+    """
+
+    def setUp(self):
+        """Create a game with a human and a computer empire."""
+        cache.clear()
+        self.game = Game.objects.create(turn=0)
+        race = Race.objects.create(name="Test Race")
+        self.empire = Empire.objects.create(
+            name="Human Empire",
+            player=Player.objects.create(player_type=Player.PlayerType.HUMAN),
+            race=race,
+            game=self.game,
+            mineral_storage=10
+        )
+        self.computer_empire = Empire.objects.create(
+            name="Computer Empire",
+            player=Player.objects.create(player_type=Player.PlayerType.COMPUTER),
+            race=race,
+            game=self.game
+        )
+        system = System.objects.create(
+            x=1, y=1, star=Star.objects.create(star_type="yellow"), game=self.game
+        )
+        self.planet = Planet.objects.create(
+            system=system, orbit=1, empire=self.empire,
+            mineral_production=75, mineral_storage_capacity=150
+        )
+        self.belt = AsteroidBelt.objects.create(
+            system=system, orbit=2, empire=self.empire, mineral_production=100
+        )
+        Planet.objects.create(system=system, orbit=3, empire=self.computer_empire)
+        done = Technology.objects.create(
+            name="Mining", description="", category=Technology.Category.RESOURCES, cost=50
+        )
+        pending = Technology.objects.create(
+            name="Lasers", description="", category=Technology.Category.MILITARY, cost=100
+        )
+        EmpireTechnology.objects.create(technology=done, empire=self.empire, research_points=50)
+        EmpireTechnology.objects.create(technology=pending, empire=self.empire, research_points=20)
+        self.url = reverse('game-dashboard', args=[self.game.id])
+
+    def test_dashboard(self):
+        """Test the dashboard contents for an empire"""
+        response = self.client.get(self.url, {'empire': self.empire.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data
+        self.assertEqual(data['turn'], 0)
+        self.assertEqual(data['empire']['name'], "Human Empire")
+        self.assertEqual(data['empire']['player']['player_type'], 'human')
+        self.assertEqual(data['storage']['mineral'], Decimal('10'))
+        self.assertEqual(data['capacities']['mineral_capacity'], Decimal('150'))
+        self.assertEqual(data['production']['mineral'], '175.00')
+        self.assertEqual([p['id'] for p in data['colonies']['planets']], [self.planet.id])
+        self.assertEqual([b['id'] for b in data['colonies']['asteroid_belts']], [self.belt.id])
+        self.assertEqual(data['research']['total'], 2)
+        self.assertEqual(data['research']['completed'], 1)
+        self.assertEqual(data['research']['in_progress'][0]['name'], "Lasers")
+        self.assertEqual(data['research']['research_points'], '70.00')
+
+    def test_amounts_match_other_endpoints(self):
+        """Test that amounts are rendered as on the empire, planet and research endpoints"""
+        data = self.client.get(self.url, {'empire': self.empire.id}).json()
+        empire = self.client.get(reverse('empire-detail', args=[self.empire.id])).json()
+        self.assertEqual(data['storage']['mineral'], empire['mineral_storage'])
+        planet = data['colonies']['planets'][0]
+        self.assertIsInstance(data['production']['mineral'], type(planet['mineral_production']))
+        research = self.client.get(reverse('empiretechnology-list')).json()['results']
+        self.assertIsInstance(data['research']['in_progress'][0]['research_points'],
+                              type(research[0]['research_points']))
+
+    def test_defaults_to_human_empire(self):
+        """Test that the human empire is used when no empire is given"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['empire']['id'], self.empire.id)
+
+    def test_empire_from_other_game(self):
+        """Test that empires outside the game are not found"""
+        other = Empire.objects.create(
+            name="Elsewhere", player=self.empire.player, race=self.empire.race,
+            game=Game.objects.create()
+        )
+        response = self.client.get(self.url, {'empire': other.id})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalid_empire(self):
+        """Test that a non-integer empire is rejected"""
+        response = self.client.get(self.url, {'empire': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_fixed_query_count(self):
+        """Test that the dashboard is built from a fixed number of queries"""
+        with self.assertNumQueries(6):
+            self.client.get(self.url, {'empire': self.empire.id})
+
+    def test_cached_per_version(self):
+        """Test that the dashboard is cached until the game version changes"""
+        self.client.get(self.url, {'empire': self.empire.id})
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {'empire': self.empire.id})
+        self.assertEqual(response.data['turn'], 0)
+
+        process(self.game)
+        response = self.client.get(self.url, {'empire': self.empire.id})
+        self.assertEqual(response.data['turn'], 1)
+        self.assertEqual(response.data['storage']['mineral'], Decimal('150'))
@@ -0,0 +1,133 @@
+"""Tests for server push of game events.
+
+This module verifies the in-process pub/sub fan-out and that the game event
+stream pushes a turn-completed event with the new turn and version when a
+turn is processed.
+"""
+
+import asyncio
+import gc
+import json
+import threading
+from asgiref.sync import sync_to_async
+from django.test import TestCase
+from django.urls import reverse
+from play.events import (
+    LocalPubSub, PostgresPubSub, get_pubsub, game_channel, format_event, local_pubsub_warning
+)
+from play.models import Game
+from play.turn import process
+from play.versioning import game_etag
+
+
+def parse_event(chunk):
+    """Parse a Server-Sent Event into its type and data."""
+    text = chunk.decode('utf-8') if isinstance(chunk, bytes) else chunk
+    lines = dict(line.split(': ', 1) for line in text.strip().splitlines())
+    return lines['event'], json.loads(lines['data'])
+
+
+class LocalPubSubTests(TestCase):
+    """Test suite for the in-process pub/sub backend."""
+
+    async def test_publish_from_other_thread(self):
+        """Test that messages published from any thread reach subscribers of the channel"""
+        pubsub = LocalPubSub()
+        subscription = pubsub.subscribe('game:1')
+        other = pubsub.subscribe('game:2')
+        publisher = threading.Thread(target=pubsub.publish, args=('game:1', {'event': 'test'}))
+        publisher.start()
+        publisher.join()
+        self.assertEqual(await subscription.get(1), {'event': 'test'})
+        self.assertIsNone(await other.get(0.01))
+
+    async def test_close_unsubscribes(self):
+        """Test that closed subscriptions no longer receive messages"""
+        pubsub = LocalPubSub()
+        subscription = pubsub.subscribe('game:1')
+        self.assertEqual(pubsub.subscriber_count('game:1'), 1)
+        subscription.close()
+        self.assertEqual(pubsub.subscriber_count('game:1'), 0)
+        self.assertEqual(pubsub.publish('game:1', {'event': 'test'}), 0)
+
+    async def test_postgres_notification_delivery(self):
+        """Test that PostgreSQL notifications reach the subscribers of their channel"""
+        pubsub = PostgresPubSub()
+        # Subscribed without starting the listener, which needs PostgreSQL
+        subscription = LocalPubSub.subscribe(pubsub, 'game:1')
+        other = LocalPubSub.subscribe(pubsub, 'game:2')
+        delivered = pubsub.deliver_notification(json.dumps({'channel': 'game:1', 'message': {'event': 'test'}}))
+        self.assertEqual(delivered, 1)
+        self.assertEqual(await subscription.get(1), {'event': 'test'})
+        self.assertIsNone(await other.get(0.01))
+
+    def test_local_pubsub_warning(self):
+        """Test that only backends limited to one process are warned about"""
+        self.assertIsInstance(get_pubsub(), LocalPubSub)
+        self.assertIn('play.events.PostgresPubSub', local_pubsub_warning())
+        self.assertTrue(PostgresPubSub.cross_process)
+
+    def test_format_event(self):
+        """Test the Server-Sent Event format"""
+        self.assertEqual(
+            format_event({'event': 'turn_completed', 'turn': 2}),
+            'event: turn_completed\ndata: {"event": "turn_completed", "turn": 2}\n\n'
+        )
+
+
+class GameEventStreamTests(TestCase):
+    """Test suite for the game event stream."""
+
+    def setUp(self):
+        """Create a game."""
+        self.game = Game.objects.create(turn=3)
+        self.url = reverse('game-events', args=[self.game.id])
+
+    async def test_stream_pushes_turn_completed(self):
+        """Test that the stream sends the current turn, then each processed turn"""
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = response.streaming_content
+
+        event, data = parse_event(await asyncio.wait_for(anext(stream), 5))
+        self.assertEqual(event, 'turn_completed')
+        self.assertEqual(data['turn'], 3)
+        self.assertEqual(data['version'], await sync_to_async(game_etag)(self.game.id))
+
+        def end_turn():
+            with self.captureOnCommitCallbacks(execute=True):
+                process(self.game)
+
+        await sync_to_async(end_turn)()
+        event, data = parse_event(await asyncio.wait_for(anext(stream), 5))
+        self.assertEqual(data['game'], self.game.id)
+        self.assertEqual(data['turn'], 4)
+        self.assertEqual(data['version'], await sync_to_async(game_etag)(self.game.id))
+
+        # Disconnected streams are finalized by the event loop and unsubscribe
+        await stream.aclose()
+        del stream, response
+        gc.collect()
+        await asyncio.sleep(0.01)
+        self.assertEqual(get_pubsub().subscriber_count(game_channel(self.game.id)), 0)
+
+    def test_turn_published_on_commit(self):
+        """Test that turn processing publishes only when the transaction commits"""
+        with self.captureOnCommitCallbacks() as callbacks:
+            process(self.game)
+        self.assertEqual(len(callbacks), 1)
+
+    def test_wsgi_fallback(self):
+        """Test that WSGI requests get the current turn and a reconnect delay"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.streaming)
+        retry, event = response.content.decode('utf-8').split('\n', 1)
+        self.assertEqual(retry, 'retry: 5000')
+        self.assertEqual(parse_event(event)[1]['turn'], 3)
+
+    async def test_unknown_game(self):
+        """Test that streams of unknown games are not found"""
+        response = await self.async_client.get(reverse('game-events', args=[0]))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,82 @@
+"""Tests for game forking.
+
+This module verifies that a fork copies every row of a game under new IDs,
+leaves the source game alone, and takes a fixed number of queries however
+large the game is.
+"""
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from play.fork import fork_game
+from play.models import Empire, Game, Player, Race
+from play.turn import process
+from celestial.models import Planet, System, Star
+from .factories import create_game, game_contents
+
+
+class ForkTests(TestCase):
+    """Test suite for forking games."""
+
+    def setUp(self):
+        """Create a game."""
+        self.race = Race.objects.create(name="Test Race")
+        self.game = create_game(self.race, systems=3)
+
+    def test_fork_copies_game(self):
+        """Test that a fork has the same contents under new IDs"""
+        before = game_contents(self.game)
+        fork = fork_game(self.game)
+
+        self.assertNotEqual(fork.id, self.game.id)
+        self.assertEqual(game_contents(fork), before)
+        self.assertEqual(game_contents(self.game), before)
+        # Nothing is shared between the games
+        self.assertFalse(System.objects.filter(game=fork, star__system__game=self.game).exists())
+        self.assertFalse(Planet.objects.filter(system__game=fork, empire__game=self.game).exists())
+        self.assertFalse(Empire.objects.filter(game=fork, player__empires__game=self.game).exists())
+
+    def test_fork_is_independent(self):
+        """Test that forks can be played and forked, and new rows get fresh IDs"""
+        fork = fork_game(self.game)
+        process(fork)
+        self.assertEqual(Game.objects.get(pk=fork.pk).turn, 2)
+        self.assertEqual(Game.objects.get(pk=self.game.pk).turn, 1)
+
+        second = fork_game(fork)
+        self.assertEqual(game_contents(second), game_contents(fork))
+        star = Star.objects.create(star_type='blue')
+        player = Player.objects.create()
+        self.assertEqual(star.pk, Star.objects.order_by('-pk').values_list('pk', flat=True).first())
+        self.assertEqual(player.pk, Player.objects.order_by('-pk').values_list('pk', flat=True).first())
+
+    def test_constant_query_count(self):
+        """Test that forking a larger game takes the same number of queries"""
+        large_game = create_game(self.race, systems=12)
+
+        def count(game):
+            with CaptureQueriesContext(connection) as queries:
+                fork_game(game)
+            return len(queries)
+
+        self.assertEqual(count(self.game), count(large_game))
+
+
+class ForkAPITests(APITestCase):
+    """Test suite for the fork endpoint."""
+
+    def test_fork(self):
+        """Test that the endpoint returns the new game"""
+        game = create_game(Race.objects.create(name="Test Race"))
+        response = self.client.post(reverse('game-fork', args=[game.id]))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotEqual(response.data['id'], game.id)
+        self.assertEqual(response.data['turn'], game.turn)
+        self.assertEqual(len(response.data['empires']), 2)
+        self.assertEqual(len(response.data['systems']), 2)
+
+        response = self.client.post(reverse('game-fork', args=[999999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,160 @@
+"""Tests for per-turn snapshots and rewind.
+
+This module verifies that turn processing records keyframes and deltas of
+the game's mutable state, that deltas hold only changed rows, and that
+games can be rewound to the start of an earlier turn through the API.
+"""
+
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from play.history import RewindError, record_turn_snapshot, rewind_game, state_at
+from play.models import Empire, Game, GameChange, Race, TurnSnapshot
+from play.turn import process
+from celestial.bulk import reassign_owners
+from celestial.models import Planet
+from research.models import EmpireTechnology
+from .factories import create_game
+
+
+def producing_game(race, systems=2):
+    """Create a game whose empires gain minerals every turn."""
+    game = create_game(race, systems=systems)
+    Planet.objects.filter(system__game=game).update(
+        mineral_production=Decimal('10'), mineral_storage_capacity=Decimal('1000')
+    )
+    return game
+
+
+class TurnSnapshotTests(TestCase):
+    """Test suite for recording turn snapshots."""
+
+    def setUp(self):
+        """Create a game."""
+        self.race = Race.objects.create(name="Test Race")
+        self.game = producing_game(self.race)
+
+    def test_first_snapshot_is_keyframe(self):
+        """Test that the first processed turn records every row"""
+        process(self.game)
+        snapshot = TurnSnapshot.objects.get(game=self.game, turn=2)
+        self.assertTrue(snapshot.full)
+        self.assertEqual(len(snapshot.data['planets']), 2)
+        self.assertEqual(len(snapshot.data['asteroid_belts']), 2)
+        self.assertEqual(len(snapshot.data['research']), 2)
+
+    def test_delta_holds_changed_rows(self):
+        """Test that later snapshots only hold the rows that changed"""
+        process(self.game)
+        planet = Planet.objects.filter(system__game=self.game).order_by('pk').first()
+        reassign_owners(Planet, {planet.pk: None})
+        process(self.game)
+
+        snapshot = TurnSnapshot.objects.get(game=self.game, turn=3)
+        self.assertFalse(snapshot.full)
+        self.assertEqual(snapshot.data['planets'], {str(planet.pk): None})
+        self.assertEqual(snapshot.data['asteroid_belts'], {})
+        self.assertEqual(snapshot.data['research'], {})
+        self.assertEqual(len(snapshot.data['empires']), 2)
+
+    @override_settings(GAME_SNAPSHOT_KEYFRAME_INTERVAL=2)
+    def test_keyframe_interval(self):
+        """Test that keyframes are written every keyframe interval"""
+        for _ in range(4):
+            process(self.game)
+        self.assertEqual(
+            list(TurnSnapshot.objects.filter(game=self.game).order_by('turn').values_list('turn', 'full')),
+            [(2, True), (3, False), (4, True), (5, False)]
+        )
+
+    def test_constant_query_count(self):
+        """Test that recording a delta doesn't take more queries for larger games"""
+        large_game = producing_game(self.race, systems=10)
+
+        def count(game):
+            process(game)
+            game.turn += 1
+            with CaptureQueriesContext(connection) as queries:
+                record_turn_snapshot(game)
+            return len(queries)
+
+        self.assertEqual(count(self.game), count(large_game))
+
+    def test_state_at_unrecorded_turn(self):
+        """Test that turns without a snapshot can't be restored"""
+        process(self.game)
+        with self.assertRaises(RewindError):
+            state_at(self.game, 1)
+        with self.assertRaises(RewindError):
+            state_at(self.game, 5)
+
+
+class RewindTests(APITestCase):
+    """Test suite for rewinding games."""
+
+    def setUp(self):
+        """Create a game and play three turns, changing owners and research."""
+        self.game = producing_game(Race.objects.create(name="Test Race"))
+        process(self.game)
+        self.storage = dict(Empire.objects.filter(game=self.game).values_list('id', 'mineral_storage'))
+        self.owners = dict(Planet.objects.filter(system__game=self.game).values_list('id', 'empire_id'))
+
+        reassign_owners(Planet, {pk: None for pk in self.owners})
+        research = EmpireTechnology.objects.filter(empire__game=self.game).first()
+        research.research_points = Decimal('42.00')
+        research.save()
+        process(self.game)
+        process(self.game)
+
+    def test_rewind(self):
+        """Test that rewinding restores storage, owners, research and the turn"""
+        response = self.client.post(f"{reverse('game-rewind', args=[self.game.id])}?turn=2")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['turn'], 2)
+
+        self.assertEqual(
+            dict(Empire.objects.filter(game=self.game).values_list('id', 'mineral_storage')), self.storage
+        )
+        self.assertEqual(
+            dict(Planet.objects.filter(system__game=self.game).values_list('id', 'empire_id')), self.owners
+        )
+        self.assertFalse(
+            EmpireTechnology.objects.filter(empire__game=self.game, research_points__gt=0).exists()
+        )
+        self.assertFalse(TurnSnapshot.objects.filter(game=self.game, turn__gt=2).exists())
+        self.assertFalse(GameChange.objects.filter(game=self.game, turn__gt=2).exists())
+
+    def test_replay_after_rewind(self):
+        """Test that turns played after a rewind are snapshotted again"""
+        game = rewind_game(Game.objects.get(pk=self.game.pk), 2)
+        process(game)
+        storage = dict(Empire.objects.filter(game=game).values_list('id', 'mineral_storage'))
+        process(game)
+        rewind_game(game, 3)
+        self.assertEqual(
+            dict(Empire.objects.filter(game=game).values_list('id', 'mineral_storage')), storage
+        )
+
+    def test_changes_after_rewind(self):
+        """Test that a delta since a turn undone by a rewind asks the client to reload"""
+        url = reverse('game-changes', args=[self.game.id])
+        rewind_game(Game.objects.get(pk=self.game.pk), 2)
+        response = self.client.get(url, {'since_turn': 4})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        self.assertIn('rewound', response.data['error'])
+        response = self.client.get(url, {'since_turn': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['planets']), len(self.owners))
+
+    def test_rewind_errors(self):
+        """Test that invalid and unrecorded turns are rejected"""
+        url = reverse('game-rewind', args=[self.game.id])
+        for turn in ('', 'abc', '1', '9'):
+            response = self.client.post(f'{url}?turn={turn}')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('error', response.data)
+        self.assertEqual(Game.objects.get(pk=self.game.pk).turn, 4)
@@ -0,0 +1,57 @@
+"""Tests for the game-scoped indexes and the query plan audit.
+
+This module verifies that the hot game queries use indexes, that orbits are
+unique per system in the database, and that sequential scans are detected
+in PostgreSQL and SQLite plans.
+"""
+
+from io import StringIO
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from play.management.commands.explain_queries import sequential_scans
+from play.models import Game
+from celestial.models import Planet, AsteroidBelt, System, Star
+
+
+class QueryPlanTests(TestCase):
+    """Test suite for the hot query plans."""
+
+    def setUp(self):
+        """Create a game with a system."""
+        self.game = Game.objects.create(turn=0)
+        self.system = System.objects.create(
+            x=0, y=0, star=Star.objects.create(star_type="yellow"), game=self.game
+        )
+
+    def test_hot_queries_use_indexes(self):
+        """Test that no hot query scans a table"""
+        out = StringIO()
+        call_command('explain_queries', '--fail-on-scan', '--game', str(self.game.id), stdout=out)
+        self.assertIn('0 of 11 queries scan a table', out.getvalue())
+
+    def test_orbits_are_unique_in_database(self):
+        """Test that bulk inserts bypassing clean() can't share an orbit"""
+        Planet.objects.create(system=self.system, orbit=1)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Planet.objects.bulk_create([Planet(system=self.system, orbit=1)])
+        AsteroidBelt.objects.create(system=self.system, orbit=2)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            AsteroidBelt.objects.bulk_create([AsteroidBelt(system=self.system, orbit=2)])
+
+    def test_sequential_scan_detection(self):
+        """Test that full table reads are flagged and index reads are not"""
+        self.assertEqual(
+            sequential_scans('Seq Scan on celestial_planet  (cost=0.00..35.50 rows=10 width=4)', 'postgresql'),
+            ['celestial_planet']
+        )
+        self.assertEqual(
+            sequential_scans('Index Only Scan using celestial_planet_empire_cov on celestial_planet', 'postgresql'),
+            []
+        )
+        self.assertEqual(sequential_scans('2 0 0 SCAN celestial_planet', 'sqlite'), ['celestial_planet'])
+        self.assertEqual(
+            sequential_scans('2 0 0 SCAN celestial_planet USING COVERING INDEX celestial_planet_empire_cov', 'sqlite'),
+            []
+        )
+        self.assertEqual(sequential_scans('3 0 0 SEARCH celestial_planet USING INDEX x (empire_id=?)', 'sqlite'), [])
@@ -0,0 +1,121 @@
+"""Tests for the galaxy layout cache.
+
+This module verifies that the systems of a game are served from the cached
+layout with a fresh ownership overlay, and that the layout is only rebuilt
+after celestial edits.
+"""
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from play.models import Game, Empire, Player, Race
+from celestial.models import Planet, AsteroidBelt, System, Star
+
+
+@override_settings(GAME_READ_COALESCE_TIMEOUT=0)
+class GalaxyLayoutTests(APITestCase):
+    """Test suite for the cached galaxy layout.
+
+    Request coalescing is disabled so each request reaches the layout cache.
+    """
+
+    def setUp(self):
+        """Create a game with an empire and two systems."""
+        cache.clear()
+        self.game = Game.objects.create(turn=0)
+        self.empire = Empire.objects.create(
+            name="Test Empire",
+            player=Player.objects.create(),
+            race=Race.objects.create(name="Test Race"),
+            game=self.game
+        )
+        self.systems = [
+            System.objects.create(
+                x=x, y=0, star=Star.objects.create(star_type="yellow"), game=self.game
+            )
+            for x in range(2)
+        ]
+        self.planet = Planet.objects.create(system=self.systems[0], orbit=1, empire=self.empire)
+        self.belt = AsteroidBelt.objects.create(system=self.systems[1], orbit=2)
+        self.url = reverse('game-systems', args=[self.game.id])
+
+    def test_matches_uncached_systems(self):
+        """Test that the cached response matches the systems read from the database"""
+        cached = self.client.get(self.url).json()
+        self.client.get(self.url)
+        uncached = self.client.get(self.url, {'fields': 'id,x,y,star,planets,asteroid_belts'}).json()
+        self.assertEqual(cached, uncached)
+        self.assertEqual(cached[0]['planets'][0]['empire'], self.empire.id)
+        self.assertIsNone(cached[1]['asteroid_belts'][0]['empire'])
+
+    def test_cache_hit_queries(self):
+        """Test that cached layouts only read the game, its version and the owners"""
+        self.client.get(self.url)
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_ownership_is_fresh(self):
+        """Test that ownership changes show up without rebuilding the layout"""
+        self.client.get(self.url)
+        Planet.objects.filter(pk=self.planet.pk).update(empire=None)
+        AsteroidBelt.objects.filter(pk=self.belt.pk).update(empire=self.empire)
+        with self.assertNumQueries(3):
+            data = self.client.get(self.url).json()
+        self.assertIsNone(data[0]['planets'][0]['empire'])
+        self.assertEqual(data[1]['asteroid_belts'][0]['empire'], self.empire.id)
+
+    def test_celestial_edit_invalidates(self):
+        """Test that edits through the celestial API rebuild the layout"""
+        self.client.get(self.url)
+        response = self.client.patch(
+            reverse('star-detail', args=[self.systems[0].star.id]), {'star_type': 'blue'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(
+            reverse('system-add-asteroid-belt', args=[self.systems[0].id]),
+            {
+                'orbit': 3,
+                'mineral_production': '1.00',
+                'organic_production': '1.00',
+                'radioactive_production': '1.00',
+                'exotic_production': '1.00',
+            }
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        data = self.client.get(self.url).json()
+        self.assertEqual(data[0]['star']['star_type'], 'blue')
+        self.assertEqual(len(data[0]['asteroid_belts']), 1)
+
+    def test_delete_invalidates(self):
+        """Test that deleting a body through the API rebuilds the layout"""
+        self.client.get(self.url)
+        response = self.client.delete(reverse('asteroidbelt-detail', args=[self.belt.id]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        data = self.client.get(self.url).json()
+        self.assertEqual(data[1]['asteroid_belts'], [])
+
+    def test_model_save_invalidates(self):
+        """Test that edits outside the API, such as through the admin, rebuild the layout"""
+        self.client.get(self.url)
+        star = Star.objects.get(pk=self.systems[0].star_id)
+        star.star_type = 'blue'
+        star.save()
+        planet = Planet.objects.get(pk=self.planet.pk)
+        planet.orbit = 5
+        planet.save()
+        data = self.client.get(self.url).json()
+        self.assertEqual(data[0]['star']['star_type'], 'blue')
+        self.assertEqual(data[0]['planets'][0]['orbit'], 5)
+
+    def test_owner_save_keeps_layout(self):
+        """Test that saving only a body's owner doesn't rebuild the layout"""
+        self.client.get(self.url)
+        self.planet.empire = None
+        self.planet.save(update_fields=['empire'])
+        with self.assertNumQueries(3):
+            data = self.client.get(self.url).json()
+        self.assertIsNone(data[0]['planets'][0]['empire'])
@@ -0,0 +1,143 @@
+"""Tests for the player order queue.
+
+This module verifies that orders are submitted in batches with a single
+INSERT, validated against the game and the research budget, and resolved
+together by kind at the end of the turn on the in-memory game state.
+"""
+
+from decimal import Decimal
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from play.history import rewind_game
+from play.models import Empire, Order, Race
+from play.turn import process
+from celestial.models import AsteroidBelt, Planet
+from research.models import EmpireTechnology, Technology
+from .factories import create_game
+
+
+class OrderTests(APITestCase):
+    """Test suite for submitting and resolving orders."""
+
+    def setUp(self):
+        """Create a game with two empires and three unowned asteroid belts."""
+        self.game = create_game(Race.objects.create(name="Test Race"), systems=3)
+        self.empires = list(Empire.objects.filter(game=self.game).order_by('pk'))
+        self.belts = list(AsteroidBelt.objects.filter(system__game=self.game).order_by('pk'))
+        self.research = list(EmpireTechnology.objects.filter(empire__game=self.game).order_by('empire_id'))
+        self.url = reverse('game-orders', args=[self.game.id])
+
+    def submit(self, *orders):
+        """Submit orders and return the response."""
+        return self.client.post(self.url, {'orders': list(orders)}, format='json')
+
+    def test_submit_batch(self):
+        """Test that a batch of orders is appended with one INSERT for the current turn"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.submit(
+                {'empire': self.empires[0].id, 'kind': 'colonize_asteroid_belt', 'target': self.belts[0].id},
+                {'empire': self.empires[0].id, 'kind': 'research', 'target': self.research[0].id, 'amount': '5'},
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['turn'], 1)
+        self.assertEqual(len(response.data['orders']), 2)
+        writes = [query['sql'] for query in queries if not query['sql'].startswith('SELECT')]
+        self.assertEqual(len(writes), 1)
+        self.assertTrue(writes[0].startswith('INSERT'))
+        self.assertEqual(Order.objects.filter(game=self.game, turn=1).count(), 2)
+
+    def test_invalid_orders(self):
+        """Test that invalid orders are reported per entry and nothing is queued"""
+        other_game = create_game(Race.objects.get(name="Test Race"))
+        response = self.submit(
+            {'empire': self.empires[0].id, 'kind': 'colonize_asteroid_belt', 'target': self.belts[0].id},
+            {'empire': self.empires[0].id, 'kind': 'colonize_planet',
+             'target': Planet.objects.filter(system__game=other_game).first().id},
+            {'empire': self.empires[0].id, 'kind': 'research', 'target': self.research[1].id, 'amount': '5'},
+            {'empire': self.empires[1].id, 'kind': 'research', 'target': self.research[1].id},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['orders'][0], {})
+        self.assertIn('target', response.data['orders'][1])
+        self.assertIn('research belongs to another empire', str(response.data['orders'][2]['target']))
+        self.assertIn('amount', response.data['orders'][3])
+        self.assertFalse(Order.objects.exists())
+
+    def test_resolve_at_end_of_turn(self):
+        """Test that orders are resolved by kind when the turn ends and then pruned"""
+        first, second = self.empires
+        self.submit(
+            {'empire': second.id, 'kind': 'colonize_asteroid_belt', 'target': self.belts[0].id},
+            {'empire': second.id, 'kind': 'colonize_asteroid_belt', 'target': self.belts[1].id},
+            {'empire': first.id, 'kind': 'colonize_asteroid_belt', 'target': self.belts[0].id},
+            {'empire': first.id, 'kind': 'colonize_asteroid_belt', 'target': self.belts[2].id},
+            {'empire': first.id, 'kind': 'research', 'target': self.research[0].id, 'amount': '5'},
+        )
+        # A later order for the same target replaces the earlier one
+        self.submit({'empire': first.id, 'kind': 'research', 'target': self.research[0].id, 'amount': '7.5'})
+
+        process(self.game)
+
+        owners = dict(AsteroidBelt.objects.filter(system__game=self.game).values_list('pk', 'empire_id'))
+        # The contested belt goes to the lower empire ID, the other empire takes its next choice
+        self.assertEqual(owners, {self.belts[0].id: first.id, self.belts[1].id: second.id, self.belts[2].id: None})
+        self.research[0].refresh_from_db()
+        self.assertEqual(self.research[0].research_points, Decimal('7.5'))
+        self.assertFalse(Order.objects.filter(game=self.game).exists())
+
+    @override_settings(RESEARCH_POINTS_PER_TURN=10)
+    def test_research_budget(self):
+        """Test that research orders can't allocate more than the budget per empire and turn"""
+        first = self.empires[0]
+        extra = EmpireTechnology.objects.create(
+            empire=first, technology=Technology.objects.create(name="Warp Drive", cost=100)
+        )
+        self.assertEqual(self.submit(
+            {'empire': first.id, 'kind': 'research', 'target': self.research[0].id, 'amount': '6'}
+        ).status_code, status.HTTP_201_CREATED)
+        # Replacing the order keeps within the budget, adding to it doesn't
+        self.assertEqual(self.submit(
+            {'empire': first.id, 'kind': 'research', 'target': self.research[0].id, 'amount': '8'}
+        ).status_code, status.HTTP_201_CREATED)
+        response = self.submit({'empire': first.id, 'kind': 'research', 'target': extra.id, 'amount': '5'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('more than the 10 per turn', str(response.data['orders'][0]['amount']))
+
+        # Orders that got past validation together are cut to the budget in submission order
+        Order.objects.create(
+            game=self.game, empire=first, turn=1, kind=Order.Kind.RESEARCH, target=extra.id, amount=5
+        )
+        process(self.game)
+        self.research[0].refresh_from_db()
+        extra.refresh_from_db()
+        self.assertEqual((self.research[0].research_points, extra.research_points), (Decimal(8), Decimal(2)))
+
+    def test_research_points_stay_in_range(self):
+        """Test that research points are capped at what the column holds"""
+        EmpireTechnology.objects.filter(pk=self.research[0].pk).update(research_points=Decimal('99999995'))
+        self.submit({'empire': self.empires[0].id, 'kind': 'research', 'target': self.research[0].id, 'amount': '10'})
+        process(self.game)
+        self.research[0].refresh_from_db()
+        self.assertEqual(self.research[0].research_points, Decimal('99999999.99'))
+
+    def test_orders_of_other_turns_are_ignored(self):
+        """Test that only orders of the ending turn are resolved"""
+        Order.objects.create(
+            game=self.game, empire=self.empires[0], turn=2,
+            kind=Order.Kind.COLONIZE_ASTEROID_BELT, target=self.belts[0].id
+        )
+        process(self.game)
+        self.assertIsNone(AsteroidBelt.objects.get(pk=self.belts[0].id).empire_id)
+        self.assertTrue(Order.objects.filter(game=self.game, turn=2).exists())
+
+    def test_rewind_discards_pending_orders(self):
+        """Test that rewinding a game drops the orders queued after the restored turn"""
+        process(self.game)
+        process(self.game)
+        self.submit({'empire': self.empires[0].id, 'kind': 'colonize_asteroid_belt', 'target': self.belts[0].id})
+        rewind_game(self.game, 2)
+        self.assertFalse(Order.objects.filter(game=self.game).exists())
@@ -0,0 +1,110 @@
+"""Tests for batch ownership reassignment.
+
+This module verifies that the game ownership endpoint and empire updates
+reassign planets and asteroid belts with set-based updates, validate all
+entries against the game, and record the changes in the change log.
+"""
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from play.models import Game, Empire, Player, Race, GameChange
+from celestial.models import Planet, AsteroidBelt, System, Star
+
+
+class OwnershipAPITests(APITestCase):
+    """Test suite for reassigning the owners of bodies."""
+
+    def setUp(self):
+        """Create a game with two empires and a system with three planets and a belt."""
+        self.game = Game.objects.create(turn=0)
+        race = Race.objects.create(name="Test Race")
+        self.empire = Empire.objects.create(
+            name="First Empire", player=Player.objects.create(), race=race, game=self.game
+        )
+        self.other_empire = Empire.objects.create(
+            name="Second Empire", player=Player.objects.create(), race=race, game=self.game
+        )
+        system = System.objects.create(
+            x=1, y=1, star=Star.objects.create(star_type="yellow"), game=self.game
+        )
+        self.planets = [
+            Planet.objects.create(system=system, orbit=orbit, empire=self.empire)
+            for orbit in (1, 2, 3)
+        ]
+        self.belt = AsteroidBelt.objects.create(system=system, orbit=4)
+        self.url = reverse('game-ownership', args=[self.game.id])
+
+    def test_reassign_owners(self):
+        """Test moving bodies between empires and releasing them"""
+        data = {
+            'planets': [
+                {'id': self.planets[0].id, 'empire': self.other_empire.id},
+                {'id': self.planets[1].id, 'empire': None},
+                {'id': self.planets[2].id, 'empire': self.empire.id},
+            ],
+            'asteroid_belts': [{'id': self.belt.id, 'empire': self.other_empire.id}],
+        }
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # The third planet already belongs to the empire and is left untouched
+        self.assertEqual(response.data['planets'], [self.planets[0].id, self.planets[1].id])
+        self.assertEqual(response.data['asteroid_belts'], [self.belt.id])
+        owners = dict(Planet.objects.values_list('id', 'empire_id'))
+        self.assertEqual(owners[self.planets[0].id], self.other_empire.id)
+        self.assertIsNone(owners[self.planets[1].id])
+        self.assertEqual(owners[self.planets[2].id], self.empire.id)
+        self.belt.refresh_from_db()
+        self.assertEqual(self.belt.empire, self.other_empire)
+
+    def test_records_changes(self):
+        """Test that reassigned bodies are recorded in the change log"""
+        GameChange.objects.all().delete()
+        data = {'planets': [{'id': self.planets[0].id, 'empire': None}]}
+        self.client.post(self.url, data, format='json')
+        self.assertEqual(
+            list(GameChange.objects.values_list('kind', 'object_id')),
+            [(GameChange.Kind.PLANET, self.planets[0].id)]
+        )
+
+    def test_fixed_query_count(self):
+        """Test that reassigning many bodies uses one UPDATE per empire"""
+        data = {
+            'planets': [{'id': planet.id, 'empire': self.other_empire.id} for planet in self.planets],
+            'asteroid_belts': [{'id': self.belt.id, 'empire': self.other_empire.id}],
+        }
+        # Game, empires, 2 body checks, 2 owner selects, 2 updates, 6 savepoint
+        # statements, and one version bump and change log write for both types
+        with self.assertNumQueries(17):
+            self.client.post(self.url, data, format='json')
+
+    def test_invalid_entries(self):
+        """Test that bodies and empires outside the game are rejected"""
+        other_game = Game.objects.create()
+        outsider = Empire.objects.create(
+            name="Outsider", player=Player.objects.create(), race=self.empire.race, game=other_game
+        )
+        data = {
+            'planets': [
+                {'id': self.planets[0].id, 'empire': None},
+                {'id': 0, 'empire': outsider.id},
+            ],
+        }
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['planets'][0], {})
+        self.assertEqual(set(response.data['planets'][1]), {'id', 'empire'})
+        self.planets[0].refresh_from_db()
+        self.assertEqual(self.planets[0].empire, self.empire)
+
+    def test_empire_update_is_set_based(self):
+        """Test that updating an empire's planets doesn't save each planet"""
+        url = reverse('empire-detail', args=[self.empire.id])
+        data = {'planet_ids': [self.planets[0].id]}
+        with self.assertNumQueries(13):
+            response = self.client.patch(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(Planet.objects.filter(empire=self.empire).values_list('id', flat=True)),
+            [self.planets[0].id]
+        )
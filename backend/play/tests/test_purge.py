@@ -0,0 +1,97 @@
+"""Tests for fast game deletion.
+
+This module verifies that deleting a game hides it at once and schedules a
+background purge, and that the purge removes every row of the game,
+including its stars and players, with a fixed number of set-based deletes.
+"""
+
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from play.models import Game, GameChange, Empire, Player, Race
+from play.purge import purge_game, purge_orphan_stars
+from celestial.models import Planet, AsteroidBelt, System, Star
+from research.models import EmpireTechnology
+from .factories import create_game
+
+
+class GameDeletionTests(APITestCase):
+    """Test suite for deleting games through the API."""
+
+    def setUp(self):
+        """Create a game."""
+        self.game = create_game(Race.objects.create(name="Test Race"))
+
+    def test_delete_hides_game_and_schedules_purge(self):
+        """Test that deletion hides the game at once and purges it after commit"""
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.delete(reverse('game-detail', args=[self.game.id]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(len(callbacks), 1)
+        self.assertFalse(Game.objects.filter(pk=self.game.id).exists())
+        self.assertIsNotNone(Game.all_objects.get(pk=self.game.id).deleted)
+        self.assertEqual(
+            self.client.get(reverse('game-detail', args=[self.game.id])).status_code,
+            status.HTTP_404_NOT_FOUND
+        )
+        # Rows stay until the background purge runs
+        self.assertEqual(System.objects.filter(game_id=self.game.id).count(), 2)
+
+
+class PurgeTests(TestCase):
+    """Test suite for purging game rows."""
+
+    def setUp(self):
+        """Create a small and a large game."""
+        race = Race.objects.create(name="Test Race")
+        self.game = create_game(race)
+        self.large_game = create_game(race, systems=6)
+        GameChange.objects.create(game=self.game, turn=1, kind='planet', object_id=1)
+
+    def test_purge_removes_game_rows(self):
+        """Test that the purge removes the game, its stars and players, and nothing else"""
+        stars = Star.objects.count()
+        players = Player.objects.count()
+        deleted = purge_game(self.game.id)
+
+        self.assertEqual(deleted['play.Game'], 1)
+        self.assertEqual(deleted['celestial.Star'], 2)
+        self.assertEqual(deleted['play.Player'], 2)
+        self.assertFalse(Game.all_objects.filter(pk=self.game.id).exists())
+        for model, lookup in [
+            (Empire, 'game'), (System, 'game'), (Planet, 'system__game'),
+            (AsteroidBelt, 'system__game'), (EmpireTechnology, 'empire__game'), (GameChange, 'game'),
+        ]:
+            self.assertFalse(model.objects.filter(**{lookup: self.game.id}).exists(), model)
+        self.assertEqual(Star.objects.count(), stars - 2)
+        self.assertEqual(Player.objects.count(), players - 2)
+        self.assertEqual(System.objects.filter(game=self.large_game).count(), 6)
+        self.assertEqual(purge_orphan_stars(), 0)
+
+    def test_purge_queries_do_not_grow_with_game_size(self):
+        """Test that purges run the same statements for small and large games"""
+        with CaptureQueriesContext(connection) as small:
+            purge_game(self.game.id)
+        with CaptureQueriesContext(connection) as large:
+            purge_game(self.large_game.id)
+        self.assertEqual(len(small), len(large))
+
+    def test_purge_orphan_stars(self):
+        """Test that stars without a system are removed"""
+        Star.objects.create(star_type="blue")
+        self.assertEqual(purge_orphan_stars(), 1)
+        self.assertEqual(Star.objects.count(), 8)
+
+    def test_command_purges_deleted_games(self):
+        """Test that the command finishes purges of soft-deleted games"""
+        Game.all_objects.filter(pk=self.game.id).update(deleted=self.game.created)
+        out = StringIO()
+        call_command('purge_deleted_games', '--orphan-stars', stdout=out)
+        self.assertIn('Purged 1 deleted games', out.getvalue())
+        self.assertFalse(Game.all_objects.filter(pk=self.game.id).exists())
+        self.assertTrue(Game.objects.filter(pk=self.large_game.id).exists())
@@ -0,0 +1,93 @@
+"""Tests for the turn scheduler and game leases.
+
+This module verifies that leases are held by one process at a time and
+lapse when they expire, and that the scheduler processes overdue games
+earliest first, skips games leased elsewhere and stops loading deadlines
+while its backlog is too large.
+"""
+
+import io
+from datetime import timedelta
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from play.leases import acquire_lease, lease_holders, release_lease
+from play.models import Game, Lease, Race
+from play.scheduler import TurnScheduler
+from .factories import create_game
+
+
+class LeaseTests(TestCase):
+    """Test suite for database leases."""
+
+    def test_one_holder_at_a_time(self):
+        """Test that a lease is held by one owner until released or expired"""
+        now = timezone.now()
+        self.assertTrue(acquire_lease('game:1', 'a', 60, now))
+        self.assertFalse(acquire_lease('game:1', 'b', 60, now))
+        # Renewing extends the holder's lease
+        self.assertTrue(acquire_lease('game:1', 'a', 120, now))
+        self.assertFalse(acquire_lease('game:1', 'b', 60, now + timedelta(seconds=90)))
+        self.assertTrue(acquire_lease('game:1', 'b', 60, now + timedelta(seconds=121)))
+        self.assertEqual(lease_holders('game:', now + timedelta(seconds=122)), {'game:1': 'b'})
+
+        self.assertFalse(release_lease('game:1', 'a'))
+        self.assertTrue(release_lease('game:1', 'b'))
+        self.assertTrue(acquire_lease('game:1', 'a', 60, now))
+
+
+class TurnSchedulerTests(TestCase):
+    """Test suite for processing games at their turn deadline."""
+
+    def setUp(self):
+        """Create three games, two of them overdue."""
+        race = Race.objects.create(name="Test Race")
+        self.now = timezone.now()
+        self.games = [create_game(race) for _ in range(3)]
+        for minutes, game in zip((-2, -1, 10), self.games):
+            Game.objects.filter(pk=game.pk).update(turn_deadline=self.now + timedelta(minutes=minutes))
+
+    def turns(self):
+        """Get the turn of each game."""
+        return [Game.objects.get(pk=game.pk).turn for game in self.games]
+
+    def test_processes_overdue_games_earliest_first(self):
+        """Test that due games are processed in deadline order, a batch at a time"""
+        scheduler = TurnScheduler(owner='a', workers=1, batch_size=1)
+        self.assertEqual(scheduler.run_once(self.now), {'processed': 1, 'skipped': 0, 'backlog': 1})
+        self.assertEqual(self.turns(), [2, 1, 1])
+        self.assertEqual(scheduler.run_once(self.now), {'processed': 1, 'skipped': 0, 'backlog': 0})
+        self.assertEqual(self.turns(), [2, 2, 1])
+        self.assertEqual(scheduler.run_once(self.now)['processed'], 0)
+        self.assertFalse(Lease.objects.exists())
+
+    def test_skips_games_leased_elsewhere(self):
+        """Test that a game leased by another scheduler is left to it"""
+        acquire_lease(f'game:{self.games[0].pk}', 'b', 60)
+        scheduler = TurnScheduler(owner='a', workers=1, batch_size=5)
+        self.assertEqual(scheduler.run_once(self.now)['processed'], 1)
+        self.assertEqual(self.turns(), [1, 2, 1])
+        # Once the other lease lapses, the game is picked up again
+        Lease.objects.update(expires=self.now)
+        self.assertEqual(scheduler.run_once(self.now)['processed'], 1)
+        self.assertEqual(self.turns(), [2, 2, 1])
+
+    def test_backpressure(self):
+        """Test that new deadlines aren't loaded while the backlog is full"""
+        scheduler = TurnScheduler(owner='a', workers=1, batch_size=1, max_backlog=1)
+        self.assertEqual(scheduler.run_once(self.now)['backlog'], 1)
+        # The third game comes due, but the backlog already holds the second
+        Game.objects.filter(pk=self.games[2].pk).update(turn_deadline=self.now - timedelta(minutes=3))
+        with self.assertLogs('play.scheduler', 'WARNING'):
+            self.assertEqual(scheduler.run_once(self.now), {'processed': 1, 'skipped': 0, 'backlog': 0})
+        self.assertEqual(self.turns(), [2, 2, 1])
+        self.assertEqual(scheduler.run_once(self.now)['processed'], 1)
+        self.assertEqual(self.turns(), [2, 2, 2])
+
+    def test_command_once(self):
+        """Test that the command processes one batch"""
+        out, err = io.StringIO(), io.StringIO()
+        call_command('run_turn_scheduler', once=True, workers=1, batch_size=5, stdout=out, stderr=err)
+        self.assertIn('Processed 2 games', out.getvalue())
+        self.assertIn('play.events.PostgresPubSub', err.getvalue())
+
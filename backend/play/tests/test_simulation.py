@@ -0,0 +1,84 @@
+"""Tests for the headless game simulator.
+
+This module verifies that simulated games start and play exactly like live
+games, without database queries, and that results are the same whether
+games run in one process or across a pool.
+"""
+
+import csv
+import io
+import json
+import os
+import tempfile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from play.models import Empire, Player
+from play.simulation import generate_state, make_specs, run_simulations, simulate_game, write_results
+from play.start import start_game
+from play.turn import process
+from celestial.models import Planet, AsteroidBelt
+
+
+class SimulationTests(TestCase):
+    """Test suite for simulating games."""
+
+    @override_settings(AI_TURN_BUDGET=60)
+    def test_matches_live_game(self):
+        """Test that a simulated game ends like the same live game of computer empires"""
+        game = start_game({'player_empire_name': 'Player', 'computer_empire_count': 3, 'galaxy_size': 'tiny'})
+        Player.objects.filter(empires__game=game).update(player_type=Player.PlayerType.COMPUTER)
+        for _ in range(3):
+            process(game)
+        live = sorted(Empire.objects.filter(game=game).values_list('mineral_storage', 'exotic_storage'))
+        owned = Planet.objects.filter(system__game=game, empire__isnull=False).count() + \
+            AsteroidBelt.objects.filter(system__game=game, empire__isnull=False).count()
+
+        with self.assertNumQueries(0):
+            state = generate_state('tiny', 4)
+            result = simulate_game({'game': 0, 'galaxy_size': 'tiny', 'empires': 4, 'turns': 3})
+        self.assertEqual(len(state.planets), 4)
+        self.assertEqual(result['systems'], 4)
+        self.assertEqual(result['bodies_owned_mean'], owned / 4)
+        self.assertEqual(result['mineral_storage_mean'], float(live[0][0]))
+        self.assertEqual(result['mineral_storage_min'], float(min(live)[0]))
+        self.assertEqual(result['exotic_storage_max'], float(max(live)[1]))
+        # 75 minerals a turn against a capacity of 150
+        self.assertEqual(result['mineral_filled_turn'], 2)
+
+    def test_parallel_matches_serial(self):
+        """Test that a process pool gives the same results in the same order"""
+        specs = make_specs(8, 5, seed=3)
+        self.assertEqual(
+            list(run_simulations(specs, workers=2, chunksize=2)), list(run_simulations(specs, workers=1))
+        )
+        self.assertEqual(make_specs(8, 5, seed=3), specs)
+
+    def test_write_results(self):
+        """Test that summaries are written as CSV and NDJSON rows"""
+        results = list(run_simulations(make_specs(3, 2, galaxy_size='small', empires=(2, 2)), workers=1))
+        stream = io.StringIO()
+        self.assertEqual(write_results(results, stream, 'ndjson'), 3)
+        rows = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([row['game'] for row in rows], [0, 1, 2])
+        self.assertTrue(all(row['galaxy_size'] == 'small' and row['systems'] == 5 for row in rows))
+
+        stream = io.StringIO()
+        write_results(results, stream, 'csv')
+        rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['empires'], '2')
+
+    def test_command(self):
+        """Test that the command writes one row per game to the output file"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.ndjson')
+            out = io.StringIO()
+            call_command(
+                'simulate_games', games=4, turns=3, empires='3', workers=1,
+                format='ndjson', output=path, stdout=out
+            )
+            with open(path) as stream:
+                rows = [json.loads(line) for line in stream]
+        self.assertEqual(len(rows), 4)
+        self.assertTrue(all(row['empires'] == 3 and row['turns'] == 3 for row in rows))
+        self.assertIn('Simulated 4 games', out.getvalue())
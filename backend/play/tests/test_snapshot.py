@@ -0,0 +1,160 @@
+"""Tests for save-game snapshots.
+
+This module verifies that a game exported as a snapshot loads back as an
+identical new game, that export and import use a fixed number of queries
+however large the game is, that snapshots written before columns were
+added still load, and that invalid or oversized snapshots are rejected.
+"""
+
+import gzip
+import json
+from decimal import Decimal
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from play.models import Game, Empire, Race
+from play.snapshot import (
+    SnapshotError, export_snapshot, encode_snapshot, decode_snapshot, import_snapshot
+)
+from celestial.models import Planet, System
+from .factories import create_game, game_contents
+
+
+class SnapshotTests(TestCase):
+    """Test suite for exporting and importing snapshots."""
+
+    def setUp(self):
+        """Create a game with fractional resource amounts."""
+        self.game = create_game(Race.objects.create(name="Test Race"), systems=3)
+        Empire.objects.filter(game=self.game).update(mineral_storage=Decimal('12.5'), exotic_storage=3)
+        Planet.objects.filter(system__game=self.game).update(mineral_production=Decimal('1.25'))
+
+    def test_round_trip(self):
+        """Test that an imported snapshot recreates the game with new IDs"""
+        data = encode_snapshot(export_snapshot(self.game))
+        copy = import_snapshot(decode_snapshot(data))
+
+        self.assertNotEqual(copy.id, self.game.id)
+        self.assertEqual(game_contents(copy), game_contents(self.game))
+        # The copy has its own stars and players
+        self.assertFalse(
+            System.objects.filter(game=copy, star__system__game=self.game).exists()
+        )
+        self.assertFalse(Empire.objects.filter(game=copy, player__empires__game=self.game).exists())
+
+    def test_constant_query_count(self):
+        """Test that export and import queries don't grow with the game size"""
+        large_game = create_game(Race.objects.get(name="Test Race"), systems=12)
+
+        def count(game):
+            with CaptureQueriesContext(connection) as export_queries:
+                document = export_snapshot(game)
+            with CaptureQueriesContext(connection) as import_queries:
+                import_snapshot(document)
+            return len(export_queries), len(import_queries)
+
+        self.assertEqual(count(self.game), count(large_game))
+
+    def test_unknown_technology(self):
+        """Test that snapshots with research missing on this server are rejected"""
+        document = export_snapshot(self.game)
+        document['technologies'] = {key: 'Warp Drive' for key in document['technologies']}
+        games = Game.objects.count()
+        with self.assertRaises(SnapshotError):
+            import_snapshot(document)
+        self.assertEqual(Game.objects.count(), games)
+
+    def test_missing_columns_get_defaults(self):
+        """Test that snapshots without a later column import with its default"""
+        document = export_snapshot(self.game)
+        del document['tables']['empires']['ready_turn']
+        copy = import_snapshot(document)
+        self.assertEqual(game_contents(copy), game_contents(self.game))
+        self.assertFalse(Empire.objects.filter(game=copy, ready_turn__isnull=False).exists())
+
+    def test_turn_timer(self):
+        """Test that the turn duration is restored and the deadline restarts on import"""
+        self.game.turn_duration = 3600
+        self.game.save()
+        document = export_snapshot(self.game)
+        copy = import_snapshot(decode_snapshot(encode_snapshot(document)))
+        self.assertEqual(copy.turn_duration, 3600)
+        self.assertGreater(copy.turn_deadline, timezone.now())
+
+        del document['game']['turn_duration']
+        copy = import_snapshot(document)
+        self.assertIsNone(copy.turn_duration)
+        self.assertIsNone(copy.turn_deadline)
+
+    def test_inconsistent_snapshot(self):
+        """Test that snapshots with dangling references are rejected without changes"""
+        document = export_snapshot(self.game)
+        document['tables']['planets']['system_id'][0] = 999999
+        games = Game.objects.count()
+        with self.assertRaises(SnapshotError):
+            import_snapshot(document)
+        self.assertEqual(Game.objects.count(), games)
+
+
+class SnapshotAPITests(APITestCase):
+    """Test suite for the snapshot endpoints."""
+
+    def setUp(self):
+        """Create a game."""
+        self.game = create_game(Race.objects.create(name="Test Race"))
+
+    def test_download_and_import(self):
+        """Test that a downloaded snapshot can be imported as a new game"""
+        response = self.client.get(reverse('game-snapshot', args=[self.game.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn(f'game-{self.game.id}-turn-1', response['Content-Disposition'])
+
+        response = self.client.post(
+            reverse('game-import-snapshot'), response.content, content_type='application/gzip'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        copy = Game.objects.get(pk=response.data['id'])
+        self.assertEqual(len(response.data['empires']), 2)
+        self.assertEqual(game_contents(copy), game_contents(self.game))
+
+    def test_import_multipart(self):
+        """Test that a snapshot can be uploaded as a form file"""
+        data = encode_snapshot(export_snapshot(self.game))
+        response = self.client.post(
+            reverse('game-import-snapshot'),
+            {'snapshot': SimpleUploadedFile('game.snapshot.gz', data, content_type='application/gzip')},
+            format='multipart'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_import_rejects_bad_data(self):
+        """Test that non-snapshots and unsupported versions are rejected with 400"""
+        url = reverse('game-import-snapshot')
+        response = self.client.post(url, b'not gzip', content_type='application/gzip')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', response.data)
+
+        document = export_snapshot(self.game)
+        document['version'] = 99
+        response = self.client.post(
+            url, gzip.compress(json.dumps(document).encode()), content_type='application/gzip'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('version', response.data['error'])
+
+    @override_settings(GAME_SNAPSHOT_MAX_SIZE=1024)
+    def test_import_rejects_oversized_snapshot(self):
+        """Test that snapshots decompressing past the limit are rejected"""
+        response = self.client.post(
+            reverse('game-import-snapshot'), gzip.compress(b' ' * 1025), content_type='application/gzip'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('larger than 1024 bytes', response.data['error'])
+        with self.assertRaises(SnapshotError):
+            decode_snapshot(gzip.compress(b'{}')[:-4])
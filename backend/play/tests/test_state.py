@@ -0,0 +1,94 @@
+"""Tests for the in-memory game state.
+
+This module verifies that a game's state loads with one query per table,
+that only changed rows are written back, and that turn processing on the
+state takes a fixed number of queries however large the game is.
+"""
+
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from play.models import Empire, GameChange, Race
+from play.state import GameState
+from play.turn import calculate_resource_production, process
+from celestial.models import Planet, AsteroidBelt
+from research.models import EmpireTechnology
+from .factories import create_game
+
+
+class GameStateTests(TestCase):
+    """Test suite for loading and flushing game state."""
+
+    def setUp(self):
+        """Create a game."""
+        self.race = Race.objects.create(name="Test Race")
+        self.game = create_game(self.race, systems=3)
+
+    def test_load(self):
+        """Test that every row of the game is loaded with one query per table"""
+        with self.assertNumQueries(4):
+            state = GameState.load(self.game)
+        self.assertEqual(len(state.empires), 2)
+        self.assertEqual(len(state.planets), 3)
+        self.assertEqual(len(state.asteroid_belts), 3)
+        self.assertEqual(len(state.research), 2)
+        self.assertEqual(state.dirty(), {'empires': [], 'planets': [], 'asteroid_belts': [], 'research': []})
+
+    def test_production_matches_models(self):
+        """Test that production summed from the state matches the model queries"""
+        state = GameState.load(self.game)
+        holdings = state.holdings()
+        for empire in Empire.objects.filter(game=self.game):
+            production = state.production(empire.id, holdings)
+            self.assertEqual(tuple(production.values()), calculate_resource_production(empire))
+            self.assertEqual(state.capacity(empire.id, holdings)['mineral'], empire.mineral_capacity)
+
+    def test_flush_writes_dirty_rows(self):
+        """Test that only changed rows and columns are written and logged"""
+        state = GameState.load(self.game)
+        empire = next(iter(state.empires.values()))
+        empire.mineral_storage = Decimal('12.5')
+        planet = next(iter(state.planets.values()))
+        planet.empire_id = None
+        research = next(iter(state.research.values()))
+        research.research_points = Decimal('7.25')
+
+        self.assertEqual(planet.changed_fields(), ['empire_id'])
+        GameChange.objects.filter(game=self.game).delete()
+        with CaptureQueriesContext(connection) as queries:
+            written = state.flush()
+        self.assertEqual(written, {'empires': 1, 'planets': 1, 'asteroid_belts': 0, 'research': 1})
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE')]
+        # One bulk update per changed table plus the game version bump
+        self.assertEqual(len(updates), 4)
+        self.assertNotIn('production', next(sql for sql in updates if 'celestial_planet' in sql))
+
+        self.assertEqual(Empire.objects.get(pk=empire.id).mineral_storage, Decimal('12.5'))
+        self.assertIsNone(Planet.objects.get(pk=planet.id).empire_id)
+        self.assertEqual(EmpireTechnology.objects.get(pk=research.id).research_points, Decimal('7.25'))
+        self.assertEqual(
+            set(GameChange.objects.filter(game=self.game).values_list('kind', 'object_id')),
+            {(GameChange.Kind.EMPIRE, empire.id), (GameChange.Kind.PLANET, planet.id),
+             (GameChange.Kind.RESEARCH, research.id)}
+        )
+        self.assertFalse(any(state.dirty().values()))
+        with self.assertNumQueries(0):
+            state.flush()
+
+    def test_process_constant_query_count(self):
+        """Test that turn processing takes the same number of queries for larger games"""
+        large_game = create_game(self.race, systems=12)
+        for game in (self.game, large_game):
+            Planet.objects.filter(system__game=game).update(mineral_production=Decimal('10'))
+            AsteroidBelt.objects.filter(system__game=game).update(
+                empire=Empire.objects.filter(game=game).first()
+            )
+            process(game)
+
+        def count(game):
+            with CaptureQueriesContext(connection) as queries:
+                process(game)
+            return len(queries)
+
+        self.assertEqual(count(self.game), count(large_game))
@@ -0,0 +1,204 @@
+"""Tests for game versioning and conditional GETs.
+
+This module verifies that writes to game-scoped rows bump the game's version,
+that game-scoped GETs return an ETag, that a matching If-None-Match header
+is answered with 304 Not Modified, and that identical reads of the same
+version are coalesced.
+"""
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from play.models import Game, GameChange, Empire, Player, Race
+from play.turn import process
+from play.versioning import game_etag, deferred_version_bumps
+from celestial.models import Planet, AsteroidBelt, System, Star
+from research.models import EmpireTechnology, Technology
+
+
+class GameVersionTests(APITestCase):
+    """Test suite for game versions and ETags."""
+
+    def setUp(self):
+        """Create a game with an empire and a system with a planet."""
+        cache.clear()
+        self.game = Game.objects.create(turn=0)
+        self.empire = Empire.objects.create(
+            name="Test Empire",
+            player=Player.objects.create(),
+            race=Race.objects.create(name="Test Race"),
+            game=self.game
+        )
+        self.system = System.objects.create(
+            x=1, y=1, star=Star.objects.create(star_type="yellow"), game=self.game
+        )
+        self.planet = Planet.objects.create(system=self.system, orbit=1, empire=self.empire)
+
+    def version(self):
+        """Get the current mutation counter of the test game."""
+        return Game.objects.values_list('version', flat=True).get(pk=self.game.pk)
+
+    def test_planet_write_bumps_version(self):
+        """Test that saving and deleting planets bumps the game version"""
+        before = self.version()
+        self.planet.empire = None
+        self.planet.save()
+        self.assertEqual(self.version(), before + 1)
+        self.planet.delete()
+        self.assertEqual(self.version(), before + 2)
+
+    def test_belt_and_empire_writes_bump_version(self):
+        """Test that asteroid belt and empire writes bump the game version"""
+        before = self.version()
+        AsteroidBelt.objects.create(system=self.system, orbit=2)
+        self.empire.name = "Renamed"
+        self.empire.save()
+        self.assertEqual(self.version(), before + 2)
+
+    def test_star_write_bumps_version(self):
+        """Test that star writes bump the version of the system's game"""
+        before = self.version()
+        self.system.star.star_type = "blue"
+        self.system.star.save()
+        self.assertEqual(self.version(), before + 1)
+
+    def test_deferred_bumps_apply_once(self):
+        """Test that bumps inside a deferred block are applied once"""
+        before = self.version()
+        with deferred_version_bumps():
+            self.empire.save()
+            self.planet.save()
+            self.assertEqual(self.version(), before)
+        self.assertEqual(self.version(), before + 1)
+
+    def test_deferred_game_lookups(self):
+        """Test that saves inside a deferred block find their games with one query per type"""
+        research = EmpireTechnology.objects.create(
+            empire=self.empire, technology=Technology.objects.create(name="Mining")
+        )
+        planets = [self.planet] + [Planet.objects.create(system=self.system, orbit=orbit) for orbit in (2, 3)]
+        before = self.version()
+        GameChange.objects.all().delete()
+        with CaptureQueriesContext(connection) as queries:
+            with deferred_version_bumps():
+                # Loaded without their systems, empires or star's system
+                for planet in Planet.objects.filter(pk__in=[planet.pk for planet in planets]):
+                    planet.save()
+                EmpireTechnology.objects.get(pk=research.pk).save()
+                Star.objects.get(pk=self.system.star_id).save()
+                in_block = len(queries)
+        # Saves don't look their games up one by one; the lookups run as the block exits
+        lookups = [i for i, query in enumerate(queries) if '"game_id" FROM' in query['sql']]
+        self.assertFalse([
+            i for i in lookups if queries[i]['sql'].startswith(('SELECT "celestial_system"."game_id"',
+                                                                 'SELECT "play_empire"."game_id"'))
+        ])
+        self.assertEqual(len([i for i in lookups if i >= in_block]), 2)
+        self.assertEqual(self.version(), before + 1)
+        self.assertEqual(
+            sorted(GameChange.objects.filter(game=self.game).values_list('kind', 'object_id')),
+            sorted([('planet', planet.pk) for planet in planets] + [('research', research.pk)])
+        )
+
+    def test_game_save_keeps_version(self):
+        """Test that saving a stale game instance doesn't reset its version"""
+        self.planet.save()
+        version = self.version()
+        self.game.save()
+        self.assertEqual(self.version(), version)
+
+    def test_end_turn_changes_etag(self):
+        """Test that processing a turn changes the game's ETag"""
+        etag = game_etag(self.game.id)
+        process(self.game)
+        self.assertNotEqual(game_etag(self.game.id), etag)
+
+    def test_game_detail_etag(self):
+        """Test that the game detail returns an ETag and honours If-None-Match"""
+        url = reverse('game-detail', args=[self.game.id])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith(game_etag(self.game.id)[:-1]))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_write_invalidates_etag(self):
+        """Test that a write to the game's planets invalidates the systems ETag"""
+        url = reverse('game-systems', args=[self.game.id])
+        etag = self.client.get(url)['ETag']
+        self.planet.empire = None
+        self.planet.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_not_modified_skips_serializers(self):
+        """Test that a 304 is answered without serializing the empire"""
+        url = reverse('empire-detail', args=[self.empire.id])
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(2):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_game_filtered_list_etag(self):
+        """Test that lists filtered by game carry an ETag of the game's version"""
+        response = self.client.get(reverse('planet-list'), {'game': self.game.id})
+        self.assertTrue(response['ETag'].startswith(game_etag(self.game.id)[:-1]))
+        response = self.client.get(reverse('planet-list'))
+        self.assertNotIn('ETag', response)
+
+    def test_etag_differs_per_page_and_fields(self):
+        """Test that other pages and field sets are not answered with 304 for one ETag"""
+        Planet.objects.create(system=self.system, orbit=2)
+        url = reverse('planet-list')
+        first = self.client.get(url, {'game': self.game.id, 'page_size': 1})
+        etag = first['ETag']
+        self.assertIsNotNone(first.json()['next'])
+
+        response = self.client.get(first.json()['next'], HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        response = self.client.get(url, {'game': self.game.id, 'page_size': 1, 'fields': 'id'},
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(url, {'game': self.game.id, 'page_size': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_write_methods_have_no_etag(self):
+        """Test that non-GET requests are not answered with 304"""
+        url = reverse('game-end-turn', args=[self.game.id])
+        response = self.client.post(url, HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['turn'], 1)
+
+    def test_identical_reads_are_coalesced(self):
+        """Test that repeated reads of the same version share the response data"""
+        url = reverse('game-systems', args=[self.game.id])
+        first = self.client.get(url)
+        with self.assertNumQueries(1):
+            second = self.client.get(url)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_write_ends_coalescing(self):
+        """Test that reads after a write are computed for the new version"""
+        url = reverse('empire-detail', args=[self.empire.id])
+        self.client.get(url)
+        self.empire.name = "Renamed"
+        self.empire.save()
+        self.assertEqual(self.client.get(url).data['name'], "Renamed")
+
+    def test_errors_are_not_coalesced(self):
+        """Test that error responses are not shared between requests"""
+        url = reverse('game-dashboard', args=[self.game.id])
+        response = self.client.get(url, {'empire': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url, {'empire': self.empire.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,104 @@
+"""Tests for sharded turn workers.
+
+This module verifies that workers split the game partitions fairly, take
+over the partitions of a worker that stops renewing its leases, process
+only the games of their own partitions and report throughput and lag.
+"""
+
+import io
+import os
+import tempfile
+from datetime import timedelta
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from play.models import Game, Lease, Race
+from play.workers import TurnWorker, format_metrics, partition_of
+from .factories import create_game
+
+
+class TurnWorkerTests(TestCase):
+    """Test suite for partition leases and sharded processing."""
+
+    def setUp(self):
+        """Create four overdue games."""
+        self.now = timezone.now()
+        race = Race.objects.create(name="Test Race")
+        self.games = [create_game(race) for _ in range(4)]
+        Game.objects.update(turn_deadline=self.now - timedelta(minutes=1))
+
+    def worker(self, owner):
+        """Create a worker of four partitions processing in the calling thread."""
+        return TurnWorker(partitions=4, owner=owner, workers=1, batch_size=10, lease_seconds=30)
+
+    def test_fair_share_and_failover(self):
+        """Test that workers split the partitions and take over those of a dead worker"""
+        first, second = self.worker('first'), self.worker('second')
+        self.assertEqual(first.rebalance(self.now), {0, 1, 2, 3})
+        # A new worker finds everything taken; the first gives up its surplus next round
+        self.assertEqual(second.rebalance(self.now), set())
+        self.assertEqual(len(first.rebalance(self.now + timedelta(seconds=5))), 2)
+        self.assertEqual(len(second.rebalance(self.now + timedelta(seconds=5))), 2)
+        self.assertFalse(first.owned & second.owned)
+
+        # The second worker dies; once its leases lapse the first takes over
+        later = self.now + timedelta(seconds=20)
+        self.assertEqual(len(first.rebalance(later)), 2)
+        self.assertEqual(first.rebalance(later + timedelta(seconds=16)), {0, 1, 2, 3})
+        self.assertEqual(first.live_workers, 1)
+
+    def test_processes_own_partitions(self):
+        """Test that a worker only processes the overdue games of its partitions"""
+        first, second = self.worker('first'), self.worker('second')
+        first.rebalance(self.now)
+        second.rebalance(self.now)
+        first.rebalance(self.now)
+        stats = first.run_once(self.now)
+        mine = [game.pk for game in self.games if partition_of(game.pk, 4) in first.owned]
+        self.assertEqual(stats['processed'], len(mine))
+        turns = dict(Game.objects.values_list('pk', 'turn'))
+        self.assertEqual({pk for pk, turn in turns.items() if turn == 2}, set(mine))
+
+        second.run_once(self.now)
+        self.assertEqual(set(Game.objects.values_list('turn', flat=True)), {2})
+
+    def test_metrics(self):
+        """Test that lag and overdue games are measured over the worker's partitions"""
+        worker = self.worker('first')
+        worker.rebalance(self.now)
+        metrics = worker.metrics(self.now)
+        self.assertEqual(metrics['overdue'], 4)
+        self.assertEqual(metrics['lag_seconds'], 60.0)
+        self.assertEqual(metrics['partitions'], 4)
+
+        worker.run_once(self.now)
+        metrics = worker.metrics(self.now)
+        self.assertEqual(metrics['processed_total'], 4)
+        self.assertEqual(metrics['overdue'], 0)
+        self.assertEqual(metrics['lag_seconds'], 0.0)
+        self.assertGreater(metrics['throughput'], 0)
+        text = format_metrics(metrics, 'first')
+        self.assertIn('# TYPE spacegame_turn_worker_processed_total counter', text)
+        self.assertIn('spacegame_turn_worker_lag_seconds{worker="first"} 0.0', text)
+
+    def test_shutdown_releases_leases(self):
+        """Test that a stopping worker hands its partitions over at once"""
+        first, second = self.worker('first'), self.worker('second')
+        first.rebalance(self.now)
+        first.shutdown()
+        self.assertFalse(Lease.objects.exists())
+        self.assertEqual(second.rebalance(self.now), {0, 1, 2, 3})
+
+    def test_command(self):
+        """Test that the command processes a round and writes its metrics"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'worker.prom')
+            out = io.StringIO()
+            call_command(
+                'run_turn_worker', partitions=2, workers=1, batch_size=10, rounds=1,
+                metrics_file=path, stdout=out, stderr=io.StringIO()
+            )
+            with open(path) as stream:
+                self.assertIn('spacegame_turn_worker_processed_total', stream.read())
+        self.assertIn('"processed_total": 4', out.getvalue())
+        self.assertFalse(Lease.objects.exists())
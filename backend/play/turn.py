@@ -7,10 +7,20 @@ This module handles the end-of-turn processing for games, including:
 - Calculating resource production and storage
 
 The module provides a single public function `process()` that handles all turn processing logic.
+It works on the game's in-memory :class:`play.state.GameState` and writes back only the
+rows that changed.
 """
 
 import logging
 from .models import Game, Empire
+from .versioning import deferred_version_bumps
+from .economy import RESOURCES, next_storage
+from .state import GameState
+from .ai import run_ai_phase
+from .orders import resolve_orders, prune_orders
+from .changes import prune_changes
+from .history import record_turn_snapshot
+from .events import publish_turn_completed
 from celestial.models import Planet, AsteroidBelt
 from decimal import Decimal
 from django.db.models import Sum
@@ -74,10 +84,13 @@ def update_empire_resources(empire: Empire) -> None:
     old_exotic = empire.exotic_storage
     
     # Update storage values, capped at capacity
-    empire.mineral_storage = min(empire.mineral_storage + mineral_prod, empire.mineral_capacity)
-    empire.organic_storage = min(empire.organic_storage + organic_prod, empire.organic_capacity)
-    empire.radioactive_storage = min(empire.radioactive_storage + radioactive_prod, empire.radioactive_capacity)
-    empire.exotic_storage = min(empire.exotic_storage + exotic_prod, empire.exotic_capacity)
+    storage = next_storage(
+        {resource: getattr(empire, f'{resource}_storage') for resource in RESOURCES},
+        dict(zip(RESOURCES, (mineral_prod, organic_prod, radioactive_prod, exotic_prod))),
+        {resource: getattr(empire, f'{resource}_capacity') for resource in RESOURCES}
+    )
+    for resource, value in storage.items():
+        setattr(empire, f'{resource}_storage', value)
     
     # Save changes
     empire.save()
@@ -88,14 +101,35 @@ def update_empire_resources(empire: Empire) -> None:
                 f"Radioactive: {old_radioactive} -> {empire.radioactive_storage}, "
                 f"Exotic: {old_exotic} -> {empire.exotic_storage}")
 
+def produce_resources(state: GameState) -> None:
+    """Add one turn of production to the storage of every empire, capped at capacity.
+    
+    Args:
+        state (GameState): The game state to update in memory
+    """
+    holdings = state.holdings()
+    for empire in state.empires.values():
+        storage = next_storage(
+            {resource: getattr(empire, f'{resource}_storage') for resource in RESOURCES},
+            state.production(empire.id, holdings),
+            state.capacity(empire.id, holdings)
+        )
+        for resource, value in storage.items():
+            setattr(empire, f'{resource}_storage', value)
+
 def process(game: Game) -> Game:
     """Process the end of turn for a game.
     
     This function handles all end-of-turn processing for a game, including:
-    - Advancing the turn counter
+    - Advancing the turn counter and setting the new turn's deadline
+    - Resolving the orders players submitted during the turn
+    - Deciding and applying the orders of computer empires
     - Calculating resource production for each empire
     - Updating resource storage values
     - Saving the updated game state
+    - Recording a snapshot of the rows that changed, for rewinding
+    - Pruning change log entries older than the change log horizon and resolved orders
+    - Notifying subscribed clients once the turn is committed
     
     Args:
         game (Game): The game instance to process
@@ -105,17 +139,29 @@ def process(game: Game) -> Game:
     """
     logger.info(f"Processing end of turn {game.turn} for game {game.id}")
     
-    # Process resources for each empire
-    empires = game.empires.all()
-    logger.info(f"Processing resources for {len(empires)} empires")
-    
-    for empire in empires:
-        update_empire_resources(empire)
-    
-    # Advance turn counter
-    old_turn = game.turn
-    game.turn += 1
-    game.save()
+    # Process orders and resources for each empire on the in-memory state
+    state = GameState.load(game)
+    resolve_orders(state)
+    if game.turn > 0:
+        # Computer empires act from the first played turn on, not during setup
+        run_ai_phase(state)
+    logger.info(f"Processing resources for {len(state.empires)} empires")
+    produce_resources(state)
+    
+    # Version bumps and change log entries are written once, stamped with the new turn
+    with deferred_version_bumps():
+        state.flush()
+    
+        # Advance turn counter
+        old_turn = game.turn
+        game.turn += 1
+        game.turn_deadline = game.next_turn_deadline()
+        game.save()
+    
+    record_turn_snapshot(game)
+    prune_changes(game)
+    prune_orders(game)
+    publish_turn_completed(game.id)
     
     logger.info(f"Turn processing complete. Game {game.id} advanced from turn {old_turn} to {game.turn}")
     return game 
\ No newline at end of file
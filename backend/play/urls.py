@@ -1,6 +1,7 @@
 from rest_framework.routers import DefaultRouter
 from django.urls import path, include
 from .views import PlayerViewSet, RaceViewSet, EmpireViewSet, GameViewSet
+from .events import game_events
 
 router = DefaultRouter()
 router.register(r'players', PlayerViewSet)
@@ -9,5 +10,6 @@ router.register(r'empires', EmpireViewSet)
 router.register(r'games', GameViewSet)
 
 urlpatterns = [
+    path('games/<int:game_id>/events/', game_events, name='game-events'),
     path('', include(router.urls)),
 ]
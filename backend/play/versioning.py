@@ -0,0 +1,363 @@
+"""Game state versioning and conditional GET support.
+
+This module tracks a cheap version for each game so that clients can
+revalidate cached game-scoped resources instead of re-downloading them:
+
+- A game's version combines ``Game.turn``, ``Game.modified`` and the
+  ``Game.version`` mutation counter
+- Writes to planets, asteroid belts, empires, systems, stars and research
+  bump the counter (see :mod:`play.signals`)
+- Writes to empires, planets, asteroid belts and research are also recorded
+  in the :model:`play.GameChange` log that backs delta sync
+- Writes to systems, stars and bodies also drop the game's cached galaxy
+  layout (see :mod:`play.layout`)
+- :class:`GameETagMixin` returns the version, combined with a digest of the
+  request path and query, as an ``ETag`` on game-scoped GETs and answers a
+  matching ``If-None-Match`` with 304 before any serializer runs
+- Identical concurrent game-scoped GETs for the same version are coalesced:
+  one request computes the response data and the others share it (see
+  :mod:`core.singleflight`)
+"""
+
+import hashlib
+import threading
+from contextlib import contextmanager
+from django.conf import settings
+from django.db.models import F
+from django.utils.http import parse_etags
+from django.http import HttpResponseBase
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+from core.singleflight import coalesce, Unshared
+from .models import Game, GameChange
+
+_state = threading.local()
+
+DEFAULT_GAME_READ_COALESCE_TIMEOUT = 60
+
+# Queued with a game's changed rows when its galaxy layout changed
+LAYOUT_CHANGED = ('layout', None)
+
+
+def game_etag(game_id):
+    """Build the ETag for the current version of a game.
+
+    Args:
+        game_id (int): The game ID
+
+    Returns:
+        str: Weak ETag for the game's state, or None if the game doesn't exist
+    """
+    row = Game.objects.filter(pk=game_id).values_list('turn', 'version', 'modified').first()
+    return _format_etag(game_id, row)
+
+
+async def agame_etag(game_id):
+    """Async version of :func:`game_etag` for async views."""
+    row = await Game.objects.filter(pk=game_id).values_list('turn', 'version', 'modified').afirst()
+    return _format_etag(game_id, row)
+
+
+def _format_etag(game_id, row):
+    """Format a game's ``(turn, version, modified)`` row as a weak ETag."""
+    if row is None:
+        return None
+    turn, version, modified = row
+    return f'W/"{game_id}-{turn}-{version}-{int(modified.timestamp() * 1000000)}"'
+
+
+def resource_etag(version, request):
+    """Build the ETag of a game-scoped resource for a game version.
+
+    Every page, field set and filter of a game's resources is a different
+    representation, so the ETag includes a digest of the route and query.
+    Routes are identified by name and arguments, so the sync and async
+    routes of a resource share ETags.
+
+    Args:
+        version (str): The game's version ETag, see :func:`game_etag`
+        request: The HTTP request
+
+    Returns:
+        str: Weak ETag for the resource, or None if the version is None
+    """
+    if version is None:
+        return None
+    match = request.resolver_match
+    resource = f'{match.url_name}:{sorted((k, str(v)) for k, v in match.kwargs.items())}' if match else request.path
+    query = request.META.get('QUERY_STRING', '')
+    digest = hashlib.sha1(f'{resource}?{query}'.encode('utf-8')).hexdigest()[:12]
+    return f'{version[:-1]}-{digest}"'
+
+
+def etag_matches(request, etag):
+    """Check whether a request's ``If-None-Match`` header matches an ETag.
+
+    Args:
+        request: The HTTP request
+        etag (str): The current ETag
+
+    Returns:
+        bool: True if the client's cached copy is current
+    """
+    client_etags = parse_etags(request.headers.get('If-None-Match', ''))
+    return '*' in client_etags or _strip_weak(etag) in {
+        _strip_weak(client_etag) for client_etag in client_etags
+    }
+
+
+def read_cache_key(etag, request):
+    """Get the cache key of a game-scoped GET's response data.
+
+    Args:
+        etag (str): The game's version ETag
+        request: The HTTP request
+
+    Returns:
+        str: The cache key, unique per game version and full path
+    """
+    digest = hashlib.sha1(f'{etag}:{request.get_full_path()}'.encode('utf-8')).hexdigest()
+    return f'play:read:{digest}'
+
+
+def _rows(kind, object_ids, layout):
+    """Get the queued entries of changed rows."""
+    rows = {(kind, object_id) for object_id in object_ids} if kind is not None else set()
+    if layout:
+        rows.add(LAYOUT_CHANGED)
+    return rows
+
+
+def record_changes(game_id, kind, object_ids, layout=False):
+    """Record changed rows of a game and bump its version.
+
+    Inside a :func:`deferred_version_bumps` block the write is postponed
+    until the block exits.
+
+    Args:
+        game_id (int): The game the rows belong to, or None
+        kind (str): A :class:`play.models.GameChange.Kind` value, or None to
+            only bump the game's version
+        object_ids (Iterable[int]): Primary keys of the changed rows
+        layout (bool): Whether the rows are part of the galaxy layout
+    """
+    if game_id is None:
+        return
+    _queue({game_id: _rows(kind, object_ids, layout)})
+
+
+def record_changes_by_lookup(model, field, value, kind, object_ids, layout=False):
+    """Record changed rows of the game found through a related row.
+
+    Used when the game ID of the changed rows isn't at hand, for example a
+    saved planet whose system wasn't loaded. Inside a
+    :func:`deferred_version_bumps` block the lookups are postponed and
+    resolved when the block exits, with one query per lookup type.
+
+    Args:
+        model (Model): The model holding the game ID, System or Empire
+        field (str): The column of ``model`` to match, such as ``pk``
+        value: The value of ``field``
+        kind (str): A :class:`play.models.GameChange.Kind` value, or None to
+            only bump the game's version
+        object_ids (Iterable[int]): Primary keys of the changed rows
+        layout (bool): Whether the rows are part of the galaxy layout
+    """
+    _queue({}, {(model, field): {value: _rows(kind, object_ids, layout)}})
+
+
+def bump_game_versions(game_ids):
+    """Increment the mutation counter of the given games.
+
+    Inside a :func:`deferred_version_bumps` block the bump is postponed
+    until the block exits, so each game is bumped once per block.
+
+    Args:
+        game_ids (Iterable[int]): IDs of the games whose state changed
+    """
+    _queue({game_id: set() for game_id in game_ids if game_id is not None})
+
+
+@contextmanager
+def deferred_version_bumps():
+    """Collect version bumps and changes and apply them when the block exits.
+
+    Used by bulk operations such as turn processing, which save many rows
+    of the same game and only need a single version change. Changes are
+    stamped with the game's turn at the end of the block.
+    """
+    if getattr(_state, 'pending', None) is not None:
+        # Nested block, the outermost one applies the bumps
+        yield
+        return
+    _state.pending = {}
+    _state.lookups = {}
+    try:
+        yield
+    finally:
+        pending, _state.pending = _state.pending, None
+        lookups, _state.lookups = _state.lookups, None
+        _flush(pending, lookups)
+
+
+def _queue(changes, lookups=None):
+    """Buffer or immediately apply version bumps and changes by game.
+
+    ``lookups`` holds changes whose game is still to be found, as
+    ``{(model, field): {value: rows}}``.
+    """
+    if not changes and not lookups:
+        return
+    pending = getattr(_state, 'pending', None)
+    if pending is None:
+        _flush(changes, lookups)
+        return
+    for game_id, rows in changes.items():
+        pending.setdefault(game_id, set()).update(rows)
+    for key, values in (lookups or {}).items():
+        queued = _state.lookups.setdefault(key, {})
+        for value, rows in values.items():
+            queued.setdefault(value, set()).update(rows)
+
+
+def _resolve(changes, lookups):
+    """Merge changes found through related rows into changes by game ID."""
+    changes = {game_id: set(rows) for game_id, rows in changes.items()}
+    for (model, field), values in lookups.items():
+        for value, game_id in model.objects.filter(**{f'{field}__in': values}).values_list(field, 'game_id'):
+            changes.setdefault(game_id, set()).update(values[value])
+    return changes
+
+
+def _flush(changes, lookups=None):
+    """Bump the versions of the given games, write their change log and drop stale layouts."""
+    if lookups:
+        changes = _resolve(changes, lookups)
+    if not changes:
+        return
+    Game.objects.filter(pk__in=changes).update(version=F('version') + 1)
+    layouts = [game_id for game_id, rows in changes.items() if LAYOUT_CHANGED in rows]
+    if layouts:
+        # Imported here to avoid a cycle: play.layout imports play.signals,
+        # which imports this module
+        from .layout import invalidate_layout
+        invalidate_layout(layouts)
+    changes = {game_id: rows - {LAYOUT_CHANGED} for game_id, rows in changes.items()}
+    logged = [game_id for game_id, rows in changes.items() if rows]
+    if not logged:
+        return
+    turns = dict(Game.objects.filter(pk__in=logged).values_list('id', 'turn'))
+    GameChange.objects.bulk_create([
+        GameChange(game_id=game_id, turn=turns[game_id], kind=kind, object_id=object_id)
+        for game_id in logged if game_id in turns
+        for kind, object_id in sorted(changes[game_id])
+    ])
+
+
+class NotModified(APIException):
+    """Raised when the client's cached copy of a game resource is current."""
+    status_code = status.HTTP_304_NOT_MODIFIED
+    default_detail = 'Not modified.'
+    default_code = 'not_modified'
+
+
+class GameETagMixin:
+    """Add game-versioned ETags and conditional GETs to a viewset.
+
+    Views set ``etag_game_lookup`` to the ORM path from their model to the
+    owning game's ID. Detail routes look the game up from the object's
+    primary key; list routes are game-scoped when a ``game`` query parameter
+    is given. The check runs in :meth:`initial`, before the handler touches
+    any serializer.
+    
+    Game-scoped GETs that aren't answered with 304 are coalesced per game
+    version and path: concurrent identical requests wait for one handler
+    run and share its response data, which stays cached for
+    ``GAME_READ_COALESCE_TIMEOUT`` seconds (0 disables coalescing). Views
+    set ``coalesce_reads = False`` to opt out.
+    """
+    etag_game_lookup = 'game_id'
+    coalesce_reads = True
+
+    def get_etag_game_id(self):
+        """Get the ID of the game this GET request reads.
+
+        Returns:
+            int: The game ID, or None if the request isn't game-scoped
+        """
+        lookup_value = self.kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        if lookup_value is None:
+            lookup_value = self.request.query_params.get('game')
+            return int(lookup_value) if lookup_value and lookup_value.isdigit() else None
+        if not str(lookup_value).isdigit():
+            return None
+        if self.etag_game_lookup == 'id':
+            return int(lookup_value)
+        model = self.get_queryset().model
+        return model.objects.filter(pk=lookup_value).values_list(
+            self.etag_game_lookup, flat=True
+        ).first()
+
+    def initial(self, request, *args, **kwargs):
+        """Answer conditional GETs for unchanged games with 304."""
+        super().initial(request, *args, **kwargs)
+        self.game_version = self.game_etag = None
+        if request.method not in ('GET', 'HEAD'):
+            return
+        game_id = self.get_etag_game_id()
+        if game_id is None:
+            return
+        self.game_version = game_etag(game_id)
+        if self.game_version is None:
+            return
+        self.game_etag = resource_etag(self.game_version, request)
+        if etag_matches(request, self.game_etag):
+            raise NotModified()
+        self.coalesce_read(request)
+
+    def coalesce_read(self, request):
+        """Route this game-scoped GET through the coalesced read cache.
+
+        Only successful DRF responses are shared; errors, streams and other
+        responses are returned to the request that produced them.
+        """
+        timeout = getattr(settings, 'GAME_READ_COALESCE_TIMEOUT', DEFAULT_GAME_READ_COALESCE_TIMEOUT)
+        if not (self.coalesce_reads and timeout):
+            return
+        method = request.method.lower()
+        handler = getattr(self, method)
+        key = read_cache_key(self.game_version, request)
+
+        def compute(request, args, kwargs):
+            response = handler(request, *args, **kwargs)
+            if not isinstance(response, Response) or response.status_code != status.HTTP_200_OK:
+                raise Unshared(response)
+            return response.data
+
+        def coalesced(request, *args, **kwargs):
+            result = coalesce(key, lambda: compute(request, args, kwargs), timeout)
+            return result if isinstance(result, HttpResponseBase) else Response(result)
+
+        # dispatch() looks the handler up after initial(), so it gets the wrapper
+        setattr(self, method, coalesced)
+
+    def handle_exception(self, exc):
+        """Return an empty 304 response for :class:`NotModified`."""
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Attach the game's ETag to successful game-scoped GETs."""
+        response = super().finalize_response(request, response, *args, **kwargs)
+        etag = getattr(self, 'game_etag', None)
+        if etag and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+def _strip_weak(etag):
+    """Drop the weak validator prefix so ETags compare weakly."""
+    return etag[2:] if etag.startswith('W/') else etag
@@ -10,25 +10,70 @@ These views handle HTTP requests and coordinate with models and serializers
 to provide the game's API endpoints.
 """
 
+from django.http import HttpResponse
 from django.shortcuts import render
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.parsers import BaseParser, MultiPartParser
 from rest_framework.response import Response
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
 from .models import Player, Race, Empire, Game
 from .serializers import (
     PlayerSerializer, 
     RaceSerializer, 
     EmpireSerializer, 
     GameSerializer,
-    StartGameSerializer
+    StartGameSerializer,
+    OwnershipSerializer,
+    OrderBatchSerializer
 )
 from celestial.serializers import SystemSerializer, PlanetSerializer, AsteroidBeltSerializer
 from .start import start_game, GalaxySize
-from .turn import process
+from .barrier import BarrierError, end_turn
+from .purge import soft_delete_game
+from .history import RewindError, rewind_game
+from .fork import fork_game
+from .snapshot import (
+    SNAPSHOT_CONTENT_TYPE, SnapshotError, export_snapshot, encode_snapshot, decode_snapshot, import_snapshot
+)
+from .versioning import GameETagMixin, game_etag
+from .dashboard import get_dashboard
+from .layout import get_systems
+from .changes import changes_since, ChangesPruned
+from core.serializers import parse_field_list
+from core.streaming import StreamingListMixin, streaming_json_response, wants_stream
 
 # Create your views here.
 
+class SnapshotParser(BaseParser):
+    """Pass a raw game snapshot upload through as bytes."""
+    media_type = 'application/*'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Read the request body."""
+        return stream.read() if stream is not None else b''
+
+
+def prefetch_empire_expansions(queryset, request):
+    """Prefetch the empire relations requested with ``?expand=`` or ``?fields=``.
+    
+    Args:
+        queryset (QuerySet): The empire queryset
+        request: The DRF or plain Django HTTP request
+        
+    Returns:
+        QuerySet: The queryset with the needed prefetches
+    """
+    params = getattr(request, 'query_params', request.GET)
+    requested = parse_field_list(params.get('expand')) | parse_field_list(params.get('fields'))
+    if requested & {'planets', 'resource_capacities'}:
+        queryset = queryset.prefetch_related('owned_planets')
+    if 'asteroid_belts' in requested:
+        queryset = queryset.prefetch_related('owned_asteroid_belts')
+    return queryset
+
+
 @extend_schema(tags=['players'])
 class PlayerViewSet(viewsets.ModelViewSet):
     """ViewSet for managing player instances.
@@ -60,7 +105,7 @@ class RaceViewSet(viewsets.ModelViewSet):
 
 
 @extend_schema(tags=['empires'])
-class EmpireViewSet(viewsets.ModelViewSet):
+class EmpireViewSet(GameETagMixin, StreamingListMixin, viewsets.ModelViewSet):
     """ViewSet for managing empire instances.
     
     Provides CRUD operations for empires in the game:
@@ -73,9 +118,16 @@ class EmpireViewSet(viewsets.ModelViewSet):
     Additional endpoints:
     * GET /api/empires/{id}/planets/ - List all planets belonging to the empire
     * GET /api/empires/{id}/asteroid-belts/ - List all asteroid belts belonging to the empire
+    
+    GET responses carry the owning game's version as an ETag.
     """
-    queryset = Empire.objects.all()
+    queryset = Empire.objects.select_related('player', 'race')
     serializer_class = EmpireSerializer
+    scope_filter_lookups = {'game': 'game'}
+
+    def get_queryset(self):
+        """Get empires, prefetching only the relations the client requested."""
+        return prefetch_empire_expansions(super().get_queryset(), self.request)
 
     @extend_schema(
         description='Get all planets belonging to this empire',
@@ -94,7 +146,7 @@ class EmpireViewSet(viewsets.ModelViewSet):
         """
         empire = self.get_object()
         planets = empire.planets
-        serializer = PlanetSerializer(planets, many=True)
+        serializer = PlanetSerializer(planets, many=True, context=self.get_serializer_context())
         return Response(serializer.data)
 
     @extend_schema(
@@ -114,19 +166,31 @@ class EmpireViewSet(viewsets.ModelViewSet):
         """
         empire = self.get_object()
         asteroid_belts = empire.asteroid_belts
-        serializer = AsteroidBeltSerializer(asteroid_belts, many=True)
+        serializer = AsteroidBeltSerializer(asteroid_belts, many=True, context=self.get_serializer_context())
         return Response(serializer.data)
 
 
 @extend_schema(tags=['games'])
-class GameViewSet(viewsets.ModelViewSet):
+class GameViewSet(GameETagMixin, viewsets.ModelViewSet):
     """ViewSet for managing game instances.
     
     Provides endpoints for creating, retrieving, updating and deleting games,
     as well as game-specific actions like ending turns and starting new games.
+    
+    GET responses carry the game's version as an ETag, and requests with a
+    matching If-None-Match header are answered with 304 Not Modified.
     """
     queryset = Game.objects.all()
     serializer_class = GameSerializer
+    etag_game_lookup = 'id'
+
+    def get_queryset(self):
+        """Get games, prefetching the related ids rendered by GameSerializer."""
+        queryset = super().get_queryset()
+        if self.action in ('systems', 'empires', 'dashboard', 'changes', 'ownership', 'orders', 'snapshot',
+                           'import_snapshot', 'rewind', 'fork'):
+            return queryset
+        return queryset.prefetch_related('empires', 'systems')
 
     def perform_create(self, serializer):
         """Create a new game starting at turn 0.
@@ -136,8 +200,23 @@ class GameViewSet(viewsets.ModelViewSet):
         """
         serializer.save(turn=0)
 
+    def perform_destroy(self, instance):
+        """Hide the game at once and purge its rows in the background.
+        
+        Args:
+            instance (Game): The game to delete
+        """
+        soft_delete_game(instance)
+
     @extend_schema(
         description='Get all systems in this game',
+        parameters=[
+            OpenApiParameter(
+                'stream', bool,
+                description='Stream the systems as a JSON array, gzip-compressed '
+                            'if the client accepts it'
+            )
+        ],
         responses={200: SystemSerializer(many=True)}
     )
     @action(detail=True, methods=['get'])
@@ -149,11 +228,23 @@ class GameViewSet(viewsets.ModelViewSet):
             pk: The game ID
             
         Returns:
-            Response: List of systems in the game
+            Response: List of systems in the game, streamed with ``?stream=true``
+            
+        The full list is served from the cached galaxy layout with a fresh
+        ownership overlay. Sparse fieldsets and streams are rendered from
+        the database.
         """
         game = self.get_object()
-        systems = game.systems.all()
-        serializer = SystemSerializer(systems, many=True)
+        if not wants_stream(request) and not (
+            request.query_params.get('fields') or request.query_params.get('expand')
+        ):
+            return Response(get_systems(game))
+        systems = game.systems.select_related('star').prefetch_related('planets', 'asteroid_belts')
+        if wants_stream(request):
+            return streaming_json_response(
+                request, systems, SystemSerializer, self.get_serializer_context()
+            )
+        serializer = SystemSerializer(systems, many=True, context=self.get_serializer_context())
         return Response(serializer.data)
 
     @extend_schema(
@@ -172,37 +263,365 @@ class GameViewSet(viewsets.ModelViewSet):
             Response: List of empires in the game
         """
         game = self.get_object()
-        empires = game.empires.all()
-        serializer = EmpireSerializer(empires, many=True)
+        empires = prefetch_empire_expansions(
+            game.empires.select_related('player', 'race'), request
+        )
+        serializer = EmpireSerializer(empires, many=True, context=self.get_serializer_context())
         return Response(serializer.data)
 
     @extend_schema(
-        description='End the current turn and start the next one',
+        description='Get the dashboard of an empire in this game: storage, capacities, '
+                    'production totals, colonies and research summary',
+        parameters=[
+            OpenApiParameter(
+                'empire', int,
+                description='The empire ID (defaults to the human empire of the game)'
+            )
+        ],
+        responses={200: OpenApiTypes.OBJECT}
+    )
+    @action(detail=True, methods=['get'])
+    def dashboard(self, request, pk=None):
+        """Get the dashboard of an empire in this game.
+        
+        The dashboard is built from a fixed number of queries and cached
+        per game version.
+        
+        Args:
+            request: The HTTP request, with an optional ``empire`` query parameter
+            pk: The game ID
+            
+        Returns:
+            Response: The empire dashboard, or 404 if the empire isn't in the game
+        """
+        game = self.get_object()
+        empire_id = request.query_params.get('empire')
+        if empire_id is None:
+            empire_id = game.empires.filter(
+                player__player_type=Player.PlayerType.HUMAN
+            ).order_by('id').values_list('id', flat=True).first()
+        elif not empire_id.isdigit():
+            return Response(
+                {'error': 'empire must be an integer id'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if empire_id is None:
+            return Response({'error': 'Empire not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            data = get_dashboard(game, int(empire_id), self.game_version or game_etag(game.id))
+        except Empire.DoesNotExist:
+            return Response({'error': 'Empire not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(data)
+
+    @extend_schema(
+        description='Get the empires, planets, asteroid belts and research rows that '
+                    'changed since the start of a turn',
+        parameters=[
+            OpenApiParameter(
+                'since_turn', int, required=True,
+                description='The turn during which the client last loaded the game'
+            )
+        ],
+        responses={200: OpenApiTypes.OBJECT}
+    )
+    @action(detail=True, methods=['get'])
+    def changes(self, request, pk=None):
+        """Get the rows of this game that changed since the start of a turn.
+        
+        Args:
+            request: The HTTP request, with a ``since_turn`` query parameter
+            pk: The game ID
+            
+        Returns:
+            Response: The changed and deleted rows, 400 if ``since_turn`` is
+            invalid, or 410 if the changes have been pruned and the client
+            must reload the full game state
+        """
+        game = self.get_object()
+        since_turn = request.query_params.get('since_turn', '')
+        if not since_turn.isdigit():
+            return Response(
+                {'error': 'since_turn must be a non-negative integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            data = changes_since(game, int(since_turn), self.get_serializer_context())
+        except ChangesPruned as e:
+            return Response({'error': str(e)}, status=status.HTTP_410_GONE)
+        return Response(data)
+
+    @extend_schema(
+        description='Reassign the owners of many planets and asteroid belts in this game',
+        request=OwnershipSerializer,
+        responses={
+            200: {
+                'type': 'object',
+                'properties': {
+                    'planets': {'type': 'array', 'items': {'type': 'integer'}},
+                    'asteroid_belts': {'type': 'array', 'items': {'type': 'integer'}}
+                }
+            }
+        }
+    )
+    @action(detail=True, methods=['post'])
+    def ownership(self, request, pk=None):
+        """Reassign the owners of many planets and asteroid belts.
+        
+        Bodies and empires are validated against the game with one query per
+        type, and owners are written with one UPDATE per target empire.
+        Nothing is changed if any entry is invalid.
+        
+        Args:
+            request: The HTTP request with ``planets`` and ``asteroid_belts``
+                lists of ``{"id", "empire"}`` entries
+            pk: The game ID
+            
+        Returns:
+            Response: IDs of the bodies whose owner changed, or 400 with
+            per-entry errors
+        """
+        game = self.get_object()
+        serializer = OwnershipSerializer(data=request.data, context={'game': game})
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response(serializer.save())
+
+    @extend_schema(
+        description='Queue orders for the current turn, resolved when the turn ends',
+        request=OrderBatchSerializer,
+        responses={
+            201: {
+                'type': 'object',
+                'properties': {
+                    'turn': {'type': 'integer', 'description': 'The turn the orders were queued for'},
+                    'orders': {'type': 'array', 'items': {'type': 'integer'}}
+                }
+            }
+        }
+    )
+    @action(detail=True, methods=['post'])
+    def orders(self, request, pk=None):
+        """Queue orders for the current turn.
+        
+        Empires and targets are validated against the game with one query
+        per type, and the orders are appended with one INSERT. They are
+        resolved together at the end of the turn, see :mod:`play.orders`.
+        Nothing is queued if any order is invalid.
+        
+        Args:
+            request: The HTTP request with an ``orders`` list of
+                ``{"empire", "kind", "target", "amount"}`` entries
+            pk: The game ID
+            
+        Returns:
+            Response: The turn and IDs of the queued orders, or 400 with
+            per-order errors
+        """
+        game = self.get_object()
+        serializer = OrderBatchSerializer(data=request.data, context={'game': game})
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response(serializer.save(), status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        description='Copy the game at its current turn into a new game',
         request=None,
-        responses={200: GameSerializer}
+        responses={201: GameSerializer}
+    )
+    @action(detail=True, methods=['post'])
+    def fork(self, request, pk=None):
+        """Copy the game at its current turn into a new game.
+        
+        Rows are copied in the database with one INSERT ... SELECT per
+        table, see :mod:`play.fork`.
+        
+        Args:
+            request: The HTTP request
+            pk: The game ID
+            
+        Returns:
+            Response: The new game data
+        """
+        fork = fork_game(self.get_object())
+        fork = Game.objects.prefetch_related('empires', 'systems').get(pk=fork.pk)
+        return Response(self.get_serializer(fork).data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        description='Download the whole game as a compressed save-game snapshot',
+        responses={(200, SNAPSHOT_CONTENT_TYPE): OpenApiTypes.BINARY}
+    )
+    @action(detail=True, methods=['get'])
+    def snapshot(self, request, pk=None):
+        """Download the whole game as a compressed save-game snapshot.
+        
+        The snapshot is read with one query per table, see :mod:`play.snapshot`.
+        
+        Args:
+            request: The HTTP request
+            pk: The game ID
+            
+        Returns:
+            HttpResponse: The gzip-compressed snapshot as an attachment
+        """
+        game = self.get_object()
+        response = HttpResponse(encode_snapshot(export_snapshot(game)), content_type=SNAPSHOT_CONTENT_TYPE)
+        response['Content-Disposition'] = f'attachment; filename="game-{game.id}-turn-{game.turn}.snapshot.gz"'
+        return response
+
+    @extend_schema(
+        description='Load a save-game snapshot as a new game. Send the snapshot as the request body '
+                    '(application/gzip) or as the "snapshot" file of a multipart form.',
+        request={SNAPSHOT_CONTENT_TYPE: OpenApiTypes.BINARY, 'multipart/form-data': {
+            'type': 'object', 'properties': {'snapshot': {'type': 'string', 'format': 'binary'}}
+        }},
+        responses={
+            201: GameSerializer,
+            400: {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string', 'description': 'Why the snapshot could not be loaded'}
+                }
+            }
+        }
+    )
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[SnapshotParser, MultiPartParser])
+    def import_snapshot(self, request):
+        """Load a save-game snapshot as a new game.
+        
+        The game is restored with one bulk insert per table and gets new IDs
+        throughout; the game the snapshot was taken from is not touched.
+        
+        Args:
+            request: The HTTP request carrying the snapshot
+            
+        Returns:
+            Response: The new game data, or 400 if the snapshot is invalid
+        """
+        data = request.data
+        if not isinstance(data, bytes):
+            upload = data.get('snapshot')
+            data = upload.read() if upload else b''
+        try:
+            game = import_snapshot(decode_snapshot(data))
+        except SnapshotError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        game = Game.objects.prefetch_related('empires', 'systems').get(pk=game.pk)
+        return Response(self.get_serializer(game).data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        description='End the current turn for an empire; the turn is processed once every human empire '
+                    'has ended it or its deadline has passed',
+        request={
+            'application/json': {
+                'type': 'object',
+                'properties': {
+                    'empire': {
+                        'type': 'integer',
+                        'description': 'The human empire ending the turn, required when several humans play'
+                    }
+                }
+            }
+        },
+        responses={
+            200: GameSerializer,
+            202: {
+                'type': 'object',
+                'description': 'The unchanged game and the human empires still to end the turn',
+                'properties': {
+                    'waiting_for': {'type': 'array', 'items': {'type': 'integer'}}
+                }
+            },
+            400: {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string', 'description': 'Why the empire could not end the turn'}
+                }
+            }
+        }
     )
     @action(detail=True, methods=['post'], url_path='end-turn')
     def end_turn(self, request, pk=None):
-        """End the current turn and start the next one.
+        """End the current turn for an empire.
         
         This action:
-        1. Retrieves the current game
-        2. Processes the end of turn
-        3. Returns the updated game state
+        1. Marks the empire ready for the current turn
+        2. Processes the end of turn once no human empire is left to wait
+           for, or the turn's deadline has passed, see :mod:`play.barrier`
+        3. Returns the game state
         
         Args:
-            request: The HTTP request
+            request: The HTTP request with an optional ``empire``
             pk: The primary key of the game
             
         Returns:
-            Response: The updated game data
+            Response: The updated game data, 202 with the unchanged game and
+            the empires still to end the turn, or 400 for an invalid empire
         """
         game = self.get_object()
-        game = process(game)
+        empire_id = request.data.get('empire')
+        if empire_id is not None and not str(empire_id).isdigit():
+            return Response({'error': 'empire must be an empire ID'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            game, waiting = end_turn(game, None if empire_id is None else int(empire_id))
+        except BarrierError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         serializer = self.get_serializer(game)
+        if waiting:
+            return Response(dict(serializer.data, waiting_for=waiting), status=status.HTTP_202_ACCEPTED)
         return Response(serializer.data)
 
+    @extend_schema(
+        description='Restore the game to the start of an earlier turn from its per-turn snapshots',
+        parameters=[
+            OpenApiParameter(
+                name='turn',
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                required=True,
+                description='The turn to rewind to'
+            )
+        ],
+        request=None,
+        responses={
+            200: GameSerializer,
+            400: {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string', 'description': 'Why the game could not be rewound'}
+                }
+            }
+        }
+    )
+    @action(detail=True, methods=['post'])
+    def rewind(self, request, pk=None):
+        """Restore the game to the start of an earlier turn.
+        
+        Empire storage, planet and asteroid belt owners and research points
+        are restored from the game's per-turn snapshots, see :mod:`play.history`.
+        
+        Args:
+            request: The HTTP request with the ``turn`` query parameter
+            pk: The game ID
+            
+        Returns:
+            Response: The rewound game data, or 400 if the turn can't be restored
+        """
+        game = self.get_object()
+        turn = request.query_params.get('turn', '')
+        if not turn.isdigit():
+            return Response(
+                {'error': 'turn must be a non-negative integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            game = rewind_game(game, int(turn))
+        except RewindError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        game = Game.objects.prefetch_related('empires', 'systems').get(pk=game.pk)
+        return Response(self.get_serializer(game).data)
+
     @extend_schema(
         description='Start a new game with the specified parameters',
         request=StartGameSerializer,
@@ -0,0 +1,195 @@
+"""Sharded turn workers.
+
+To spread turn processing over machines, games are split into a fixed
+number of hash partitions (the game ID modulo ``partitions``), and each
+:class:`TurnWorker` processes the overdue turns of the partitions it holds:
+
+- Every worker renews a ``worker:<owner>`` lease each round, so the live
+  workers can be counted, and holds a ``partition:<n>`` lease per partition
+- Each round, a worker renews its partitions up to its fair share (the
+  partitions divided by the live workers), releases any beyond it, and
+  claims free partitions until it has its share. A worker that dies stops
+  renewing, and once its leases expire the others take its partitions over
+- Within its partitions a worker is a :class:`play.scheduler.TurnScheduler`,
+  with the same per-game leases, parallel batches and backpressure
+
+:meth:`TurnWorker.metrics` reports throughput and lag, and
+:func:`format_metrics` renders them in the Prometheus text format.
+``python manage.py run_turn_worker`` runs a worker.
+"""
+
+import logging
+import math
+import time
+import zlib
+from django.db.models import Count, Min
+from django.db.models.functions import Mod
+from django.utils import timezone
+from .leases import acquire_lease, lease_holders, release_lease
+from .models import Game
+from .scheduler import TurnScheduler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARTITIONS = 16
+
+DEFAULT_WORKER_LEASE_SECONDS = 30
+
+PARTITION_PREFIX = 'partition:'
+
+WORKER_PREFIX = 'worker:'
+
+
+def partition_of(game_id, partitions):
+    """Get the partition a game belongs to.
+
+    Args:
+        game_id (int): The game ID
+        partitions (int): Number of partitions
+
+    Returns:
+        int: The partition number
+    """
+    return game_id % partitions
+
+
+class TurnWorker(TurnScheduler):
+    """Process the overdue turns of the partitions this worker holds.
+
+    Args:
+        partitions (int): Number of partitions, the same for every worker
+        lease_seconds (float): How long partition and worker leases last;
+            rounds must come more often than this
+        **kwargs: :class:`play.scheduler.TurnScheduler` arguments
+    """
+
+    def __init__(self, partitions=DEFAULT_PARTITIONS, lease_seconds=DEFAULT_WORKER_LEASE_SECONDS, **kwargs):
+        super().__init__(lease_seconds=lease_seconds, **kwargs)
+        self.partitions = partitions
+        self.owned = set()
+        self.live_workers = 1
+        # Workers start claiming at different partitions, so they don't all contend for the first ones
+        self._offset = zlib.crc32(self.owner.encode()) % partitions
+        self._started = time.monotonic()
+        self._last_metrics = (self._started, 0)
+
+    def games(self):
+        """Get the games of the partitions this worker holds.
+
+        Returns:
+            QuerySet: The games
+        """
+        if not self.owned:
+            return Game.objects.none()
+        return Game.objects.annotate(partition=Mod('id', self.partitions)).filter(partition__in=self.owned)
+
+    def rebalance(self, now=None):
+        """Renew this worker's leases and take its fair share of partitions.
+
+        Args:
+            now (datetime): The current time, defaults to now
+
+        Returns:
+            set: The partitions this worker holds
+        """
+        now = now or timezone.now()
+        acquire_lease(f'{WORKER_PREFIX}{self.owner}', self.owner, self.lease_seconds, now)
+        self.live_workers = max(len(lease_holders(WORKER_PREFIX, now)), 1)
+        share = math.ceil(self.partitions / self.live_workers)
+        holders = lease_holders(PARTITION_PREFIX, now)
+
+        mine = sorted(
+            int(name[len(PARTITION_PREFIX):]) for name, owner in holders.items() if owner == self.owner
+        )
+        owned = set()
+        for partition in mine[share:]:
+            release_lease(f'{PARTITION_PREFIX}{partition}', self.owner)
+        for partition in mine[:share]:
+            if acquire_lease(f'{PARTITION_PREFIX}{partition}', self.owner, self.lease_seconds, now):
+                owned.add(partition)
+        for step in range(self.partitions):
+            if len(owned) >= share:
+                break
+            partition = (self._offset + step) % self.partitions
+            if f'{PARTITION_PREFIX}{partition}' in holders:
+                continue
+            if acquire_lease(f'{PARTITION_PREFIX}{partition}', self.owner, self.lease_seconds, now):
+                owned.add(partition)
+
+        if owned != self.owned:
+            logger.info(
+                f"Turn worker {self.owner} holds partitions {sorted(owned)} "
+                f"of {self.partitions} with {self.live_workers} live workers"
+            )
+            # Queued deadlines may belong to partitions that moved
+            self.reset()
+        self.owned = owned
+        return owned
+
+    def run_once(self, now=None):
+        """Rebalance the partitions and process one batch of their overdue games.
+
+        Args:
+            now (datetime): The current time, defaults to now
+
+        Returns:
+            dict: See :meth:`play.scheduler.TurnScheduler.run_once`
+        """
+        now = now or timezone.now()
+        self.rebalance(now)
+        return super().run_once(now)
+
+    def metrics(self, now=None):
+        """Measure the worker's throughput and lag.
+
+        Args:
+            now (datetime): The current time, defaults to now
+
+        Returns:
+            dict: ``partitions`` held, ``live_workers``, ``processed_total``
+            turns, ``throughput`` in turns per second since the previous
+            call, ``overdue`` games in the held partitions and ``lag_seconds``,
+            how long the most overdue of them has waited
+        """
+        now = now or timezone.now()
+        overdue = self.games().filter(turn_deadline__lte=now).aggregate(
+            count=Count('id'), oldest=Min('turn_deadline')
+        )
+        clock = time.monotonic()
+        since, processed = self._last_metrics
+        self._last_metrics = (clock, self.processed)
+        return {
+            'partitions': len(self.owned),
+            'live_workers': self.live_workers,
+            'processed_total': self.processed,
+            'throughput': round((self.processed - processed) / (clock - since), 3) if clock > since else 0.0,
+            'overdue': overdue['count'],
+            'lag_seconds': round((now - overdue['oldest']).total_seconds(), 3) if overdue['oldest'] else 0.0,
+        }
+
+    def shutdown(self):
+        """Give up this worker's leases, so the others take its partitions over at once."""
+        for partition in self.owned:
+            release_lease(f'{PARTITION_PREFIX}{partition}', self.owner)
+        release_lease(f'{WORKER_PREFIX}{self.owner}', self.owner)
+        self.owned = set()
+        self.close()
+
+
+def format_metrics(metrics, owner):
+    """Render worker metrics in the Prometheus text exposition format.
+
+    Args:
+        metrics (dict): Result of :meth:`TurnWorker.metrics`
+        owner (str): The worker, added as the ``worker`` label
+
+    Returns:
+        str: One sample per metric
+    """
+    types = {'processed_total': 'counter'}
+    lines = []
+    for name, value in metrics.items():
+        metric = f'spacegame_turn_worker_{name}'
+        lines.append(f'# TYPE {metric} {types.get(name, "gauge")}')
+        lines.append(f'{metric}{{worker="{owner}"}} {value}')
+    return '\n'.join(lines) + '\n'
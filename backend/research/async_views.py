@@ -0,0 +1,34 @@
+"""Async read views for the research API.
+
+Serves ``GET technologies/`` with Django's async ORM, in the same id cursor
+pages as :class:`research.views.TechnologyViewSet`. Creating technologies
+through the same route is delegated to the sync viewset. See
+:mod:`play.async_views` for how the async views are mounted.
+"""
+
+from core.async_views import InvalidCursor, paginate_by_id, read_view, render_json
+from .models import Technology
+from .serializers import TechnologySerializer
+from .views import TechnologyViewSet
+
+
+async def technology_list(request):
+    """List technologies with their prerequisites, one id cursor page at a time.
+
+    Args:
+        request: The HTTP request
+
+    Returns:
+        HttpResponse: Page of technologies with ``next`` and ``previous`` links
+    """
+    technologies = Technology.objects.prefetch_related('prerequisites')
+    try:
+        page = await paginate_by_id(
+            request, technologies, lambda rows: TechnologySerializer(rows, many=True).data
+        )
+    except InvalidCursor:
+        return render_json({'detail': 'Invalid cursor'}, status=404)
+    return render_json(page)
+
+
+technologies = read_view(technology_list, TechnologyViewSet.as_view({'post': 'create'}))
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("play", "0003_game_change"),
+        ("research", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="empiretechnology",
+            name="empire",
+            field=models.ForeignKey(
+                db_index=False,
+                help_text="The empire researching the technology",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="technology_research",
+                to="play.empire",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="empiretechnology",
+            name="technology",
+            field=models.ForeignKey(
+                db_index=False,
+                help_text="The technology being researched",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="empire_research",
+                to="research.technology",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="empiretechnology",
+            index=models.Index(
+                fields=["empire", "technology"],
+                include=("research_points",),
+                name="research_emptech_empire_cov",
+            ),
+        ),
+    ]
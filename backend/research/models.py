@@ -58,12 +58,14 @@ class EmpireTechnology(models.Model):
         Technology,
         on_delete=models.CASCADE,
         related_name='empire_research',
+        db_index=False,  # Leading column of the unique_together (technology, empire) index
         help_text="The technology being researched"
     )
     empire = models.ForeignKey(
         'play.Empire',
         on_delete=models.CASCADE,
         related_name='technology_research',
+        db_index=False,  # Leading column of research_emptech_empire_cov
         help_text="The empire researching the technology"
     )
     research_points = models.DecimalField(
@@ -77,6 +79,14 @@ class EmpireTechnology(models.Model):
         app_label = 'research'
         verbose_name_plural = 'Empire Technologies'
         unique_together = ['technology', 'empire']
+        indexes = [
+            # An empire's research, and (empire, technology) lookups, with the
+            # progress read from the index on PostgreSQL
+            models.Index(
+                fields=['empire', 'technology'], include=['research_points'],
+                name='research_emptech_empire_cov',
+            ),
+        ]
 
     def __str__(self):
         """String representation of the EmpireTechnology."""
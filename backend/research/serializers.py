@@ -2,6 +2,7 @@ from rest_framework import serializers
 from research.models import Technology, EmpireTechnology
 from play.serializers import EmpireSerializer
 from play.models import Empire
+from core.serializers import SparseFieldsetMixin
 
 
 class TechnologySerializer(serializers.ModelSerializer):
@@ -33,11 +34,12 @@ class TechnologySerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class EmpireTechnologySerializer(serializers.ModelSerializer):
+class EmpireTechnologySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for EmpireTechnology model.
     
     Handles conversion of EmpireTechnology instances to/from JSON for API responses.
-    Includes related technology and empire information.
+    Includes related technology information. The empire is rendered as
+    ``empire_id`` unless the nested empire is requested with ``?expand=empire``.
     """
     technology = TechnologySerializer(read_only=True)
     technology_id = serializers.PrimaryKeyRelatedField(
@@ -50,7 +52,6 @@ class EmpireTechnologySerializer(serializers.ModelSerializer):
     empire_id = serializers.PrimaryKeyRelatedField(
         queryset=Empire.objects.all(),
         source='empire',
-        write_only=True,
         help_text="The empire researching the technology"
     )
 
@@ -60,4 +61,5 @@ class EmpireTechnologySerializer(serializers.ModelSerializer):
             'id', 'technology', 'technology_id', 'empire', 'empire_id',
             'research_points', 'is_complete'
         ]
-        read_only_fields = ['id', 'is_complete'] 
\ No newline at end of file
+        read_only_fields = ['id', 'is_complete']
+        expandable_fields = ['empire'] 
\ No newline at end of file
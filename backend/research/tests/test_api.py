@@ -30,7 +30,7 @@ class TechnologyAPITests(APITestCase):
         """Test retrieving a list of technologies"""
         response = self.client.get(self.tech_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
 
     def test_create_technology(self):
         """Test creating a new technology"""
@@ -119,7 +119,7 @@ class EmpireTechnologyAPITests(APITestCase):
         """Test retrieving a list of empire technologies"""
         response = self.client.get(self.empire_tech_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_create_empire_technology(self):
         """Test creating a new empire technology"""
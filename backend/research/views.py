@@ -6,6 +6,8 @@ from django.db import transaction
 from decimal import Decimal
 from research.models import Technology, EmpireTechnology
 from research.serializers import TechnologySerializer, EmpireTechnologySerializer
+from play.versioning import GameETagMixin
+from core.streaming import StreamingListMixin
 
 
 class TechnologyViewSet(viewsets.ModelViewSet):
@@ -61,13 +63,17 @@ class TechnologyViewSet(viewsets.ModelViewSet):
             )
 
 
-class EmpireTechnologyViewSet(viewsets.ModelViewSet):
+class EmpireTechnologyViewSet(GameETagMixin, StreamingListMixin, viewsets.ModelViewSet):
     """ViewSet for EmpireTechnology model.
     
     Provides CRUD operations for empire technology research and additional actions for managing research progress.
     """
-    queryset = EmpireTechnology.objects.all()
+    queryset = EmpireTechnology.objects.select_related(
+        'technology', 'empire__player', 'empire__race'
+    ).prefetch_related('technology__prerequisites')
     serializer_class = EmpireTechnologySerializer
+    scope_filter_lookups = {'game': 'empire__game', 'empire': 'empire'}
+    etag_game_lookup = 'empire__game_id'
 
     @action(detail=True, methods=['post'])
     def add_research_points(self, request, pk=None):
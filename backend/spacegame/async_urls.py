@@ -0,0 +1,23 @@
+"""
+URL configuration of the async read views.
+
+Included under ``api/async/``, and also under ``api/`` in front of the sync
+viewsets when ``ASYNC_READ_VIEWS`` is enabled. The routes mirror the sync
+viewset routes they replace.
+"""
+
+from django.urls import path
+from play import async_views as play_views
+from research import async_views as research_views
+
+app_name = 'async'
+
+urlpatterns = [
+    path('games/', play_views.games, name='game-list'),
+    path('games/<int:pk>/', play_views.game, name='game-detail'),
+    path('games/<int:pk>/systems/', play_views.systems, name='game-systems'),
+    path('games/<int:pk>/empires/', play_views.empires, name='game-empires'),
+    path('empires/<int:pk>/planets/', play_views.planets, name='empire-planets'),
+    path('empires/<int:pk>/asteroid-belts/', play_views.asteroid_belts, name='empire-asteroid-belts'),
+    path('technologies/', research_views.technologies, name='technology-list'),
+]
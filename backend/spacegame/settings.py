@@ -11,10 +11,17 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 from pathlib import Path
+import environ
+from core.database import database_settings, replica_database_settings
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Read deployment settings from the environment, or from backend/.env if present
+env = environ.Env()
+if (BASE_DIR / ".env").exists():
+    environ.Env.read_env(BASE_DIR / ".env")
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.0/howto/deployment/checklist/
@@ -53,6 +60,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.routers.replica_routing_middleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -84,18 +92,21 @@ WSGI_APPLICATION = "spacegame.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
+# Configured with DATABASE_URL or POSTGRES_* variables, and DB_CONN_MAX_AGE,
+# DB_CONN_HEALTH_CHECKS and DB_POOL* for connection reuse (see core.database)
 
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": "spacegame",
-        "USER": "spacegame",
-        "PASSWORD": "spacegame",
-        "HOST": "db",
-        "PORT": "5432",
-    }
+    "default": database_settings(env),
 }
 
+# Reads of GET/HEAD/OPTIONS requests go to a replica set with DATABASE_REPLICA_URL,
+# except for clients that wrote in the last REPLICA_STICKY_SECONDS (see core.routers)
+if replica_database_settings(env):
+    DATABASES["replica"] = replica_database_settings(env)
+DATABASE_ROUTERS = ["core.routers.ReplicaRouter"]
+REPLICA_DATABASE_ALIAS = "replica" if "replica" in DATABASES else None
+REPLICA_STICKY_SECONDS = env.int("DB_REPLICA_STICKY_SECONDS", default=5)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -204,6 +215,8 @@ LOGGING = {
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.IdCursorPagination',
+    'DEFAULT_FILTER_BACKENDS': ['core.filters.GameScopeFilterBackend'],
 }
 
 # Spectacular settings
@@ -216,3 +229,48 @@ SPECTACULAR_SETTINGS = {
 
 # URL Configuration
 APPEND_SLASH = False
+
+# Game settings
+# Seconds an empire dashboard stays cached (entries are also keyed by game version)
+DASHBOARD_CACHE_TIMEOUT = 60 * 60
+
+# Number of turns of changes kept per game for delta sync
+GAME_CHANGE_LOG_HORIZON = 10
+
+# Turns between full snapshots of a game's state; the turns between them
+# store only the rows that changed (see play.history)
+GAME_SNAPSHOT_KEYFRAME_INTERVAL = 20
+
+# Largest decompressed save-game snapshot accepted for import, in bytes
+GAME_SNAPSHOT_MAX_SIZE = 64 * 1024 * 1024
+
+# Rows fetched and rendered per chunk by streamed list responses (?stream=true)
+STREAM_CHUNK_SIZE = 500
+
+# Seconds a game's galaxy layout stays cached (celestial edits also invalidate it)
+GALAXY_LAYOUT_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Seconds the response data of a game-scoped GET is shared between identical
+# requests for the same game version (0 disables request coalescing)
+GAME_READ_COALESCE_TIMEOUT = 60
+
+# Pub/sub backend fanning out game events to Server-Sent Event streams. Set
+# play.events.PostgresPubSub when turns are processed by run_turn_scheduler,
+# run_turn_worker or several web processes (LocalPubSub reaches this process only)
+GAME_EVENTS_PUBSUB = env.str("GAME_EVENTS_PUBSUB", default="play.events.LocalPubSub")
+
+# Seconds between heartbeat comments on idle game event streams
+GAME_EVENTS_HEARTBEAT = 15
+
+# Research points each empire may allocate with orders per turn
+RESEARCH_POINTS_PER_TURN = 100
+
+# CPU seconds each computer empire may think per turn, and processes the turn
+# scheduler and worker commands start to decide computer empire orders in
+# parallel (None: one per CPU, 0: in process). Web processes always decide in process
+AI_TURN_BUDGET = env.float("AI_TURN_BUDGET", default=0.05)
+AI_WORKERS = env.int("AI_WORKERS", default=None)
+
+# Serve the read-only game endpoints under /api/ with the async ORM views
+# (they are always available under /api/async/); run under an ASGI server
+ASYNC_READ_VIEWS = env.bool('ASYNC_READ_VIEWS', default=False)
@@ -5,8 +5,19 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': ':memory:',
-    }
+    },
+    # Separate database standing in for a read replica; tests that use it
+    # enable routing with REPLICA_DATABASE_ALIAS
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
 }
+REPLICA_DATABASE_ALIAS = None
+
+# Decide computer empire orders in the test process; tests that use the
+# process pool enable it with AI_WORKERS
+AI_WORKERS = 0
 
 # Disable password hashers for faster tests
 PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
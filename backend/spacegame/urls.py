@@ -15,16 +15,23 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 from .views import HomeView
 
+# Async read views, also served in front of the sync viewsets when enabled
+async_api = [path("api/async/", include("spacegame.async_urls", namespace="async"))]
+if getattr(settings, 'ASYNC_READ_VIEWS', False):
+    async_api.append(path("api/", include("spacegame.async_urls", namespace="async-default")))
+
 urlpatterns = [
     path("", HomeView.as_view(), name="home"),
     path("admin/doc/", include("django.contrib.admindocs.urls")),
     path("admin/", admin.site.urls),
     # API endpoints
+    *async_api,
     path("api/", include("celestial.urls")),
     path("api/", include("play.urls")),
     path("api/", include("research.urls")),
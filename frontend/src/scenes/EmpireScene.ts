@@ -132,40 +132,27 @@ export class EmpireScene extends Phaser.Scene {
 
     private async loadEmpireData() {
         try {
-            // First get the game data to find our empire
-            const gameResponse = await fetch(`/api/games/${this.gameData.id}/empires/`);
-            if (!gameResponse.ok) {
-                throw new Error('Failed to fetch game empires');
+            // One request returns the empire, its storage and capacities and its colonies
+            const response = await fetch(`/api/games/${this.gameData.id}/dashboard/`);
+            if (!response.ok) {
+                throw new Error('Failed to fetch empire dashboard');
             }
-            const empires: EmpireData[] = await gameResponse.json();
-            const humanEmpire = empires.find(empire => empire.player.player_type === 'human');
-            if (!humanEmpire) {
-                throw new Error('Could not find human empire');
-            }
-
-            // Now get the detailed empire data
-            const empireResponse = await fetch(`/api/empires/${humanEmpire.id}/`);
-            if (!empireResponse.ok) {
-                throw new Error('Failed to fetch empire data');
-            }
-            this.empireData = await empireResponse.json();
-            
-            // Fetch planets and asteroid belts using the correct empire ID
-            const [planetsResponse, asteroidsResponse] = await Promise.all([
-                fetch(`/api/empires/${this.empireData.id}/planets/`),
-                fetch(`/api/empires/${this.empireData.id}/asteroid-belts/`)
-            ]);
-
-            if (!planetsResponse.ok || !asteroidsResponse.ok) {
-                throw new Error('Failed to fetch colonies data');
-            }
-
-            const planets = await planetsResponse.json();
-            const asteroids = await asteroidsResponse.json();
+            const dashboard = await response.json();
+
+            this.empireData = {
+                ...dashboard.empire,
+                planets: dashboard.colonies.planets,
+                asteroid_belts: dashboard.colonies.asteroid_belts,
+                mineral_storage: dashboard.storage.mineral,
+                organic_storage: dashboard.storage.organic,
+                radioactive_storage: dashboard.storage.radioactive,
+                exotic_storage: dashboard.storage.exotic,
+                resource_capacities: dashboard.capacities
+            };
 
             this.colonies = [
-                ...planets.map((p: any) => ({ ...p, type: 'planet' as const })),
-                ...asteroids.map((a: any) => ({ ...a, type: 'asteroid-belt' as const }))
+                ...dashboard.colonies.planets.map((p: any) => ({ ...p, type: 'planet' as const })),
+                ...dashboard.colonies.asteroid_belts.map((a: any) => ({ ...a, type: 'asteroid-belt' as const }))
             ];
 
             // Sort colonies by orbit number
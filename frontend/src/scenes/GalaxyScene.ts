@@ -38,6 +38,12 @@ interface AsteroidBeltData {
     exotic_production: number;
 }
 
+interface TurnCompletedEvent {
+    game: number;
+    turn: number;
+    version: string;
+}
+
 interface SystemData {
     id: number;
     x: number;
@@ -53,6 +59,7 @@ export class GalaxyScene extends Phaser.Scene {
     private gameData!: GameData;
     private turnText!: Phaser.GameObjects.Text;
     private systems: SystemData[] = [];
+    private eventStream?: EventSource;
     private readonly GRID_SIZE = 50;
     private readonly PADDING = 50; // Padding from screen edges
 
@@ -102,6 +109,9 @@ export class GalaxyScene extends Phaser.Scene {
 
         // Fetch and draw systems with adjusted padding
         await this.fetchAndDrawSystems(effectivePadding);
+
+        // Follow turn changes pushed by the server instead of polling
+        this.subscribeToGameEvents();
         
         // Position End Turn button in bottom right
         const endTurnButtonX = this.cameras.main.width - buttonWidth - padding;
@@ -239,6 +249,42 @@ export class GalaxyScene extends Phaser.Scene {
         }
     }
 
+    private subscribeToGameEvents(): void {
+        this.eventStream = new EventSource(`/api/games/${this.gameData.id}/events/`);
+        this.eventStream.addEventListener('turn_completed', (event: MessageEvent) => {
+            const data: TurnCompletedEvent = JSON.parse(event.data);
+            this.gameData.turn = data.turn;
+            this.turnText.setText(`Turn: ${data.turn}`);
+            // Computer empires and player orders change owners during the turn
+            this.refreshOwnership();
+        });
+        this.eventStream.onerror = (error) => {
+            // EventSource reconnects by itself and the server resends the current turn
+            console.error('Game event stream error:', error);
+        };
+
+        // Close the stream when leaving the galaxy view
+        this.sys.events.once(Phaser.Scenes.Events.SHUTDOWN, () => {
+            this.eventStream?.close();
+            this.eventStream = undefined;
+        });
+    }
+
+    private async refreshOwnership(): Promise<void> {
+        try {
+            // The server serves the systems from its cached galaxy layout with a
+            // fresh ownership overlay, so this costs one small query. Positions
+            // don't change between turns, so nothing is redrawn.
+            const response = await fetch(`/api/games/${this.gameData.id}/systems/`);
+            if (!response.ok) {
+                throw new Error('Failed to fetch systems');
+            }
+            this.systems = await response.json();
+        } catch (error) {
+            console.error('Error refreshing ownership:', error);
+        }
+    }
+
     private async endTurn(): Promise<void> {
         try {
             const response = await fetch(`/api/games/${this.gameData.id}/end-turn/`, {
@@ -252,29 +298,20 @@ export class GalaxyScene extends Phaser.Scene {
                 throw new Error('Failed to end turn');
             }
 
+            // 202 means other empires haven't ended the turn yet
+            if (response.status === 202) {
+                return;
+            }
+
+            // The new turn arrives on the event stream, and is also taken
+            // from the response in case the stream is down
             const updatedGameData = await response.json();
             this.gameData = updatedGameData;
             this.turnText.setText(`Turn: ${this.gameData.turn}`);
-            
-            // Calculate UI dimensions for padding
-            const buttonHeight = 50;
-            const padding = 20;
-            const topBarHeight = 60;
-            const bottomBarHeight = buttonHeight + (padding * 2);
-
-            // Create padding object for grid and systems
-            const effectivePadding = {
-                top: this.PADDING + topBarHeight,
-                bottom: this.PADDING + bottomBarHeight,
-                left: this.PADDING,
-                right: this.PADDING
-            };
-            
-            // Refresh systems after turn with proper padding
-            await this.fetchAndDrawSystems(effectivePadding);
+            await this.refreshOwnership();
         } catch (error) {
             console.error('Error ending turn:', error);
             // TODO: Show error message to user
         }
     }
-} 
\ No newline at end of file
+}
\ No newline at end of file
@@ -59,18 +59,72 @@ export class LoadGameScene extends Phaser.Scene {
             }
         });
 
+        // Create Import button for save-game snapshots
+        new SciFiButton({
+            scene: this,
+            x: this.cameras.main.width - 100,
+            y: this.cameras.main.height - 50,
+            text: 'Import',
+            style: ButtonStyle.PRIMARY,
+            callback: () => this.importSnapshot()
+        });
+
         // Load and display games
         await this.loadGames();
     }
 
+    private importSnapshot(): void {
+        const input = document.createElement('input');
+        input.type = 'file';
+        input.accept = '.gz,application/gzip';
+        input.onchange = async () => {
+            const file = input.files?.[0];
+            if (!file) {
+                return;
+            }
+            try {
+                const response = await fetch('/api/games/import/', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/gzip' },
+                    body: file
+                });
+                if (!response.ok) {
+                    throw new Error('Failed to import game');
+                }
+                // Reload games list
+                await this.loadGames();
+            } catch (error) {
+                console.error('Error importing game:', error);
+                // TODO: Show error message to user
+            }
+        };
+        input.click();
+    }
+
+    private exportSnapshot(game: GameData): void {
+        // The server sends the snapshot as an attachment
+        const link = document.createElement('a');
+        link.href = `/api/games/${game.id}/snapshot/`;
+        link.download = `game-${game.id}-turn-${game.turn}.snapshot.gz`;
+        link.click();
+    }
+
     private async loadGames(): Promise<void> {
         try {
-            const response = await fetch('/api/games/');
-            if (!response.ok) {
-                throw new Error('Failed to fetch games');
-            }
+            // The games list is paged; follow the cursor links to the last page
+            const games: GameData[] = [];
+            let url: string | null = '/api/games/';
+            while (url) {
+                const response = await fetch(url);
+                if (!response.ok) {
+                    throw new Error('Failed to fetch games');
+                }
 
-            this.games = await response.json();
+                const page: { next: string | null; results: GameData[] } = await response.json();
+                games.push(...page.results);
+                url = page.next;
+            }
+            this.games = games;
             this.displayGames();
         } catch (error) {
             console.error('Error loading games:', error);
@@ -92,7 +146,7 @@ export class LoadGameScene extends Phaser.Scene {
             // Load button
             const loadButton = new SciFiButton({
                 scene: this,
-                x: -50,
+                x: -90,
                 y: 0,
                 text: 'Load',
                 width: 80,
@@ -107,10 +161,23 @@ export class LoadGameScene extends Phaser.Scene {
                 }
             });
 
+            // Export button
+            const exportButton = new SciFiButton({
+                scene: this,
+                x: 0,
+                y: 0,
+                text: 'Export',
+                width: 80,
+                height: 30,
+                style: ButtonStyle.SECONDARY,
+                textStyle: { fontSize: '14px' },
+                callback: () => this.exportSnapshot(game)
+            });
+
             // Delete button
             const deleteButton = new SciFiButton({
                 scene: this,
-                x: 50,
+                x: 90,
                 y: 0,
                 text: 'Delete',
                 width: 80,
@@ -134,7 +201,7 @@ export class LoadGameScene extends Phaser.Scene {
                 }
             });
 
-            container.add([loadButton, deleteButton]);
+            container.add([loadButton, exportButton, deleteButton]);
             return container;
         };
 
@@ -154,7 +221,7 @@ export class LoadGameScene extends Phaser.Scene {
                 { header: 'Turn', key: 'turn', width: 100 },
                 { header: 'Created', key: 'created', width: 200, formatter: formatDate },
                 { header: 'Modified', key: 'modified', width: 200, formatter: formatDate },
-                { header: 'Actions', key: 'actions', width: 200 }
+                { header: 'Actions', key: 'actions', width: 280 }
             ],
             data: this.games.map(game => ({
                 ...game,